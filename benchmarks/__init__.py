@@ -0,0 +1,5 @@
+"""
+Benchmarks de desempenho da IA
+
+Cada módulo roda com `python -m benchmarks.<nome>`.
+"""
@@ -0,0 +1,65 @@
+"""
+Simulador de partidas em lote
+
+Joga partidas entre as políticas "curar com HP baixo, senão atacar" dos
+dois lados com simulate() e com RulesEngine.play_match(), uma partida por
+vez: partidas e turnos por segundo, e taxa de vitória e duração média de
+cada um (devem coincidir, a menos do sorteio).
+
+Uso:
+    python -m benchmarks.batch_simulator --matches 2000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from game.rules import ATTACK, ENEMY, HEAL, PLAYER, BattleRules, RulesEngine
+from game.simulator import heal_when_low, simulate
+
+
+def engine_matches(count, rules, seed):
+    engine = RulesEngine(rules, np.random.default_rng(seed))
+    threshold = rules.max_hp * 0.3
+    player_policy = lambda state: HEAL if state.player_hp < threshold else ATTACK
+    enemy_policy = lambda state: HEAL if state.enemy_hp < threshold else ATTACK
+
+    wins = turns = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        state = engine.play_match(player_policy, enemy_policy)
+        wins += state.winner == PLAYER
+        turns += state.turn - 1
+    return wins / count, turns / count, turns, time.perf_counter() - start
+
+
+def report(name, matches, win_rate, mean_turns, turns, elapsed, baseline=None):
+    rate = matches / elapsed
+    speedup = f"{rate / baseline:9.0f}x" if baseline else f"{'':>10}"
+    print(f"{name:>14} {matches:10d} {rate:12,.0f} {turns / elapsed:13,.0f} "
+          f"{win_rate:8.2%} {mean_turns:7.2f} {speedup}")
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de partidas em lote")
+    parser.add_argument('--matches', type=int, default=2_000_000)
+    parser.add_argument('--engine-matches', type=int, default=20_000,
+                        help="partidas jogadas uma a uma com RulesEngine")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rules = BattleRules.from_config()
+    print(f"{'':>14} {'partidas':>10} {'partidas/s':>12} {'turnos/s':>13} "
+          f"{'jogador':>8} {'turnos':>7}")
+    baseline = report("RulesEngine", args.engine_matches,
+                      *engine_matches(args.engine_matches, rules, args.seed))
+    result = simulate(args.matches, heal_when_low(PLAYER), heal_when_low(ENEMY), rules,
+                      rng=args.seed)
+    report("simulate()", len(result), result.player_win_rate, float(result.turns.mean()),
+           result.total_turns, result.elapsed, baseline)
+
+
+if __name__ == "__main__":
+    main()
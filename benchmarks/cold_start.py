@@ -0,0 +1,76 @@
+"""
+Partida a frio da IA neural
+
+Mede, em um processo novo para cada caso, o tempo de import do pacote,
+de create_neural_ai() (o que a janela espera antes de aparecer) e da
+primeira decisão:
+
+- eager, sem modelo: o comportamento anterior (treino inicial completo
+  no construtor);
+- lazy, modelo do pacote: game/data/default_model.bin carregado na
+  primeira decisão;
+- lazy, sem modelo: treino inicial em segundo plano e estratégia básica
+  até ele terminar.
+
+Uso:
+    python -m benchmarks.cold_start
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# Executado no processo filho
+CHILD = r"""
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+from game.neural_ai import NeuralAI
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    ai = NeuralAI(model_path=sys.argv[1], legacy_model_path=None,
+                  default_model_path=sys.argv[2] or None, lazy=sys.argv[3] == 'lazy')
+    created = time.perf_counter()
+    ai.decide_action(150, 200)
+    decided = time.perf_counter()
+    ai.wait_ready()
+    ready = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create': created - imported,
+                  'decide': decided - created, 'ready': ready - start,
+                  'source': ai.model_source}))
+"""
+
+CASES = (
+    ('eager, sem modelo', False, 'eager'),
+    ('lazy, modelo do pacote', True, 'lazy'),
+    ('lazy, sem modelo', False, 'lazy'),
+)
+
+
+def run_case(use_default, mode):
+    from game.neural_ai import DEFAULT_MODEL_PATH
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'model.bin')
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD, model_path,
+             DEFAULT_MODEL_PATH if use_default else '', mode],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partida a frio da IA neural")
+    parser.parse_args(argv)
+
+    print(f"{'':>24} {'import':>9} {'criação':>9} {'1ª decisão':>11} {'rede pronta':>12}  origem")
+    for name, use_default, mode in CASES:
+        times = run_case(use_default, mode)
+        print(f"{name:>24} {times['import'] * 1000:7.0f}ms {times['create'] * 1000:7.1f}ms "
+              f"{times['decide'] * 1000:9.1f}ms {times['ready']:11.2f}s  {times['source']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Partidas sem interface com o núcleo de regras
+
+Joga partidas entre duas políticas simples (curar com HP baixo, senão
+atacar) com Character (imprimindo em um buffer, como o console faria) e
+com RulesEngine.play_match(), com random.Random e com np.random.Generator.
+Mede turnos por segundo em um núcleo.
+
+Uso:
+    python -m benchmarks.headless_rules --seconds 3
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.entities import Character
+from game.rules import ATTACK, HEAL, RulesEngine
+
+
+def heal_when_low_policies():
+    """Políticas do jogador e do inimigo: curar abaixo de 30% do HP máximo, senão atacar"""
+    threshold = GAME_CONFIG['MAX_HP'] * 0.3
+    return (lambda state: HEAL if state.player_hp < threshold else ATTACK,
+            lambda state: HEAL if state.enemy_hp < threshold else ATTACK)
+
+
+def character_matches(seconds, seed):
+    """Partidas com Character, como os laços do console e das GUIs"""
+    max_hp = GAME_CONFIG['MAX_HP']
+    threshold = max_hp * 0.3
+    rng = random.Random(seed)
+    turns = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while time.perf_counter() - start < seconds:
+            player = Character("Jogador", max_hp, GAME_CONFIG['PLAYER_ATTACK'],
+                               GAME_CONFIG['PLAYER_DEFENSE'], rng=rng)
+            enemy = Character("Inimigo", max_hp, GAME_CONFIG['AI_ATTACK'],
+                              GAME_CONFIG['AI_DEFENSE'], rng=rng)
+            while player.is_alive() and enemy.is_alive():
+                player.reset_turn()
+                enemy.reset_turn()
+                player.heal() if player.hp < threshold else player.attack(enemy)
+                if enemy.is_alive():
+                    enemy.heal() if enemy.hp < threshold else enemy.attack(player)
+                turns += 1
+    return turns, time.perf_counter() - start
+
+
+def engine_matches(rng, seconds):
+    engine = RulesEngine(rng=rng)
+    player_policy, enemy_policy = heal_when_low_policies()
+    turns = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        state = engine.play_match(player_policy, enemy_policy)
+        turns += state.turn - 1
+    return turns, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partidas sem interface com o núcleo de regras")
+    parser.add_argument('--seconds', type=float, default=3.0, help="tempo de cada medição")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("Character", lambda: character_matches(args.seconds, args.seed)),
+        ("RulesEngine + Random", lambda: engine_matches(random.Random(args.seed), args.seconds)),
+        ("RulesEngine + Generator",
+         lambda: engine_matches(np.random.default_rng(args.seed), args.seconds)),
+    ]
+    print(f"{'':>24} {'turnos':>10} {'turnos/s':>12} {'aceleração':>11}")
+    baseline = None
+    for name, measure in cases:
+        turns, elapsed = measure()
+        rate = turns / elapsed
+        baseline = baseline or rate
+        print(f"{name:>24} {turns:10d} {rate:12,.0f} {rate / baseline:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
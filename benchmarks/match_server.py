@@ -0,0 +1,63 @@
+"""
+Servidor de partidas sob carga
+
+Sobe `python -m game.server` em outro processo, numa porta livre, e joga
+com run_load() levas de partidas simultâneas (padrão: 1.000 e 10.000) até
+o fim: latência de cada turno (p50, p99 e máxima, do pedido à resposta) e
+turnos por segundo.
+
+Uso:
+    python -m benchmarks.match_server --matches 1000 10000 --agent minimax-facil
+"""
+
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+
+from game.server import run_load
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"servidor não respondeu na porta {port}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas sob carga")
+    parser.add_argument('--matches', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--agent', default='minimax-facil')
+    parser.add_argument('--workers', type=int, default=0,
+                        help="processos da IA no servidor (0 = número de CPUs)")
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-m', 'game.server', '--host', '127.0.0.1',
+                               '--port', str(port), '--workers', str(args.workers)])
+    try:
+        wait_for_server(port)
+        print(f"Inimigo: {args.agent}")
+        for matches in args.matches:
+            report = asyncio.run(run_load(matches, '127.0.0.1', port, args.agent))
+            print(report.format())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Treinamento do modelo inicial da IA neural
+
+Compara o treinamento amostra por amostra (forward/backward com vetores,
+como SimpleNeuralNetwork.train fazia) com SimpleNeuralNetwork.fit em
+mini-batches, sobre os mesmos dados de train_initial_model(): tempo e
+acerto das ações da estratégia básica.
+
+Uso:
+    python -m benchmarks.neural_training --epochs 1000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+
+
+def per_sample_train(network, inputs, expected_outputs, epochs):
+    """Treinamento anterior: um forward/backward por amostra"""
+    for _ in range(epochs):
+        for sample, expected in zip(inputs, expected_outputs):
+            network.forward(sample)
+            network.backward(sample, expected)
+
+
+def accuracy(network, inputs, expected_outputs):
+    predicted = [np.argmax(network.forward(sample)) for sample in inputs]
+    return float(np.mean(np.array(predicted) == expected_outputs.argmax(axis=1)))
+
+
+def run(name, train, inputs, expected_outputs, seed):
+    np.random.seed(seed)
+    network = SimpleNeuralNetwork()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        train(network)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>18} {elapsed:9.2f}s {accuracy(network, inputs, expected_outputs):9.1%}")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Treinamento do modelo inicial da IA neural")
+    parser.add_argument('--epochs', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    ai = NeuralAI.__new__(NeuralAI)  # Só para gerar os dados, sem carregar modelo
+    inputs, expected_outputs = ai.initial_training_data()
+
+    print(f"{len(inputs)} amostras, {args.epochs} épocas")
+    print(f"{'':>18} {'tempo':>10} {'acerto':>9}")
+    old = run("amostra a amostra",
+              lambda network: per_sample_train(network, inputs, expected_outputs, args.epochs),
+              inputs, expected_outputs, args.seed)
+    new = run(f"lotes de {args.batch_size}",
+              lambda network: network.fit(inputs, expected_outputs, epochs=args.epochs,
+                                          batch_size=args.batch_size),
+              inputs, expected_outputs, args.seed)
+    print(f"{'aceleração':>18} {old / new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
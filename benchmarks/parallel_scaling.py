@@ -0,0 +1,62 @@
+"""
+Escalabilidade da busca paralela
+
+Mede o tempo de ParallelSearcher com 1, 2, 4 e 8 workers nas mesmas
+posições e informa o speedup em relação à busca serial. Como os workers
+mantêm uma tabela de transposição entre as tarefas, a referência serial
+também usa uma.
+
+Uso:
+    python -m benchmarks.parallel_scaling --depth 24 --positions 5
+"""
+
+import argparse
+import os
+import random
+import time
+
+from game.minimax import BattleState, minimax
+from game.parallel_search import ParallelSearcher
+from game.transposition import create_transposition_table
+
+
+def sample_positions(count, seed=0):
+    """Posições de meio de partida com a vez da IA"""
+    rng = random.Random(seed)
+    return [BattleState(rng.randint(80, 300), rng.randint(80, 300), False,
+                        rng.random() < 0.3, False)
+            for _ in range(count)]
+
+
+def time_searches(search, positions, depth):
+    start = time.perf_counter()
+    results = [search(state, depth, True) for state in positions]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speedup da busca paralela por número de workers")
+    parser.add_argument('--depth', type=int, default=24)
+    parser.add_argument('--positions', type=int, default=5)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    positions = sample_positions(args.positions)
+    print(f"CPUs: {os.cpu_count()} | profundidade {args.depth} | {len(positions)} posições")
+
+    table = create_transposition_table()
+    serial_time, expected = time_searches(
+        lambda state, depth, maximizing: minimax(state, depth, maximizing, tt=table),
+        positions, args.depth)
+    print(f"{'serial':>8}: {serial_time:8.3f}s")
+
+    for workers in args.workers:
+        with ParallelSearcher(workers=workers, min_depth=0) as searcher:
+            searcher.warm_up()
+            elapsed, results = time_searches(searcher.search, positions, args.depth)
+        status = "ok" if results == expected else "DIVERGENTE"
+        print(f"{workers:>8}: {elapsed:8.3f}s  speedup {serial_time / elapsed:5.2f}x  {status}")
+
+
+if __name__ == "__main__":
+    main()
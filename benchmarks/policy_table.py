@@ -0,0 +1,81 @@
+"""
+Decisões da IA neural: rede a cada chamada x PolicyTable
+
+Mede uma decisão por chamada (game_state_to_input + predict, como
+decide_action fazia, contra PolicyTable.action_index), decisões em lote
+(forward_batch contra lookup) e o custo de calcular a tabela.
+
+Uso:
+    python -m benchmarks.policy_table --decisions 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from game.policy_table import PolicyTable
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rede neural x tabela de política")
+    parser.add_argument('--decisions', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    np.random.seed(args.seed)
+    ai = NeuralAI.__new__(NeuralAI)  # Sem carregar modelo do disco
+    ai.network = SimpleNeuralNetwork()
+    ai.policy_table = None
+    table = PolicyTable(ai)
+
+    rng = np.random.default_rng(args.seed)
+    states = [(int(player_hp), int(enemy_hp), bool(player_defending), bool(enemy_defending),
+               int(turn))
+              for player_hp, enemy_hp, player_defending, enemy_defending, turn in zip(
+                  rng.integers(0, 301, args.decisions), rng.integers(0, 301, args.decisions),
+                  rng.random(args.decisions) < 0.5, rng.random(args.decisions) < 0.5,
+                  rng.integers(1, 30, args.decisions))]
+
+    start = time.perf_counter()
+    table.build()
+    build_time = time.perf_counter() - start
+    print(f"Tabela completa: {table.nbytes / 1e6:.1f} MB, {table.builds} linhas em "
+          f"{build_time:.2f}s ({build_time / table.builds * 1e6:.0f} µs/linha)")
+
+    start = time.perf_counter()
+    for fields in states:
+        ai.network.predict(ai.game_state_to_input(*fields))
+    network_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for fields in states:
+        table.action_index(*fields)
+    table_time = time.perf_counter() - start
+
+    print(f"\n{'uma por chamada':>18} {'µs/decisão':>12}")
+    print(f"{'rede':>18} {network_time / len(states) * 1e6:12.2f}")
+    print(f"{'tabela':>18} {table_time / len(states) * 1e6:12.2f}")
+    print(f"{'aceleração':>18} {network_time / table_time:11.1f}x")
+
+    batch = (rng.integers(0, 301, args.batch), rng.integers(0, 301, args.batch),
+             rng.random(args.batch) < 0.5, rng.random(args.batch) < 0.5,
+             rng.integers(1, 30, args.batch))
+    start = time.perf_counter()
+    expected = ai.network.predict_batch(ai.states_to_inputs(*batch))
+    network_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actions = table.lookup(*batch)
+    table_time = time.perf_counter() - start
+    assert np.array_equal(actions, expected)
+
+    print(f"\n{'lote de ' + str(args.batch):>18} {'ns/decisão':>12}")
+    print(f"{'rede':>18} {network_time / args.batch * 1e9:12.0f}")
+    print(f"{'tabela':>18} {table_time / args.batch * 1e9:12.0f}")
+    print(f"{'aceleração':>18} {network_time / table_time:11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Replay priorizado no retreino da IA neural
+
+Simula o aprendizado de uma sequência de experiências com retreino a cada
+50: na primeira metade os estados cobrem todos os HPs do jogador, na
+segunda só HPs altos (as curas perto da morte somem das experiências
+recentes). Compara o retreino anterior (últimas 50 experiências, 100
+épocas), o sorteio uniforme do buffer e o replay priorizado com poucas
+épocas: épocas somadas, amostras processadas, tempo e acerto em estados de
+todo o espaço.
+
+Uso:
+    python -m benchmarks.prioritized_replay --experiences 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from game.experience_buffer import ExperienceBuffer
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork, basic_strategy
+from game.prioritized_replay import PrioritizedExperienceBuffer
+
+RETRAIN_EVERY = 50
+
+
+def make_states(ai, rng, count, min_player_hp):
+    """Estados aleatórios com a ação da estratégia básica como saída esperada"""
+    player_hp = rng.integers(min_player_hp, 101, count)
+    enemy_hp = rng.integers(1, 101, count)
+    inputs = ai.states_to_inputs(player_hp, enemy_hp, rng.random(count) < 0.5,
+                                 rng.random(count) < 0.5, rng.integers(1, 16, count))
+    return inputs, np.eye(3)[basic_strategy(player_hp, enemy_hp, 100)]
+
+
+def recent_window(network, buffer, epochs, samples, rng):
+    batch = buffer.recent(50)
+    network.fit(batch.inputs, batch.targets, epochs=epochs, verbose=False)
+    return len(batch.inputs)
+
+
+def uniform_replay(network, buffer, epochs, samples, rng):
+    batch = buffer.sample(samples, rng)
+    network.fit(batch.inputs, batch.targets, epochs=epochs, verbose=False)
+    return samples
+
+
+def prioritized_replay(network, buffer, epochs, samples, rng):
+    sample = buffer.sample_prioritized(samples, rng=rng)
+    batch = sample.batch
+    network.fit(batch.inputs, batch.targets, epochs=epochs, sample_weight=sample.weights,
+                verbose=False)
+    buffer.update_priorities(sample.indices, network.sample_errors(batch.inputs, batch.targets))
+    return samples
+
+
+def run(name, retrain, buffer_class, epochs, samples, data, test, seed):
+    inputs, targets = data
+    rng = np.random.default_rng(seed)
+    np.random.seed(seed)
+    network = SimpleNeuralNetwork()
+    buffer = buffer_class(len(inputs))
+
+    total_epochs = processed = 0
+    start = time.perf_counter()
+    for first in range(0, len(inputs), RETRAIN_EVERY):
+        buffer.extend(inputs[first:first + RETRAIN_EVERY], targets[first:first + RETRAIN_EVERY])
+        processed += retrain(network, buffer, epochs, samples, rng) * epochs
+        total_epochs += epochs
+    elapsed = time.perf_counter() - start
+
+    accuracy = float(np.mean(network.predict_batch(test[0]) == test[1].argmax(axis=1)))
+    print(f"{name:>28} {total_epochs:7d} {processed:9d} {elapsed:8.2f}s {accuracy:8.1%}")
+    return accuracy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay priorizado no retreino da IA neural")
+    parser.add_argument('--experiences', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=64, help="experiências por retreino")
+    parser.add_argument('--epochs', type=int, default=20, help="épocas por retreino com replay")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ai = NeuralAI.__new__(NeuralAI)  # Só para codificar os estados, sem carregar modelo
+    rng = np.random.default_rng(args.seed)
+    half = args.experiences // 2
+    first, second = make_states(ai, rng, half, 1), make_states(ai, rng, half, 40)
+    data = (np.vstack([first[0], second[0]]), np.vstack([first[1], second[1]]))
+    test = make_states(ai, np.random.default_rng(args.seed + 1000), 2000, 1)
+
+    print(f"{args.experiences} experiências, retreino a cada {RETRAIN_EVERY}")
+    print(f"{'':>28} {'épocas':>7} {'amostras':>9} {'tempo':>9} {'acerto':>8}")
+    run("últimas 50, 100 épocas", recent_window, ExperienceBuffer, 100, 50, data, test,
+        args.seed)
+    run(f"uniforme, {args.epochs} épocas", uniform_replay, ExperienceBuffer, args.epochs,
+        args.samples, data, test, args.seed)
+    run(f"priorizado, {args.epochs} épocas", prioritized_replay, PrioritizedExperienceBuffer,
+        args.epochs, args.samples, data, test, args.seed)
+
+
+if __name__ == "__main__":
+    main()
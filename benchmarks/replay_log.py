@@ -0,0 +1,77 @@
+"""
+Gravação e leitura de partidas
+
+Grava partidas do RulesEngine (ações sorteadas) com ReplayWriter e mede:
+turnos gravados por segundo, abertura do log com e sem o índice salvo e
+acesso a partidas sorteadas com ReplayReader.match().
+
+Uso:
+    python -m benchmarks.replay_log --matches 50000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from game.replay import ReplayReader, ReplayWriter
+from game.rules import BattleRules, RulesEngine
+
+
+def write_log(path, matches, rules, seed):
+    choices = random.Random(seed)
+    start = time.perf_counter()
+    with ReplayWriter(path, rules) as writer:
+        for match_seed in range(matches):
+            engine = RulesEngine(rules, match_seed)
+            state = engine.new_match()
+            recording = writer.begin_match(match_seed)
+            while state.winner is None:
+                events = []
+                engine.play_turn(state, choices.randrange(3), choices.randrange(3), events)
+                recording.record_events(events, state)
+            recording.finish()
+    return writer.records, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gravação e leitura de partidas")
+    parser.add_argument('--matches', type=int, default=50_000)
+    parser.add_argument('--reads', type=int, default=100_000,
+                        help="partidas sorteadas lidas do log")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rules = BattleRules.from_config()
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'replays.tbr')
+        records, elapsed = write_log(path, args.matches, rules, args.seed)
+        size = os.path.getsize(path)
+        print(f"Gravação: {args.matches} partidas, {records} turnos em {elapsed:.2f}s "
+              f"({records / elapsed:,.0f} turnos/s, {size / 2**20:.1f} MB)")
+
+        for label in ("sem índice", "com índice"):
+            start = time.perf_counter()
+            reader = ReplayReader(path)
+            print(f"Abertura {label}: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        rng = np.random.default_rng(args.seed)
+        picks = rng.integers(0, len(reader), args.reads)
+        start = time.perf_counter()
+        final_hp = [int(reader.match(i)['player_hp'][-1]) for i in picks]
+        elapsed = time.perf_counter() - start
+        print(f"Acesso aleatório: {len(final_hp)} partidas em {elapsed:.2f}s "
+              f"({elapsed / args.reads * 1e6:.1f} µs por partida)")
+        print(reader.summary())
+        reader.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Custo de geração de estados da busca
+
+Compara o BattleState atual (__slots__ e BattleRules) com a versão
+anterior, que criava um __dict__ por estado e consultava GAME_CONFIG a
+cada jogada: memória por estado, tempo de apply_action e tempo de uma
+busca exaustiva.
+
+Uso:
+    python -m benchmarks.state_alloc --depth 10
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from game.config import GAME_CONFIG
+from game.minimax import ACTIONS, BattleState, full_minimax
+
+
+class LegacyBattleState:
+    """BattleState como era antes de BattleRules (referência do benchmark)"""
+
+    def __init__(self, player_hp, enemy_hp, player_turn, player_defending=False, enemy_defending=False):
+        self.player_hp = player_hp
+        self.enemy_hp = enemy_hp
+        self.player_turn = player_turn
+        self.player_defending = player_defending
+        self.enemy_defending = enemy_defending
+
+    is_terminal = BattleState.is_terminal
+    evaluate = BattleState.evaluate
+
+    def get_actions(self):
+        return list(ACTIONS)
+
+    def apply_action(self, action):
+        new_player_hp = self.player_hp
+        new_enemy_hp = self.enemy_hp
+        new_player_defending = False
+        new_enemy_defending = False
+
+        if self.player_turn:
+            if action == 'attack':
+                damage = GAME_CONFIG['PLAYER_ATTACK']
+                if self.enemy_defending:
+                    damage = max(1, damage - GAME_CONFIG['AI_DEFENSE'])
+                new_enemy_hp = max(0, new_enemy_hp - damage)
+            elif action == 'heal':
+                healing = (GAME_CONFIG['HEAL_MIN'] + GAME_CONFIG['HEAL_MAX']) // 2
+                new_player_hp = min(GAME_CONFIG['MAX_HP'], new_player_hp + healing)
+            elif action == 'defend':
+                new_player_defending = True
+        else:
+            if action == 'attack':
+                damage = GAME_CONFIG['AI_ATTACK']
+                if self.player_defending:
+                    damage = max(1, damage - GAME_CONFIG['PLAYER_DEFENSE'])
+                new_player_hp = max(0, new_player_hp - damage)
+            elif action == 'heal':
+                healing = (GAME_CONFIG['HEAL_MIN'] + GAME_CONFIG['HEAL_MAX']) // 2
+                new_enemy_hp = min(GAME_CONFIG['MAX_HP'], new_enemy_hp + healing)
+            elif action == 'defend':
+                new_enemy_defending = True
+
+        return LegacyBattleState(
+            new_player_hp,
+            new_enemy_hp,
+            not self.player_turn,
+            player_defending=new_player_defending,
+            enemy_defending=new_enemy_defending
+        )
+
+
+def bytes_per_state(state_class, count=10000):
+    """Memória alocada por estado vivo, medida com tracemalloc"""
+    root = state_class(200, 200, False)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [root.apply_action(ACTIONS[i % 3]) for i in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del states
+    return allocated / count
+
+
+def apply_action_time(state_class, count=300000):
+    states = [state_class(200, 150, turn, defending, not defending)
+              for turn in (False, True) for defending in (False, True)]
+    start = time.perf_counter()
+    for i in range(count):
+        states[i & 3].apply_action(ACTIONS[i % 3])
+    return time.perf_counter() - start
+
+
+def search_time(state_class, depth):
+    counter = [0]
+    start = time.perf_counter()
+    full_minimax(state_class(300, 300, False), depth, True, counter)
+    return time.perf_counter() - start, counter[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alocação e tempo do BattleState")
+    parser.add_argument('--depth', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'':>18} {'bytes/estado':>13} {'apply_action':>13} {'busca prof. ' + str(args.depth):>16}")
+    results = {}
+    for name, state_class in (('anterior', LegacyBattleState), ('atual', BattleState)):
+        memory = bytes_per_state(state_class)
+        apply_time = apply_action_time(state_class)
+        elapsed, nodes = search_time(state_class, args.depth)
+        results[name] = (memory, apply_time, elapsed)
+        print(f"{name:>18} {memory:13.0f} {apply_time:12.3f}s {elapsed:15.3f}s  ({nodes} nós)")
+
+    old, new = results['anterior'], results['atual']
+    print(f"{'redução':>18} {1 - new[0] / old[0]:13.0%} {old[1] / new[1]:12.2f}x {old[2] / new[2]:15.2f}x")
+
+
+if __name__ == "__main__":
+    main()
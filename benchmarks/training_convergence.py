@@ -0,0 +1,58 @@
+"""
+Convergência do treinamento da IA neural
+
+Treina o modelo inicial (dados de train_initial_model()) com cada
+otimizador, primeiro pelo número fixo de épocas e depois com validação,
+parada antecipada e limite de tempo (opções de NEURAL_CONFIG): épocas
+executadas, tempo, motivo da parada e acerto das ações da estratégia básica.
+
+Uso:
+    python -m benchmarks.training_convergence --epochs 1000
+"""
+
+import argparse
+import random
+
+import numpy as np
+
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from game.training import create_optimizer
+
+# Otimizador e taxa de aprendizado de cada configuração comparada
+OPTIMIZERS = (('sgd', 0.1), ('momentum', 0.02), ('adam', 0.01))
+
+
+def run(name, inputs, expected_outputs, epochs, seed, **options):
+    np.random.seed(seed)
+    network = SimpleNeuralNetwork()
+    network.fit(inputs, expected_outputs, epochs=epochs, verbose=False, **options)
+    report = network.last_report
+    accuracy = float(np.mean(network.predict_batch(inputs) == expected_outputs.argmax(axis=1)))
+    print(f"{name:>28} {report.epochs:7d} {report.elapsed:8.2f}s {accuracy:8.1%}  "
+          f"{report.stop_reason}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convergência do treinamento da IA neural")
+    parser.add_argument('--epochs', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    ai = NeuralAI.__new__(NeuralAI)  # Só para gerar os dados, sem carregar modelo
+    inputs, expected_outputs = ai.initial_training_data()
+    options = ai.training_options()
+    del options['optimizer']
+
+    print(f"{len(inputs)} amostras, até {args.epochs} épocas")
+    print(f"{'':>28} {'épocas':>7} {'tempo':>9} {'acerto':>8}  parada")
+    baseline = run("sgd (épocas fixas)", inputs, expected_outputs, args.epochs, args.seed)
+    for name, learning_rate in OPTIMIZERS:
+        report = run(f"{name} (parada antecipada)", inputs, expected_outputs, args.epochs,
+                     args.seed, optimizer=create_optimizer(name, learning_rate), **options)
+        print(f"{'':>28} {baseline.elapsed / report.elapsed:7.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
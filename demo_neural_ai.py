@@ -6,6 +6,7 @@ Demonstração da IA Neural no jogo de combate por turnos
 import sys
 from game import run_game_with_neural_ai, run_game_with_minimax, run_window_manager
 from game.neural_ai import create_neural_ai
+from game.arena import run_tournament
 from game.config import GAME_CONFIG
 
 def demo_neural_ai():
@@ -64,6 +65,23 @@ def demo_neural_ai():
     print("\n" + "=" * 50)
     print("Demonstração concluída!")
 
+def demo_torneio():
+    """Torneio entre as IAs de ARENA_CONFIG, com os resultados aparecendo ao vivo"""
+    agentes = GAME_CONFIG['ARENA_CONFIG']['AGENTS']
+    print("🏆 TORNEIO ENTRE IAs")
+    print("=" * 50)
+    print(f"Agentes: {', '.join(agentes)}")
+    print("Cada confronto para quando o resultado é estatisticamente decidido (SPRT).\n")
+
+    def mostrar(resultado):
+        primeiro, segundo = (agentes[i] for i in resultado.pair)
+        placar = {1.0: "venceu", 0.5: "empatou", 0.0: "perdeu"}[resultado.score]
+        print(f"   {primeiro} {placar} contra {segundo} ({resultado.turns} turnos)")
+
+    torneio = run_tournament(agentes, on_result=mostrar)
+    print()
+    print(torneio.format())
+
 def menu_principal():
     """Menu principal da demonstração"""
     while True:
@@ -73,12 +91,13 @@ def menu_principal():
         print("2. 🎯 Testar IA Minimax (Console)")
         print("3. 🖥️  Interface Gráfica Completa")
         print("4. 📊 Demonstração da IA Neural")
-        print("5. ⚙️  Configurações Atuais")
-        print("6. ❌ Sair")
+        print("5. 🏆 Torneio entre IAs")
+        print("6. ⚙️  Configurações Atuais")
+        print("7. ❌ Sair")
         print("-" * 55)
         
         try:
-            escolha = input("Escolha uma opção (1-6): ").strip()
+            escolha = input("Escolha uma opção (1-7): ").strip()
             
             if escolha == "1":
                 print("\n🧠 Iniciando jogo com IA Neural...")
@@ -96,9 +115,12 @@ def menu_principal():
                 demo_neural_ai()
                 
             elif escolha == "5":
-                mostrar_configuracoes()
+                demo_torneio()
                 
             elif escolha == "6":
+                mostrar_configuracoes()
+                
+            elif escolha == "7":
                 print("\n👋 Obrigado por testar!")
                 break
                 
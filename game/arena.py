@@ -0,0 +1,525 @@
+"""
+Arena de torneios entre IAs
+
+Joga torneios todos-contra-todos entre agentes registrados (Minimax em cada
+profundidade de DIFFICULTY_LEVELS, a IA neural e agentes de referência
+aleatórios ou roteirizados) com o núcleo de regras (RulesEngine), sem
+interface.
+
+- Cada partida tem uma semente própria, derivada da semente do torneio e
+  do número da partida: uma partida se repete igual em qualquer número de
+  processos (só o ponto de parada do SPRT pode variar com as partidas que
+  estavam em andamento).
+- Os agentes alternam de lado (jogador e inimigo têm ataque e defesa
+  diferentes) a cada partida do confronto.
+- As partidas rodam em um pool de processos e os resultados chegam conforme
+  terminam; cada confronto para assim que um teste sequencial (SPRT) decide
+  qual agente é melhor, ou no limite de partidas.
+- O resultado é uma tabela com pontuação, intervalo de confiança de Wilson,
+  rating Elo e a vazão (partidas e turnos por segundo).
+
+Uso:
+    python -m game.arena --agents random healer minimax-facil neural --games 200
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .config import GAME_CONFIG
+from .rules import ATTACK, DEFEND, ENEMY, HEAL, PLAYER, BattleRules, RulesEngine, action_index
+
+# Resultado de uma partida, do ponto de vista do primeiro agente do confronto
+MatchResult = namedtuple('MatchResult', ['pair', 'game', 'seed', 'first_side', 'score',
+                                         'turns', 'elapsed'])
+
+# Pontuação de vitória, empate (limite de turnos) e derrota
+WIN, DRAW, LOSS = 1.0, 0.5, 0.0
+
+# z do intervalo de confiança de 95%
+Z_95 = 1.959963984540054
+
+
+# Agentes
+
+
+class Agent:
+    """Base dos agentes: escolhe a ação de um lado (PLAYER ou ENEMY) da partida"""
+
+    name = 'agent'
+    cheap = False  # Decide em tempo constante (o servidor não manda a decisão para o pool)
+
+    def reset(self, rng, rules):
+        """Início de uma partida: gerador próprio do agente e regras em uso"""
+        self.rng = rng
+        self.rules = rules
+
+    def decide(self, state, side):
+        """Código da ação (ATTACK, DEFEND ou HEAL) para `side` no MatchState `state`"""
+        raise NotImplementedError
+
+
+def _perspective(state, side):
+    """(meu HP, HP do oponente, eu defendendo, oponente defendendo)"""
+    if side == PLAYER:
+        return state.player_hp, state.enemy_hp, state.player_defending, state.enemy_defending
+    return state.enemy_hp, state.player_hp, state.enemy_defending, state.player_defending
+
+
+def _rules_as_enemy(rules, side):
+    """Regras vistas por quem joga `side` no papel de inimigo (a IA da busca)"""
+    if side == ENEMY:
+        return rules
+    return BattleRules(rules.max_hp, rules.ai_attack, rules.ai_defense, rules.player_attack,
+                       rules.player_defense, rules.heal_min, rules.heal_max)
+
+
+class RandomAgent(Agent):
+    """Ações sorteadas com a mesma chance"""
+
+    name = 'random'
+    cheap = True
+
+    def decide(self, state, side):
+        return self.rng.choice((ATTACK, DEFEND, HEAL))
+
+
+class ScriptedAgent(Agent):
+    """Ataca sempre, curando abaixo de `heal_below` x HP máximo (None: nunca cura)"""
+
+    cheap = True
+
+    def __init__(self, name, heal_below=None):
+        self.name = name
+        self.heal_below = heal_below
+
+    def decide(self, state, side):
+        my_hp = _perspective(state, side)[0]
+        if self.heal_below is not None and my_hp < self.heal_below * self.rules.max_hp:
+            return HEAL
+        return ATTACK
+
+
+class MinimaxAgent(Agent):
+    """Minimax alpha-beta com profundidade fixa e tabela de transposição por partida"""
+
+    def __init__(self, depth, name=None):
+        self.depth = depth
+        self.name = name or f"minimax-{depth}"
+
+    def reset(self, rng, rules):
+        from .transposition import create_transposition_table
+        super().reset(rng, rules)
+        self.tt = create_transposition_table()
+        self._side_rules = {side: _rules_as_enemy(rules, side) for side in (PLAYER, ENEMY)}
+
+    def decide(self, state, side):
+        from .minimax import BattleState, minimax
+        my_hp, opponent_hp, my_defending, opponent_defending = _perspective(state, side)
+        # A busca joga sempre como inimigo: o oponente fica no lugar do jogador
+        search_state = BattleState(opponent_hp, my_hp, False, opponent_defending, my_defending,
+                                   rules=self._side_rules[side])
+        _, action = minimax(search_state, self.depth, True, tt=self.tt)
+        return action_index(action) if action is not None else ATTACK
+
+
+class NeuralAgent(Agent):
+    """IA neural sem exploração nem aprendizado (modelo carregado uma vez por processo)"""
+
+    name = 'neural'
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path
+        self.neural_ai = None
+
+    def reset(self, rng, rules):
+        super().reset(rng, rules)
+        if self.neural_ai is None:
+            from .neural_ai import NeuralAI
+            self.neural_ai = NeuralAI(model_path=self.model_path, legacy_model_path=None,
+                                     lazy=False)
+            self.neural_ai.wait_ready()
+
+    def decide(self, state, side):
+        my_hp, opponent_hp, my_defending, opponent_defending = _perspective(state, side)
+        # A rede foi treinada como inimigo: o oponente entra como jogador
+        return int(self.neural_ai.decide_action_indices(
+            opponent_hp, my_hp, opponent_defending, my_defending, state.turn,
+            exploration_rate=0.0)[0])
+
+
+# Fábricas de agentes por nome; recriadas em cada processo do pool
+AGENTS = {}
+
+
+def register_agent(name, factory):
+    """Registra `factory` (sem argumentos, devolve um Agent) com o nome `name`
+
+    Com o método "spawn" de multiprocessing, os processos do pool só
+    conhecem agentes registrados na importação de um módulo.
+    """
+    AGENTS[name] = factory
+
+
+def create_agent(name):
+    try:
+        factory = AGENTS[name]
+    except KeyError:
+        raise ValueError(f"Agente desconhecido: {name!r} "
+                         f"(registrados: {', '.join(sorted(AGENTS))})") from None
+    agent = factory()
+    agent.name = name
+    return agent
+
+
+register_agent('random', RandomAgent)
+register_agent('aggressive', lambda: ScriptedAgent('aggressive'))
+register_agent('healer', lambda: ScriptedAgent('healer', heal_below=0.3))
+register_agent('neural', NeuralAgent)
+for _level, _settings in GAME_CONFIG['DIFFICULTY_LEVELS'].items():
+    register_agent(f"minimax-{_level.lower()}",
+                   lambda depth=_settings['MINIMAX_DEPTH']: MinimaxAgent(depth))
+
+
+# Partidas
+
+
+def match_seed(seed, game_id):
+    """Semente da partida `game_id` de um torneio com semente `seed`"""
+    return int(np.random.SeedSequence([seed, game_id]).generate_state(1)[0])
+
+
+def play_match(first, second, seed, first_side=PLAYER, rules=None, max_turns=500):
+    """Joga uma partida entre dois agentes
+
+    Returns:
+        (pontuação do primeiro agente, turnos jogados)
+    """
+    rules = BattleRules.from_config() if rules is None else rules
+    engine = RulesEngine(rules, random.Random(seed))
+    first.reset(random.Random(seed + 1), rules)
+    second.reset(random.Random(seed + 2), rules)
+    player, enemy = (first, second) if first_side == PLAYER else (second, first)
+
+    state = engine.play_match(lambda s: player.decide(s, PLAYER),
+                              lambda s: enemy.decide(s, ENEMY), max_turns=max_turns)
+    if state.winner is None:
+        score = DRAW
+    else:
+        score = WIN if state.winner == first_side else LOSS
+    return score, state.turn - 1
+
+
+# Agentes já criados neste processo, por nome
+_worker_agents = {}
+
+
+def _run_match(task):
+    """Tarefa do pool: joga uma partida e devolve o MatchResult"""
+    pair, game, seed, first_side, names, rules, max_turns = task
+    agents = []
+    for name in names:
+        if name not in _worker_agents:
+            _worker_agents[name] = create_agent(name)
+        agents.append(_worker_agents[name])
+    start = time.perf_counter()
+    score, turns = play_match(agents[0], agents[1], seed, first_side, rules, max_turns)
+    return MatchResult(pair, game, seed, first_side, score, turns, time.perf_counter() - start)
+
+
+class _SerialExecutor:
+    """Executor no próprio processo, com a interface usada de ProcessPoolExecutor"""
+
+    class _Done:
+        def __init__(self, value):
+            self._value = value
+
+        def result(self):
+            return self._value
+
+        def cancel(self):
+            return False
+
+    def submit(self, function, *args):
+        return self._Done(function(*args))
+
+    def shutdown(self, wait=True):
+        pass
+
+
+# Estatística
+
+
+class SPRT:
+    """Teste sequencial da razão de probabilidades para a pontuação de um confronto
+
+    H0: pontuação esperada do primeiro agente = 0.5 - delta (o segundo é melhor)
+    H1: pontuação esperada do primeiro agente = 0.5 + delta (o primeiro é melhor)
+
+    Empates contam meio ponto. O teste decide quando o log da razão de
+    verossimilhança sai do intervalo definido por alpha e beta.
+    """
+
+    def __init__(self, delta=0.05, alpha=0.05, beta=0.05):
+        self.delta = delta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self._win = math.log((0.5 + delta) / (0.5 - delta))
+        self._loss = -self._win
+        self.llr = 0.0
+        self.decision = None  # 'first', 'second' ou None enquanto não decidiu
+
+    def update(self, score):
+        if self.decision is not None:
+            return self.decision
+        self.llr += score * self._win + (1 - score) * self._loss
+        if self.llr >= self.upper:
+            self.decision = 'first'
+        elif self.llr <= self.lower:
+            self.decision = 'second'
+        return self.decision
+
+
+def wilson_interval(score, games, z=Z_95):
+    """Intervalo de confiança de Wilson para uma pontuação média em `games` partidas"""
+    if games == 0:
+        return 0.0, 1.0
+    center = (score + z * z / (2 * games)) / (1 + z * z / games)
+    margin = z * math.sqrt(score * (1 - score) / games + z * z / (4 * games * games)) \
+        / (1 + z * z / games)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def elo_difference(score):
+    """Diferença de Elo correspondente a uma pontuação média"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_ratings(names, points, games, iterations=200):
+    """Ratings Elo de máxima verossimilhança (Bradley-Terry), com média 0
+
+    Args:
+        names: Agentes
+        points: points[i][j] = pontos de i contra j
+        games: games[i][j] = partidas entre i e j
+    """
+    count = len(names)
+    strength = np.ones(count)
+    points = np.asarray(points, dtype=float) + 0.5 * (np.asarray(games) > 0)  # Evita força 0/∞
+    games = np.asarray(games, dtype=float) + (np.asarray(games) > 0)
+    for _ in range(iterations):
+        totals = points.sum(axis=1)
+        denominators = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+        strength = np.where(denominators > 0, totals / np.maximum(denominators, 1e-12), strength)
+        strength /= np.exp(np.mean(np.log(strength)))
+    return 400 * np.log10(strength)
+
+
+# Torneio
+
+
+class TournamentResult:
+    """Tabela e estatísticas de um torneio"""
+
+    def __init__(self, names, results, decisions, elapsed):
+        self.names = names
+        self.results = results  # MatchResult de todas as partidas
+        self.decisions = decisions  # {(i, j): 'first', 'second' ou None}
+        self.elapsed = elapsed
+
+        count = len(names)
+        self.points = np.zeros((count, count))
+        self.games = np.zeros((count, count), dtype=int)
+        for result in results:
+            first, second = result.pair
+            self.points[first, second] += result.score
+            self.points[second, first] += 1 - result.score
+            self.games[first, second] += 1
+            self.games[second, first] += 1
+        self.ratings = elo_ratings(names, self.points, self.games)
+
+    @property
+    def total_turns(self):
+        return sum(result.turns for result in self.results)
+
+    @property
+    def matches_per_second(self):
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def turns_per_second(self):
+        return self.total_turns / self.elapsed if self.elapsed > 0 else 0.0
+
+    def standings(self):
+        """Linhas da tabela, do maior para o menor rating"""
+        rows = []
+        for index, name in enumerate(self.names):
+            games = int(self.games[index].sum())
+            score = self.points[index].sum() / games if games else 0.0
+            low, high = wilson_interval(score, games)
+            rows.append({
+                'agent': name,
+                'games': games,
+                'points': float(self.points[index].sum()),
+                'score': score,
+                'score_low': low,
+                'score_high': high,
+                'elo': float(self.ratings[index]),
+            })
+        return sorted(rows, key=lambda row: row['elo'], reverse=True)
+
+    def format(self):
+        """Tabela em texto"""
+        lines = [f"{'agente':>16} {'partidas':>8} {'pontos':>8} {'pontuação':>10} "
+                 f"{'IC 95%':>15} {'Elo':>7}"]
+        for row in self.standings():
+            lines.append(f"{row['agent']:>16} {row['games']:8d} {row['points']:8.1f} "
+                         f"{row['score']:10.1%} {row['score_low']:7.1%}-{row['score_high']:<7.1%} "
+                         f"{row['elo']:+7.0f}")
+        for (first, second), decision in sorted(self.decisions.items()):
+            games = self.games[first, second]
+            verdict = {'first': f"{self.names[first]} é melhor",
+                       'second': f"{self.names[second]} é melhor"}.get(decision, "sem decisão")
+            lines.append(f"  {self.names[first]} x {self.names[second]}: {verdict} "
+                         f"({games} partidas)")
+        lines.append(f"{len(self.results)} partidas em {self.elapsed:.1f}s: "
+                     f"{self.matches_per_second:,.1f} partidas/s, "
+                     f"{self.turns_per_second:,.0f} turnos/s")
+        return "\n".join(lines)
+
+
+def run_tournament(names, games=None, workers=None, seed=0, rules=None, max_turns=500,
+                   sprt=True, sprt_delta=None, batch=None, on_result=None):
+    """Torneio todos-contra-todos entre os agentes `names`
+
+    Args:
+        names: Nomes de agentes registrados
+        games: Máximo de partidas por confronto (padrão: MAX_GAMES de ARENA_CONFIG)
+        workers: Processos (padrão: WORKERS de ARENA_CONFIG; 0 = número de
+            CPUs; 1 = no próprio processo)
+        seed: Semente do torneio
+        rules: BattleRules (padrão: GAME_CONFIG atual)
+        max_turns: Limite de turnos de cada partida (depois dele, empate)
+        sprt: Para cada confronto quando o SPRT decidir
+        sprt_delta: Diferença de pontuação testada pelo SPRT (padrão: SPRT_DELTA)
+        batch: Partidas de cada confronto em andamento ao mesmo tempo
+        on_result: Chamada com cada MatchResult, na ordem em que terminam
+
+    Returns:
+        TournamentResult
+    """
+    config = GAME_CONFIG.get('ARENA_CONFIG', {})
+    games = config.get('MAX_GAMES', 200) if games is None else games
+    workers = config.get('WORKERS', 0) if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    sprt_delta = config.get('SPRT_DELTA', 0.05) if sprt_delta is None else sprt_delta
+    rules = BattleRules.from_config() if rules is None else rules
+    for name in names:
+        if name not in AGENTS:
+            create_agent(name)  # Erro com a lista de agentes registrados
+    batch = batch or max(2, 2 * workers)
+
+    pairs = list(itertools.combinations(range(len(names)), 2))
+    tests = {pair: SPRT(sprt_delta) for pair in pairs}
+    next_game = dict.fromkeys(pairs, 0)
+    pending = dict.fromkeys(pairs, 0)
+    results = []
+
+    def tasks_for(pair):
+        while pending[pair] < batch and next_game[pair] < games \
+                and (not sprt or tests[pair].decision is None):
+            game = next_game[pair]
+            game_id = pairs.index(pair) * games + game
+            first_side = PLAYER if game % 2 == 0 else ENEMY
+            next_game[pair] += 1
+            pending[pair] += 1
+            yield (pair, game, match_seed(seed, game_id), first_side,
+                   (names[pair[0]], names[pair[1]]), rules, max_turns)
+
+    start = time.perf_counter()
+    executor = _SerialExecutor() if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    futures = set()
+    try:
+        for pair in pairs:
+            futures.update(executor.submit(_run_match, task) for task in tasks_for(pair))
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED) \
+                if workers > 1 else (futures, set())
+            for future in done:
+                result = future.result()
+                pending[result.pair] -= 1
+                results.append(result)
+                tests[result.pair].update(result.score)
+                if on_result is not None:
+                    on_result(result)
+                futures.update(executor.submit(_run_match, task)
+                               for task in tasks_for(result.pair))
+    finally:
+        # Partidas que não começaram são descartadas (shutdown(cancel_futures=True)
+        # só existe a partir do Python 3.9)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+    results.sort(key=lambda result: (result.pair, result.game))
+    return TournamentResult(list(names), results,
+                            {pair: tests[pair].decision for pair in pairs},
+                            time.perf_counter() - start)
+
+
+def main(argv=None):
+    """Linha de comando da arena"""
+    parser = argparse.ArgumentParser(description="Torneio entre IAs do combate por turnos")
+    parser.add_argument('--agents', nargs='+', default=None,
+                        help=f"agentes (registrados: {', '.join(sorted(AGENTS))})")
+    parser.add_argument('--games', type=int, default=None, help="máximo de partidas por confronto")
+    parser.add_argument('--workers', type=int, default=None, help="processos (0 = CPUs)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-sprt', action='store_true', help="joga todas as partidas")
+    parser.add_argument('--quiet', action='store_true', help="não mostra cada partida")
+    args = parser.parse_args(argv)
+
+    names = args.agents or GAME_CONFIG.get('ARENA_CONFIG', {}).get(
+        'AGENTS', ['random', 'healer', 'minimax-facil', 'neural'])
+
+    def show(result):
+        first, second = (names[index] for index in result.pair)
+        print(f"{first} x {second} #{result.game}: {result.score:.1f} ({result.turns} turnos)")
+
+    tournament = run_tournament(names, games=args.games, workers=args.workers, seed=args.seed,
+                                sprt=not args.no_sprt, on_result=None if args.quiet else show)
+    print(tournament.format())
+    return tournament
+
+
+__all__ = [
+    "AGENTS",
+    "Agent",
+    "MatchResult",
+    "MinimaxAgent",
+    "NeuralAgent",
+    "RandomAgent",
+    "SPRT",
+    "ScriptedAgent",
+    "TournamentResult",
+    "create_agent",
+    "elo_difference",
+    "elo_ratings",
+    "match_seed",
+    "play_match",
+    "register_agent",
+    "run_tournament",
+    "wilson_interval",
+]
+
+
+if __name__ == "__main__":
+    main()
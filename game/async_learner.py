@@ -0,0 +1,149 @@
+"""
+Aprendizado da IA neural em segundo plano
+
+AsyncLearner tira o treinamento do caminho das decisões: as experiências
+entram em uma fila e uma thread as grava no ExperienceBuffer. A cada
+retreino essa thread treina uma cópia da rede e só então a coloca em
+NeuralAI.network, uma troca atômica de referência. Quem está decidindo
+continua com a versão anterior até a troca (forward_batch() lê os pesos uma
+vez por chamada), e a GUI nunca espera pelo treinamento nem pela gravação
+do modelo.
+
+As versões são contadas em experiências: `latest_version` é o número de
+experiências enviadas e `model_version` o número que já estava no buffer
+quando a rede em uso foi treinada.
+"""
+
+import queue
+import threading
+import time
+
+# Mensagens de controle na fila
+_RETRAIN = object()
+_STOP = object()
+
+
+class AsyncLearner:
+    """Fila de experiências e retreino em uma thread de trabalho"""
+
+    def __init__(self, neural_ai, retrain_every: int = 50):
+        """
+        Args:
+            neural_ai: NeuralAI cuja rede é treinada e substituída
+            retrain_every: Retreina a cada tantas experiências novas
+        """
+        self.neural_ai = neural_ai
+        self.retrain_every = retrain_every
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="neural-learner", daemon=True)
+
+        self.latest_version = neural_ai.experience_buffer.total
+        self.model_version = self.latest_version
+        self.retrains = 0
+        self.last_train_time = 0.0
+        self.total_train_time = 0.0
+        self.training = False
+        self.last_error = None
+
+        self._thread.start()
+
+    def submit(self, inputs, target, action: int, reward: float, turn: int):
+        """Enfileira uma experiência; retorna imediatamente"""
+        with self._lock:
+            self.latest_version += 1
+        self._queue.put((inputs, target, action, reward, turn))
+
+    def request_retrain(self):
+        """Pede um retreino com as experiências já enviadas"""
+        self._queue.put(_RETRAIN)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Espera a fila esvaziar e o retreino em andamento terminar
+
+        Returns:
+            False se `timeout` segundos passaram antes disso
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = None):
+        """Termina o trabalho pendente e encerra a thread"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    @property
+    def version_lag(self) -> int:
+        """Experiências enviadas que a rede em uso ainda não aprendeu"""
+        with self._lock:
+            return self.latest_version - self.model_version
+
+    def get_metrics(self) -> dict:
+        """Retorna o estado da fila e o atraso do modelo em uso"""
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'latest_version': self.latest_version,
+                'model_version': self.model_version,
+                'version_lag': self.latest_version - self.model_version,
+                'training': self.training,
+                'retrains': self.retrains,
+                'last_train_time': self.last_train_time,
+                'total_train_time': self.total_train_time
+            }
+
+    def _run(self):
+        buffer = self.neural_ai.experience_buffer
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if item is _RETRAIN:
+                    self._retrain()
+                else:
+                    buffer.append(*item)
+                    if buffer.total % self.retrain_every == 0:
+                        self._retrain()
+            except Exception as e:  # A thread não pode morrer com a fila cheia
+                self.last_error = e
+                print(f"Erro no aprendizado da IA neural: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _retrain(self):
+        neural_ai = self.neural_ai
+        if len(neural_ai.experience_buffer) < 10:
+            return
+
+        version = neural_ai.experience_buffer.total
+        with self._lock:
+            self.training = True
+        start = time.perf_counter()
+        try:
+            # Treina uma cópia; a rede em uso continua respondendo às decisões
+            network = neural_ai.network.clone()
+            neural_ai.train_network(network)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.training = False
+                self.last_train_time = elapsed
+                self.total_train_time += elapsed
+
+        with self._lock:
+            neural_ai.network = network
+            self.model_version = version
+            self.retrains += 1
+
+
+__all__ = [
+    "AsyncLearner",
+]
@@ -0,0 +1,195 @@
+"""
+Minimax em lote com NumPy
+
+Busca muitos estados de uma vez (análises, mapas de calor, geração de
+rótulos para treino). A árvore do modelo determinístico tem sempre 3 ações
+por nó, então cada nível é expandido como um array e os valores são
+reduzidos com max/min ao longo do eixo das ações. Cada nível é deduplicado
+(transposições são expandidas uma vez só) e estados terminais são copiados
+para os três filhos, o que mantém o valor deles congelado.
+
+Os resultados são idênticos aos de minimax() e full_minimax(): mesmos
+scores inteiros e, em empates, a primeira ação na ordem de ACTIONS.
+"""
+
+import numpy as np
+
+from .config import GAME_CONFIG
+from .minimax import ACTIONS
+from .rules import BattleRules
+
+# Índice de ação devolvido para estados terminais ou depth == 0
+NO_ACTION = -1
+
+# Estados da entrada buscados juntos; blocos maiores compartilham mais
+# transposições, mas cada nível da árvore do bloco fica na memória
+CHUNK_SIZE = 4096
+
+
+def _evaluate(player_hp, enemy_hp):
+    """BattleState.evaluate() vetorizado"""
+    hp_diff = enemy_hp - player_hp
+    score = hp_diff * 10 + np.sign(hp_diff) * 50
+    score = np.where(enemy_hp <= 0, -10000, score)
+    return np.where(player_hp <= 0, 10000, score)
+
+
+def _expand(player_hp, enemy_hp, player_turn, player_defending, enemy_defending, rules):
+    """Gera os filhos de cada estado, na ordem de ACTIONS, como arrays (n * 3,)"""
+    player_damage, player_damage_defended, ai_damage, ai_damage_defended, healing, max_hp = rules
+    terminal = (player_hp <= 0) | (enemy_hp <= 0)
+
+    attacked_enemy_hp = np.maximum(0, enemy_hp - np.where(enemy_defending, player_damage_defended,
+                                                          player_damage))
+    attacked_player_hp = np.maximum(0, player_hp - np.where(player_defending, ai_damage_defended,
+                                                            ai_damage))
+    healed_player_hp = np.minimum(max_hp, player_hp + healing)
+    healed_enemy_hp = np.minimum(max_hp, enemy_hp + healing)
+
+    new_player_hp = np.stack([
+        np.where(player_turn, player_hp, attacked_player_hp),
+        np.where(player_turn, healed_player_hp, player_hp),
+        player_hp,
+    ], axis=1)
+    new_enemy_hp = np.stack([
+        np.where(player_turn, attacked_enemy_hp, enemy_hp),
+        np.where(player_turn, enemy_hp, healed_enemy_hp),
+        enemy_hp,
+    ], axis=1)
+    new_turn = np.repeat(~player_turn, 3).reshape(-1, 3)
+    new_player_defending = np.zeros_like(new_turn)
+    new_player_defending[:, 2] = player_turn
+    new_enemy_defending = np.zeros_like(new_turn)
+    new_enemy_defending[:, 2] = ~player_turn
+
+    # Estados terminais não mudam: os três filhos são cópias do pai
+    frozen = terminal[:, None]
+    return (np.where(frozen, player_hp[:, None], new_player_hp).ravel(),
+            np.where(frozen, enemy_hp[:, None], new_enemy_hp).ravel(),
+            np.where(frozen, player_turn[:, None], new_turn).ravel(),
+            np.where(frozen, player_defending[:, None], new_player_defending).ravel(),
+            np.where(frozen, enemy_defending[:, None], new_enemy_defending).ravel())
+
+
+def _rules(config):
+    rules = BattleRules.from_config(config)
+    return (rules.player_damage, rules.player_damage_defended, rules.ai_damage,
+            rules.ai_damage_defended, rules.healing, rules.max_hp)
+
+
+class _KeyCodec:
+    """Empacota (estado, quem maximiza) em um int64 para deduplicar níveis"""
+
+    def __init__(self, hp_low, hp_high):
+        self.hp_low = hp_low
+        self.span = hp_high - hp_low + 1
+
+    def pack(self, player_hp, enemy_hp, player_turn, player_defending, enemy_defending,
+             maximizing):
+        hp_pair = (player_hp - self.hp_low) * self.span + (enemy_hp - self.hp_low)
+        return (hp_pair << 4) | (player_turn.astype(np.int64) << 3) \
+            | (player_defending.astype(np.int64) << 2) \
+            | (enemy_defending.astype(np.int64) << 1) | maximizing.astype(np.int64)
+
+    def unpack(self, keys):
+        hp_pair = keys >> 4
+        return ((hp_pair // self.span + self.hp_low, hp_pair % self.span + self.hp_low,
+                 (keys & 8) != 0, (keys & 4) != 0, (keys & 2) != 0), (keys & 1) != 0)
+
+
+def _search_chunk(states, depth, maximizing, rules):
+    player_hp, enemy_hp = states[0], states[1]
+    if depth == 0:
+        return _evaluate(player_hp, enemy_hp), np.full(len(player_hp), NO_ACTION, dtype=np.int8)
+
+    max_hp = rules[-1]
+    codec = _KeyCodec(min(0, int(player_hp.min()), int(enemy_hp.min())),
+                      max(max_hp, int(player_hp.max()), int(enemy_hp.max())))
+
+    # Desce a árvore nível a nível, expandindo cada estado distinto uma só vez
+    # (as transposições entre ramos e entre estados da entrada são comuns)
+    keys, root_index = np.unique(codec.pack(*states, maximizing), return_inverse=True)
+    levels = []
+    for _ in range(depth):
+        level_states, level_max = codec.unpack(keys)
+        children = _expand(*level_states, rules)
+        child_keys = codec.pack(*children, np.repeat(~level_max, 3))
+        keys, child_index = np.unique(child_keys, return_inverse=True)
+        levels.append((level_states, level_max, child_index))
+    leaf_states, _ = codec.unpack(keys)
+    values = _evaluate(leaf_states[0], leaf_states[1])
+
+    # Sobe a árvore reduzindo os três filhos de cada nó com max/min
+    for _, level_max, child_index in reversed(levels[1:]):
+        children = values[child_index].reshape(-1, 3)
+        values = np.where(level_max, children.max(axis=1), children.min(axis=1))
+
+    # argmax/argmin devolvem o primeiro índice em empates, como a busca recursiva
+    root_states, root_max, child_index = levels[0]
+    children = values[child_index].reshape(-1, 3)
+    actions = np.where(root_max, children.argmax(axis=1), children.argmin(axis=1))
+    scores = np.take_along_axis(children, actions[:, None], axis=1)[:, 0]
+    # Estados terminais: os filhos são cópias, então o score já é evaluate()
+    root_terminal = (root_states[0] <= 0) | (root_states[1] <= 0)
+    actions = np.where(root_terminal, NO_ACTION, actions).astype(np.int8)
+    return scores[root_index], actions[root_index]
+
+
+def batch_minimax(player_hp, enemy_hp, player_turn, player_defending=False,
+                  enemy_defending=False, depth=1, maximizing_player=True,
+                  config=None, chunk_size=CHUNK_SIZE):
+    """Minimax para vários estados de uma vez
+
+    Os argumentos de estado são arrays (ou escalares, por broadcast) com os
+    campos de BattleState; `maximizing_player` também pode variar por estado.
+    Retorna (scores int64, actions int8), em que actions[i] indexa ACTIONS ou
+    vale NO_ACTION (-1) para estados terminais e depth == 0 — o equivalente
+    de minimax(state, depth, maximizing_player) para cada estado.
+
+    A entrada é buscada em blocos de `chunk_size` estados.
+    """
+    if depth < 0:
+        raise ValueError("depth deve ser >= 0")
+    config = GAME_CONFIG if config is None else config
+    rules = _rules(config)
+
+    arrays = np.broadcast_arrays(
+        np.asarray(player_hp, dtype=np.int64), np.asarray(enemy_hp, dtype=np.int64),
+        np.asarray(player_turn, dtype=bool), np.asarray(player_defending, dtype=bool),
+        np.asarray(enemy_defending, dtype=bool), np.asarray(maximizing_player, dtype=bool))
+    shape = arrays[0].shape
+    arrays = [array.ravel() for array in arrays]
+    count = len(arrays[0])
+
+    scores = np.empty(count, dtype=np.int64)
+    actions = np.empty(count, dtype=np.int8)
+    for start in range(0, count, chunk_size):
+        part = slice(start, start + chunk_size)
+        states = tuple(array[part] for array in arrays[:5])
+        scores[part], actions[part] = _search_chunk(states, depth, arrays[5][part], rules)
+
+    return scores.reshape(shape), actions.reshape(shape)
+
+
+def batch_minimax_states(states, depth, maximizing_player=True, config=None):
+    """batch_minimax() para uma lista de BattleState
+
+    Retorna uma lista de (score, ação) como a de minimax(), com ação None
+    para estados terminais.
+    """
+    scores, actions = batch_minimax(
+        [state.player_hp for state in states],
+        [state.enemy_hp for state in states],
+        [bool(state.player_turn) for state in states],
+        [bool(state.player_defending) for state in states],
+        [bool(state.enemy_defending) for state in states],
+        depth=depth, maximizing_player=maximizing_player, config=config)
+    return [(int(score), ACTIONS[action] if action != NO_ACTION else None)
+            for score, action in zip(scores.tolist(), actions.tolist())]
+
+
+__all__ = [
+    "batch_minimax",
+    "batch_minimax_states",
+    "NO_ACTION",
+]
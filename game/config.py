@@ -18,10 +18,17 @@ GAME_CONFIG = {
     
     # Configurações específicas por tipo de IA
     'MINIMAX_CONFIG': {
-        'THINKING_TIME': 1.0,  # Tempo de "pensamento" em segundos
+        'THINKING_TIME': 1.0,  # Tempo de "pensamento" e prazo da busca, em segundos
         'SHOW_ANALYSIS': True,  # Mostra análise das jogadas
         'CONSISTENCY': 1.0,  # 100% consistente
-        'AGGRESSION': 0.7  # Nível de agressividade
+        'AGGRESSION': 0.7,  # Nível de agressividade
+        'TT_SIZE': 200000,  # Entradas da tabela de transposição
+        'TT_POLICY': 'lru',  # Política de remoção: 'lru', 'fifo' ou 'depth'
+        'USE_TABLEBASE': True,  # Consulta a tablebase exata quando ela existir
+        'TABLEBASE_MIN_DEPTH': 8,  # Profundidade mínima para usar a tablebase (só DIFICIL)
+        'PARALLEL_WORKERS': 0,  # Processos da busca paralela (0 = número de CPUs)
+        'PARALLEL_MIN_DEPTH': 16,  # Abaixo desta profundidade a busca é serial
+        'PONDERING': True  # Pensa nas respostas enquanto o jogador escolhe
     },
     
     'NEURAL_CONFIG': {
@@ -29,13 +36,56 @@ GAME_CONFIG = {
         'SHOW_LEARNING': True,  # Mostra processo de aprendizado
         'EXPLORATION_RATE': 0.15,  # Taxa de exploração (ações aleatórias)
         'ADAPTATION_SPEED': 0.1,  # Velocidade de adaptação
-        'PERSONALITY_SHIFT': True  # Muda personalidade com o tempo
+        'PERSONALITY_SHIFT': True,  # Muda personalidade com o tempo
+        'BATCH_SIZE': 32,  # Amostras por lote no treinamento
+        'ASYNC_LEARNING': True,  # Treina em uma thread, sem travar a interface
+        'SAVE_INTERVAL': 30.0,  # Intervalo mínimo entre gravações do modelo, em segundos
+        'POLICY_TABLE': True,  # Decide por uma tabela com a ação da rede para cada estado
+        'LAZY_START': True,  # Carrega o modelo só na primeira decisão
+        'MODEL_PATH': None,  # Modelo do jogador (None = pasta de dados do usuário, game/paths.py)
+        'OPTIMIZER': 'momentum',  # Otimizador do treinamento: 'sgd', 'momentum' ou 'adam'
+        'LEARNING_RATE': 0.02,  # Taxa de aprendizado do otimizador
+        'VALIDATION_SPLIT': 0.2,  # Fração das amostras usada para validação
+        'PATIENCE': 20,  # Épocas sem melhora na validação antes de parar
+        'MIN_DELTA': 1e-4,  # Queda mínima do erro para contar como melhora
+        'TRAIN_TIME_BUDGET': 2.0,  # Tempo máximo de cada treinamento, em segundos (None = sem limite)
+        'PRIORITIZED_REPLAY': True,  # Retreina com experiências sorteadas pelo erro de predição
+        'REPLAY_SAMPLES': 64,  # Experiências sorteadas por retreino
+        'REPLAY_EPOCHS': 20,  # Épocas de cada retreino com replay priorizado
+        'PRIORITY_ALPHA': 0.6,  # Peso do erro na prioridade (0 = sorteio uniforme)
+        'PRIORITY_BETA': 0.4  # Correção do viés do sorteio (1 = total)
+    },
+    
+    # Torneios entre IAs (game/arena.py)
+    'ARENA_CONFIG': {
+        'AGENTS': ['random', 'healer', 'minimax-facil', 'minimax-normal', 'neural'],
+        'MAX_GAMES': 200,  # Máximo de partidas por confronto
+        'WORKERS': 0,  # Processos do torneio (0 = número de CPUs)
+        'SPRT_DELTA': 0.05  # Diferença de pontuação que o SPRT tenta detectar
+    },
+    
+    # Gravação das partidas (game/replay.py)
+    'REPLAY_CONFIG': {
+        'RECORD': False,  # Grava as partidas do console e das GUIs (o arquivo só cresce)
+        'PATH': None,  # Arquivo de replay (None = replays.tbr na pasta de dados do usuário)
+        'BUFFER_RECORDS': 4096  # Turnos guardados em memória antes de escrever
+    },
+    
+    # Servidor de partidas (game/server.py)
+    'SERVER_CONFIG': {
+        'HOST': '127.0.0.1',
+        'PORT': 8765,
+        'WORKERS': 0,  # Processos para as decisões da IA (0 = número de CPUs)
+        'MAX_BATCH': 256,  # Decisões mandadas juntas para um processo
+        'MAX_MATCHES': 20000,  # Partidas simultâneas aceitas
+        'DEFAULT_AGENT': 'minimax-normal'  # Inimigo quando o cliente não escolhe
     },
     
     # Configurações visuais do console
     'HP_BAR_LENGTH': 20,
     
     # Configurações de dificuldade
+    'DIFFICULTY': 'NORMAL',  # Nível em uso (troque com apply_difficulty())
     'DIFFICULTY_LEVELS': {
         'FACIL': {'AI_ATTACK': 20, 'MINIMAX_DEPTH': 3},
         'NORMAL': {'AI_ATTACK': 25, 'MINIMAX_DEPTH': 6},
@@ -85,4 +135,18 @@ STYLE_CONFIG = {
         'PLAYER': ['#27AE60', '#229954'],
         'ENEMY': ['#E74C3C', '#C0392B']
     }
-}
\ No newline at end of file
+}
+
+
+def difficulty_config(level, config=None):
+    """Cópia de `config` (padrão: GAME_CONFIG) com o ataque e a profundidade do nível `level`"""
+    config = GAME_CONFIG if config is None else config
+    levels = config['DIFFICULTY_LEVELS']
+    if level not in levels:
+        raise ValueError(f"Dificuldade desconhecida: {level!r} (use {', '.join(levels)})")
+    return dict(config, DIFFICULTY=level, **levels[level])
+
+
+def apply_difficulty(level):
+    """Aplica em GAME_CONFIG o nível `level` de DIFFICULTY_LEVELS"""
+    GAME_CONFIG.update(difficulty_config(level))
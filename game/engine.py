@@ -1,7 +1,14 @@
+import random
 import numpy as np
 from .entities import Character
-from .minimax import minimax, BattleState
+from .minimax import iterative_deepening, BattleState
+from .parallel_search import get_parallel_searcher
+from .transposition import create_transposition_table
+from .tablebase import probe as probe_tablebase
+from .search_stats import SearchStats, MatchSearchStats
+from .pondering import PonderService
 from .neural_ai import create_neural_ai
+from .replay import get_replay_writer, new_seed
 from .config import GAME_CONFIG
 
 def draw_health_bar(name, hp, max_hp=None, bar_length=None):
@@ -15,8 +22,13 @@ def draw_health_bar(name, hp, max_hp=None, bar_length=None):
     bar = '█' * filled_length + '-' * (bar_length - filled_length)
     return f"{name} HP: |{bar}| {hp}/{max_hp}"
 
-def run_game(ai_type=None):
-    """Executa o jogo principal no console"""
+def run_game(ai_type=None, replay_writer=None):
+    """Executa o jogo principal no console
+
+    Args:
+        ai_type: 'MINIMAX' ou 'NEURAL' (padrão: AI_TYPE de GAME_CONFIG)
+        replay_writer: ReplayWriter que grava a partida (padrão: o de REPLAY_CONFIG)
+    """
     if ai_type is None:
         ai_type = GAME_CONFIG['AI_TYPE']
     
@@ -25,8 +37,15 @@ def run_game(ai_type=None):
 
     # Usa configurações centralizadas
     max_hp = GAME_CONFIG['MAX_HP']
-    player = Character("Jogador", max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'])
-    ai_character = Character("Inimigo", max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'])
+    # Os sorteios dos dois lados saem de um gerador com semente, gravada no replay
+    seed = new_seed()
+    rng = random.Random(seed)
+    player = Character("Jogador", max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'], rng=rng)
+    ai_character = Character("Inimigo", max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'], rng=rng)
+
+    if replay_writer is None:
+        replay_writer = get_replay_writer()
+    recording = replay_writer.begin_match(seed) if replay_writer is not None else None
 
     # Inicializa IA Neural se necessário
     neural_ai = None
@@ -36,6 +55,11 @@ def run_game(ai_type=None):
 
     turn = 1
     game_history = []  # Para aprendizado da IA neural
+    transposition_table = create_transposition_table()  # Reaproveitada entre turnos
+    search_stats = MatchSearchStats()  # Custo das decisões do Minimax na partida
+    ponder_service = None
+    if ai_type != 'NEURAL' and GAME_CONFIG['MINIMAX_CONFIG'].get('PONDERING', False):
+        ponder_service = PonderService(tt=transposition_table)
     
     while player.is_alive() and ai_character.is_alive():
         print("\n" + "=" * 30)
@@ -58,6 +82,10 @@ def run_game(ai_type=None):
         player.reset_turn()
         ai_character.reset_turn()
 
+        # A IA pensa nas respostas enquanto o jogador escolhe
+        if ponder_service is not None:
+            ponder_service.ponder(BattleState(player.hp, ai_character.hp, player_turn=True))
+
         # TURNO DO JOGADOR
         print("\nEscolha sua ação:")
         print("1 - Atacar")
@@ -68,23 +96,30 @@ def run_game(ai_type=None):
             action = input("> ").strip()
             
             player_action = None
+            player_amount = 0
             if action == "1":
-                damage = player.attack(ai_character)
+                player_amount = player.attack(ai_character)
                 player_action = "attack"
             elif action == "2":
                 player.defend()
                 player_action = "defend"
             elif action == "3":
-                healing = player.heal()
+                player_amount = player.heal()
                 player_action = "heal"
             else:
                 print("Ação inválida. Você perdeu o turno.")
                 player_action = "invalid"
         except KeyboardInterrupt:
             print("\n\nJogo interrompido pelo jogador.")
+            if ponder_service is not None:
+                ponder_service.close()
+            if recording is not None:
+                recording.finish()
             return
 
         if not ai_character.is_alive():
+            if recording is not None:
+                recording.record_turn(player_action, None, player.hp, ai_character.hp, player_amount)
             break
 
         # TURNO DO INIMIGO
@@ -102,7 +137,25 @@ def run_game(ai_type=None):
             state = BattleState(player.hp, ai_character.hp, player_turn=False, 
                               player_defending=player.is_defending, 
                               enemy_defending=ai_character.is_defending)
-            _, ai_action = minimax(state, depth=GAME_CONFIG['MINIMAX_DEPTH'], maximizing_player=True)
+            # Tablebase exata, resposta do pondering ou busca limitada pelo tempo de pensamento
+            stats = SearchStats()
+            result = probe_tablebase(state)
+            if result is not None:
+                stats.tablebase_hits += 1
+                if ponder_service is not None:
+                    ponder_service.cancel()
+            elif ponder_service is not None:
+                result = ponder_service.take(state, stats)
+            if result is None:
+                result = iterative_deepening(
+                    state, GAME_CONFIG['MINIMAX_CONFIG']['THINKING_TIME'],
+                    max_depth=GAME_CONFIG['MINIMAX_DEPTH'], tt=transposition_table, stats=stats,
+                    parallel=get_parallel_searcher()
+                )
+            ai_action = result.action
+            search_stats.record(stats, turn)
+            if GAME_CONFIG['MINIMAX_CONFIG']['SHOW_ANALYSIS']:
+                print(f"📈 Busca: {stats.format()}")
 
         print(f"IA escolheu: {ai_action}")
 
@@ -140,9 +193,17 @@ def run_game(ai_type=None):
             'player_hp_after': player.hp,
             'ai_hp_after': ai_character.hp
         })
+        if recording is not None:
+            recording.record_turn(player_action, ai_action, player.hp, ai_character.hp,
+                                  player_amount, ai_damage_dealt or ai_healing_done)
 
         turn += 1
 
+    if ponder_service is not None:
+        ponder_service.close()
+    if recording is not None:
+        recording.finish()
+
     # Resultado final
     print("\n🏁 Fim do jogo!")
     game_won = player.is_alive()
@@ -151,6 +212,9 @@ def run_game(ai_type=None):
         print("🎉 Você venceu!")
     else:
         print("💀 Você perdeu!")
+
+    if len(search_stats):
+        print(f"📈 Custo da IA: {search_stats.summary()}")
     
     # Aprendizado final da IA Neural
     if ai_type == 'NEURAL' and neural_ai and GAME_CONFIG['NEURAL_LEARNING']:
@@ -165,6 +229,8 @@ def run_game(ai_type=None):
                 turn_count=history_entry['turn']
             )
         
+        # Espera a thread de aprendizado antes de mostrar as estatísticas
+        neural_ai.close()
         print(f"🧠 IA Neural aprendeu com este jogo!")
         stats = neural_ai.get_performance_stats()
         print(f"📊 Experiências acumuladas: {stats['experience_count']}")
@@ -7,8 +7,14 @@ import threading
 import numpy as np
 from .config import GUI_CONFIG, GAME_CONFIG, STYLE_CONFIG
 from .entities import Character
-from .minimax import minimax, BattleState
+from .minimax import iterative_deepening, BattleState
+from .parallel_search import get_parallel_searcher
+from .transposition import create_transposition_table
+from .tablebase import probe as probe_tablebase
+from .search_stats import SearchStats, MatchSearchStats
+from .pondering import PonderService
 from .neural_ai import create_neural_ai
+from .replay import get_replay_writer, new_seed
 
 try:
     from PIL import Image, ImageTk
@@ -30,11 +36,22 @@ class ModernGameGUI:
         self.turn_count = 1
         self.game_history = []
         self.is_game_active = True
+        self.game_number = 0  # Descarta turnos da IA agendados antes de um novo jogo
         self.thinking_animation_active = False
-        
-        # Personagens
-        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'])
-        self.enemy = Character("IA", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'])
+        self.transposition_table = create_transposition_table()
+        self.search_thread = None
+        self.search_result = None
+        self.search_stats = None
+        self.match_search_stats = MatchSearchStats()
+        self.ponder_service = None
+        if self.ai_type != 'NEURAL' and GAME_CONFIG['MINIMAX_CONFIG'].get('PONDERING', False):
+            self.ponder_service = PonderService(tt=self.transposition_table)
+            self.root.bind('<Destroy>', self.on_destroy, add='+')
+        
+        # Personagens e gravação da partida
+        self.replay_writer = get_replay_writer()
+        self.recording = None
+        self.create_characters()
         
         # IA Neural
         self.neural_ai = None
@@ -54,6 +71,31 @@ class ModernGameGUI:
         
         self.setup_ui()
         self.start_game()
+        self.start_pondering()
+        
+    def create_characters(self):
+        """Cria os personagens de uma partida nova e começa a gravá-la
+
+        Os sorteios dos dois lados saem de um gerador com semente, gravada no replay.
+        """
+        if self.recording is not None:
+            self.recording.finish()
+        seed = new_seed()
+        rng = random.Random(seed)
+        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'], rng=rng)
+        self.enemy = Character("IA", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'], rng=rng)
+        self.player_move = ("invalid", 0)  # Ação do jogador no turno e o dano ou a cura
+        self.recording = self.replay_writer.begin_match(seed) if self.replay_writer else None
+
+    def record_turn(self, enemy_action=None, enemy_amount=0):
+        """Grava o turno no replay; a partida vai para o arquivo quando termina"""
+        if self.recording is None:
+            return
+        player_action, player_amount = self.player_move
+        self.recording.record_turn(player_action, enemy_action, self.player.hp, self.enemy.hp,
+                                   player_amount, enemy_amount)
+        if not self.player.is_alive() or not self.enemy.is_alive():
+            self.recording.finish()
         
     def setup_window(self):
         """Configura a janela principal"""
@@ -493,6 +535,7 @@ class ModernGameGUI:
         self.enemy.reset_turn()
         
         damage = self.player.attack(self.enemy)
+        self.player_move = ("attack", damage)
         self.session_stats['total_damage_dealt'] += damage
         
         self.log_message(f"⚔️ Você atacou causando {damage} de dano!", "player")
@@ -501,10 +544,11 @@ class ModernGameGUI:
         self.update_display()
         
         if self.check_game_end():
+            self.record_turn()
             return
             
         # Turno da IA
-        self.root.after(1000, self.ai_turn)
+        self.root.after(1000, self.ai_turn, self.game_number)
         
     def player_defend(self):
         """Jogador defende"""
@@ -519,12 +563,13 @@ class ModernGameGUI:
         self.enemy.reset_turn()
         
         self.player.defend()
+        self.player_move = ("defend", 0)
         self.log_message("🛡️ Você se defendeu!", "player")
         
         self.update_display()
         
         # Turno da IA
-        self.root.after(1000, self.ai_turn)
+        self.root.after(1000, self.ai_turn, self.game_number)
         
     def player_heal(self):
         """Jogador cura"""
@@ -539,6 +584,7 @@ class ModernGameGUI:
         self.enemy.reset_turn()
         
         healing = self.player.heal()
+        self.player_move = ("heal", healing)
         self.log_message(f"💚 Você se curou em {healing} pontos!", "heal")
         self.animate_heal(self.player_hp_bar)
         
@@ -548,11 +594,11 @@ class ModernGameGUI:
             return
             
         # Turno da IA
-        self.root.after(1000, self.ai_turn)
+        self.root.after(1000, self.ai_turn, self.game_number)
         
-    def ai_turn(self):
+    def ai_turn(self, game_number):
         """Turno da IA com comportamento específico"""
-        if not self.is_game_active:
+        if not self.is_game_active or game_number != self.game_number:
             return
             
         self.footer_label.config(text="🤖 IA está pensando...")
@@ -563,8 +609,69 @@ class ModernGameGUI:
         # Tempo de pensamento baseado no tipo de IA
         thinking_time = GAME_CONFIG[f'{self.ai_type}_CONFIG']['THINKING_TIME']
         
+        # O Minimax busca em segundo plano com prazo igual ao tempo de pensamento
+        if not (self.ai_type == 'NEURAL' and self.neural_ai):
+            if self.start_minimax_search(thinking_time):
+                # Resposta já pensada durante a vez do jogador
+                thinking_time = 0
+        
         # Executa ação da IA após o tempo de pensamento
-        self.root.after(int(thinking_time * 1000), self.execute_ai_action)
+        self.root.after(int(thinking_time * 1000), self.execute_ai_action, game_number)
+        
+    def get_battle_state(self):
+        """Retorna o estado atual do combate, do ponto de vista da IA"""
+        return BattleState(
+            self.player.hp, self.enemy.hp, player_turn=False,
+            player_defending=self.player.is_defending,
+            enemy_defending=self.enemy.is_defending
+        )
+        
+    def start_minimax_search(self, time_limit):
+        """Inicia a busca do Minimax em uma thread, fora do loop do Tk
+
+        Retorna True se a resposta já estava pronta (tablebase ou pondering).
+        """
+        state = self.get_battle_state()
+        self.search_result = None
+        self.search_stats = stats = SearchStats()
+        # A tablebase, quando cobre o estado, vale sobre a resposta do pondering
+        self.search_result = probe_tablebase(state)
+        if self.search_result is not None:
+            stats.tablebase_hits += 1
+            if self.ponder_service is not None:
+                self.ponder_service.cancel()
+        elif self.ponder_service is not None:
+            self.search_result = self.ponder_service.take(state, stats)
+        if self.search_result is not None:
+            return True
+        
+        def search():
+            self.search_result = self.run_minimax_search(state, time_limit, stats)
+        
+        self.search_thread = threading.Thread(target=search, daemon=True)
+        self.search_thread.start()
+        return False
+        
+    def start_pondering(self):
+        """Começa a pensar nas respostas da IA enquanto o jogador escolhe"""
+        if self.ponder_service is not None:
+            self.ponder_service.ponder(BattleState(self.player.hp, self.enemy.hp, player_turn=True))
+        
+    def on_destroy(self, event):
+        """Encerra a thread do pondering quando a janela é fechada"""
+        if event.widget is self.root and self.ponder_service is not None:
+            self.ponder_service.close()
+
+    def run_minimax_search(self, state, time_limit, stats):
+        """Consulta a tablebase ou busca com prazo, registrando o custo em `stats`"""
+        result = probe_tablebase(state)
+        if result is not None:
+            stats.tablebase_hits += 1
+            return result
+        return iterative_deepening(
+            state, time_limit, max_depth=GAME_CONFIG['MINIMAX_DEPTH'],
+            tt=self.transposition_table, stats=stats, parallel=get_parallel_searcher()
+        )
         
     def start_thinking_animation(self):
         """Inicia animação de pensamento"""
@@ -584,8 +691,15 @@ class ModernGameGUI:
         self.thinking_dots += 1
         self.root.after(300, self.animate_thinking)
         
-    def execute_ai_action(self):
+    def execute_ai_action(self, game_number):
         """Executa ação da IA"""
+        if game_number != self.game_number:  # Jogo reiniciado durante a busca
+            return
+        # A busca pode estourar o prazo em alguns milissegundos
+        if self.search_thread is not None and self.search_thread.is_alive():
+            self.root.after(10, self.execute_ai_action, game_number)
+            return
+            
         self.thinking_animation_active = False
         
         # Salva estado para aprendizado
@@ -614,16 +728,29 @@ class ModernGameGUI:
             if GAME_CONFIG['MINIMAX_CONFIG']['SHOW_ANALYSIS']:
                 self.log_message("🎯 Calculando melhor jogada...", "thinking")
                 
-            state = BattleState(
-                self.player.hp, self.enemy.hp, player_turn=False,
-                player_defending=self.player.is_defending,
-                enemy_defending=self.enemy.is_defending
-            )
-            
-            score, action = minimax(state, depth=GAME_CONFIG['MINIMAX_DEPTH'], maximizing_player=True)
+            result = self.search_result
+            stats = self.search_stats
+            if result is None:
+                stats = SearchStats()
+                result = self.run_minimax_search(
+                    self.get_battle_state(), GAME_CONFIG['MINIMAX_CONFIG']['THINKING_TIME'], stats
+                )
+            self.search_thread = None
+            self.search_result = None
+            self.search_stats = None
+            score, action = result.score, result.action
+            self.match_search_stats.record(stats, self.turn_count)
             
             if GAME_CONFIG['MINIMAX_CONFIG']['SHOW_ANALYSIS']:
-                self.log_message(f"🎯 Avaliação: {score:.2f}", "thinking")
+                if stats.tablebase_hits:
+                    # Resultado exato (±10000 menos a distância), não o placar de HP da busca
+                    outcome = "vitória" if score > 0 else "derrota" if score < 0 else "empate"
+                    self.log_message(f"📚 Tablebase: {outcome} da IA em {result.depth} jogadas",
+                                     "thinking")
+                else:
+                    self.log_message(f"🎯 Avaliação: {score:.2f} (profundidade {result.depth})",
+                                     "thinking")
+                self.log_message(f"📈 Busca: {stats.format()}", "thinking")
         
         # Executa ação
         self.session_stats['ai_actions'][action] += 1
@@ -662,6 +789,7 @@ class ModernGameGUI:
                 learning_msg = "📈 Ação bem-sucedida!" if result_score > 0 else "📉 Ajustando estratégia..."
                 self.log_message(learning_msg, "thinking")
         
+        self.record_turn(action, damage_dealt or healing_done)
         self.turn_count += 1
         self.update_display()
         
@@ -670,6 +798,7 @@ class ModernGameGUI:
             
         # Próximo turno do jogador
         self.enable_actions()
+        self.start_pondering()
         self.footer_label.config(text="🎮 Seu turno! Escolha uma ação.")
         
     def calculate_action_score(self, pre_state, action, damage_dealt, healing_done):
@@ -741,6 +870,13 @@ class ModernGameGUI:
             self.log_message("💀 DERROTA! A IA venceu!", "enemy")
             self.footer_label.config(text="💀 Que pena! A IA venceu!")
             
+        # Custo do Minimax na partida
+        if len(self.match_search_stats):
+            summary = self.match_search_stats.summary()
+            print(f"📈 Custo da IA Minimax: {summary}")
+            if GAME_CONFIG['MINIMAX_CONFIG']['SHOW_ANALYSIS']:
+                self.log_message(f"📈 Custo da IA: {summary}", "thinking")
+            
         # Aprendizado final da IA Neural
         if self.ai_type == 'NEURAL' and self.neural_ai and GAME_CONFIG['NEURAL_LEARNING']:
             final_score = -1.0 if player_won else 1.0
@@ -769,18 +905,31 @@ class ModernGameGUI:
     def new_game(self):
         """Inicia novo jogo"""
         self.is_game_active = True
+        self.game_number += 1
         self.turn_count = 1
         self.game_history = []
+        # Nenhuma busca pode estar usando a tabela quando ela é limpa: a do turno
+        # em andamento termina no prazo e o pondering é cancelado
+        if self.search_thread is not None:
+            self.search_thread.join()
+        self.search_thread = None
+        self.search_result = None
+        self.search_stats = None
+        self.thinking_animation_active = False
+        if self.ponder_service is not None:
+            self.ponder_service.cancel()
+        self.transposition_table.clear()
+        self.match_search_stats.reset()
         
-        # Recria personagens
-        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'])
-        self.enemy = Character("IA", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'])
+        # Recria personagens (uma partida interrompida é gravada até onde foi)
+        self.create_characters()
         
         # Limpa log
         self.combat_log.delete(1.0, tk.END)
         
         self.start_game()
         self.enable_actions()
+        self.start_pondering()
         
     def switch_ai(self):
         """Troca tipo de IA"""
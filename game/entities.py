@@ -1,41 +1,53 @@
 import random
-from .config import GAME_CONFIG
+from .rules import ATTACK, DEFEND, HEAL, Dice, TurnEvent, attack_damage, describe_event
 
 
 class Character:
-    def __init__(self, name, hp, atk, defense):
+    """Personagem das interfaces: adapta o núcleo de regras (game.rules)
+
+    Os sorteios usam o gerador injetado (random.Random ou np.random.Generator;
+    padrão: o módulo random, como antes) e cada ação gera um TurnEvent,
+    guardado em last_event e impresso se `echo` for verdadeiro.
+    """
+
+    def __init__(self, name, hp, atk, defense, rng=None, echo=True):
         self.name = name
         self.hp = hp
         self.max_hp = hp
         self.atk = atk
         self.defense = defense
         self.is_defending = False
+        self.dice = Dice(random if rng is None else rng)
+        self.echo = echo
+        self.last_event = None
 
     def is_alive(self):
         return self.hp > 0
 
+    def _emit(self, action, amount, target=None):
+        self.last_event = TurnEvent(self.name, action, amount)
+        if self.echo:
+            print(describe_event(self.last_event, self.name,
+                                 target.name if target is not None else None))
+
     def attack(self, target):
         # Usa o ataque base do personagem com variação aleatória
-        base_damage = self.atk
-        variation = random.randint(-5, 5)
-        damage = max(1, base_damage + variation)
-
+        variation = self.dice.variation()
         # Se o alvo está defendendo, reduz o dano
-        if target.is_defending:
-            damage = max(1, damage - target.defense)
+        damage = attack_damage(self.atk, variation, target.is_defending, target.defense)
 
         target.hp = max(0, target.hp - damage)
-        print(f"{self.name} atacou {target.name} causando {damage} de dano!")
+        self._emit(ATTACK, damage, target)
         return damage
 
     def defend(self):
         self.is_defending = True
-        print(f"{self.name} entrou em modo de defesa!")
+        self._emit(DEFEND, 0)
 
     def heal(self):
-        healing = random.randint(GAME_CONFIG['HEAL_MIN'], GAME_CONFIG['HEAL_MAX'])
+        healing = self.dice.healing()
         self.hp = min(self.max_hp, self.hp + healing)
-        print(f"{self.name} se curou em {healing} pontos!")
+        self._emit(HEAL, healing)
         return healing
 
     def reset_turn(self):
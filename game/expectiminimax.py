@@ -0,0 +1,391 @@
+"""
+Expectiminimax sobre as distribuições reais de dano e cura
+
+BattleState.apply_action usa dano fixo e a cura média, mas Character.attack
+soma random.randint(-5, 5) ao ataque e Character.heal sorteia a cura de
+HEAL_MIN a HEAL_MAX. Aqui cada ataque ou cura vira um nó de acaso com as
+probabilidades exatas dessas distribuições.
+
+Para manter a busca rápida:
+- as tabelas de probabilidade são calculadas uma única vez (ChanceTables);
+- resultados que levam ao mesmo HP depois do limite (0 ou MAX_HP) são
+  somados em um único filho;
+- os nós de acaso são podados com limites no estilo Star1, e opcionalmente
+  Star2 (sondagem da primeira jogada de cada filho);
+- os nós de decisão usam a TranspositionTable.
+"""
+
+from .config import GAME_CONFIG
+from .minimax import ACTIONS, BattleState
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Limites de BattleState.evaluate()
+SCORE_MIN = -10000
+SCORE_MAX = 10000
+
+# Variação aleatória aplicada em Character.attack
+ATTACK_VARIATION = 5
+
+
+def damage_distribution(attack, defending, defense, variation=ATTACK_VARIATION):
+    """Retorna ((dano, peso), ...) de um ataque, como em Character.attack
+
+    Os pesos são inteiros e somam 2 * variation + 1.
+    """
+    distribution = {}
+    for delta in range(-variation, variation + 1):
+        damage = max(1, attack + delta)
+        if defending:
+            damage = max(1, damage - defense)
+        distribution[damage] = distribution.get(damage, 0) + 1
+    return tuple(sorted(distribution.items()))
+
+
+def heal_distribution(heal_min, heal_max):
+    """Retorna ((cura, peso), ...) de uma cura, como em Character.heal"""
+    return tuple((healing, 1) for healing in range(heal_min, heal_max + 1))
+
+
+class ChanceTables:
+    """Tabelas de probabilidade pré-calculadas a partir de GAME_CONFIG"""
+
+    def __init__(self, config=None, cache_size=200000):
+        config = GAME_CONFIG if config is None else config
+        self.max_hp = config['MAX_HP']
+        # Chave: (jogador_ataca, alvo_defendendo)
+        self.attack = {
+            (True, False): damage_distribution(config['PLAYER_ATTACK'], False, config['AI_DEFENSE']),
+            (True, True): damage_distribution(config['PLAYER_ATTACK'], True, config['AI_DEFENSE']),
+            (False, False): damage_distribution(config['AI_ATTACK'], False, config['PLAYER_DEFENSE']),
+            (False, True): damage_distribution(config['AI_ATTACK'], True, config['PLAYER_DEFENSE']),
+        }
+        self.heal = heal_distribution(config['HEAL_MIN'], config['HEAL_MAX'])
+
+        # Maiores variações de HP possíveis em uma jogada (para os limites)
+        self.max_player_damage = max(self.attack[(True, False)])[0]
+        self.max_ai_damage = max(self.attack[(False, False)])[0]
+        self.max_heal = config['HEAL_MAX']
+
+        self.cache_size = cache_size
+        self._cache = {}
+
+    def outcomes(self, state, action):
+        """Retorna (peso_total, [(peso, estado), ...]) da ação, somando HPs iguais
+
+        Os pesos são inteiros (probabilidade = peso / peso_total), então
+        resultados que coincidem todos viram um único filho e os valores
+        esperados não acumulam erro de arredondamento.
+        """
+        cache_key = (state.to_key(), action)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        player_turn = state.player_turn
+        if action == 'defend':
+            result = (1, [(1, BattleState(state.player_hp, state.enemy_hp, not player_turn,
+                                          player_turn, not player_turn, state.rules))])
+        else:
+            merged = {}
+            if action == 'attack':
+                if player_turn:
+                    hp = state.enemy_hp
+                    distribution = self.attack[(True, state.enemy_defending)]
+                else:
+                    hp = state.player_hp
+                    distribution = self.attack[(False, state.player_defending)]
+                for damage, weight in distribution:
+                    new_hp = max(0, hp - damage)
+                    merged[new_hp] = merged.get(new_hp, 0) + weight
+            else:
+                hp = state.player_hp if player_turn else state.enemy_hp
+                distribution = self.heal
+                for healing, weight in distribution:
+                    new_hp = min(self.max_hp, hp + healing)
+                    merged[new_hp] = merged.get(new_hp, 0) + weight
+
+            # Quem atacou mexe no HP do outro lado; quem curou, no próprio
+            changes_player_hp = (action == 'attack') != player_turn
+            outcomes = []
+            for new_hp, weight in merged.items():
+                if changes_player_hp:
+                    child = BattleState(new_hp, state.enemy_hp, not player_turn,
+                                        rules=state.rules)
+                else:
+                    child = BattleState(state.player_hp, new_hp, not player_turn,
+                                        rules=state.rules)
+                outcomes.append((weight, child))
+            # Mais prováveis primeiro
+            outcomes.sort(key=lambda outcome: -outcome[0])
+            result = (sum(weight for _, weight in distribution), outcomes)
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = result
+        return result
+
+    def bounds(self, state, depth):
+        """Limites (mínimo, máximo) do valor de `state` buscado a `depth` jogadas
+
+        Considera o HP que cada lado ainda pode perder ou recuperar: se nenhum
+        lado pode morrer, o valor fica preso à faixa de avaliações possíveis.
+        """
+        if state.is_terminal() or depth == 0:
+            value = state.evaluate()
+            return value, value
+
+        mover_moves = (depth + 1) // 2
+        other_moves = depth // 2
+        if state.player_turn:
+            player_moves, ai_moves = mover_moves, other_moves
+        else:
+            player_moves, ai_moves = other_moves, mover_moves
+
+        player_hp_min = state.player_hp - ai_moves * self.max_ai_damage
+        enemy_hp_min = state.enemy_hp - player_moves * self.max_player_damage
+        player_hp_max = max(state.player_hp,
+                            min(self.max_hp, state.player_hp + player_moves * self.max_heal))
+        enemy_hp_max = max(state.enemy_hp,
+                           min(self.max_hp, state.enemy_hp + ai_moves * self.max_heal))
+
+        low = SCORE_MIN if enemy_hp_min <= 0 else _static_score(enemy_hp_min - player_hp_max)
+        high = SCORE_MAX if player_hp_min <= 0 else _static_score(enemy_hp_max - player_hp_min)
+        return low, high
+
+    def chance_node(self, state, action, depth):
+        """Resultados da ação com os limites de cada filho a `depth - 1` jogadas
+
+        Retorna (peso_total, resultados, mínimos, máximos, soma_mínimos,
+        soma_máximos), com as somas ponderadas pelos pesos.
+        """
+        cache_key = (state.to_key(), action, depth)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        total_weight, outcomes = self.outcomes(state, action)
+        lower = []
+        upper = []
+        sum_lower = 0
+        sum_upper = 0
+        for weight, child in outcomes:
+            low, high = self.bounds(child, depth - 1)
+            lower.append(low)
+            upper.append(high)
+            sum_lower += weight * low
+            sum_upper += weight * high
+
+        result = (total_weight, outcomes, lower, upper, sum_lower, sum_upper)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = result
+        return result
+
+
+def _static_score(hp_diff):
+    """Mesma conta de BattleState.evaluate() para estados não terminais"""
+    if hp_diff > 0:
+        return hp_diff * 10 + 50
+    if hp_diff < 0:
+        return hp_diff * 10 - 50
+    return 0
+
+
+class ExpectiminimaxSearch:
+    """Busca expectiminimax com poda Star1/Star2 e tabela de transposição
+
+    Star1 usa os limites de ChanceTables.bounds() para cada filho ainda não
+    buscado. Star2 (opcional) sonda a primeira jogada de cada filho antes da
+    busca completa; só compensa com janelas estreitas, por isso vem
+    desligada por padrão.
+    """
+
+    def __init__(self, tables=None, tt=None, star2=False):
+        self.tables = tables if tables is not None else ChanceTables()
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.star2 = star2
+        self.nodes = 0
+        self.chance_nodes = 0
+        self.cutoffs = 0
+
+    def search(self, state, depth, maximizing_player=True):
+        """Retorna (valor_esperado, melhor_ação) a partir de `state`"""
+        self.nodes += 1
+        if state.is_terminal() or depth == 0:
+            return state.evaluate(), None
+
+        best_score = None
+        best_action = None
+        for action in state.get_actions():
+            if best_action is None:
+                score = self._action_value(state, action, depth, SCORE_MIN, SCORE_MAX,
+                                           maximizing_player)
+            elif maximizing_player:
+                score = self._action_value(state, action, depth, best_score, SCORE_MAX, True)
+            else:
+                score = self._action_value(state, action, depth, SCORE_MIN, best_score, False)
+
+            if (best_action is None or (maximizing_player and score > best_score)
+                    or (not maximizing_player and score < best_score)):
+                best_score, best_action = score, action
+
+        return best_score, best_action
+
+    def _decision(self, state, depth, alpha, beta, maximizing_player, only_action=None):
+        self.nodes += 1
+        if state.is_terminal() or depth == 0:
+            return state.evaluate()
+
+        tt = self.tt
+        key = (state.to_key() << 1) | maximizing_player
+        entry = tt.probe(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, entry_value, tt_move = entry
+            if only_action is None and tt.is_usable(entry_depth, depth):
+                if flag == EXACT:
+                    return entry_value
+                if flag == LOWER_BOUND and entry_value >= beta:
+                    return entry_value
+                if flag == UPPER_BOUND and entry_value <= alpha:
+                    return entry_value
+
+        if only_action is not None:
+            actions = [only_action]
+        elif tt_move is not None:
+            actions = [tt_move] + [action for action in ACTIONS if action != tt_move]
+        else:
+            actions = ACTIONS
+
+        alpha_orig, beta_orig = alpha, beta
+        best_action = None
+        value = float('-inf') if maximizing_player else float('inf')
+        for action in actions:
+            score = self._action_value(state, action, depth, alpha, beta, maximizing_player)
+            if maximizing_player:
+                if score > value:
+                    value, best_action = score, action
+                    alpha = max(alpha, value)
+            else:
+                if score < value:
+                    value, best_action = score, action
+                    beta = min(beta, value)
+            if alpha >= beta:
+                self.cutoffs += 1
+                break
+
+        # Sondagens (Star2) só avaliam uma jogada e não valem como resultado do nó
+        if only_action is None:
+            if value <= alpha_orig:
+                flag = UPPER_BOUND
+            elif value >= beta_orig:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, value, best_action)
+        return value
+
+    def _action_value(self, state, action, depth, alpha, beta, maximizing_player):
+        """Valor esperado de `action` (nó de acaso) dentro da janela (alpha, beta)"""
+        total_weight, outcomes, lower, upper, sum_lower, sum_upper = \
+            self.tables.chance_node(state, action, depth)
+        child_depth = depth - 1
+        child_max = not maximizing_player
+        if len(outcomes) == 1:
+            return self._decision(outcomes[0][1], child_depth, alpha, beta, child_max)
+
+        self.chance_nodes += 1
+        # Contas feitas em unidades de peso: valor = soma(peso * valor) / peso_total
+        alpha_w = alpha * total_weight
+        beta_w = beta * total_weight
+
+        # Star2: a primeira jogada de cada filho limita seu valor por um lado
+        # (por baixo se o filho maximiza, por cima se minimiza)
+        if self.star2 and child_depth > 0 and sum_lower < beta_w and sum_upper > alpha_w:
+            # Cópias: as listas em cache valem para qualquer janela
+            lower = list(lower)
+            upper = list(upper)
+            for i, (weight, child) in enumerate(outcomes):
+                if lower[i] == upper[i]:
+                    continue
+                probe_alpha = (alpha_w - (sum_upper - weight * upper[i])) / weight
+                probe_beta = (beta_w - (sum_lower - weight * lower[i])) / weight
+                score = self._decision(child, child_depth,
+                                       max(lower[i], probe_alpha), min(upper[i], probe_beta),
+                                       child_max, only_action=ACTIONS[0])
+                if child_max and lower[i] < score < SCORE_MAX and score > probe_alpha:
+                    sum_lower += weight * (score - lower[i])
+                    lower[i] = score
+                elif not child_max and SCORE_MIN < score < upper[i] and score < probe_beta:
+                    sum_upper -= weight * (upper[i] - score)
+                    upper[i] = score
+
+        # Star1: corta se os limites dos filhos já decidem o nó
+        if sum_lower >= beta_w:
+            self.cutoffs += 1
+            return sum_lower / total_weight
+        if sum_upper <= alpha_w:
+            self.cutoffs += 1
+            return sum_upper / total_weight
+
+        rest_lower = sum_lower
+        rest_upper = sum_upper
+        total = 0
+        for i, (weight, child) in enumerate(outcomes):
+            rest_lower -= weight * lower[i]
+            rest_upper -= weight * upper[i]
+
+            if lower[i] == upper[i]:
+                score = lower[i]
+            else:
+                child_alpha = (alpha_w - total - rest_upper) / weight
+                child_beta = (beta_w - total - rest_lower) / weight
+                score = self._decision(child, child_depth,
+                                       max(lower[i], child_alpha), min(upper[i], child_beta),
+                                       child_max)
+            total += weight * score
+
+            if total + rest_upper <= alpha_w:
+                self.cutoffs += 1
+                return (total + rest_upper) / total_weight
+            if total + rest_lower >= beta_w:
+                self.cutoffs += 1
+                return (total + rest_lower) / total_weight
+
+        return total / total_weight
+
+
+def expectiminimax(state, depth, maximizing_player=True, tables=None, tt=None, star2=False):
+    """Retorna (valor_esperado, melhor_ação) com nós de acaso de dano e cura"""
+    return ExpectiminimaxSearch(tables, tt, star2).search(state, depth, maximizing_player)
+
+
+def full_expectiminimax(state, depth, maximizing_player, tables=None):
+    """Expectiminimax exaustivo (sem poda nem tabela), mantido como referência"""
+    tables = tables if tables is not None else ChanceTables()
+    if state.is_terminal() or depth == 0:
+        return state.evaluate(), None
+
+    best_score = None
+    best_action = None
+    for action in state.get_actions():
+        total_weight, outcomes = tables.outcomes(state, action)
+        score = 0
+        for weight, child in outcomes:
+            child_score, _ = full_expectiminimax(child, depth - 1, not maximizing_player, tables)
+            score += weight * child_score
+        score /= total_weight
+        if (best_action is None or (maximizing_player and score > best_score)
+                or (not maximizing_player and score < best_score)):
+            best_score, best_action = score, action
+    return best_score, best_action
+
+
+__all__ = [
+    "expectiminimax",
+    "full_expectiminimax",
+    "ExpectiminimaxSearch",
+    "ChanceTables",
+    "damage_distribution",
+    "heal_distribution",
+]
@@ -0,0 +1,144 @@
+"""
+Buffer de experiências da IA neural
+
+ExperienceBuffer guarda as experiências em arrays NumPy pré-alocados (uma
+coluna por campo) usados como buffer circular: inserir é O(1) e não cria
+objetos por experiência.
+
+Cada experiência é gravada duas vezes, na posição i e na posição
+i + capacidade. Com esse espelho as N experiências mais recentes estão
+sempre em um trecho contíguo dos arrays, e recent() devolve views, sem
+cópia, mesmo depois de o buffer dar a volta.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Ação desconhecida nas colunas de metadados
+NO_ACTION = -1
+
+# Lote de experiências: uma linha por experiência em cada array
+ExperienceBatch = namedtuple('ExperienceBatch', ['inputs', 'targets', 'actions', 'rewards', 'turns'])
+
+
+class ExperienceBuffer:
+    """Buffer circular de experiências em estrutura de arrays"""
+
+    def __init__(self, capacity: int, input_size: int = 6, output_size: int = 3):
+        """
+        Args:
+            capacity: Número máximo de experiências guardadas
+            input_size: Tamanho da entrada da rede
+            output_size: Tamanho da saída esperada
+        """
+        if capacity <= 0:
+            raise ValueError("capacity deve ser > 0")
+        self.capacity = capacity
+        self.input_size = input_size
+        self.output_size = output_size
+
+        # Cada coluna tem o dobro da capacidade por causa do espelho
+        self._inputs = np.zeros((2 * capacity, input_size), dtype=np.float32)
+        self._targets = np.zeros((2 * capacity, output_size), dtype=np.float32)
+        self._actions = np.full(2 * capacity, NO_ACTION, dtype=np.int8)
+        self._rewards = np.zeros(2 * capacity, dtype=np.float32)
+        self._turns = np.zeros(2 * capacity, dtype=np.int32)
+
+        self._head = 0  # Próxima posição de escrita, em [0, capacity)
+        self._size = 0
+        self.total = 0  # Experiências inseridas desde a criação (ou clear())
+
+    def __len__(self):
+        return self._size
+
+    def _columns(self):
+        return (self._inputs, self._targets, self._actions, self._rewards, self._turns)
+
+    def append(self, inputs, target, action: int = NO_ACTION, reward: float = 0.0,
+               turn: int = 0):
+        """Insere uma experiência, descartando a mais antiga se o buffer estiver cheio"""
+        head = self._head
+        for column, value in zip(self._columns(), (inputs, target, action, reward, turn)):
+            column[head] = value
+            column[head + self.capacity] = value
+        self._written(np.array([head]))
+
+        self._head = (head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, inputs, targets, actions=NO_ACTION, rewards=0.0, turns=0):
+        """Insere várias experiências de uma vez (arrays com uma linha por experiência)"""
+        inputs = np.asarray(inputs, dtype=np.float32).reshape(-1, self.input_size)
+        count = len(inputs)
+        if count == 0:
+            return
+        values = (inputs,
+                  np.asarray(targets, dtype=np.float32).reshape(-1, self.output_size),
+                  np.broadcast_to(np.asarray(actions, dtype=np.int8), (count,)),
+                  np.broadcast_to(np.asarray(rewards, dtype=np.float32), (count,)),
+                  np.broadcast_to(np.asarray(turns, dtype=np.int32), (count,)))
+
+        # Só as últimas `capacity` experiências sobreviveriam
+        skipped = max(0, count - self.capacity)
+        positions = (self._head + skipped + np.arange(count - skipped)) % self.capacity
+        for column, value in zip(self._columns(), values):
+            column[positions] = value[skipped:]
+            column[positions + self.capacity] = value[skipped:]
+        self._written(positions)
+
+        self._head = (self._head + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+        self.total += count
+
+    def _written(self, positions):
+        """Chamado após gravar experiências nas posições `positions` de [0, capacity)"""
+
+    def recent(self, n: int) -> ExperienceBatch:
+        """As `n` experiências mais recentes, da mais antiga para a mais nova
+
+        Os arrays devolvidos são views do buffer (sem cópia) e mudam quando
+        novas experiências sobrescrevem essas posições.
+        """
+        n = max(0, min(n, self._size))
+        end = self._head + self.capacity
+        window = slice(end - n, end)
+        return ExperienceBatch(*(column[window] for column in self._columns()))
+
+    def all(self) -> ExperienceBatch:
+        """Todas as experiências guardadas (views, da mais antiga para a mais nova)"""
+        return self.recent(self._size)
+
+    def sample(self, n: int, rng=None) -> ExperienceBatch:
+        """Sorteia `n` experiências (com reposição) para replay
+
+        Args:
+            n: Tamanho do lote
+            rng: np.random.Generator usado no sorteio (padrão: np.random)
+
+        Returns:
+            ExperienceBatch com cópias das experiências sorteadas
+        """
+        if self._size == 0:
+            raise ValueError("buffer de experiências vazio")
+        rng = np.random if rng is None else rng
+        # As posições [0, size) guardam exatamente as experiências atuais
+        indices = np.floor(rng.random(n) * self._size).astype(np.intp)
+        return ExperienceBatch(*(column[indices] for column in self._columns()))
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos arrays, em bytes"""
+        return sum(column.nbytes for column in self._columns())
+
+
+__all__ = [
+    "ExperienceBatch",
+    "ExperienceBuffer",
+]
@@ -2,11 +2,17 @@ import tkinter as tk
 from tkinter import ttk
 import random
 import os
+import threading
 import numpy as np
 from .config import GUI_CONFIG, GAME_CONFIG
 from .entities import Character
-from .minimax import minimax, BattleState
+from .minimax import iterative_deepening, BattleState
+from .parallel_search import get_parallel_searcher
+from .transposition import create_transposition_table
+from .tablebase import probe as probe_tablebase
+from .pondering import PonderService
 from .neural_ai import create_neural_ai
+from .replay import get_replay_writer, new_seed
 
 try:
     from PIL import Image, ImageTk
@@ -25,6 +31,13 @@ class GameGUI:
         self.neural_ai = None
         self.turn_count = 1
         self.game_history = []
+        self.transposition_table = create_transposition_table()
+        self.search_thread = None  # Busca do Minimax em andamento
+        self.search_result = None
+        self.ponder_service = None
+        if self.ai_type != 'NEURAL' and GAME_CONFIG['MINIMAX_CONFIG'].get('PONDERING', False):
+            self.ponder_service = PonderService(tt=self.transposition_table)
+            self.root.bind('<Destroy>', self.on_destroy, add='+')
         
         # Inicializa IA Neural se necessário
         if self.ai_type == 'NEURAL':
@@ -35,12 +48,38 @@ class GameGUI:
         self.max_hp = GAME_CONFIG['MAX_HP']
         
         # Cria personagens usando a classe Character
-        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'])
-        self.enemy = Character("Inimigo", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'])
+        self.replay_writer = get_replay_writer()
+        self.recording = None
+        self.create_characters()
 
         # Carrega imagens com tratamento de erro
         self.load_images()
         self.setup_ui()
+        self.start_pondering()
+
+    def create_characters(self):
+        """Cria os personagens de uma partida nova e começa a gravá-la
+
+        Os sorteios dos dois lados saem de um gerador com semente, gravada no replay.
+        """
+        if self.recording is not None:
+            self.recording.finish()
+        seed = new_seed()
+        rng = random.Random(seed)
+        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'], rng=rng)
+        self.enemy = Character("Inimigo", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'], rng=rng)
+        self.player_move = ("invalid", 0)  # Ação do jogador no turno e o dano ou a cura
+        self.recording = self.replay_writer.begin_match(seed) if self.replay_writer else None
+
+    def record_turn(self, enemy_action=None, enemy_amount=0):
+        """Grava o turno no replay; a partida vai para o arquivo quando termina"""
+        if self.recording is None:
+            return
+        player_action, player_amount = self.player_move
+        self.recording.record_turn(player_action, enemy_action, self.player.hp, self.enemy.hp,
+                                   player_amount, enemy_amount)
+        if not self.player.is_alive() or not self.enemy.is_alive():
+            self.recording.finish()
 
     def load_images(self):
         """Carrega imagens com tratamento de erro"""
@@ -173,12 +212,14 @@ class GameGUI:
         
         # Jogador ataca
         damage = self.player.attack(self.enemy)
+        self.player_move = ("attack", damage)
         self.log_message(f"⚔️ Você atacou causando {damage} de dano!")
         
         self.animate_bar(self.enemy_hp_bar, "Red")
         self.update_display()
         
         if self.check_end():
+            self.record_turn()
             return
             
         # Turno do inimigo
@@ -194,6 +235,7 @@ class GameGUI:
         self.enemy.reset_turn()
         
         self.player.defend()
+        self.player_move = ("defend", 0)
         self.log_message("🛡️ Você se defendeu!")
         
         # Turno do inimigo
@@ -209,6 +251,7 @@ class GameGUI:
         self.enemy.reset_turn()
         
         healing = self.player.heal()
+        self.player_move = ("heal", healing)
         self.log_message(f"💚 Você se curou em {healing} pontos!")
         
         self.animate_bar(self.player_hp_bar, "Green")
@@ -226,7 +269,62 @@ class GameGUI:
             return
             
         self.log_message("🤖 IA está pensando...")
+        self.disable_actions()
         
+        # Escolhe ação baseada no tipo de IA
+        if self.ai_type == 'NEURAL' and self.neural_ai:
+            ai_action = self.neural_ai.decide_action(
+                self.player.hp, self.enemy.hp,
+                self.player.is_defending, self.enemy.is_defending,
+                self.turn_count
+            )
+            self.execute_enemy_action(ai_action)
+            return
+
+        # O Minimax busca em uma thread, fora do loop do Tk
+        state = BattleState(
+            self.player.hp, 
+            self.enemy.hp, 
+            player_turn=False,
+            player_defending=self.player.is_defending,
+            enemy_defending=self.enemy.is_defending
+        )
+        self.search_result = None
+        
+        def search():
+            self.search_result = self.run_minimax_search(state)
+        
+        self.search_thread = threading.Thread(target=search, daemon=True)
+        self.search_thread.start()
+        self.root.after(10, self.finish_enemy_turn, self.search_thread)
+    
+    def run_minimax_search(self, state):
+        """Consulta a tablebase, a resposta do pondering ou busca com prazo (roda fora do Tk)"""
+        result = probe_tablebase(state)
+        if result is not None:
+            if self.ponder_service is not None:
+                self.ponder_service.cancel()
+            return result
+        if self.ponder_service is not None:
+            result = self.ponder_service.take(state)
+        return result or iterative_deepening(
+            state, GAME_CONFIG['MINIMAX_CONFIG']['THINKING_TIME'],
+            max_depth=GAME_CONFIG['MINIMAX_DEPTH'], tt=self.transposition_table,
+            parallel=get_parallel_searcher()
+        )
+    
+    def finish_enemy_turn(self, thread):
+        """Aplica a jogada do Minimax quando a thread `thread` termina a busca"""
+        if thread is not self.search_thread:  # Jogo reiniciado durante a busca
+            return
+        if thread.is_alive():
+            self.root.after(10, self.finish_enemy_turn, thread)
+            return
+        self.search_thread = None
+        self.execute_enemy_action(self.search_result.action)
+    
+    def execute_enemy_action(self, ai_action):
+        """Executa a ação escolhida pela IA e encerra o turno"""
         # Salva estado antes da ação (para aprendizado)
         pre_action_state = {
             'player_hp': self.player.hp,
@@ -236,24 +334,6 @@ class GameGUI:
             'turn': self.turn_count
         }
         
-        # Escolhe ação baseada no tipo de IA
-        if self.ai_type == 'NEURAL' and self.neural_ai:
-            ai_action = self.neural_ai.decide_action(
-                self.player.hp, self.enemy.hp,
-                self.player.is_defending, self.enemy.is_defending,
-                self.turn_count
-            )
-        else:
-            # Usa Minimax
-            state = BattleState(
-                self.player.hp, 
-                self.enemy.hp, 
-                player_turn=False,
-                player_defending=self.player.is_defending,
-                enemy_defending=self.enemy.is_defending
-            )
-            _, ai_action = minimax(state, depth=GAME_CONFIG['MINIMAX_DEPTH'], maximizing_player=True)
-        
         # Executa ação da IA
         damage_dealt = 0
         healing_done = 0
@@ -292,11 +372,24 @@ class GameGUI:
             'player_hp_after': self.player.hp,
             'enemy_hp_after': self.enemy.hp
         })
+        self.record_turn(ai_action, damage_dealt or healing_done)
         
         self.turn_count += 1
         self.update_display()
-        self.check_end()
+        if not self.check_end():
+            self.enable_actions()
+            self.start_pondering()
+    
+    def start_pondering(self):
+        """Começa a pensar nas respostas da IA enquanto o jogador escolhe"""
+        if self.ponder_service is not None:
+            self.ponder_service.ponder(BattleState(self.player.hp, self.enemy.hp, player_turn=True))
     
+    def on_destroy(self, event):
+        """Encerra a thread do pondering quando a janela é fechada"""
+        if event.widget is self.root and self.ponder_service is not None:
+            self.ponder_service.close()
+
     def calculate_action_score(self, pre_state, action, damage_dealt, healing_done):
         """Calcula score para uma ação da IA (para aprendizado)"""
         score = 0.0
@@ -353,9 +446,15 @@ class GameGUI:
 
     def reset(self):
         """Reinicia o jogo"""
-        # Recria os personagens
-        self.player = Character("Jogador", self.max_hp, GAME_CONFIG['PLAYER_ATTACK'], GAME_CONFIG['PLAYER_DEFENSE'])
-        self.enemy = Character("Inimigo", self.max_hp, GAME_CONFIG['AI_ATTACK'], GAME_CONFIG['AI_DEFENSE'])
+        # Recria os personagens (uma partida interrompida é gravada até onde foi)
+        self.create_characters()
+        # A busca em andamento é descartada; espera ela liberar a tabela
+        if self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = None
+        if self.ponder_service is not None:
+            self.ponder_service.cancel()
+        self.transposition_table.clear()
         
         # Atualiza display
         self.update_display()
@@ -366,6 +465,7 @@ class GameGUI:
         
         # Reabilita ações
         self.enable_actions()
+        self.start_pondering()
 
 def run_gui():
     """Função para executar a GUI"""
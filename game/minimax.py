@@ -1,12 +1,41 @@
-from .config import GAME_CONFIG
+import time
+from collections import namedtuple
+from .rules import BattleRules
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Ordem canônica das ações: é ela que decide empates entre jogadas de mesmo valor
+ACTIONS = ('attack', 'heal', 'defend')
+
+# Resultado da busca com aprofundamento iterativo
+SearchResult = namedtuple('SearchResult', ['score', 'action', 'depth'])
+
+# A cada quantos nós o relógio é consultado
+DEADLINE_CHECK_INTERVAL = 256
+
+
+class SearchTimeout(Exception):
+    """Interrompe uma busca cujo prazo terminou"""
+
 
 class BattleState:
-    def __init__(self, player_hp, enemy_hp, player_turn, player_defending=False, enemy_defending=False):
+    """Estado do combate visto pela busca
+
+    Usa __slots__ para não criar um __dict__ por nó. As regras (BattleRules)
+    são lidas de GAME_CONFIG quando o estado é criado sem elas e repassadas
+    aos filhos por apply_action.
+    """
+
+    __slots__ = ('player_hp', 'enemy_hp', 'player_turn', 'player_defending',
+                 'enemy_defending', 'rules')
+
+    def __init__(self, player_hp, enemy_hp, player_turn, player_defending=False,
+                 enemy_defending=False, rules=None):
         self.player_hp = player_hp
         self.enemy_hp = enemy_hp
         self.player_turn = player_turn
         self.player_defending = player_defending
         self.enemy_defending = enemy_defending
+        self.rules = rules if rules is not None else BattleRules.from_config()
 
     def is_terminal(self):
         return self.player_hp <= 0 or self.enemy_hp <= 0
@@ -20,56 +49,379 @@ class BattleState:
         # Avaliação mais balanceada
         hp_diff = self.enemy_hp - self.player_hp
         score = hp_diff * 10
-        
+
         # Bônus por ter mais HP
         if self.enemy_hp > self.player_hp:
             score += 50
         elif self.player_hp > self.enemy_hp:
             score -= 50
-            
+
         return score
 
+    def to_key(self):
+        """Codifica o estado em um inteiro compacto (HPs até 32767)"""
+        return ((self.player_hp << 18) | (self.enemy_hp << 3) | (bool(self.player_turn) << 2)
+                | (bool(self.player_defending) << 1) | bool(self.enemy_defending))
+
     def get_actions(self):
-        return ['attack', 'heal', 'defend']
+        return list(ACTIONS)
 
     def apply_action(self, action):
-        new_player_hp = self.player_hp
-        new_enemy_hp = self.enemy_hp
-        new_player_defending = False
-        new_enemy_defending = False
+        rules = self.rules
+        player_hp = self.player_hp
+        enemy_hp = self.enemy_hp
 
         if self.player_turn:
             if action == 'attack':
-                damage = GAME_CONFIG['PLAYER_ATTACK']
                 if self.enemy_defending:
-                    damage = max(1, damage - GAME_CONFIG['AI_DEFENSE'])
-                new_enemy_hp = max(0, new_enemy_hp - damage)
-            elif action == 'heal':
-                healing = (GAME_CONFIG['HEAL_MIN'] + GAME_CONFIG['HEAL_MAX']) // 2
-                new_player_hp = min(GAME_CONFIG['MAX_HP'], new_player_hp + healing)
-            elif action == 'defend':
-                new_player_defending = True
+                    enemy_hp -= rules.player_damage_defended
+                else:
+                    enemy_hp -= rules.player_damage
+                return BattleState(player_hp, enemy_hp if enemy_hp > 0 else 0,
+                                   False, False, False, rules)
+            if action == 'heal':
+                player_hp += rules.healing
+                return BattleState(player_hp if player_hp < rules.max_hp else rules.max_hp,
+                                   enemy_hp, False, False, False, rules)
+            if action == 'defend':
+                return BattleState(player_hp, enemy_hp, False, True, False, rules)
+            return BattleState(player_hp, enemy_hp, False, False, False, rules)
+
+        if action == 'attack':
+            if self.player_defending:
+                player_hp -= rules.ai_damage_defended
+            else:
+                player_hp -= rules.ai_damage
+            return BattleState(player_hp if player_hp > 0 else 0, enemy_hp,
+                               True, False, False, rules)
+        if action == 'heal':
+            enemy_hp += rules.healing
+            return BattleState(player_hp, enemy_hp if enemy_hp < rules.max_hp else rules.max_hp,
+                               True, False, False, rules)
+        if action == 'defend':
+            return BattleState(player_hp, enemy_hp, True, False, True, rules)
+        return BattleState(player_hp, enemy_hp, True, False, False, rules)
+
+
+class MoveOrdering:
+    """Ordenação de jogadas padrão: mantém a ordem de get_actions()"""
+
+    def order(self, state, actions, depth, maximizing_player):
+        """Retorna as ações na ordem em que devem ser exploradas"""
+        return actions
+
+    def record_cutoff(self, state, action, depth):
+        """Notifica que `action` causou um corte beta/alpha em `depth`"""
+
+    def reset(self):
+        """Limpa qualquer informação acumulada entre buscas"""
+
+
+class EvaluationOrdering(MoveOrdering):
+    """Ordena pelas avaliações estáticas dos estados filhos"""
+
+    def order(self, state, actions, depth, maximizing_player):
+        # sorted é estável: empates mantêm a ordem canônica
+        return sorted(actions,
+                      key=lambda action: state.apply_action(action).evaluate(),
+                      reverse=maximizing_player)
+
+
+class KillerHistoryOrdering(MoveOrdering):
+    """Heurísticas killer (por profundidade) e de histórico de cortes"""
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback
+        self.killers = {}
+        self.history = {action: 0 for action in ACTIONS}
+
+    def order(self, state, actions, depth, maximizing_player):
+        if self.fallback is not None:
+            actions = self.fallback.order(state, actions, depth, maximizing_player)
+        killer = self.killers.get(depth)
+        history = self.history
+        return sorted(actions, key=lambda action: (action != killer, -history[action]))
+
+    def record_cutoff(self, state, action, depth):
+        self.killers[depth] = action
+        self.history[action] += depth * depth
+
+    def reset(self):
+        self.killers.clear()
+        for action in self.history:
+            self.history[action] = 0
+
+
+class AlphaBetaSearch:
+    """Minimax com poda alpha-beta e ordenação de jogadas plugável
+
+    Devolve sempre a mesma ação que a busca exaustiva: na raiz, uma jogada que
+    vem antes na ordem canônica é testada com janela alargada em 1 ponto (as
+    avaliações são inteiras), de modo que um empate ainda a faz vencer.
+
+    Com uma TranspositionTable (`tt`), estados já buscados são reaproveitados
+    e a melhor jogada guardada é explorada primeiro.
+
+    Se `deadline` (instante de time.perf_counter()) for definido, a busca
+    levanta SearchTimeout ao ultrapassá-lo.
+    """
+
+    def __init__(self, ordering=None, tt=None, deadline=None):
+        self.ordering = ordering if ordering is not None else KillerHistoryOrdering()
+        self.tt = tt
+        self.deadline = deadline
+        self.nodes = 0
+        self.cutoffs = 0
+
+    def search(self, state, depth, maximizing_player, first_move=None):
+        """Busca a partir de `state` e retorna (score, melhor_ação)
+
+        `first_move`, se informado, é a primeira jogada explorada na raiz.
+        """
+        self.nodes += 1
+        if state.is_terminal() or depth == 0:
+            return state.evaluate(), None
+
+        canonical = state.get_actions()
+        actions = self.ordering.order(state, canonical, depth, maximizing_player)
+        if first_move is not None and first_move in actions:
+            actions = [first_move] + [action for action in actions if action != first_move]
+
+        best_score = None
+        best_action = None
+        best_index = None
+        for action in actions:
+            index = canonical.index(action)
+            child = state.apply_action(action)
+
+            if best_action is None:
+                score = self._alphabeta(child, depth - 1, float('-inf'), float('inf'),
+                                        not maximizing_player)
+            elif maximizing_player:
+                alpha = best_score - 1 if index < best_index else best_score
+                score = self._alphabeta(child, depth - 1, alpha, float('inf'), False)
+            else:
+                beta = best_score + 1 if index < best_index else best_score
+                score = self._alphabeta(child, depth - 1, float('-inf'), beta, True)
+
+            if best_action is None:
+                improves = True
+            elif maximizing_player:
+                improves = score > best_score or (score == best_score and index < best_index)
+            else:
+                improves = score < best_score or (score == best_score and index < best_index)
+
+            if improves:
+                best_score, best_action, best_index = score, action, index
+
+        return best_score, best_action
+
+    def value(self, state, depth, maximizing_player, alpha=float('-inf'), beta=float('inf')):
+        """Valor de `state` na janela (alpha, beta)
+
+        Dentro da janela o valor é exato; fora dela é só um limite (no máximo
+        alpha ou no mínimo beta), suficiente para descartar a jogada.
+        """
+        return self._alphabeta(state, depth, alpha, beta, maximizing_player)
+
+    def _alphabeta(self, state, depth, alpha, beta, maximizing_player):
+        self.nodes += 1
+        if (self.deadline is not None and self.nodes % DEADLINE_CHECK_INTERVAL == 0
+                and time.perf_counter() >= self.deadline):
+            raise SearchTimeout()
+        if state.is_terminal() or depth == 0:
+            return state.evaluate()
+
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key = (state.to_key() << 1) | maximizing_player
+            entry = tt.probe(key)
+            if entry is not None:
+                entry_depth, flag, entry_value, tt_move = entry
+                if tt.is_usable(entry_depth, depth):
+                    if flag == EXACT:
+                        return entry_value
+                    if flag == LOWER_BOUND and entry_value >= beta:
+                        return entry_value
+                    if flag == UPPER_BOUND and entry_value <= alpha:
+                        return entry_value
+
+        actions = self.ordering.order(state, state.get_actions(), depth, maximizing_player)
+        if tt_move is not None and actions[0] != tt_move:
+            actions = [tt_move] + [action for action in actions if action != tt_move]
+
+        alpha_orig, beta_orig = alpha, beta
+        best_action = None
+
+        if maximizing_player:
+            value = float('-inf')
+            for action in actions:
+                score = self._alphabeta(state.apply_action(action), depth - 1, alpha, beta, False)
+                if score > value:
+                    value = score
+                    best_action = action
+                    if value > alpha:
+                        alpha = value
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    self.ordering.record_cutoff(state, action, depth)
+                    break
         else:
-            if action == 'attack':
-                damage = GAME_CONFIG['AI_ATTACK']
-                if self.player_defending:
-                    damage = max(1, damage - GAME_CONFIG['PLAYER_DEFENSE'])
-                new_player_hp = max(0, new_player_hp - damage)
-            elif action == 'heal':
-                healing = (GAME_CONFIG['HEAL_MIN'] + GAME_CONFIG['HEAL_MAX']) // 2
-                new_enemy_hp = min(GAME_CONFIG['MAX_HP'], new_enemy_hp + healing)
-            elif action == 'defend':
-                new_enemy_defending = True
-
-        return BattleState(
-            new_player_hp,
-            new_enemy_hp,
-            not self.player_turn,
-            player_defending=new_player_defending,
-            enemy_defending=new_enemy_defending
-        )
-
-def minimax(state, depth, maximizing_player):
+            value = float('inf')
+            for action in actions:
+                score = self._alphabeta(state.apply_action(action), depth - 1, alpha, beta, True)
+                if score < value:
+                    value = score
+                    best_action = action
+                    if value < beta:
+                        beta = value
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    self.ordering.record_cutoff(state, action, depth)
+                    break
+
+        if tt is not None:
+            if value <= alpha_orig:
+                flag = UPPER_BOUND
+            elif value >= beta_orig:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, value, best_action)
+
+        return value
+
+
+class InstrumentedSearch(AlphaBetaSearch):
+    """AlphaBetaSearch que registra folhas e profundidade em uma SearchStats
+
+    Fica em uma subclasse para que a busca sem estatísticas não pague nada.
+    """
+
+    def __init__(self, stats, ordering=None, tt=None, deadline=None):
+        super().__init__(ordering, tt, deadline)
+        self.stats = stats
+        self.root_depth = 0
+
+    def search(self, state, depth, maximizing_player, first_move=None):
+        self.root_depth = depth
+        if state.is_terminal() or depth == 0:
+            self.stats.record_leaf(0)
+        return super().search(state, depth, maximizing_player, first_move)
+
+    def _alphabeta(self, state, depth, alpha, beta, maximizing_player):
+        if depth == 0 or state.is_terminal():
+            self.stats.record_leaf(self.root_depth - depth)
+        return super()._alphabeta(state, depth, alpha, beta, maximizing_player)
+
+
+def _create_search(ordering, tt, stats):
+    if stats is None:
+        return AlphaBetaSearch(ordering, tt)
+    return InstrumentedSearch(stats, ordering, tt)
+
+
+def _tt_counts(tt):
+    return (tt.hits, tt.hits + tt.misses) if tt is not None else (0, 0)
+
+
+def _record_search(stats, search, start, tt_before, depth):
+    """Soma em `stats` o custo de `search`, iniciada em `start`"""
+    tt_hits, tt_probes = _tt_counts(search.tt)
+    stats.nodes += search.nodes
+    stats.cutoffs += search.cutoffs
+    stats.tt_hits += tt_hits - tt_before[0]
+    stats.tt_probes += tt_probes - tt_before[1]
+    stats.depth = max(stats.depth, depth)
+    stats.elapsed += time.perf_counter() - start
+
+
+def minimax(state, depth, maximizing_player, ordering=None, tt=None, tablebase=None,
+            stats=None):
+    """Retorna (score, melhor_ação) usando busca alpha-beta
+
+    Passe a mesma TranspositionTable em `tt` para reaproveitar a busca entre
+    os turnos de uma partida. Com uma Tablebase que cubra o estado, a
+    resposta exata é lida em O(1) e `depth` é ignorado. Uma SearchStats em
+    `stats` recebe o custo da busca.
+    """
+    if (tablebase is not None and maximizing_player != bool(state.player_turn)
+            and tablebase.covers(state)):
+        if stats is not None:
+            stats.tablebase_hits += 1
+        return tablebase.lookup(state)
+
+    search = _create_search(ordering, tt, stats)
+    if stats is None:
+        return search.search(state, depth, maximizing_player)
+
+    start = time.perf_counter()
+    tt_before = _tt_counts(tt)
+    result = search.search(state, depth, maximizing_player)
+    _record_search(stats, search, start, tt_before, depth)
+    return result
+
+
+def iterative_deepening(state, time_limit, max_depth=64, maximizing_player=True,
+                        ordering=None, tt=None, stats=None, parallel=None):
+    """Aprofunda a busca (1, 2, 3...) até o prazo de `time_limit` segundos
+
+    Retorna SearchResult(score, action, depth) da última profundidade
+    concluída. A profundidade 1 é sempre concluída, então sempre há jogada
+    para estados não terminais. A melhor jogada de cada iteração abre a
+    busca da iteração seguinte. Uma SearchStats em `stats` recebe o custo
+    de todas as iterações, inclusive a interrompida.
+
+    Com um ParallelSearcher em `parallel`, as iterações a partir da
+    profundidade mínima dele (PARALLEL_MIN_DEPTH) são feitas no pool de
+    processos, com o mesmo prazo.
+    """
+    start = time.perf_counter()
+    if state.is_terminal() or max_depth == 0:
+        if stats is not None:
+            stats.nodes += 1
+            stats.record_leaf(0)
+        return SearchResult(state.evaluate(), None, 0)
+
+    deadline = start + time_limit
+    tt_before = _tt_counts(tt)
+    search = _create_search(ordering, tt, stats)
+    score, action = search.search(state, 1, maximizing_player)
+    result = SearchResult(score, action, 1)
+
+    search.deadline = deadline
+    for depth in range(2, max_depth + 1):
+        if time.perf_counter() >= deadline:
+            break
+        try:
+            if parallel is not None and parallel.is_parallel(state, depth):
+                nodes = parallel.nodes
+                try:
+                    score, action = parallel.search(state, depth, maximizing_player,
+                                                    first_move=result.action, deadline=deadline)
+                finally:
+                    search.nodes += parallel.nodes - nodes
+            else:
+                score, action = search.search(state, depth, maximizing_player,
+                                              first_move=result.action)
+        except SearchTimeout:
+            break
+        result = SearchResult(score, action, depth)
+
+    if stats is not None:
+        _record_search(stats, search, start, tt_before, result.depth)
+    return result
+
+
+def full_minimax(state, depth, maximizing_player, counter=None):
+    """Minimax exaustivo (sem poda), mantido como referência
+
+    Se `counter` for uma lista, counter[0] é incrementado a cada nó visitado.
+    """
+    if counter is not None:
+        counter[0] += 1
+
     if state.is_terminal() or depth == 0:
         return state.evaluate(), None
 
@@ -79,7 +431,7 @@ def minimax(state, depth, maximizing_player):
         max_eval = float('-inf')
         for action in state.get_actions():
             new_state = state.apply_action(action)
-            eval_score, _ = minimax(new_state, depth - 1, False)
+            eval_score, _ = full_minimax(new_state, depth - 1, False, counter)
             if eval_score > max_eval:
                 max_eval = eval_score
                 best_action = action
@@ -89,11 +441,24 @@ def minimax(state, depth, maximizing_player):
         min_eval = float('inf')
         for action in state.get_actions():
             new_state = state.apply_action(action)
-            eval_score, _ = minimax(new_state, depth - 1, True)
+            eval_score, _ = full_minimax(new_state, depth - 1, True, counter)
             if eval_score < min_eval:
                 min_eval = eval_score
                 best_action = action
         return min_eval, best_action
 
 
-__all__ = ["minimax", "BattleState"]
\ No newline at end of file
+__all__ = [
+    "minimax",
+    "iterative_deepening",
+    "SearchResult",
+    "SearchTimeout",
+    "full_minimax",
+    "BattleState",
+    "AlphaBetaSearch",
+    "InstrumentedSearch",
+    "MoveOrdering",
+    "EvaluationOrdering",
+    "KillerHistoryOrdering",
+    "ACTIONS",
+]
@@ -0,0 +1,236 @@
+"""
+Formato binário dos modelos da IA neural
+
+Um arquivo de modelo é um cabeçalho fixo seguido dos pesos em float32,
+na ordem: pesos entrada→oculta, bias da oculta, pesos oculta→saída, bias
+da saída e, por fim, o histórico de erro do treinamento.
+
+    magic 'TBNN' | versão | input | hidden | output | reservado |
+    tamanho do histórico | geração | CRC32 dos dados | reservado
+
+O cabeçalho é conferido na leitura (arquitetura, versão e CRC), e os dados
+são lidos de uma vez com np.fromfile para arrays em memória. O arquivo não
+fica aberto nem mapeado depois da leitura, então o próprio modelo pode ser
+regravado por cima dele (no Windows, os.replace() falha sobre um arquivo
+mapeado).
+
+A gravação é atômica: o arquivo é escrito ao lado do destino com outro
+nome e só então renomeado com os.replace(), então uma falha no meio nunca
+deixa um modelo corrompido no lugar do anterior.
+"""
+
+import json
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+MAGIC = b'TBNN'
+FORMAT_VERSION = 1
+
+# magic, versão, input, hidden, output, reservado, histórico, geração, crc32, reservado
+_HEADER = struct.Struct('<4sHHHHHIQII')
+HEADER_SIZE = _HEADER.size
+
+DTYPE = np.dtype('<f4')
+
+
+class ModelFormatError(ValueError):
+    """Arquivo de modelo inválido, corrompido ou de outra arquitetura"""
+
+
+class ModelHeader:
+    """Cabeçalho de um arquivo de modelo"""
+
+    __slots__ = ('version', 'input_size', 'hidden_size', 'output_size', 'history_size',
+                 'generation', 'checksum')
+
+    def __init__(self, version, input_size, hidden_size, output_size, history_size,
+                 generation, checksum):
+        self.version = version
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.output_size = output_size
+        self.history_size = history_size
+        self.generation = generation
+        self.checksum = checksum
+
+    @property
+    def weight_count(self):
+        """Número de floats dos pesos e bias"""
+        return (self.input_size * self.hidden_size + self.hidden_size
+                + self.hidden_size * self.output_size + self.output_size)
+
+    @property
+    def file_size(self):
+        return HEADER_SIZE + (self.weight_count + self.history_size) * DTYPE.itemsize
+
+    def pack(self):
+        return _HEADER.pack(MAGIC, self.version, self.input_size, self.hidden_size,
+                            self.output_size, 0, self.history_size, self.generation,
+                            self.checksum, 0)
+
+    def __repr__(self):
+        return (f"ModelHeader(v{self.version}, {self.input_size}-{self.hidden_size}-"
+                f"{self.output_size}, geração {self.generation})")
+
+
+def read_header(filepath) -> ModelHeader:
+    """Lê e valida o cabeçalho de um arquivo de modelo"""
+    with open(filepath, 'rb') as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ModelFormatError(f"{filepath}: arquivo menor que o cabeçalho")
+
+    magic, version, input_size, hidden_size, output_size, _, history_size, generation, \
+        checksum, _ = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ModelFormatError(f"{filepath}: não é um modelo binário")
+    if version != FORMAT_VERSION:
+        raise ModelFormatError(f"{filepath}: versão {version} do formato não suportada")
+
+    header = ModelHeader(version, input_size, hidden_size, output_size, history_size,
+                         generation, checksum)
+    if os.path.getsize(filepath) != header.file_size:
+        raise ModelFormatError(f"{filepath}: tamanho não confere com o cabeçalho")
+    return header
+
+
+def _payload(network):
+    return np.concatenate([
+        np.ravel(network.weights_input_hidden),
+        np.ravel(network.bias_hidden),
+        np.ravel(network.weights_hidden_output),
+        np.ravel(network.bias_output),
+        np.asarray(network.performance_history, dtype=float),
+    ]).astype(DTYPE)
+
+
+def save_network(network, filepath, generation=None):
+    """Grava a rede de forma atômica
+
+    Args:
+        network: SimpleNeuralNetwork
+        filepath: Destino
+        generation: Geração gravada no cabeçalho (padrão: network.generation)
+    """
+    payload = _payload(network)
+    generation = getattr(network, 'generation', 0) if generation is None else generation
+    header = ModelHeader(FORMAT_VERSION, network.input_size, network.hidden_size,
+                         network.output_size, len(network.performance_history), generation,
+                         zlib.crc32(payload.tobytes()))
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.model-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header.pack())
+            f.write(payload.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp cria o arquivo só para o dono; mantém as permissões de um modelo comum
+        mode = os.stat(filepath).st_mode & 0o777 if os.path.exists(filepath) else 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_network(network, filepath, verify=True):
+    """Carrega os pesos de `filepath` em `network`
+
+    Os pesos ficam em float32, copiados para a memória.
+
+    Args:
+        network: SimpleNeuralNetwork com a arquitetura do arquivo
+        filepath: Arquivo de modelo
+        verify: Confere o CRC32 dos dados
+
+    Returns:
+        ModelHeader do arquivo
+    """
+    header = read_header(filepath)
+    architecture = (header.input_size, header.hidden_size, header.output_size)
+    expected = (network.input_size, network.hidden_size, network.output_size)
+    if architecture != expected:
+        raise ModelFormatError(f"{filepath}: arquitetura {architecture}, esperada {expected}")
+
+    count = header.weight_count + header.history_size
+    with open(filepath, 'rb') as f:
+        f.seek(HEADER_SIZE)
+        data = np.fromfile(f, dtype=DTYPE, count=count)
+    if len(data) != count:
+        raise ModelFormatError(f"{filepath}: arquivo truncado")
+    if verify and zlib.crc32(data) != header.checksum:
+        raise ModelFormatError(f"{filepath}: CRC32 dos dados não confere")
+
+    input_size, hidden_size, output_size = architecture
+    offset = 0
+    arrays = []
+    for shape in ((input_size, hidden_size), (hidden_size,), (hidden_size, output_size),
+                  (output_size,)):
+        size = int(np.prod(shape))
+        arrays.append(data[offset:offset + size].reshape(shape))
+        offset += size
+
+    (network.weights_input_hidden, network.bias_hidden,
+     network.weights_hidden_output, network.bias_output) = arrays
+    network.performance_history = data[offset:].tolist()
+    network.generation = header.generation
+    return header
+
+
+def load_json_network(network, filepath):
+    """Carrega um modelo no formato JSON anterior"""
+    with open(filepath, 'r') as f:
+        model_data = json.load(f)
+
+    architecture = tuple(model_data.get(key, getattr(network, key))
+                         for key in ('input_size', 'hidden_size', 'output_size'))
+    expected = (network.input_size, network.hidden_size, network.output_size)
+    if architecture != expected:
+        raise ModelFormatError(f"{filepath}: arquitetura {architecture}, esperada {expected}")
+
+    network.weights_input_hidden = np.array(model_data['weights_input_hidden'])
+    network.weights_hidden_output = np.array(model_data['weights_hidden_output'])
+    network.bias_hidden = np.array(model_data['bias_hidden'])
+    network.bias_output = np.array(model_data['bias_output'])
+    network.performance_history = model_data.get('performance_history', [])
+
+
+def migrate_json(json_path, binary_path=None, network=None):
+    """Converte um modelo JSON para o formato binário (uma vez só)
+
+    Args:
+        json_path: Modelo JSON existente
+        binary_path: Destino (padrão: mesmo nome com extensão .bin)
+        network: SimpleNeuralNetwork usada na conversão (padrão: uma nova)
+
+    Returns:
+        Caminho do arquivo binário
+    """
+    if binary_path is None:
+        binary_path = os.path.splitext(json_path)[0] + '.bin'
+    if network is None:
+        from .neural_ai import SimpleNeuralNetwork
+        network = SimpleNeuralNetwork()
+    load_json_network(network, json_path)
+    save_network(network, binary_path)
+    return binary_path
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "ModelFormatError",
+    "ModelHeader",
+    "load_json_network",
+    "load_network",
+    "migrate_json",
+    "read_header",
+    "save_network",
+]
@@ -0,0 +1,187 @@
+"""
+Gravação adiada e agrupada do modelo neural
+
+Em vez de gravar o arquivo a cada retreino, a NeuralAI marca o modelo como
+alterado em ModelPersister.mark_dirty(). Uma thread grava a versão mais
+recente no máximo a cada `flush_interval` segundos; flush() e checkpoint()
+gravam na hora, e os modelos pendentes são gravados ao sair do programa.
+Vários retreinos entre duas gravações viram uma gravação só. Uma gravação
+que falha (pasta sem permissão, disco cheio) é avisada e o modelo continua
+pendente: o jogo segue e a próxima gravação tenta de novo.
+
+Várias janelas (cada uma com sua NeuralAI) podem usar o mesmo arquivo. A
+gravação é feita com um lock de arquivo e só acontece se a geração do
+modelo (número de treinamentos) for maior que a do arquivo em disco, então
+uma versão mais antiga nunca sobrescreve uma mais nova.
+"""
+
+import atexit
+import os
+import threading
+import weakref
+
+from .config import GAME_CONFIG
+from .model_format import ModelFormatError, read_header, save_network
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Lock exclusivo entre processos, em um arquivo auxiliar"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class ModelPersister:
+    """Grava o modelo em segundo plano, agrupando as alterações"""
+
+    def __init__(self, path, flush_interval=None):
+        """
+        Args:
+            path: Arquivo do modelo (formato binário)
+            flush_interval: Intervalo mínimo entre gravações, em segundos
+                (padrão: SAVE_INTERVAL de NEURAL_CONFIG)
+        """
+        if flush_interval is None:
+            flush_interval = GAME_CONFIG['NEURAL_CONFIG'].get('SAVE_INTERVAL', 30.0)
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._thread = None
+        self._stop = None
+
+        self.marks = 0  # Chamadas de mark_dirty()
+        self.saves = 0  # Gravações feitas
+        self.skipped = 0  # Gravações evitadas: o arquivo já tinha uma geração igual ou maior
+        self.errors = 0  # Gravações que falharam
+
+        _persisters.add(self)
+
+    @property
+    def dirty(self):
+        return self._pending is not None
+
+    def mark_dirty(self, network):
+        """Marca `network` como a versão a gravar; retorna imediatamente
+
+        Uma cópia é guardada, então a rede pode continuar sendo treinada.
+        """
+        snapshot = network.clone()
+        with self._lock:
+            self._pending = snapshot
+            self.marks += 1
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                                name="model-persister", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Grava agora a versão pendente, se houver
+
+        Returns:
+            True se o arquivo foi gravado (False também quando a gravação
+            falha; o erro é avisado e o modelo continua pendente)
+        """
+        with self._lock:
+            network, self._pending = self._pending, None
+        if network is None:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self._write_lock, FileLock(self.path + '.lock'):
+                if disk_generation(self.path) >= network.generation:
+                    self.skipped += 1
+                    return False
+                save_network(network, self.path)
+                self.saves += 1
+                return True
+        except OSError as e:
+            with self._lock:
+                if self._pending is None:  # Uma versão mais nova tem preferência
+                    self._pending = network
+            self.errors += 1
+            print(f"Erro ao salvar o modelo neural: {e}")
+            return False
+
+    def checkpoint(self, network=None):
+        """Grava imediatamente (`network`, se dado, ou a versão pendente)"""
+        if network is not None:
+            self.mark_dirty(network)
+        return self.flush()
+
+    def close(self):
+        """Grava a versão pendente e encerra a thread
+
+        Um mark_dirty() posterior inicia a thread de novo.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            stop = self._stop
+        if thread is not None:
+            stop.set()
+            thread.join()
+        self.flush()
+
+    def get_stats(self):
+        return {'marks': self.marks, 'saves': self.saves, 'skipped': self.skipped,
+                'errors': self.errors, 'dirty': self.dirty}
+
+    def _run(self, stop):
+        while not stop.wait(self.flush_interval):
+            self.flush()
+
+
+def disk_generation(path):
+    """Geração do modelo gravado em `path` (-1 se não houver modelo válido)"""
+    try:
+        return read_header(path).generation
+    except (OSError, ModelFormatError):
+        return -1
+
+
+# Persisters vivos, gravados ao sair do programa
+_persisters = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for persister in list(_persisters):
+        persister.flush()
+
+
+__all__ = [
+    "FileLock",
+    "ModelPersister",
+    "disk_generation",
+]
@@ -2,8 +2,45 @@ import numpy as np
 import random
 import json
 import os
+import threading
 from typing import List, Tuple
 from .config import GAME_CONFIG
+from .async_learner import AsyncLearner
+from .experience_buffer import ExperienceBuffer
+from .model_format import ModelFormatError, load_json_network, load_network, save_network
+from .model_persister import ModelPersister
+from .paths import PACKAGE_DATA_DIR, PROJECT_DIR, user_data_path
+from .policy_table import PolicyTable
+from .prioritized_replay import PrioritizedExperienceBuffer
+from .training import Trainer, create_optimizer
+
+# Ações na ordem das saídas da rede
+ACTIONS = ('attack', 'defend', 'heal')
+
+# Nenhum caminho depende do diretório atual (veja game/paths.py)
+DATA_DIR = PACKAGE_DATA_DIR
+# Modelo pré-treinado distribuído com o jogo (somente leitura)
+DEFAULT_MODEL_PATH = os.path.join(DATA_DIR, 'default_model.bin')
+# Modelo do jogador, atualizado pelo aprendizado, na pasta de dados do usuário
+USER_MODEL_NAME = 'neural_ai_model.bin'
+# Modelo JSON das versões antigas, gravado na raiz do projeto
+LEGACY_MODEL_PATH = os.path.join(PROJECT_DIR, 'neural_ai_model.json')
+
+
+def basic_strategy(player_hp, enemy_hp, max_hp=None):
+    """Estratégia básica usada no treino inicial e enquanto a rede não está pronta
+
+    Aceita escalares ou arrays; retorna o índice em ACTIONS de cada estado.
+    """
+    max_hp = GAME_CONFIG['MAX_HP'] if max_hp is None else max_hp
+    player_hp = np.asarray(player_hp)
+    enemy_hp = np.asarray(enemy_hp)
+    return np.select(
+        [player_hp < max_hp * 0.3,  # HP baixo
+         enemy_hp < max_hp * 0.3,  # Inimigo com HP baixo
+         enemy_hp > player_hp * 1.5],  # Inimigo muito mais forte
+        [ACTIONS.index('heal'), ACTIONS.index('attack'), ACTIONS.index('defend')],
+        default=ACTIONS.index('attack'))
 
 class SimpleNeuralNetwork:
     """Rede neural simples para IA do jogo"""
@@ -35,7 +72,30 @@ class SimpleNeuralNetwork:
         # Histórico de treinamento
         self.training_data = []
         self.performance_history = []
-        
+
+        # Número de treinamentos (vai no cabeçalho do arquivo binário)
+        self.generation = 0
+
+        # Relatório do último fit() (TrainingReport)
+        self.last_report = None
+        
+    def clone(self) -> 'SimpleNeuralNetwork':
+        """Cópia independente da rede (pesos e histórico)"""
+        network = SimpleNeuralNetwork.__new__(SimpleNeuralNetwork)
+        network.input_size = self.input_size
+        network.hidden_size = self.hidden_size
+        network.output_size = self.output_size
+        network.weights_input_hidden = np.array(self.weights_input_hidden)
+        network.weights_hidden_output = np.array(self.weights_hidden_output)
+        network.bias_hidden = np.array(self.bias_hidden)
+        network.bias_output = np.array(self.bias_output)
+        network.learning_rate = self.learning_rate
+        network.training_data = list(self.training_data)
+        network.performance_history = list(self.performance_history)
+        network.generation = self.generation
+        network.last_report = self.last_report
+        return network
+
     def sigmoid(self, x):
         """Função de ativação sigmoid"""
         return 1 / (1 + np.exp(-np.clip(x, -500, 500)))  # Clip para evitar overflow
@@ -73,42 +133,134 @@ class SimpleNeuralNetwork:
         self.weights_input_hidden += inputs.reshape(-1, 1).dot(hidden_delta.reshape(1, -1)) * self.learning_rate
         self.bias_hidden += hidden_delta * self.learning_rate
     
-    def train(self, training_data: List[Tuple[np.ndarray, np.ndarray]], epochs: int = 1000):
-        """Treina a rede neural"""
-        for epoch in range(epochs):
-            total_error = 0
-            for inputs, expected_output in training_data:
-                # Forward pass
-                predicted = self.forward(inputs)
-                
-                # Calcula erro
-                error = np.mean((expected_output - predicted) ** 2)
-                total_error += error
-                
-                # Backward pass
-                self.backward(inputs, expected_output)
-            
-            # Registra performance a cada 100 épocas
-            if epoch % 100 == 0:
-                avg_error = total_error / len(training_data)
-                self.performance_history.append(avg_error)
-                print(f"Época {epoch}: Erro médio = {avg_error:.4f}")
+    def train(self, training_data: List[Tuple[np.ndarray, np.ndarray]], epochs: int = 1000,
+              batch_size: int = None, shuffle: bool = True, **trainer_options):
+        """Treina a rede neural com uma lista de pares (entrada, saída esperada)"""
+        if not training_data:
+            return 0.0
+        inputs = np.array([sample[0] for sample in training_data], dtype=float)
+        expected = np.array([sample[1] for sample in training_data], dtype=float)
+        return self.fit(inputs, expected, epochs=epochs, batch_size=batch_size, shuffle=shuffle,
+                        **trainer_options)
+
+    def fit(self, inputs: np.ndarray, expected_outputs: np.ndarray, epochs: int = 1000,
+            batch_size: int = None, shuffle: bool = True, sample_weight: np.ndarray = None,
+            **trainer_options) -> float:
+        """Treina com mini-batches vetorizados
+
+        Cada lote passa pela rede como uma matriz e as direções de atualização
+        das amostras são somadas em um único passo. Não é o mesmo que chamar
+        backward() amostra por amostra: todas as amostras do lote são vistas
+        com os pesos do início do lote, então o mini-batch é só uma
+        aproximação dessa descida, com outra dinâmica (passos maiores e menos
+        frequentes), e pode pedir outra taxa de aprendizado ou número de
+        épocas. O relatório do treinamento (épocas, tempo, motivo da parada)
+        fica em last_report.
+
+        Args:
+            inputs: Matriz (n, input_size)
+            expected_outputs: Matriz (n, output_size)
+            epochs: Número máximo de épocas
+            batch_size: Amostras por lote (padrão: BATCH_SIZE de NEURAL_CONFIG;
+                0 usa todas as amostras em um único lote)
+            shuffle: Embaralha as amostras a cada época
+            sample_weight: Peso de cada amostra no gradiente (padrão: 1)
+            **trainer_options: Opções de Trainer (optimizer, validation_split,
+                patience, min_delta, time_budget...); sem elas, SGD com
+                learning_rate pelo número de épocas pedido
+
+        Returns:
+            Erro médio da última época
+        """
+        if batch_size is None:
+            batch_size = GAME_CONFIG['NEURAL_CONFIG'].get('BATCH_SIZE', 32)
+        trainer = Trainer(batch_size=batch_size, shuffle=shuffle, **trainer_options)
+        self.last_report = trainer.fit(self, inputs, expected_outputs, epochs=epochs,
+                                       sample_weight=sample_weight)
+        return self.last_report.train_loss
+
+    def gradients(self, inputs: np.ndarray, expected_outputs: np.ndarray,
+                  sample_weight: np.ndarray = None):
+        """Backpropagation de um lote, sem alterar a rede
+
+        Com `sample_weight`, a contribuição (e o erro) de cada amostra é
+        multiplicada pelo seu peso.
+
+        Returns:
+            (direções, erro): dict com a soma, nas amostras, da direção de
+            atualização de cada parâmetro (o passo de backward() sem a taxa de
+            aprendizado) e a soma dos erros quadráticos médios das amostras
+        """
+        hidden_output = self.sigmoid(inputs.dot(self.weights_input_hidden) + self.bias_hidden)
+        output = self.sigmoid(hidden_output.dot(self.weights_hidden_output) + self.bias_output)
+
+        output_error = expected_outputs - output
+        output_delta = output_error * self.sigmoid_derivative(output)
+        errors = np.mean(output_error ** 2, axis=1)
+        if sample_weight is not None:
+            output_delta *= sample_weight[:, None]
+            errors *= sample_weight
+        hidden_error = output_delta.dot(self.weights_hidden_output.T)
+        hidden_delta = hidden_error * self.sigmoid_derivative(hidden_output)
+
+        directions = {
+            'weights_input_hidden': inputs.T.dot(hidden_delta),
+            'bias_hidden': hidden_delta.sum(axis=0),
+            'weights_hidden_output': hidden_output.T.dot(output_delta),
+            'bias_output': output_delta.sum(axis=0),
+        }
+        return directions, float(errors.sum())
+
+    def loss(self, inputs: np.ndarray, expected_outputs: np.ndarray) -> float:
+        """Erro quadrático médio por amostra, sem treinar"""
+        return float(np.mean(self.sample_errors(inputs, expected_outputs)))
+
+    def sample_errors(self, inputs: np.ndarray, expected_outputs: np.ndarray) -> np.ndarray:
+        """Erro quadrático médio de cada amostra (uma linha de `inputs`)"""
+        output_error = expected_outputs - self.forward_batch(inputs)
+        return np.mean(output_error ** 2, axis=-1)
     
+    def forward_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Propagação para frente de uma matriz (n, input_size), sem guardar estado
+
+        Ao contrário de forward(), não altera atributos da rede: várias
+        threads podem usar o mesmo modelo ao mesmo tempo.
+        """
+        # Lê os pesos uma vez só, para usar sempre a mesma versão do modelo
+        weights_input_hidden, bias_hidden = self.weights_input_hidden, self.bias_hidden
+        weights_hidden_output, bias_output = self.weights_hidden_output, self.bias_output
+
+        hidden_output = self.sigmoid(np.dot(inputs, weights_input_hidden) + bias_hidden)
+        return self.sigmoid(np.dot(hidden_output, weights_hidden_output) + bias_output)
+
     def predict(self, inputs: np.ndarray) -> str:
         """Faz predição e retorna ação"""
-        output = self.forward(inputs)
+        output = self.forward_batch(inputs)
         action_index = np.argmax(output)
         
-        actions = ['attack', 'defend', 'heal']
-        return actions[action_index]
+        return ACTIONS[action_index]
+
+    def predict_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Índices em ACTIONS das ações previstas para cada linha de `inputs`"""
+        return np.argmax(self.forward_batch(inputs), axis=-1)
     
     def save_model(self, filepath: str):
-        """Salva o modelo treinado"""
+        """Salva o modelo treinado
+
+        Arquivos .json usam o formato antigo; os demais, o formato binário
+        de model_format (gravação atômica, com a geração no cabeçalho).
+        """
+        if filepath.endswith('.json'):
+            self._save_json(filepath)
+        else:
+            save_network(self, filepath)
+
+    def _save_json(self, filepath: str):
         model_data = {
-            'weights_input_hidden': self.weights_input_hidden.tolist(),
-            'weights_hidden_output': self.weights_hidden_output.tolist(),
-            'bias_hidden': self.bias_hidden.tolist(),
-            'bias_output': self.bias_output.tolist(),
+            'weights_input_hidden': np.asarray(self.weights_input_hidden).tolist(),
+            'weights_hidden_output': np.asarray(self.weights_hidden_output).tolist(),
+            'bias_hidden': np.asarray(self.bias_hidden).tolist(),
+            'bias_output': np.asarray(self.bias_output).tolist(),
             'performance_history': self.performance_history,
             'input_size': self.input_size,
             'hidden_size': self.hidden_size,
@@ -119,36 +271,127 @@ class SimpleNeuralNetwork:
             json.dump(model_data, f)
     
     def load_model(self, filepath: str):
-        """Carrega modelo salvo"""
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                model_data = json.load(f)
-            
-            self.weights_input_hidden = np.array(model_data['weights_input_hidden'])
-            self.weights_hidden_output = np.array(model_data['weights_hidden_output'])
-            self.bias_hidden = np.array(model_data['bias_hidden'])
-            self.bias_output = np.array(model_data['bias_output'])
-            self.performance_history = model_data.get('performance_history', [])
-            
-            return True
-        return False
+        """Carrega modelo salvo (binário ou .json)
+
+        Returns:
+            False se o arquivo não existe ou não é um modelo válido
+        """
+        if not os.path.exists(filepath):
+            return False
+        try:
+            if filepath.endswith('.json'):
+                load_json_network(self, filepath)
+            else:
+                load_network(self, filepath)
+        except (ModelFormatError, OSError, ValueError, KeyError) as e:
+            print(f"Modelo neural inválido ({e})")
+            return False
+        return True
 
 
 class NeuralAI:
     """IA baseada em rede neural para o jogo"""
+
+    # Chance de ação aleatória (exploração) em cada decisão
+    exploration_rate = 0.1
     
-    def __init__(self):
-        self.network = SimpleNeuralNetwork()
-        self.model_path = "neural_ai_model.json"
-        self.experience_buffer = []
+    def __init__(self, model_path: str = None,
+                 legacy_model_path: str = LEGACY_MODEL_PATH,
+                 default_model_path: str = DEFAULT_MODEL_PATH,
+                 lazy: bool = None):
+        """
+        Args:
+            model_path: Modelo do jogador no formato binário (padrão: MODEL_PATH
+                de NEURAL_CONFIG, ou neural_ai_model.bin na pasta de dados do usuário)
+            legacy_model_path: Modelo no formato JSON anterior, convertido uma vez
+                quando `model_path` ainda não existe (padrão: neural_ai_model.json
+                na raiz do projeto)
+            default_model_path: Modelo pré-treinado usado quando não há modelo
+                do jogador
+            lazy: Carrega o modelo só na primeira decisão (padrão: LAZY_START
+                de NEURAL_CONFIG)
+        """
+        config = GAME_CONFIG['NEURAL_CONFIG']
+        if model_path is None:
+            model_path = config.get('MODEL_PATH') or user_data_path(USER_MODEL_NAME)
+        self.model_path = model_path
+        self.legacy_model_path = legacy_model_path
+        self.default_model_path = default_model_path
         self.max_buffer_size = 1000
-        
-        # Tenta carregar modelo existente
-        if self.network.load_model(self.model_path):
-            print("Modelo neural carregado com sucesso!")
+        if config.get('PRIORITIZED_REPLAY', False):
+            self.experience_buffer = PrioritizedExperienceBuffer(
+                self.max_buffer_size, alpha=config.get('PRIORITY_ALPHA', 0.6),
+                beta=config.get('PRIORITY_BETA', 0.4))
         else:
-            print("Novo modelo neural criado.")
-            self.train_initial_model()
+            self.experience_buffer = ExperienceBuffer(self.max_buffer_size)
+        self.learner = None  # AsyncLearner, criado no primeiro aprendizado
+        self.persister = ModelPersister(model_path)  # Gravação adiada do modelo
+        self.policy_table = None  # PolicyTable, criada na primeira decisão
+
+        # A rede é carregada (ou treinada em segundo plano) só quando é usada
+        self._network = None
+        self._load_lock = threading.Lock()
+        self._bootstrap = None  # Thread do treino inicial
+        self.model_source = None  # De onde veio a rede: 'user', 'legacy', 'default' ou 'bootstrap'
+        self.last_training_report = None  # TrainingReport do último treinamento
+
+        if not (config.get('LAZY_START', True) if lazy is None else lazy):
+            self.network
+
+    @property
+    def network(self) -> SimpleNeuralNetwork:
+        """Rede em uso; carrega o modelo (ou espera o treino inicial) se preciso"""
+        network = getattr(self, '_network', None)
+        if network is None:
+            network = self._load_network(wait=True)
+        return network
+
+    @network.setter
+    def network(self, network: SimpleNeuralNetwork):
+        self._network = network
+
+    def is_ready(self) -> bool:
+        """Indica se a rede está pronta; inicia o carregamento na primeira chamada"""
+        if getattr(self, '_network', None) is not None:
+            return True
+        return self._load_network(wait=False) is not None
+
+    def _load_network(self, wait: bool):
+        with self._load_lock:
+            if self._network is None and self._bootstrap is None:
+                network = SimpleNeuralNetwork()
+                # Tenta carregar modelo existente
+                if network.load_model(self.model_path):
+                    self.model_source = 'user'
+                    print("Modelo neural carregado com sucesso!")
+                elif self.legacy_model_path and network.load_model(self.legacy_model_path):
+                    self.model_source = 'legacy'
+                    self.persister.checkpoint(network)
+                    print(f"Modelo neural convertido de {self.legacy_model_path} "
+                          f"para {self.model_path}!")
+                elif self.default_model_path and network.load_model(self.default_model_path):
+                    self.model_source = 'default'
+                    print("Modelo neural pré-treinado carregado!")
+                else:
+                    print("Novo modelo neural criado; usando a estratégia básica até o "
+                          "treino inicial terminar.")
+                    self._bootstrap = threading.Thread(target=self.train_initial_model,
+                                                       name="neural-bootstrap", daemon=True)
+                    self._bootstrap.start()
+                    network = None
+                self._network = network
+            bootstrap = self._bootstrap
+
+        if self._network is None and wait and bootstrap is not None:
+            bootstrap.join()
+        return self._network
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Espera a rede ficar pronta (inclusive o treino inicial)"""
+        if self.is_ready():
+            return True
+        self._bootstrap.join(timeout)
+        return self._network is not None
     
     def game_state_to_input(self, player_hp: int, enemy_hp: int, 
                            player_defending: bool = False, 
@@ -171,26 +414,109 @@ class NeuralAI:
     
     def action_to_output(self, action: str) -> np.ndarray:
         """Converte ação para saída esperada da rede"""
-        action_map = {'attack': 0, 'defend': 1, 'heal': 2}
         output = np.zeros(3)
-        if action in action_map:
-            output[action_map[action]] = 1.0
+        if action in ACTIONS:
+            output[ACTIONS.index(action)] = 1.0
         return output
     
+    def states_to_inputs(self, player_hp, enemy_hp, player_defending=False,
+                         enemy_defending=False, turn_count=1) -> np.ndarray:
+        """game_state_to_input() vetorizado
+
+        Os argumentos são arrays (ou escalares, por broadcast); retorna uma
+        matriz (n, 6) com uma linha por estado.
+        """
+        max_hp = GAME_CONFIG['MAX_HP']
+        player_hp, enemy_hp, player_defending, enemy_defending, turn_count = np.broadcast_arrays(
+            np.asarray(player_hp, dtype=float), np.asarray(enemy_hp, dtype=float),
+            np.asarray(player_defending, dtype=float), np.asarray(enemy_defending, dtype=float),
+            np.asarray(turn_count, dtype=float))
+
+        return np.stack([
+            player_hp / max_hp,
+            enemy_hp / max_hp,
+            player_defending,
+            enemy_defending,
+            np.minimum(turn_count / 20.0, 1.0),
+            (enemy_hp - player_hp) / max_hp
+        ], axis=-1).reshape(-1, 6)
+
+    def get_policy_table(self):
+        """PolicyTable da rede atual, se POLICY_TABLE estiver ativo (senão None)"""
+        if self.policy_table is None and GAME_CONFIG['NEURAL_CONFIG'].get('POLICY_TABLE', False):
+            self.policy_table = PolicyTable(self)
+        return self.policy_table
+
     def decide_action(self, player_hp: int, enemy_hp: int, 
                      player_defending: bool = False, 
                      enemy_defending: bool = False,
                      turn_count: int = 1) -> str:
         """Decide ação baseada no estado atual"""
+        # Adiciona um pouco de aleatoriedade para exploração
+        if random.random() < self.exploration_rate:
+            return random.choice(ACTIONS)
+
+        if not self.is_ready():
+            return ACTIONS[int(basic_strategy(player_hp, enemy_hp))]
+
+        policy_table = self.get_policy_table()
+        if policy_table is not None:
+            return ACTIONS[policy_table.action_index(player_hp, enemy_hp, player_defending,
+                                                     enemy_defending, turn_count)]
+
         inputs = self.game_state_to_input(player_hp, enemy_hp, 
                                         player_defending, enemy_defending, 
                                         turn_count)
-        
-        # Adiciona um pouco de aleatoriedade para exploração
-        if random.random() < 0.1:  # 10% de chance de ação aleatória
-            return random.choice(['attack', 'defend', 'heal'])
-        
         return self.network.predict(inputs)
+
+    def decide_action_indices(self, player_hp, enemy_hp, player_defending=False,
+                              enemy_defending=False, turn_count=1,
+                              exploration_rate=None, rng=None) -> np.ndarray:
+        """Decide as ações de vários estados em uma única passagem pela rede
+
+        Cada estado tem, de forma independente, a mesma chance de ação
+        aleatória de decide_action(). Com a PolicyTable ativa, as ações da
+        rede vêm da tabela; antes de a rede ficar pronta, da estratégia básica.
+
+        Args:
+            player_hp, enemy_hp, player_defending, enemy_defending, turn_count:
+                Arrays (ou escalares) com os campos de cada estado
+            exploration_rate: Chance de ação aleatória (padrão: exploration_rate)
+            rng: np.random.Generator usado na exploração (padrão: np.random)
+
+        Returns:
+            Array int com o índice em ACTIONS da ação de cada estado
+        """
+        policy_table = self.get_policy_table()
+        if not self.is_ready():
+            player_hp, enemy_hp = np.broadcast_arrays(player_hp, enemy_hp, player_defending,
+                                                      enemy_defending, turn_count)[:2]
+            actions = basic_strategy(player_hp, enemy_hp).ravel().astype(np.intp)
+        elif policy_table is not None:
+            actions = policy_table.lookup(player_hp, enemy_hp, player_defending,
+                                          enemy_defending, turn_count)
+        else:
+            inputs = self.states_to_inputs(player_hp, enemy_hp, player_defending,
+                                           enemy_defending, turn_count)
+            actions = self.network.predict_batch(inputs)
+
+        rate = self.exploration_rate if exploration_rate is None else exploration_rate
+        if rate > 0:
+            rng = np.random if rng is None else rng
+            explore = rng.random(len(actions)) < rate
+            random_actions = np.floor(rng.random(len(actions)) * len(ACTIONS)).astype(actions.dtype)
+            actions = np.where(explore, random_actions, actions)
+
+        return actions
+
+    def decide_actions(self, player_hp, enemy_hp, player_defending=False,
+                       enemy_defending=False, turn_count=1,
+                       exploration_rate=None, rng=None) -> List[str]:
+        """decide_action() para vários estados; retorna a lista de ações"""
+        indices = self.decide_action_indices(player_hp, enemy_hp, player_defending,
+                                             enemy_defending, turn_count,
+                                             exploration_rate=exploration_rate, rng=rng)
+        return [ACTIONS[index] for index in indices.tolist()]
     
     def learn_from_experience(self, player_hp: int, enemy_hp: int,
                             action_taken: str, result_score: float,
@@ -214,76 +540,169 @@ class NeuralAI:
         # Normaliza para manter entre 0 e 1
         expected_output = np.clip(expected_output, 0, 1)
         
-        # Adiciona ao buffer de experiência
-        self.experience_buffer.append((inputs, expected_output))
-        
-        # Mantém buffer limitado
-        if len(self.experience_buffer) > self.max_buffer_size:
-            self.experience_buffer.pop(0)
+        action_index = ACTIONS.index(action_taken) if action_taken in ACTIONS else -1
+        experience = (inputs, expected_output, action_index, result_score, turn_count)
+
+        learner = self.get_learner()
+        if learner is not None:
+            # O buffer e o retreino ficam com a thread de aprendizado
+            learner.submit(*experience)
+            return
+
+        # Adiciona ao buffer de experiência (a mais antiga sai quando ele está cheio)
+        self.experience_buffer.append(*experience)
         
-        # Treina periodicamente
-        if len(self.experience_buffer) % 50 == 0:
+        # Treina periodicamente (a cada 50 experiências novas, mesmo com o buffer cheio)
+        if self.experience_buffer.total % 50 == 0:
             self.retrain_network()
+
+    def get_learner(self):
+        """AsyncLearner em uso, criado se ASYNC_LEARNING estiver ativo (senão None)"""
+        if self.learner is None and GAME_CONFIG['NEURAL_CONFIG'].get('ASYNC_LEARNING', False):
+            self.learner = AsyncLearner(self)
+        return self.learner
     
     def retrain_network(self):
-        """Retreina a rede com experiências recentes"""
+        """Retreina a rede com experiências recentes
+
+        Com aprendizado assíncrono o retreino é só pedido à thread de
+        aprendizado, e a rede nova entra em uso quando ficar pronta.
+        """
+        if self.learner is not None:
+            self.learner.request_retrain()
+            return
+
         if len(self.experience_buffer) < 10:
             return
         
-        # Usa as últimas experiências para treinar
-        recent_experiences = self.experience_buffer[-50:]
-        self.network.train(recent_experiences, epochs=100)
-        
-        # Salva modelo atualizado
-        self.network.save_model(self.model_path)
+        self.train_network(self.network)
+
+    def training_options(self) -> dict:
+        """Opções de treinamento de NEURAL_CONFIG para SimpleNeuralNetwork.fit()
+
+        Cada chamada cria um otimizador novo: treinos em threads diferentes
+        não compartilham estado.
+        """
+        config = GAME_CONFIG['NEURAL_CONFIG']
+        return {
+            'optimizer': create_optimizer(config.get('OPTIMIZER', 'sgd'),
+                                          config.get('LEARNING_RATE')),
+            'validation_split': config.get('VALIDATION_SPLIT', 0.0),
+            'patience': config.get('PATIENCE'),
+            'min_delta': config.get('MIN_DELTA', 0.0),
+            'time_budget': config.get('TRAIN_TIME_BUDGET'),
+        }
+
+    def train_network(self, network: SimpleNeuralNetwork):
+        """Treina `network` com as experiências do buffer e marca o modelo para gravação
+
+        Com replay priorizado, treina em um lote sorteado de todo o buffer
+        (as experiências com mais erro saem mais vezes) e atualiza as
+        prioridades do lote com o erro da rede treinada; senão, treina nas
+        50 experiências mais recentes.
+        """
+        buffer = self.experience_buffer
+        config = GAME_CONFIG['NEURAL_CONFIG']
+        if isinstance(buffer, PrioritizedExperienceBuffer):
+            sample = buffer.sample_prioritized(config.get('REPLAY_SAMPLES', 64))
+            experiences = sample.batch
+            network.fit(experiences.inputs, experiences.targets,
+                        epochs=config.get('REPLAY_EPOCHS', 20), sample_weight=sample.weights,
+                        **self.training_options())
+            buffer.update_priorities(sample.indices,
+                                     network.sample_errors(experiences.inputs, experiences.targets))
+        else:
+            # Usa as últimas experiências para treinar
+            recent_experiences = buffer.recent(50)
+            network.fit(recent_experiences.inputs, recent_experiences.targets, epochs=100,
+                        **self.training_options())
+        self.last_training_report = network.last_report
+        print(f"Retreino da IA neural: {network.last_report.format()}")
+        
+        # O modelo atualizado é gravado depois, junto com os próximos retreinos
+        self.persister.mark_dirty(network)
+
+    def save(self):
+        """Grava o modelo em uso agora (checkpoint explícito)"""
+        return self.persister.checkpoint(self.network)
+
+    def close(self):
+        """Termina o aprendizado pendente, encerra a thread e grava o modelo"""
+        if self.learner is not None:
+            self.learner.close()
+            self.learner = None
+        self.persister.close()
     
-    def train_initial_model(self):
-        """Treina modelo inicial com estratégias básicas"""
-        print("Treinando modelo inicial...")
-        
-        training_data = []
+    def initial_training_data(self, samples: int = 500) -> Tuple[np.ndarray, np.ndarray]:
+        """Gera dados de treinamento baseados em estratégias básicas
+
+        Returns:
+            (entradas, saídas esperadas) como matrizes
+        """
         max_hp = GAME_CONFIG['MAX_HP']
-        
-        # Gera dados de treinamento baseados em estratégias básicas
-        for _ in range(500):
+        inputs = []
+        expected_outputs = []
+
+        for _ in range(samples):
             player_hp = random.randint(50, max_hp)
             enemy_hp = random.randint(50, max_hp)
             player_defending = random.choice([True, False])
             enemy_defending = random.choice([True, False])
             turn_count = random.randint(1, 15)
-            
-            inputs = self.game_state_to_input(player_hp, enemy_hp, 
-                                            player_defending, enemy_defending, 
-                                            turn_count)
-            
+
+            inputs.append(self.game_state_to_input(player_hp, enemy_hp,
+                                                   player_defending, enemy_defending,
+                                                   turn_count))
+
             # Estratégia básica para gerar dados de treinamento
-            if player_hp < max_hp * 0.3:  # HP baixo
-                action = 'heal'
-            elif enemy_hp < max_hp * 0.3:  # Inimigo com HP baixo
-                action = 'attack'
-            elif enemy_hp > player_hp * 1.5:  # Inimigo muito mais forte
-                action = 'defend'
-            else:
-                action = 'attack'
-            
-            expected_output = self.action_to_output(action)
-            training_data.append((inputs, expected_output))
-        
-        # Treina a rede
-        self.network.train(training_data, epochs=1000)
-        
-        # Salva modelo inicial
-        self.network.save_model(self.model_path)
-        print("Modelo inicial treinado e salvo!")
+            action = ACTIONS[int(basic_strategy(player_hp, enemy_hp, max_hp))]
+            expected_outputs.append(self.action_to_output(action))
+
+        return np.array(inputs), np.array(expected_outputs)
+
+    def train_initial_model(self):
+        """Treina modelo inicial com estratégias básicas
+
+        Normalmente roda na thread de treino inicial; a rede só passa a ser
+        usada quando o treino termina.
+        """
+        print("Treinando modelo inicial...")
+
+        inputs, expected_outputs = self.initial_training_data()
+
+        # Treina a rede em mini-batches
+        network = SimpleNeuralNetwork()
+        network.fit(inputs, expected_outputs, epochs=1000, **self.training_options())
+        self.last_training_report = network.last_report
+        print(f"Treino inicial: {network.last_report.format()}")
+        
+        self.model_source = 'bootstrap'
+        self._network = network
+
+        # Salva modelo inicial (uma falha é avisada pelo persister e tentada de novo depois)
+        self.persister.checkpoint(network)
+        if not self.persister.dirty:
+            print("Modelo inicial treinado e salvo!")
     
     def get_performance_stats(self) -> dict:
-        """Retorna estatísticas de performance da IA"""
-        return {
-            'training_epochs': len(self.network.performance_history),
+        """Retorna estatísticas de performance da IA (sem esperar o treino inicial)"""
+        network = self._network
+        history = network.performance_history if network is not None else []
+        stats = {
+            'training_epochs': len(history),
             'experience_count': len(self.experience_buffer),
-            'last_error': self.network.performance_history[-1] if self.network.performance_history else 0,
-            'model_exists': os.path.exists(self.model_path)
+            'last_error': history[-1] if history else 0,
+            'model_exists': os.path.exists(self.model_path),
+            'model_ready': network is not None,
+            'model_source': self.model_source,
+            'last_training': (self.last_training_report.to_dict()
+                              if self.last_training_report is not None else None)
         }
+        if self.learner is not None:
+            metrics = self.learner.get_metrics()
+            stats['queue_depth'] = metrics['queue_depth']
+            stats['version_lag'] = metrics['version_lag']
+        return stats
 
 
 # Função de conveniência para usar a IA neural
@@ -313,4 +732,5 @@ if __name__ == "__main__":
         print(f"Resultado: {result_score:.2f}")
         print("-" * 30)
     
+    ai.close()
     print("Estatísticas da IA:", ai.get_performance_stats())
\ No newline at end of file
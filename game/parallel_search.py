@@ -0,0 +1,250 @@
+"""
+Busca Minimax paralela em um pool de processos
+
+As jogadas da raiz (e, com mais de 3 workers, as respostas do oponente no
+segundo nível) são distribuídas entre processos de um ProcessPoolExecutor
+persistente. A primeira jogada da raiz é buscada antes das outras, e o
+valor dela limita a janela alpha-beta das subárvores seguintes, que só
+precisam mostrar que não a superam. Os valores são combinados na ordem
+canônica de ACTIONS, então o resultado é o mesmo de minimax().
+
+iterative_deepening(parallel=...) usa a busca paralela nas iterações a
+partir de PARALLEL_MIN_DEPTH.
+
+Em profundidades rasas o custo de comunicação domina e a busca é feita no
+próprio processo.
+"""
+
+import atexit
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .config import GAME_CONFIG
+from .minimax import ACTIONS, AlphaBetaSearch, BattleState, SearchTimeout
+from .transposition import create_transposition_table
+
+# Estado de cada processo worker
+_worker_rules = None
+_worker_tt = None
+
+
+def _warm_up(_):
+    """Tarefa vazia que força a criação do processo e os imports"""
+    return os.getpid()
+
+
+def _search_subtree(task):
+    """Executado no worker: (valor, nós) de um estado a `depth` jogadas na janela (alpha, beta)"""
+    global _worker_rules, _worker_tt
+    rules, state_fields, depth, maximizing_player, alpha, beta, deadline = task
+    if _worker_tt is None or rules != _worker_rules:
+        # A tabela é mantida entre tarefas e turnos enquanto as regras não mudam
+        _worker_rules = rules
+        _worker_tt = create_transposition_table()
+    if deadline is not None:
+        # O prazo chega no relógio de parede, comum a todos os processos
+        deadline = time.perf_counter() + (deadline - time.time())
+    search = AlphaBetaSearch(tt=_worker_tt, deadline=deadline)
+    score = search.value(BattleState(*state_fields, rules=rules), depth, maximizing_player,
+                         alpha, beta)
+    return score, search.nodes
+
+
+def _state_fields(state):
+    return (state.player_hp, state.enemy_hp, state.player_turn,
+            state.player_defending, state.enemy_defending)
+
+
+def _best(scores, maximizing_player):
+    """Índice do melhor score, ficando com o primeiro em empates"""
+    best_index = 0
+    for index, score in enumerate(scores):
+        if (score > scores[best_index]) if maximizing_player else (score < scores[best_index]):
+            best_index = index
+    return best_index
+
+
+class ParallelSearcher:
+    """Minimax paralelo com um pool de processos mantido entre as buscas
+
+    O pool é criado na primeira busca paralela (ou em warm_up()) e fica
+    ativo até close(). Se não for possível usá-lo, a busca volta a ser
+    serial.
+    """
+
+    def __init__(self, workers=None, min_depth=None):
+        """
+        Args:
+            workers: Número de processos (padrão: PARALLEL_WORKERS, ou o número
+                de CPUs quando este é 0)
+            min_depth: Profundidade a partir da qual a busca é paralela
+                (padrão: PARALLEL_MIN_DEPTH)
+        """
+        config = GAME_CONFIG['MINIMAX_CONFIG']
+        if workers is None:
+            workers = config.get('PARALLEL_WORKERS', 0)
+        if not workers:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.min_depth = min_depth if min_depth is not None else config.get('PARALLEL_MIN_DEPTH', 16)
+        # Usada pela busca serial, como a de cada worker
+        self.tt = create_transposition_table()
+        self.nodes = 0  # Nós visitados pelos workers, somados entre as buscas
+        self._pool = None
+        self._disabled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_pool(self):
+        if self._pool is None and not self._disabled:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError, ValueError) as e:
+                print(f"Busca paralela indisponível, usando busca serial: {e}")
+                self._disabled = True
+        return self._pool
+
+    def warm_up(self):
+        """Inicia todos os processos do pool antes da primeira busca"""
+        pool = self._get_pool()
+        if pool is not None:
+            list(pool.map(_warm_up, range(self.workers)))
+
+    def close(self):
+        """Encerra os processos do pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def is_parallel(self, state, depth):
+        """Indica se a busca de `state` a `depth` jogadas será paralela"""
+        return (self.workers > 1 and depth >= self.min_depth and not state.is_terminal()
+                and not self._disabled)
+
+    def search(self, state, depth, maximizing_player, first_move=None, deadline=None):
+        """Retorna (score, melhor_ação), o mesmo resultado de minimax()
+
+        `first_move`, se informado, é a primeira jogada buscada na raiz. Com um
+        `deadline` (instante de time.perf_counter()), a busca levanta
+        SearchTimeout ao ultrapassá-lo, como AlphaBetaSearch.
+        """
+        if not self.is_parallel(state, depth):
+            return self._serial_search(state, depth, maximizing_player, first_move, deadline)
+        pool = self._get_pool()
+        if pool is None:
+            return self._serial_search(state, depth, maximizing_player, first_move, deadline)
+
+        try:
+            return self._split_search(pool, state, depth, maximizing_player, first_move, deadline)
+        except BrokenProcessPool as e:
+            print(f"Pool de busca interrompido, usando busca serial: {e}")
+            self._pool = None
+            return self._serial_search(state, depth, maximizing_player, first_move, deadline)
+
+    def _serial_search(self, state, depth, maximizing_player, first_move, deadline):
+        search = AlphaBetaSearch(tt=self.tt, deadline=deadline)
+        return search.search(state, depth, maximizing_player, first_move)
+
+    def _split_search(self, pool, state, depth, maximizing_player, first_move, deadline):
+        # As regras vão em cada tarefa: os workers podem ter sido criados antes
+        # de uma mudança de dificuldade
+        rules = state.rules
+        # Com até 3 workers as 3 jogadas da raiz bastam; com mais, o segundo
+        # nível é dividido também (até 9 tarefas)
+        split_second_ply = self.workers > len(ACTIONS) and depth >= 2
+        if deadline is not None:
+            deadline = time.time() + (deadline - time.perf_counter())
+        submitted = []
+
+        def submit(action, alpha, beta):
+            child = state.apply_action(action)
+            if split_second_ply and not child.is_terminal():
+                tasks = [(rules, _state_fields(grandchild), depth - 2, maximizing_player,
+                          alpha, beta, deadline)
+                         for grandchild in map(child.apply_action, child.get_actions())]
+            else:
+                tasks = [(rules, _state_fields(child), depth - 1, not maximizing_player,
+                          alpha, beta, deadline)]
+            futures = [pool.submit(_search_subtree, task) for task in tasks]
+            submitted.extend(futures)
+            return futures
+
+        def child_score(futures):
+            # Valor da jogada da raiz: a melhor resposta do oponente entre as subárvores
+            replies = []
+            for future in futures:
+                score, nodes = future.result()
+                self.nodes += nodes
+                replies.append(score)
+            return replies[_best(replies, not maximizing_player)]
+
+        canonical = state.get_actions()
+        actions = list(canonical)
+        if first_move in actions:
+            actions.remove(first_move)
+            actions.insert(0, first_move)
+
+        try:
+            best_action = actions[0]
+            best_index = canonical.index(best_action)
+            best_score = child_score(submit(best_action, float('-inf'), float('inf')))
+
+            # As demais jogadas só mudam a resposta se superarem a primeira; uma
+            # jogada que vem antes na ordem canônica ganha 1 ponto de folga, para
+            # vencer o empate (as avaliações são inteiras)
+            later = []
+            for action in actions[1:]:
+                index = canonical.index(action)
+                if maximizing_player:
+                    alpha = best_score - 1 if index < best_index else best_score
+                    later.append((action, index, submit(action, alpha, float('inf'))))
+                else:
+                    beta = best_score + 1 if index < best_index else best_score
+                    later.append((action, index, submit(action, float('-inf'), beta)))
+
+            for action, index, futures in later:
+                score = child_score(futures)
+                if maximizing_player:
+                    improves = score > best_score or (score == best_score and index < best_index)
+                else:
+                    improves = score < best_score or (score == best_score and index < best_index)
+                if improves:
+                    best_score, best_action, best_index = score, action, index
+        except SearchTimeout:
+            # As tarefas que ainda não começaram são descartadas; as que estão
+            # rodando param sozinhas no mesmo prazo
+            for future in submitted:
+                future.cancel()
+            raise
+
+        return best_score, best_action
+
+
+_default_searcher = None
+
+
+def get_parallel_searcher():
+    """Retorna o ParallelSearcher compartilhado, criado com GAME_CONFIG"""
+    global _default_searcher
+    if _default_searcher is None:
+        _default_searcher = ParallelSearcher()
+        atexit.register(_default_searcher.close)
+    return _default_searcher
+
+
+def parallel_minimax(state, depth, maximizing_player):
+    """minimax() usando o pool de processos compartilhado quando compensa"""
+    return get_parallel_searcher().search(state, depth, maximizing_player)
+
+
+__all__ = [
+    "ParallelSearcher",
+    "get_parallel_searcher",
+    "parallel_minimax",
+]
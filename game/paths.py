@@ -0,0 +1,53 @@
+"""
+Pastas de dados do jogo
+
+Arquivos distribuídos com o jogo (modelo pré-treinado, tablebases) ficam em
+game/data, junto do pacote, e são só lidos. O que o jogo grava (modelo do
+jogador, replays) vai para uma pasta do usuário, porque a pasta do pacote
+costuma ser somente leitura depois de um `pip install`:
+
+    Linux:   $XDG_DATA_HOME/turnbased-ai (padrão: ~/.local/share/turnbased-ai)
+    macOS:   ~/Library/Application Support/turnbased-ai
+    Windows: %APPDATA%\\turnbased-ai
+
+A variável de ambiente TURNBASED_AI_DATA troca essa pasta.
+"""
+
+import os
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Dados distribuídos com o pacote (somente leitura)
+PACKAGE_DATA_DIR = os.path.join(PACKAGE_DIR, 'data')
+# Raiz do projeto, onde as versões antigas gravavam o modelo ao rodar do checkout
+PROJECT_DIR = os.path.dirname(PACKAGE_DIR)
+
+APP_NAME = 'turnbased-ai'
+
+
+def user_data_dir():
+    """Pasta gravável dos dados do jogador (não é criada aqui)"""
+    override = os.environ.get('TURNBASED_AI_DATA')
+    if override:
+        return override
+    home = os.path.expanduser('~')
+    if os.name == 'nt':
+        base = os.environ.get('APPDATA') or os.path.join(home, 'AppData', 'Roaming')
+    elif sys.platform == 'darwin':
+        base = os.path.join(home, 'Library', 'Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(home, '.local', 'share')
+    return os.path.join(base, APP_NAME)
+
+
+def user_data_path(filename):
+    """Caminho de `filename` na pasta de dados do jogador"""
+    return os.path.join(user_data_dir(), filename)
+
+
+__all__ = [
+    "PACKAGE_DATA_DIR",
+    "PROJECT_DIR",
+    "user_data_dir",
+    "user_data_path",
+]
@@ -0,0 +1,156 @@
+"""
+Tabela de política da IA neural
+
+As entradas da rede vêm de HPs inteiros, duas flags de defesa e o turno
+limitado a 20, então o conjunto de estados é pequeno:
+(MAX_HP + 1)² x 2 x 2 x 21. PolicyTable guarda a ação escolhida pela rede
+para cada um deles em um array uint8; decidir vira uma indexação.
+
+A tabela é calculada por linhas (turno, defesas e HP do jogador, com
+todos os HPs do inimigo): cada linha é calculada na primeira consulta, e as
+linhas que faltam em uma consulta em lote passam juntas pela rede. Quando a
+rede muda (outro objeto após o aprendizado assíncrono, ou outra geração
+após um treinamento), todas as linhas são invalidadas e recalculadas
+conforme forem consultadas de novo; uma partida só usa uma pequena parte
+da tabela.
+"""
+
+import threading
+
+import numpy as np
+
+from .config import GAME_CONFIG
+
+# Turno a partir do qual a entrada da rede não muda mais (min(turno / 20, 1))
+MAX_TURN = 20
+
+# Linhas calculadas por passagem pela rede em build()
+BUILD_CHUNK = 256
+
+
+class PolicyTable:
+    """Ação da rede para cada estado discreto, calculada sob demanda"""
+
+    def __init__(self, neural_ai):
+        """
+        Args:
+            neural_ai: NeuralAI cuja rede (neural_ai.network) é compilada
+        """
+        self.neural_ai = neural_ai
+        self.max_hp = None
+        self.table = None
+        self._built = None  # Linhas (turno, defesas, HP do jogador) já calculadas
+        self._network = None
+        self._generation = None
+        self._lock = threading.Lock()
+
+        self.builds = 0  # Linhas calculadas
+        self.invalidations = 0
+
+    def _sync(self):
+        """Invalida a tabela se a rede ou MAX_HP mudaram; retorna a rede atual"""
+        network = self.neural_ai.network
+        max_hp = GAME_CONFIG['MAX_HP']
+        if max_hp != self.max_hp:
+            self.max_hp = max_hp
+            self.table = np.zeros((MAX_TURN + 1, 2, 2, max_hp + 1, max_hp + 1), dtype=np.uint8)
+            self._built = np.zeros(self.table.shape[:-1], dtype=bool)
+        if network is not self._network or network.generation != self._generation:
+            if self._built.any():
+                self.invalidations += 1
+            self._network = network
+            self._generation = network.generation
+            self._built[:] = False
+        return network
+
+    def _build_rows(self, network, turn, player_defending, enemy_defending, player_hp):
+        """Calcula as linhas dadas (arrays de índices) em uma passagem pela rede"""
+        enemy_hp = np.arange(self.max_hp + 1)
+        inputs = self.neural_ai.states_to_inputs(player_hp[:, None], enemy_hp,
+                                                 player_defending[:, None],
+                                                 enemy_defending[:, None], turn[:, None])
+        rows = (turn, player_defending, enemy_defending, player_hp)
+        self.table[rows] = network.predict_batch(inputs).reshape(len(turn), -1)
+        self._built[rows] = True
+        self.builds += len(turn)
+
+    def build(self):
+        """Calcula a tabela inteira"""
+        with self._lock:
+            network = self._sync()
+            missing = np.nonzero(~self._built)
+            for start in range(0, len(missing[0]), BUILD_CHUNK):
+                self._build_rows(network, *(index[start:start + BUILD_CHUNK] for index in missing))
+
+    def lookup(self, player_hp, enemy_hp, player_defending=False, enemy_defending=False,
+               turn_count=1):
+        """Índices em ACTIONS das ações da rede para arrays (ou escalares) de estados
+
+        Estados fora da tabela (HP fora de [0, MAX_HP] ou turno negativo) são
+        decididos pela rede diretamente.
+        """
+        player_hp, enemy_hp, player_defending, enemy_defending, turn_count = (
+            np.ravel(array) for array in np.broadcast_arrays(
+                np.asarray(player_hp), np.asarray(enemy_hp),
+                np.asarray(player_defending, dtype=bool), np.asarray(enemy_defending, dtype=bool),
+                np.asarray(turn_count)))
+
+        with self._lock:
+            network = self._sync()
+            max_hp = self.max_hp
+            inside = ((player_hp >= 0) & (player_hp <= max_hp) & (enemy_hp >= 0)
+                      & (enemy_hp <= max_hp) & (turn_count >= 0)
+                      & (player_hp == np.floor(player_hp)) & (enemy_hp == np.floor(enemy_hp))
+                      & (turn_count == np.floor(turn_count)))
+            turn = np.minimum(np.where(inside, turn_count, 0), MAX_TURN).astype(np.intp)
+            rows = (turn, player_defending.astype(np.intp), enemy_defending.astype(np.intp),
+                    np.where(inside, player_hp, 0).astype(np.intp))
+            missing = inside & ~self._built[rows]
+            if missing.any():
+                # Cada linha que falta é calculada uma vez, mesmo se repetida na consulta
+                keys = np.unique(np.ravel_multi_index(tuple(index[missing] for index in rows),
+                                                      self._built.shape))
+                self._build_rows(network, *np.unravel_index(keys, self._built.shape))
+
+            actions = self.table[rows + (np.where(inside, enemy_hp, 0).astype(np.intp),)]
+            actions = actions.astype(np.intp)
+
+        if not inside.all():
+            outside = ~inside
+            inputs = self.neural_ai.states_to_inputs(player_hp[outside], enemy_hp[outside],
+                                                     player_defending[outside],
+                                                     enemy_defending[outside], turn_count[outside])
+            actions[outside] = network.predict_batch(inputs)
+        return actions
+
+    def action_index(self, player_hp, enemy_hp, player_defending=False, enemy_defending=False,
+                     turn_count=1):
+        """lookup() para um único estado"""
+        if (isinstance(player_hp, int) and isinstance(enemy_hp, int)
+                and isinstance(turn_count, int)):
+            with self._lock:
+                network = self._sync()
+                if 0 <= player_hp <= self.max_hp and 0 <= enemy_hp <= self.max_hp \
+                        and turn_count >= 0:
+                    row = (min(turn_count, MAX_TURN), int(bool(player_defending)),
+                           int(bool(enemy_defending)), player_hp)
+                    if not self._built[row]:
+                        self._build_rows(network, *(np.array([index]) for index in row))
+                    return int(self.table[row + (enemy_hp,)])
+        return int(self.lookup(player_hp, enemy_hp, player_defending, enemy_defending,
+                               turn_count)[0])
+
+    @property
+    def built_fraction(self):
+        """Fração das linhas calculadas para a rede atual"""
+        return 0.0 if self._built is None else float(self._built.mean())
+
+    @property
+    def nbytes(self):
+        return 0 if self.table is None else self.table.nbytes
+
+
+__all__ = [
+    "MAX_TURN",
+    "PolicyTable",
+]
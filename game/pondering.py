@@ -0,0 +1,188 @@
+"""
+Pondering: a IA pensa enquanto o jogador escolhe
+
+Durante a vez do jogador, uma thread em segundo plano busca a resposta da
+IA para cada estado que pode resultar da jogada dele. Ataque e cura têm
+resultado aleatório, então os estados possíveis vêm das tabelas de
+ChanceTables (os mais prováveis primeiro). Quando o jogador age, take()
+devolve na hora o resultado já calculado para o estado real.
+
+Cada chamada de ponder() ou take() invalida o trabalho anterior por meio de
+um contador de geração; a busca em andamento é interrompida como se o
+prazo tivesse terminado.
+"""
+
+import threading
+import time
+
+from .config import GAME_CONFIG
+from .expectiminimax import ChanceTables
+from .minimax import (ACTIONS, BattleState, InstrumentedSearch, SearchResult, SearchTimeout,
+                      _record_search, _tt_counts)
+from .search_stats import SearchStats
+from .tablebase import probe as probe_tablebase
+from .transposition import create_transposition_table
+
+
+class PonderService:
+    """Busca em segundo plano as respostas da IA às jogadas possíveis do jogador
+
+    A TranspositionTable (`tt`) pode ser a mesma da busca normal: take() e
+    cancel() só retornam depois que a thread parou de usá-la.
+    """
+
+    def __init__(self, depth=None, tt=None, tables=None):
+        """
+        Args:
+            depth: Profundidade da busca (padrão: MINIMAX_DEPTH no momento de ponder())
+            tt: Tabela de transposição compartilhada
+            tables: ChanceTables com os resultados possíveis de cada jogada
+        """
+        self.depth = depth
+        self.tt = tt if tt is not None else create_transposition_table()
+        self.tables = tables if tables is not None else ChanceTables()
+
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._queue = []
+        self._results = {}
+        self._search = None
+        self._busy = False
+        self._closed = False
+        self._thread = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def candidates(self, state):
+        """Estados possíveis depois da jogada do jogador em `state`, mais prováveis primeiro
+
+        Como nos loops do jogo, as defesas dos dois lados são desfeitas antes
+        da jogada do jogador.
+        """
+        base = BattleState(state.player_hp, state.enemy_hp, True, rules=state.rules)
+        weighted = {}
+        for action in ACTIONS:
+            total_weight, outcomes = self.tables.outcomes(base, action)
+            for weight, child in outcomes:
+                key = child.to_key()
+                probability = weight / total_weight
+                if key not in weighted or weighted[key][0] < probability:
+                    weighted[key] = (probability, child)
+        ordered = sorted(weighted.values(), key=lambda item: -item[0])
+        return [child for _, child in ordered if not child.is_terminal()]
+
+    def ponder(self, state):
+        """Começa a pensar nas respostas para a vez do jogador em `state`"""
+        depth = self.depth if self.depth is not None else GAME_CONFIG['MINIMAX_DEPTH']
+        jobs = [(child, depth) for child in self.candidates(state)]
+        with self._condition:
+            if self._closed:  # Janela fechada: close() não volta atrás
+                return
+            self._invalidate()
+            self._results.clear()
+            self._queue = jobs
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ponder", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def take(self, state, stats=None):
+        """Para de pensar e devolve o SearchResult já calculado para `state`, ou None
+
+        Com uma SearchStats em `stats`, o custo da busca feita em segundo
+        plano é somado a ela.
+        """
+        with self._condition:
+            self._invalidate()
+            self._wait_idle()
+            entry = self._results.pop(state.to_key(), None)
+            self._results.clear()
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        result, search_stats = entry
+        if stats is not None:
+            stats.merge(search_stats)
+        return result
+
+    def cancel(self):
+        """Descarta todo o trabalho pendente e espera a thread liberar a tabela"""
+        with self._condition:
+            self._invalidate()
+            self._wait_idle()
+            self._results.clear()
+
+    def close(self):
+        """Encerra a thread"""
+        with self._condition:
+            self._invalidate()
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_ready(self, state):
+        """Indica se a resposta para `state` já foi calculada"""
+        with self._condition:
+            return state.to_key() in self._results
+
+    def get_stats(self):
+        """Retorna os acertos e falhas de take()"""
+        served = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / served if served else 0.0}
+
+    def _invalidate(self):
+        # Chamado com o lock: novo contador de geração e busca atual interrompida
+        self._generation += 1
+        self._queue = []
+        if self._search is not None:
+            self._search.deadline = 0.0
+
+    def _wait_idle(self):
+        while self._busy:
+            self._condition.wait()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                state, depth = self._queue.pop(0)
+                generation = self._generation
+                stats = SearchStats()
+                search = InstrumentedSearch(stats, tt=self.tt, deadline=float('inf'))
+                self._search = search
+                self._busy = True
+
+            result = None
+            try:
+                result = probe_tablebase(state, depth=depth)
+                if result is not None:
+                    stats.tablebase_hits += 1
+                else:
+                    start = time.perf_counter()
+                    tt_before = _tt_counts(self.tt)
+                    score, action = search.search(state, depth, True)
+                    _record_search(stats, search, start, tt_before, depth)
+                    result = SearchResult(score, action, depth)
+            except SearchTimeout:
+                result = None
+            finally:
+                with self._condition:
+                    self._search = None
+                    self._busy = False
+                    if result is not None and generation == self._generation:
+                        self._results[state.to_key()] = (result, stats)
+                    self._condition.notify_all()
+
+
+__all__ = [
+    "PonderService",
+]
@@ -0,0 +1,159 @@
+"""
+Replay priorizado de experiências
+
+PrioritizedExperienceBuffer é um ExperienceBuffer que sorteia as
+experiências com probabilidade proporcional à sua prioridade,
+(erro de predição + epsilon) ^ alpha, em vez de treinar só nas mais
+recentes. Experiências novas entram com a maior prioridade já vista, para
+serem usadas pelo menos uma vez; depois de cada treino as prioridades das
+experiências sorteadas são atualizadas com o erro da rede nova.
+
+As prioridades ficam em uma SumTree (árvore binária de somas em um array),
+então atualizar uma prioridade e sortear uma experiência custam
+O(log n). O sorteio favorece as experiências com erro alto; os pesos de
+importância (N x P(i)) ^ -beta, normalizados pelo maior do lote, corrigem
+esse viés no gradiente.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .experience_buffer import ExperienceBatch, ExperienceBuffer
+
+# Lote sorteado: experiências, posições no buffer e pesos de importância
+PrioritizedSample = namedtuple('PrioritizedSample', ['batch', 'indices', 'weights'])
+
+
+class SumTree:
+    """Árvore de somas de prioridades, com as folhas em um array"""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Número de folhas (prioridades)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity deve ser > 0")
+        self.capacity = capacity
+        # Número de folhas arredondado para potência de 2: todas na mesma profundidade
+        self._leaves = 1 << (capacity - 1).bit_length()
+        self._depth = self._leaves.bit_length() - 1
+        # Nó i tem filhos 2i e 2i + 1; a raiz é o nó 1 e as folhas começam em _leaves
+        self._tree = np.zeros(2 * self._leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        """Soma de todas as prioridades"""
+        return float(self._tree[1])
+
+    def __getitem__(self, index):
+        return self._tree[self._leaves + np.asarray(index)]
+
+    def update(self, indices, priorities):
+        """Define as prioridades das folhas `indices` e recalcula as somas acima delas"""
+        nodes = self._leaves + np.asarray(indices, dtype=np.intp).ravel()
+        if nodes.size == 0:
+            return
+        self._tree[nodes] = np.broadcast_to(np.asarray(priorities, dtype=np.float64),
+                                            nodes.shape)
+        for _ in range(self._depth):
+            nodes = np.unique(nodes >> 1)
+            self._tree[nodes] = self._tree[2 * nodes] + self._tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Folhas onde caem as somas acumuladas `values` (em [0, total))
+
+        Cada valor desce da raiz até uma folha, indo para a direita quando é
+        maior que a soma da subárvore esquerda: as folhas são escolhidas com
+        probabilidade proporcional à prioridade.
+        """
+        values = np.array(values, dtype=np.float64).ravel()
+        nodes = np.ones(len(values), dtype=np.intp)
+        for _ in range(self._depth):
+            left = 2 * nodes
+            left_sum = self._tree[left]
+            # Erros de arredondamento nunca levam a uma subárvore vazia
+            go_right = (values >= left_sum) & (self._tree[left + 1] > 0)
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self._leaves
+
+    def clear(self):
+        self._tree[:] = 0.0
+
+
+class PrioritizedExperienceBuffer(ExperienceBuffer):
+    """ExperienceBuffer com sorteio proporcional ao erro de predição"""
+
+    def __init__(self, capacity: int, input_size: int = 6, output_size: int = 3,
+                 alpha: float = 0.6, beta: float = 0.4, epsilon: float = 1e-3):
+        """
+        Args:
+            capacity: Número máximo de experiências guardadas
+            input_size: Tamanho da entrada da rede
+            output_size: Tamanho da saída esperada
+            alpha: Quanto a prioridade depende do erro (0 = sorteio uniforme)
+            beta: Intensidade da correção por pesos de importância (1 = total)
+            epsilon: Somado ao erro, para nenhuma experiência ter prioridade zero
+        """
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        super().__init__(capacity, input_size, output_size)
+
+    def _written(self, positions):
+        # Experiências novas são sorteadas antes de terem um erro medido
+        self.tree.update(positions, self.max_priority)
+
+    def sample_prioritized(self, n: int, beta: float = None, rng=None) -> PrioritizedSample:
+        """Sorteia `n` experiências (com reposição) proporcionalmente à prioridade
+
+        O intervalo [0, total) é dividido em `n` faixas iguais com um sorteio
+        em cada uma, o que espalha o lote pelas prioridades.
+
+        Args:
+            n: Tamanho do lote
+            beta: Expoente dos pesos de importância (padrão: self.beta)
+            rng: np.random.Generator usado no sorteio (padrão: np.random)
+
+        Returns:
+            PrioritizedSample com cópias das experiências, as posições
+            sorteadas (para update_priorities()) e os pesos de importância
+        """
+        if len(self) == 0:
+            raise ValueError("buffer de experiências vazio")
+        rng = np.random if rng is None else rng
+        beta = self.beta if beta is None else beta
+
+        total = self.tree.total
+        values = (np.arange(n) + rng.random(n)) * (total / n)
+        indices = self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+
+        probabilities = self.tree[indices] / total
+        weights = (len(self) * probabilities) ** -beta
+        weights /= weights.max()
+
+        batch = ExperienceBatch(*(column[indices] for column in self._columns()))
+        return PrioritizedSample(batch, indices, weights)
+
+    def update_priorities(self, indices, errors):
+        """Atualiza as prioridades das posições `indices` com os novos erros de predição"""
+        priorities = (np.abs(np.asarray(errors, dtype=np.float64)) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        if priorities.size:
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def clear(self):
+        super().clear()
+        self.tree.clear()
+        self.max_priority = 1.0
+
+
+__all__ = [
+    "PrioritizedExperienceBuffer",
+    "PrioritizedSample",
+    "SumTree",
+]
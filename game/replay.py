@@ -0,0 +1,511 @@
+"""
+Gravação compacta das partidas
+
+Um arquivo de replay é um cabeçalho fixo (com as regras de combate) seguido
+de registros de tamanho fixo, um por turno, das partidas em sequência:
+
+    partida | semente | turno | ações | flags | dano e cura de cada lado |
+    HPs no início e no fim do turno
+
+ReplayWriter acrescenta partidas ao fim do arquivo. Cada partida é montada
+em um MatchRecorder (um por laço de jogo, então console, GUIs e torneios
+podem gravar ao mesmo tempo) e só entra no buffer do writer quando termina;
+o buffer vai para o disco em uma escrita só, com um lock de arquivo, e cada
+partida recebe o número seguinte ao da última gravada. Assim os turnos de
+uma partida ficam sempre juntos e os números crescem ao longo do arquivo.
+
+ReplayReader abre o arquivo com memory-map e monta o índice das partidas
+(o registro em que cada uma começa), guardado ao lado do log em `.idx`:
+abrir de novo um log de vários gigabytes só lê os registros acrescentados
+depois do índice. Com a semente e as ações, verify() joga a partida de novo
+com o RulesEngine e confere os HPs.
+
+Uso pela linha de comando:
+    python -m game.replay [arquivo]
+"""
+
+import argparse
+import atexit
+import os
+import random
+import struct
+import threading
+
+import numpy as np
+
+from .config import GAME_CONFIG
+from .model_persister import FileLock
+from .paths import user_data_path
+from .rules import (ATTACK, DEFEND, ENEMY, HEAL, PLAYER, BattleRules, MatchState, RulesEngine,
+                    action_index)
+from .simulator import NO_WINNER
+
+MAGIC = b'TBRP'
+FORMAT_VERSION = 1
+
+# magic, versão, tamanho do registro e as regras (RULE_KEYS)
+_HEADER = struct.Struct('<4sHH7H')
+HEADER_SIZE = 64
+
+RECORD_DTYPE = np.dtype([
+    ('match', '<u8'),  # Número da partida no arquivo
+    ('seed', '<u8'),  # Semente do gerador dos sorteios da partida
+    ('turn', '<u4'),
+    ('player_action', 'u1'),  # ATTACK, DEFEND, HEAL, INVALID ou NO_ACTION
+    ('enemy_action', 'u1'),
+    ('flags', 'u1'),
+    ('reserved', 'u1'),
+    ('player_damage', '<u2'),  # Dano causado pelo jogador
+    ('player_healing', '<u2'),
+    ('enemy_damage', '<u2'),
+    ('enemy_healing', '<u2'),
+    ('player_hp_start', '<u2'),
+    ('enemy_hp_start', '<u2'),
+    ('player_hp', '<u2'),  # HPs no fim do turno
+    ('enemy_hp', '<u2'),
+])
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+# Lado que não agiu no turno (o inimigo, quando o jogador o derrota)
+NO_ACTION = 255
+
+# Flags de um registro
+PLAYER_DEFENDED = 1
+ENEMY_DEFENDED = 2
+PLAYER_WON = 4
+ENEMY_WON = 8
+
+# Índice de partidas: magic, registros cobertos, seguido das posições (int64)
+_INDEX = struct.Struct('<4sQ')
+INDEX_MAGIC = b'TBRI'
+
+# Registros lidos de uma vez ao montar o índice
+SCAN_CHUNK = 1 << 22
+
+DEFAULT_NAME = 'replays.tbr'  # Na pasta de dados do usuário (game/paths.py)
+
+
+def default_path():
+    """Arquivo de replay padrão, na pasta de dados do usuário"""
+    return user_data_path(DEFAULT_NAME)
+
+
+class ReplayFormatError(ValueError):
+    """Arquivo de replay inválido ou gravado com outras regras"""
+
+
+def new_seed():
+    """Semente nova para o gerador de uma partida"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def _pack_header(rules):
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, *rules.values()).ljust(
+        HEADER_SIZE, b'\x00')
+
+
+def read_header(filepath):
+    """Lê e valida o cabeçalho; retorna as BattleRules do arquivo"""
+    with open(filepath, 'rb') as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ReplayFormatError(f"{filepath}: arquivo menor que o cabeçalho")
+    magic, version, record_size, *values = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayFormatError(f"{filepath}: não é um arquivo de replay")
+    if version != FORMAT_VERSION or record_size != RECORD_SIZE:
+        raise ReplayFormatError(f"{filepath}: versão {version} do formato não suportada")
+    return BattleRules(*values)
+
+
+def _action_code(action):
+    if action is None:
+        return NO_ACTION
+    return action_index(action) if isinstance(action, str) else int(action)
+
+
+class MatchRecorder:
+    """Turnos de uma partida em andamento, entregues ao writer em finish()"""
+
+    def __init__(self, writer, seed, player_hp, enemy_hp):
+        self.writer = writer
+        self.seed = seed
+        self.player_hp = player_hp  # HPs no fim do último turno gravado
+        self.enemy_hp = enemy_hp
+        self.rows = []
+        self.finished = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def record_turn(self, player_action, enemy_action, player_hp, enemy_hp, player_amount=0,
+                    enemy_amount=0):
+        """Grava um turno
+
+        Args:
+            player_action: Ação do jogador (nome como 'attack' ou código de game.rules)
+            enemy_action: Ação do inimigo, ou None se ele não agiu
+            player_hp: HP do jogador no fim do turno
+            enemy_hp: HP do inimigo no fim do turno
+            player_amount: Dano ou cura do jogador, conforme a ação
+            enemy_amount: Dano ou cura do inimigo
+        """
+        player_code = _action_code(player_action)
+        enemy_code = _action_code(enemy_action)
+        flags = (PLAYER_DEFENDED if player_code == DEFEND else 0) | \
+            (ENEMY_DEFENDED if enemy_code == DEFEND else 0)
+        if enemy_hp <= 0:
+            flags |= PLAYER_WON
+        elif player_hp <= 0:
+            flags |= ENEMY_WON
+
+        self.rows.append((
+            0, self.seed, len(self.rows) + 1, player_code, enemy_code, flags, 0,
+            player_amount if player_code == ATTACK else 0,
+            player_amount if player_code == HEAL else 0,
+            enemy_amount if enemy_code == ATTACK else 0,
+            enemy_amount if enemy_code == HEAL else 0,
+            self.player_hp, self.enemy_hp, player_hp, enemy_hp))
+        self.player_hp, self.enemy_hp = player_hp, enemy_hp
+
+    def record_events(self, events, state):
+        """Grava um turno a partir dos TurnEvents de RulesEngine.play_turn()"""
+        actions = {PLAYER: (None, 0), ENEMY: (None, 0)}
+        for event in events:
+            actions[event.actor] = (event.action, event.amount)
+        (player_action, player_amount), (enemy_action, enemy_amount) = \
+            actions[PLAYER], actions[ENEMY]
+        self.record_turn(player_action, enemy_action, state.player_hp, state.enemy_hp,
+                         player_amount, enemy_amount)
+
+    def finish(self):
+        """Entrega a partida ao writer (uma vez só; partidas sem turnos são ignoradas)"""
+        if not self.finished:
+            self.finished = True
+            if self.rows:
+                self.writer._append(np.array(self.rows, dtype=RECORD_DTYPE))
+
+
+class ReplayWriter:
+    """Acrescenta partidas a um arquivo de replay, com buffer"""
+
+    def __init__(self, path=None, rules=None, buffer_records=None):
+        """
+        Args:
+            path: Arquivo de replay (padrão: PATH de REPLAY_CONFIG ou default_path())
+            rules: BattleRules das partidas (padrão: GAME_CONFIG atual); um
+                arquivo existente precisa ter as mesmas regras
+            buffer_records: Turnos guardados em memória antes de escrever
+                (padrão: BUFFER_RECORDS de REPLAY_CONFIG)
+        """
+        config = GAME_CONFIG.get('REPLAY_CONFIG', {})
+        self.path = path or config.get('PATH') or default_path()
+        self.rules = BattleRules.from_config() if rules is None else rules
+        self.buffer_records = (config.get('BUFFER_RECORDS', 4096) if buffer_records is None
+                               else buffer_records)
+
+        self._lock = threading.Lock()
+        self._pending = []  # Partidas terminadas ainda não escritas
+        self._pending_records = 0
+        self.matches = 0  # Partidas escritas por este writer
+        self.records = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with FileLock(self.path + '.lock'):
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                with open(self.path, 'wb') as f:
+                    f.write(_pack_header(self.rules))
+            elif read_header(self.path) != self.rules:
+                raise ReplayFormatError(f"{self.path}: gravado com outras regras de combate")
+
+    def begin_match(self, seed=0, player_hp=None, enemy_hp=None):
+        """Começa a gravação de uma partida
+
+        Args:
+            seed: Semente do gerador dos sorteios da partida
+            player_hp: HP inicial do jogador (padrão: HP máximo)
+            enemy_hp: HP inicial do inimigo (padrão: HP máximo)
+
+        Returns:
+            MatchRecorder
+        """
+        return MatchRecorder(self, seed,
+                             self.rules.max_hp if player_hp is None else player_hp,
+                             self.rules.max_hp if enemy_hp is None else enemy_hp)
+
+    def _append(self, rows):
+        with self._lock:
+            rows['match'] = len(self._pending)  # Relativo; o número final sai na escrita
+            self._pending.append(rows)
+            self._pending_records += len(rows)
+            full = self._pending_records >= self.buffer_records
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Escreve as partidas do buffer no fim do arquivo
+
+        Returns:
+            Número de partidas escritas
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._pending_records = 0
+            if not pending:
+                return 0
+
+            records = np.concatenate(pending)
+            with FileLock(self.path + '.lock'), open(self.path, 'r+b') as f:
+                # Um pedaço de registro no fim é de uma escrita interrompida
+                size = f.seek(0, os.SEEK_END)
+                count = (size - HEADER_SIZE) // RECORD_SIZE
+                end = HEADER_SIZE + count * RECORD_SIZE
+                if end != size:
+                    f.truncate(end)
+                next_match = 0
+                if count:
+                    f.seek(end - RECORD_SIZE)
+                    last = np.frombuffer(f.read(RECORD_SIZE), dtype=RECORD_DTYPE)
+                    next_match = int(last['match'][0]) + 1
+
+                records['match'] += next_match
+                f.seek(end)
+                f.write(records.tobytes())
+                f.flush()
+            self.matches += len(pending)
+            self.records += len(records)
+            return len(pending)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _match_starts(matches, first):
+    """Registros (de `first` em diante) em que começa uma partida nova"""
+    parts = []
+    for low in range(max(first, 1), len(matches), SCAN_CHUNK):
+        block = np.asarray(matches[low - 1:low + SCAN_CHUNK])
+        parts.append(np.flatnonzero(block[1:] != block[:-1]) + low)
+    if first == 0 and len(matches):
+        parts.insert(0, np.zeros(1, dtype=np.int64))
+    return np.concatenate(parts).astype(np.int64) if parts else np.empty(0, dtype=np.int64)
+
+
+class ReplayReader:
+    """Acesso às partidas de um arquivo de replay, com memory-map"""
+
+    def __init__(self, path=None, index_path=None, cache_index=True):
+        """
+        Args:
+            path: Arquivo de replay (padrão: o mesmo de ReplayWriter)
+            index_path: Arquivo do índice de partidas (padrão: `path` + '.idx')
+            cache_index: Grava o índice atualizado para as próximas aberturas
+        """
+        self.path = path or GAME_CONFIG.get('REPLAY_CONFIG', {}).get('PATH') or default_path()
+        self.index_path = index_path or self.path + '.idx'
+        self.cache_index = cache_index
+        self.rules = read_header(self.path)
+        self.records = np.empty(0, dtype=RECORD_DTYPE)
+        self.starts = np.empty(0, dtype=np.int64)  # Registro em que cada partida começa
+        self._covered = 0  # Registros já indexados
+        self.refresh()
+
+    def refresh(self):
+        """Mapeia de novo o arquivo, incluindo as partidas gravadas desde a abertura"""
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // RECORD_SIZE
+        if count > 0:
+            self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE,
+                                     shape=(count,))
+        if not self._covered:
+            self.starts, self._covered = self._load_index(count)
+        if self._covered < count:
+            self.starts = np.concatenate([self.starts, _match_starts(self.records['match'],
+                                                                     self._covered)])
+            self._covered = count
+            self._save_index(count)
+
+    def _load_index(self, count):
+        """Índice salvo, se ainda valer para o arquivo; retorna (posições, registros cobertos)"""
+        empty = np.empty(0, dtype=np.int64), 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, covered = _INDEX.unpack(f.read(_INDEX.size))
+                starts = np.fromfile(f, dtype='<i8')
+        except (OSError, struct.error):
+            return empty
+        # O último registro coberto tem que ser da última partida do índice
+        if magic != INDEX_MAGIC or not 0 < covered <= count or not len(starts) \
+                or starts[-1] >= covered \
+                or self.records['match'][covered - 1] != self.records['match'][starts[-1]]:
+            return empty
+        return starts.astype(np.int64), int(covered)
+
+    def _save_index(self, count):
+        if not self.cache_index:
+            return
+        temp_path = f"{self.index_path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(_INDEX.pack(INDEX_MAGIC, count))
+                f.write(self.starts.astype('<i8').tobytes())
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # O índice é só um atalho; sem permissão de escrita ele é montado a cada abertura
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def record_count(self):
+        return len(self.records)
+
+    def bounds(self, i):
+        """(primeiro registro, fim) da i-ésima partida"""
+        start = int(self.starts[i])
+        i = i % len(self.starts)
+        end = int(self.starts[i + 1]) if i + 1 < len(self.starts) else len(self.records)
+        return start, end
+
+    def match(self, i):
+        """Registros (turnos) da i-ésima partida, sem copiar do arquivo"""
+        start, end = self.bounds(i)
+        return self.records[start:end]
+
+    __getitem__ = match
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.match(i)
+
+    def turn_counts(self):
+        """Turnos de cada partida"""
+        return np.diff(np.append(self.starts, len(self.records)))
+
+    def winners(self):
+        """Vencedor de cada partida: PLAYER, ENEMY ou NO_WINNER (partida interrompida)"""
+        flags = self.records['flags'][np.append(self.starts[1:], len(self.records)) - 1] \
+            if len(self) else np.empty(0, dtype=np.uint8)
+        return np.where(flags & PLAYER_WON, PLAYER,
+                        np.where(flags & ENEMY_WON, ENEMY, NO_WINNER)).astype(np.int8)
+
+    def verify(self, i):
+        """Joga a i-ésima partida de novo com a semente e as ações gravadas
+
+        Vale para partidas cujos sorteios saíram todos de um random.Random(semente),
+        na ordem das ações (RulesEngine com a semente, console e GUIs).
+
+        Returns:
+            True se os HPs de todos os turnos conferem
+        """
+        records = self.match(i)
+        engine = RulesEngine(self.rules, int(records['seed'][0]))
+        state = MatchState(int(records['player_hp_start'][0]), int(records['enemy_hp_start'][0]))
+        for record in records:
+            state.player_defending = state.enemy_defending = False
+            engine.apply(state, PLAYER, int(record['player_action']))
+            if record['enemy_action'] != NO_ACTION:
+                engine.apply(state, ENEMY, int(record['enemy_action']))
+            if (state.player_hp, state.enemy_hp) != (record['player_hp'], record['enemy_hp']):
+                return False
+        return True
+
+    def summary(self):
+        """Resumo de uma linha"""
+        winners = self.winners()
+        matches = max(len(self), 1)
+        return (f"{len(self)} partidas, {self.record_count} turnos: "
+                f"jogador {np.count_nonzero(winners == PLAYER) / matches:.1%}, "
+                f"inimigo {np.count_nonzero(winners == ENEMY) / matches:.1%}, "
+                f"{self.record_count / matches:.1f} turnos em média")
+
+    def close(self):
+        self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_replay_writer(config=None):
+    """ReplayWriter compartilhado do arquivo de REPLAY_CONFIG, ou None se desativado
+
+    Escrito ao sair do programa.
+    """
+    config = (GAME_CONFIG if config is None else config).get('REPLAY_CONFIG', {})
+    if not config.get('RECORD', False):
+        return None
+    path = config.get('PATH') or default_path()
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            try:
+                writer = ReplayWriter(path, buffer_records=config.get('BUFFER_RECORDS'))
+            except (OSError, ReplayFormatError) as e:
+                print(f"Gravação de partidas desativada: {e}")
+                return None
+            _writers[path] = writer
+    return writer
+
+
+@atexit.register
+def _flush_all():
+    for writer in list(_writers.values()):
+        try:
+            writer.flush()
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    """Resumo de um arquivo de replay"""
+    parser = argparse.ArgumentParser(description="Partidas gravadas do combate por turnos")
+    parser.add_argument('path', nargs='?', default=None,
+                        help="arquivo de replay (padrão: o de REPLAY_CONFIG)")
+    parser.add_argument('--verify', action='store_true',
+                        help="joga de novo cada partida e confere os HPs")
+    args = parser.parse_args(argv)
+
+    with ReplayReader(args.path) as reader:
+        print(f"📼 {reader.path}")
+        print(reader.summary())
+        if args.verify:
+            failed = [i for i in range(len(reader)) if not reader.verify(i)]
+            print(f"Conferidas: {len(reader) - len(failed)}/{len(reader)}")
+
+
+__all__ = [
+    "ENEMY_DEFENDED",
+    "ENEMY_WON",
+    "FORMAT_VERSION",
+    "MatchRecorder",
+    "NO_ACTION",
+    "PLAYER_DEFENDED",
+    "PLAYER_WON",
+    "RECORD_DTYPE",
+    "RECORD_SIZE",
+    "ReplayFormatError",
+    "ReplayReader",
+    "ReplayWriter",
+    "default_path",
+    "get_replay_writer",
+    "new_seed",
+    "read_header",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Regras do combate
+
+BattleRules guarda as constantes de GAME_CONFIG usadas para gerar os
+estados da busca (dano com e sem defesa, cura média, HP máximo), já
+calculadas. Um BattleState criado sem regras lê GAME_CONFIG uma vez e os
+estados filhos herdam o mesmo objeto, então a geração de sucessores não
+consulta dicionários.
+
+O núcleo de regras (RulesEngine) aplica as ações de verdade, com sorteio de
+dano e cura, a um MatchState compacto. Ele não imprime nada e não usa o
+módulo random global: o gerador (random.Random ou np.random.Generator) é
+injetado, então uma partida com a mesma semente se repete igual. Cada ação
+pode gerar um TurnEvent, que as interfaces (Character, console, GUIs)
+transformam em texto com describe_event().
+"""
+
+import random
+from collections import namedtuple
+
+from .config import GAME_CONFIG
+
+# Chaves de GAME_CONFIG que definem as regras do combate
+RULE_KEYS = ('MAX_HP', 'PLAYER_ATTACK', 'PLAYER_DEFENSE', 'AI_ATTACK',
+             'AI_DEFENSE', 'HEAL_MIN', 'HEAL_MAX')
+
+
+class BattleRules:
+    """Constantes de combate pré-calculadas (imutáveis)"""
+
+    __slots__ = ('max_hp', 'player_attack', 'player_defense', 'ai_attack', 'ai_defense',
+                 'heal_min', 'heal_max', 'player_damage', 'player_damage_defended',
+                 'ai_damage', 'ai_damage_defended', 'healing')
+
+    def __init__(self, max_hp, player_attack, player_defense, ai_attack, ai_defense,
+                 heal_min, heal_max):
+        self.max_hp = max_hp
+        self.player_attack = player_attack
+        self.player_defense = player_defense
+        self.ai_attack = ai_attack
+        self.ai_defense = ai_defense
+        self.heal_min = heal_min
+        self.heal_max = heal_max
+
+        # Valores usados pelo modelo determinístico da busca
+        self.player_damage = player_attack
+        self.player_damage_defended = max(1, player_attack - ai_defense)
+        self.ai_damage = ai_attack
+        self.ai_damage_defended = max(1, ai_attack - player_defense)
+        self.healing = (heal_min + heal_max) // 2
+
+    @classmethod
+    def from_config(cls, config=None):
+        """Regras atuais de `config` (padrão: GAME_CONFIG)
+
+        Enquanto os valores não mudam, devolve sempre o mesmo objeto.
+        """
+        global _cached_rules
+        config = GAME_CONFIG if config is None else config
+        values = tuple(config[key] for key in RULE_KEYS)
+        if _cached_rules is None or _cached_rules.values() != values:
+            _cached_rules = cls(*values)
+        return _cached_rules
+
+    def values(self):
+        """Valores de GAME_CONFIG na ordem de RULE_KEYS"""
+        return (self.max_hp, self.player_attack, self.player_defense, self.ai_attack,
+                self.ai_defense, self.heal_min, self.heal_max)
+
+    def to_config(self):
+        """Dicionário com as chaves de RULE_KEYS"""
+        return dict(zip(RULE_KEYS, self.values()))
+
+    def __eq__(self, other):
+        return isinstance(other, BattleRules) and self.values() == other.values()
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def __reduce__(self):
+        return (BattleRules, self.values())
+
+    def __repr__(self):
+        return f"BattleRules({', '.join(f'{k}={v}' for k, v in self.to_config().items())})"
+
+
+_cached_rules = None
+
+
+# Ações, na mesma ordem de neural_ai.ACTIONS; INVALID é uma entrada inválida (perde o turno)
+ATTACK, DEFEND, HEAL, INVALID = range(4)
+ACTION_NAMES = ('attack', 'defend', 'heal', 'invalid')
+
+# Quem age
+PLAYER, ENEMY = 0, 1
+
+# Variação aleatória do dano de um ataque: atk + randint(-5, 5)
+DAMAGE_VARIATION = 5
+
+# Números sorteados de uma vez de um np.random.Generator
+DICE_CHUNK = 4096
+
+# Ação aplicada: quem agiu (PLAYER/ENEMY; o nome, no Character), a ação e o dano ou a cura
+TurnEvent = namedtuple('TurnEvent', ['actor', 'action', 'amount'])
+
+
+def action_index(action):
+    """Código da ação (ATTACK, DEFEND...) a partir do nome; nomes desconhecidos são INVALID"""
+    try:
+        return ACTION_NAMES.index(action)
+    except ValueError:
+        return INVALID
+
+
+def attack_damage(attack, variation, target_defending=False, target_defense=0):
+    """Dano de um ataque com a variação sorteada, reduzido pela defesa do alvo"""
+    damage = max(1, attack + variation)
+    if target_defending:
+        damage = max(1, damage - target_defense)
+    return damage
+
+
+def describe_event(event, actor_name, target_name=None):
+    """Texto de um TurnEvent, como as interfaces mostram"""
+    if event.action == ATTACK:
+        return f"{actor_name} atacou {target_name} causando {event.amount} de dano!"
+    if event.action == DEFEND:
+        return f"{actor_name} entrou em modo de defesa!"
+    if event.action == HEAL:
+        return f"{actor_name} se curou em {event.amount} pontos!"
+    return f"{actor_name} perdeu o turno."
+
+
+class Dice:
+    """Sorteios do combate a partir de um gerador injetado
+
+    Aceita random.Random (ou o próprio módulo random) e np.random.Generator.
+    Com um Generator os números são sorteados em blocos de DICE_CHUNK, o que
+    torna cada sorteio tão barato quanto ler uma lista.
+    """
+
+    def __init__(self, rng=None, heal_min=None, heal_max=None):
+        """
+        Args:
+            rng: random.Random, módulo random, np.random.Generator ou semente
+                (int) de um random.Random novo; None usa um random.Random sem semente
+            heal_min: Cura mínima (padrão: HEAL_MIN de GAME_CONFIG)
+            heal_max: Cura máxima (padrão: HEAL_MAX de GAME_CONFIG)
+        """
+        if rng is None or isinstance(rng, int):
+            rng = random.Random(rng)
+        self.rng = rng
+        self.heal_min = GAME_CONFIG['HEAL_MIN'] if heal_min is None else heal_min
+        self.heal_max = GAME_CONFIG['HEAL_MAX'] if heal_max is None else heal_max
+
+        if hasattr(rng, 'randint'):
+            self.variation = lambda: rng.randint(-DAMAGE_VARIATION, DAMAGE_VARIATION)
+            self.healing = lambda: rng.randint(self.heal_min, self.heal_max)
+        else:
+            self.variation = self._chunks(-DAMAGE_VARIATION, DAMAGE_VARIATION).__next__
+            self.healing = self._chunks(self.heal_min, self.heal_max).__next__
+
+    def _chunks(self, low, high):
+        integers = self.rng.integers
+        while True:
+            yield from integers(low, high + 1, DICE_CHUNK).tolist()
+
+
+class MatchState:
+    """Estado de uma partida em andamento (mutável)"""
+
+    __slots__ = ('player_hp', 'enemy_hp', 'player_defending', 'enemy_defending', 'turn',
+                 'winner')
+
+    def __init__(self, player_hp, enemy_hp, player_defending=False, enemy_defending=False,
+                 turn=1, winner=None):
+        self.player_hp = player_hp
+        self.enemy_hp = enemy_hp
+        self.player_defending = player_defending
+        self.enemy_defending = enemy_defending
+        self.turn = turn
+        self.winner = winner  # PLAYER, ENEMY ou None enquanto a partida continua
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    def copy(self):
+        return MatchState(self.player_hp, self.enemy_hp, self.player_defending,
+                          self.enemy_defending, self.turn, self.winner)
+
+    def __eq__(self, other):
+        return isinstance(other, MatchState) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"MatchState(jogador={self.player_hp}, inimigo={self.enemy_hp}, "
+                f"turno={self.turn}, vencedor={self.winner})")
+
+
+class RulesEngine:
+    """Núcleo de regras sem interface: aplica turnos a um MatchState
+
+    Um turno segue a ordem do jogo: as defesas do turno anterior acabam, o
+    jogador age e, se o inimigo sobreviver, o inimigo age.
+    """
+
+    def __init__(self, rules=None, rng=None):
+        """
+        Args:
+            rules: BattleRules (padrão: GAME_CONFIG atual)
+            rng: Gerador dos sorteios (veja Dice) ou um Dice pronto
+        """
+        self.rules = BattleRules.from_config() if rules is None else rules
+        self.dice = rng if isinstance(rng, Dice) else Dice(rng, self.rules.heal_min,
+                                                           self.rules.heal_max)
+
+    def new_match(self):
+        """Partida nova, com os dois lados com HP máximo"""
+        return MatchState(self.rules.max_hp, self.rules.max_hp)
+
+    def apply(self, state, actor, action, events=None):
+        """Aplica a ação de `actor` (PLAYER ou ENEMY) e devolve o dano ou a cura
+
+        Com uma lista em `events`, acrescenta o TurnEvent da ação.
+        """
+        rules = self.rules
+        amount = 0
+        if actor == PLAYER:
+            if action == ATTACK:
+                amount = attack_damage(rules.player_attack, self.dice.variation(),
+                                       state.enemy_defending, rules.ai_defense)
+                state.enemy_hp = max(0, state.enemy_hp - amount)
+            elif action == DEFEND:
+                state.player_defending = True
+            elif action == HEAL:
+                amount = self.dice.healing()
+                state.player_hp = min(rules.max_hp, state.player_hp + amount)
+        else:
+            if action == ATTACK:
+                amount = attack_damage(rules.ai_attack, self.dice.variation(),
+                                       state.player_defending, rules.player_defense)
+                state.player_hp = max(0, state.player_hp - amount)
+            elif action == DEFEND:
+                state.enemy_defending = True
+            elif action == HEAL:
+                amount = self.dice.healing()
+                state.enemy_hp = min(rules.max_hp, state.enemy_hp + amount)
+
+        if state.enemy_hp <= 0:
+            state.winner = PLAYER
+        elif state.player_hp <= 0:
+            state.winner = ENEMY
+        if events is not None:
+            events.append(TurnEvent(actor, action, amount))
+        return amount
+
+    def play_turn(self, state, player_action, enemy_action, events=None):
+        """Joga um turno completo e devolve o vencedor (None se a partida continua)"""
+        state.player_defending = state.enemy_defending = False
+        self.apply(state, PLAYER, player_action, events)
+        if state.winner is None:
+            self.apply(state, ENEMY, enemy_action, events)
+        state.turn += 1
+        return state.winner
+
+    def play_match(self, player_policy, enemy_policy, state=None, max_turns=10000,
+                   events=None):
+        """Joga uma partida inteira entre duas políticas, sem interface
+
+        As políticas recebem o MatchState antes de cada ação (o inimigo vê a
+        ação do jogador já aplicada) e devolvem um código de ação. Este laço
+        faz o mesmo que play_turn() em sequência, com as regras e os HPs em
+        variáveis locais.
+
+        Returns:
+            MatchState final (winner é None se `max_turns` acabar antes)
+        """
+        state = self.new_match() if state is None else state
+        rules = self.rules
+        max_hp = rules.max_hp
+        player_attack, player_defense = rules.player_attack, rules.player_defense
+        # Só a defesa do jogador entra nas contas: a do inimigo acabaria no início do turno
+        enemy_attack = rules.ai_attack
+        variation, healing = self.dice.variation, self.dice.healing
+        record = events.append if events is not None else None
+
+        # O estado fica em variáveis locais e é copiado para `state` antes de cada política
+        player_hp, enemy_hp = state.player_hp, state.enemy_hp
+        winner = state.winner
+        turn = state.turn
+        last_turn = turn + max_turns
+        while winner is None and turn < last_turn:
+            state.player_hp = player_hp
+            state.enemy_hp = enemy_hp
+            state.player_defending = state.enemy_defending = False
+            state.turn = turn
+
+            action = player_policy(state)
+            if action == ATTACK:
+                # O inimigo nunca está defendendo aqui: as defesas acabaram no início do turno
+                amount = player_attack + variation()
+                if amount < 1:
+                    amount = 1
+                enemy_hp -= amount
+                if enemy_hp <= 0:
+                    enemy_hp = 0
+                    winner = PLAYER
+            elif action == HEAL:
+                amount = healing()
+                player_hp += amount
+                if player_hp > max_hp:
+                    player_hp = max_hp
+            else:
+                amount = 0
+                if action == DEFEND:
+                    state.player_defending = True
+            if record is not None:
+                record(TurnEvent(PLAYER, action, amount))
+
+            if winner is None:
+                state.player_hp = player_hp
+                state.enemy_hp = enemy_hp
+                action = enemy_policy(state)
+                if action == ATTACK:
+                    amount = enemy_attack + variation()
+                    if amount < 1:
+                        amount = 1
+                    if state.player_defending:
+                        amount -= player_defense
+                        if amount < 1:
+                            amount = 1
+                    player_hp -= amount
+                    if player_hp <= 0:
+                        player_hp = 0
+                        winner = ENEMY
+                elif action == HEAL:
+                    amount = healing()
+                    enemy_hp += amount
+                    if enemy_hp > max_hp:
+                        enemy_hp = max_hp
+                else:
+                    amount = 0
+                    if action == DEFEND:
+                        state.enemy_defending = True
+                if record is not None:
+                    record(TurnEvent(ENEMY, action, amount))
+            turn += 1
+
+        state.player_hp, state.enemy_hp = player_hp, enemy_hp
+        state.turn, state.winner = turn, winner
+        return state
+
+
+__all__ = [
+    "ACTION_NAMES",
+    "ATTACK",
+    "BattleRules",
+    "DEFEND",
+    "Dice",
+    "ENEMY",
+    "HEAL",
+    "INVALID",
+    "MatchState",
+    "PLAYER",
+    "RULE_KEYS",
+    "RulesEngine",
+    "TurnEvent",
+    "action_index",
+    "attack_damage",
+    "describe_event",
+]
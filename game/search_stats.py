@@ -0,0 +1,123 @@
+"""
+Estatísticas de custo das decisões da IA
+
+Uma SearchStats é passada (opcionalmente) para minimax() ou
+iterative_deepening() e preenchida durante a busca. Sem ela a busca não
+faz nenhuma contagem extra além dos contadores que já mantém.
+
+MatchSearchStats acumula as decisões de uma partida para acompanhar o
+custo da IA por turno.
+"""
+
+
+class SearchStats:
+    """Custo de uma busca (ou da soma de várias)"""
+
+    def __init__(self):
+        self.nodes = 0  # Nós visitados
+        self.leaf_evals = 0  # Avaliações estáticas (folhas e estados terminais)
+        self.cutoffs = 0  # Cortes alpha/beta
+        self.tt_hits = 0  # Consultas à tabela de transposição que acharam entrada
+        self.tt_probes = 0
+        self.tablebase_hits = 0  # Decisões respondidas pela tablebase
+        self.depth = 0  # Profundidade nominal concluída
+        self.max_depth = 0  # Maior distância da raiz visitada
+        self.elapsed = 0.0  # Segundos
+
+    @property
+    def nps(self):
+        """Nós por segundo"""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def record_leaf(self, ply):
+        """Conta uma avaliação estática a `ply` jogadas da raiz"""
+        self.leaf_evals += 1
+        if ply > self.max_depth:
+            self.max_depth = ply
+
+    def merge(self, other):
+        """Soma os contadores de `other` (profundidades: o maior valor)"""
+        self.nodes += other.nodes
+        self.leaf_evals += other.leaf_evals
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.tt_probes += other.tt_probes
+        self.tablebase_hits += other.tablebase_hits
+        self.depth = max(self.depth, other.depth)
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.elapsed += other.elapsed
+        return self
+
+    def to_dict(self):
+        """Retorna os contadores e as taxas derivadas"""
+        return {
+            'nodes': self.nodes,
+            'leaf_evals': self.leaf_evals,
+            'cutoffs': self.cutoffs,
+            'tt_hits': self.tt_hits,
+            'tt_probes': self.tt_probes,
+            'tt_hit_rate': self.tt_hit_rate,
+            'tablebase_hits': self.tablebase_hits,
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'elapsed': self.elapsed,
+            'nps': self.nps
+        }
+
+    def format(self):
+        """Resumo de uma linha para logs"""
+        if self.tablebase_hits and not self.nodes:
+            return "tablebase"
+        return (f"{self.nodes} nós | {self.leaf_evals} folhas | {self.elapsed * 1000:.1f}ms | "
+                f"{self.nps:,.0f} nós/s | prof. {self.depth} (máx. {self.max_depth}) | "
+                f"{self.cutoffs} cortes | TT {self.tt_hit_rate:.0%}")
+
+    def __repr__(self):
+        return f"SearchStats({self.format()})"
+
+
+class MatchSearchStats:
+    """Acumula as estatísticas de todas as decisões de uma partida"""
+
+    def __init__(self):
+        self.turns = []
+        self.total = SearchStats()
+
+    def __len__(self):
+        return len(self.turns)
+
+    def record(self, stats, turn=None):
+        """Registra a decisão de um turno"""
+        entry = stats.to_dict()
+        entry['turn'] = turn if turn is not None else len(self.turns) + 1
+        self.turns.append(entry)
+        self.total.merge(stats)
+
+    def average(self, field):
+        """Média de um campo de SearchStats.to_dict() por decisão"""
+        if not self.turns:
+            return 0.0
+        return sum(entry[field] for entry in self.turns) / len(self.turns)
+
+    def reset(self):
+        self.turns.clear()
+        self.total = SearchStats()
+
+    def summary(self):
+        """Resumo da partida para logs"""
+        if not self.turns:
+            return "Nenhuma decisão registrada"
+        return (f"{len(self.turns)} decisões | {self.total.nodes} nós "
+                f"({self.average('nodes'):,.0f}/turno) | {self.total.elapsed:.2f}s "
+                f"({self.average('elapsed') * 1000:.1f}ms/turno) | {self.total.nps:,.0f} nós/s | "
+                f"prof. máx. {self.total.max_depth} | tablebase {self.total.tablebase_hits}")
+
+
+__all__ = [
+    "SearchStats",
+    "MatchSearchStats",
+]
@@ -0,0 +1,617 @@
+"""
+Servidor de partidas
+
+Hospeda muitas partidas ao mesmo tempo em um servidor TCP com asyncio. O
+protocolo é JSON delimitado por quebra de linha: cada linha é um pedido
+com "op" e, opcionalmente, um "id" que volta na resposta, então um cliente
+pode ter várias partidas em andamento na mesma conexão.
+
+    {"op": "new", "agent": "minimax-normal"}          -> partida nova
+    {"op": "act", "match": 7, "action": "attack"}     -> joga um turno
+    {"op": "state", "match": 7}                        -> estado atual
+    {"op": "quit", "match": 7}                         -> abandona a partida
+    {"op": "stats"}                                    -> contadores do servidor
+
+As respostas têm "ok" (e "error" quando ok é falso). Uma partida é um
+MatchState (HPs, defesas, turno e vencedor) e o nome do agente inimigo; os
+turnos seguem o RulesEngine, com um gerador compartilhado. O inimigo é um
+agente de game.arena: os de custo constante decidem no próprio laço e os
+outros (Minimax, neural) em um pool de processos, com as decisões pedidas
+na mesma volta do laço mandadas juntas, em lotes, para os processos. Uma
+busca profunda nunca trava o laço de eventos.
+
+run_load() é um gerador de carga: abre N partidas ao mesmo tempo, joga
+todas até o fim e mede a latência de cada turno (do pedido à resposta).
+
+Uso:
+    python -m game.server --port 8765
+    python -m game.server --load 1000 10000 --agent minimax-facil
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .arena import create_agent
+from .config import GAME_CONFIG
+from .rules import (ACTION_NAMES, ENEMY, INVALID, PLAYER, BattleRules, MatchState, RulesEngine,
+                    action_index)
+
+# Maior linha aceita em um pedido
+LINE_LIMIT = 1 << 16
+
+WINNER_NAMES = {PLAYER: 'player', ENEMY: 'enemy', None: None}
+
+
+class ProtocolError(ValueError):
+    """Pedido inválido de um cliente"""
+
+
+# Agentes já criados neste processo, por nome, com as regras em uso
+_agents = {}
+
+
+def _agent(name, rules):
+    agent, agent_rules = _agents.get(name, (None, None))
+    if agent is None or agent_rules != rules:
+        agent = create_agent(name)
+        agent.reset(random.Random(), rules)
+        _agents[name] = agent, rules
+    return agent
+
+
+def _decide_batch(rules, tasks):
+    """Tarefa do pool: ações do inimigo para uma lista de (agente, valores do MatchState)"""
+    return [_agent(name, rules).decide(MatchState(*values), ENEMY) for name, values in tasks]
+
+
+class ServerMatch:
+    """Partida hospedada: o estado compacto e quem joga o inimigo"""
+
+    __slots__ = ('id', 'agent', 'state', 'busy', 'recording')
+
+    def __init__(self, match_id, agent, state, recording=None):
+        self.id = match_id
+        self.agent = agent
+        self.state = state
+        self.busy = False  # Um turno em andamento (esperando a IA)
+        self.recording = recording
+
+    def to_dict(self):
+        state = self.state
+        return {'player_hp': state.player_hp, 'enemy_hp': state.enemy_hp,
+                'player_defending': state.player_defending,
+                'enemy_defending': state.enemy_defending, 'turn': state.turn,
+                'winner': WINNER_NAMES[state.winner]}
+
+
+class AIPool:
+    """Decisões do inimigo: no laço para agentes baratos, em lotes no pool para os outros"""
+
+    def __init__(self, rules, workers=None, executor=None, max_batch=None):
+        """
+        Args:
+            rules: BattleRules das partidas
+            workers: Processos do pool (padrão: WORKERS de SERVER_CONFIG; 0 = número de CPUs)
+            executor: Executor pronto (não é encerrado em close())
+            max_batch: Máximo de decisões em uma tarefa do pool
+        """
+        config = GAME_CONFIG['SERVER_CONFIG']
+        workers = config.get('WORKERS', 0) if workers is None else workers
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = config.get('MAX_BATCH', 256) if max_batch is None else max_batch
+        self.rules = rules
+        self._own_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(self.workers)
+        self._pending = []
+        self._scheduled = False
+        self._jobs = set()  # Lotes enviados ao pool e ainda não terminados
+        self._cheap = {}
+
+        self.decisions = 0
+        self.batches = 0
+
+    def is_cheap(self, name):
+        if name not in self._cheap:
+            self._cheap[name] = create_agent(name).cheap
+        return self._cheap[name]
+
+    async def decide(self, name, state):
+        """Código da ação do agente `name` (inimigo) no MatchState `state`"""
+        self.decisions += 1
+        if self.is_cheap(name):
+            return _agent(name, self.rules).decide(state, ENEMY)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((name, (state.player_hp, state.enemy_hp, state.player_defending,
+                                     state.enemy_defending, state.turn), future))
+        if not self._scheduled:
+            # As decisões pedidas nesta volta do laço vão juntas para o pool
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        self._scheduled = False
+        pending, self._pending = self._pending, []
+        loop = asyncio.get_running_loop()
+        size = min(self.max_batch, math.ceil(len(pending) / self.workers))
+        for start in range(0, len(pending), size):
+            batch = pending[start:start + size]
+            self.batches += 1
+            job = self.executor.submit(_decide_batch, self.rules,
+                                       [(name, values) for name, values, _ in batch])
+            self._jobs.add(job)
+            job.add_done_callback(self._jobs.discard)
+            asyncio.wrap_future(job, loop=loop).add_done_callback(
+                lambda job, batch=batch: self._deliver(job, batch))
+
+    @staticmethod
+    def _deliver(job, batch):
+        if job.cancelled():  # Pool encerrado
+            for _, _, future in batch:
+                future.cancel()
+            return
+        error = job.exception()
+        actions = job.result() if error is None else [None] * len(batch)
+        for (_, _, future), action in zip(batch, actions):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(action)
+            else:
+                future.set_exception(error)
+
+    def close(self):
+        # Lotes que não começaram são descartados (shutdown(cancel_futures=True)
+        # só existe a partir do Python 3.9)
+        for job in list(self._jobs):
+            job.cancel()
+        if self._own_executor:
+            self.executor.shutdown(wait=True)
+
+
+class MatchServer:
+    """Servidor TCP de partidas (JSON por linha)"""
+
+    def __init__(self, host=None, port=None, rules=None, workers=None, executor=None,
+                 max_matches=None, seed=None, replay_writer=None):
+        """
+        Args:
+            host: Endereço (padrão: HOST de SERVER_CONFIG)
+            port: Porta (padrão: PORT de SERVER_CONFIG; 0 = porta livre qualquer)
+            rules: BattleRules (padrão: GAME_CONFIG atual)
+            workers: Processos do pool da IA (veja AIPool)
+            executor: Executor pronto para as decisões da IA
+            max_matches: Partidas simultâneas aceitas
+            seed: Semente do gerador dos sorteios
+            replay_writer: ReplayWriter que grava as partidas terminadas (os
+                sorteios saem de um gerador compartilhado, então a semente
+                gravada é 0 e ReplayReader.verify() não se aplica)
+        """
+        config = GAME_CONFIG['SERVER_CONFIG']
+        self.host = config.get('HOST', '127.0.0.1') if host is None else host
+        self.port = config.get('PORT', 8765) if port is None else port
+        self.rules = BattleRules.from_config() if rules is None else rules
+        self.max_matches = config.get('MAX_MATCHES', 20000) if max_matches is None \
+            else max_matches
+        self.default_agent = config.get('DEFAULT_AGENT', 'minimax-normal')
+        self.engine = RulesEngine(self.rules, np.random.default_rng(seed))
+        self.ai = AIPool(self.rules, workers, executor)
+        self.replay_writer = replay_writer
+        self.matches = {}
+        self._ids = itertools.count(1)
+        self._server = None
+        self._connections = set()  # Tarefas das conexões abertas
+        self._ops = {'new': self._new, 'act': self._act, 'state': self._state,
+                     'quit': self._quit, 'stats': self._stats}
+
+        self.created = 0
+        self.finished = 0
+        self.turns = 0
+
+    async def start(self):
+        """Abre o socket; self.port passa a ser a porta de verdade"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=LINE_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Para de aceitar conexões, encerra as abertas e o pool da IA"""
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self.ai.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # Conexões
+
+    async def _handle(self, reader, writer):
+        write_lock = asyncio.Lock()
+        owned = set()  # Partidas abertas nesta conexão, descartadas quando ela cai
+        tasks = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Linha maior que LINE_LIMIT
+                    await self._send(writer, write_lock,
+                                     {'ok': False, 'error': "linha longa demais"})
+                    break
+                if not line:
+                    break
+                task = asyncio.create_task(self._respond(line, owned, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            # Conexão encerrada pelo cliente ou por close(); os pedidos pendentes caem juntos
+            for task in tasks:
+                task.cancel()
+        finally:
+            self._connections.discard(connection)
+            for match_id in owned:
+                self._drop(match_id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line, owned, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("o pedido deve ser um objeto JSON")
+            request_id = request.get('id')
+            handler = self._ops.get(request.get('op'))
+            if handler is None:
+                raise ProtocolError(f"operação desconhecida: {request.get('op')!r}")
+            reply = await handler(request, owned)
+            reply['ok'] = True
+        except (ProtocolError, json.JSONDecodeError) as e:
+            reply = {'ok': False, 'error': str(e)}
+        except asyncio.CancelledError:  # Subclasse de Exception no Python 3.7
+            raise
+        except Exception as e:  # Falha da IA: o turno pode ser pedido de novo
+            reply = {'ok': False, 'error': f"erro interno: {e}"}
+        if request_id is not None:
+            reply['id'] = request_id
+        await self._send(writer, write_lock, reply)
+
+    @staticmethod
+    async def _send(writer, write_lock, reply):
+        async with write_lock:
+            writer.write(json.dumps(reply, separators=(',', ':')).encode('utf-8') + b'\n')
+            await writer.drain()
+
+    # Operações
+
+    def _match(self, request):
+        match = self.matches.get(request.get('match'))
+        if match is None:
+            raise ProtocolError(f"partida desconhecida: {request.get('match')!r}")
+        return match
+
+    def _drop(self, match_id):
+        match = self.matches.pop(match_id, None)
+        if match is not None and match.recording is not None:
+            match.recording.finish()
+
+    async def _new(self, request, owned):
+        name = request.get('agent') or self.default_agent
+        try:
+            self.ai.is_cheap(name)
+        except ValueError as e:
+            raise ProtocolError(str(e)) from None
+        if len(self.matches) >= self.max_matches:
+            raise ProtocolError("servidor cheio")
+
+        match = ServerMatch(next(self._ids), name, self.engine.new_match())
+        if self.replay_writer is not None:
+            match.recording = self.replay_writer.begin_match(0)
+        self.matches[match.id] = match
+        owned.add(match.id)
+        self.created += 1
+        return {'match': match.id, 'agent': name, 'max_hp': self.rules.max_hp,
+                'state': match.to_dict()}
+
+    async def _act(self, request, owned):
+        match = self._match(request)
+        action = request.get('action')
+        code = action_index(action) if isinstance(action, str) else INVALID
+        if code == INVALID:
+            raise ProtocolError(f"ação inválida: {action!r}")
+        if match.busy:
+            raise ProtocolError("turno anterior ainda em andamento")
+        backup = match.state.copy()
+
+        state = match.state
+        engine = self.engine
+        events = []
+        match.busy = True
+        try:
+            state.player_defending = state.enemy_defending = False
+            engine.apply(state, PLAYER, code, events)
+            if state.winner is None:
+                enemy_action = await self.ai.decide(match.agent, state)
+                if self.matches.get(match.id) is not match:
+                    # Encerrada (quit ou conexão caída) enquanto a IA decidia
+                    raise ProtocolError(f"partida encerrada: {match.id}")
+                engine.apply(state, ENEMY, enemy_action, events)
+            state.turn += 1
+        except BaseException:
+            # O turno não aconteceu: volta ao estado de antes da ação do jogador
+            match.state = backup
+            raise
+        finally:
+            match.busy = False
+        self.turns += 1
+
+        player_event = events[0]
+        enemy_event = events[1] if len(events) > 1 else None
+        if match.recording is not None:
+            match.recording.record_events(events, state)
+        if state.finished:
+            self.finished += 1
+            self._drop(match.id)
+            owned.discard(match.id)
+        return {'match': match.id, 'player': _event_dict(player_event),
+                'enemy': _event_dict(enemy_event), 'state': match.to_dict()}
+
+    async def _state(self, request, owned):
+        match = self._match(request)
+        return {'match': match.id, 'agent': match.agent, 'state': match.to_dict()}
+
+    async def _quit(self, request, owned):
+        match = self._match(request)
+        self._drop(match.id)
+        owned.discard(match.id)
+        return {'match': match.id}
+
+    async def _stats(self, request, owned):
+        return self.get_stats()
+
+    def get_stats(self):
+        return {'active': len(self.matches), 'created': self.created,
+                'finished': self.finished, 'turns': self.turns,
+                'decisions': self.ai.decisions, 'batches': self.ai.batches,
+                'workers': self.ai.workers}
+
+
+def _event_dict(event):
+    if event is None:
+        return None
+    return {'action': ACTION_NAMES[event.action], 'amount': event.amount}
+
+
+# Cliente
+
+
+class MatchClient:
+    """Cliente assíncrono: vários pedidos em andamento na mesma conexão"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, host=None, port=None):
+        config = GAME_CONFIG['SERVER_CONFIG']
+        reader, writer = await asyncio.open_connection(
+            config.get('HOST', '127.0.0.1') if host is None else host,
+            config.get('PORT', 8765) if port is None else port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        """Manda um pedido e espera a resposta (um dicionário)"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        fields.update(op=op, id=request_id)
+        async with self._write_lock:
+            self.writer.write(json.dumps(fields, separators=(',', ':')).encode('utf-8') + b'\n')
+            await self.writer.drain()
+        return await future
+
+    async def _read(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._waiting.pop(reply.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("conexão encerrada pelo servidor"))
+            self._waiting.clear()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._reader_task.cancel()
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class LoadReport:
+    """Resultado de run_load(): latências dos turnos e vazão"""
+
+    def __init__(self, matches, finished, latencies, elapsed, errors):
+        self.matches = matches  # Partidas abertas ao mesmo tempo
+        self.finished = finished  # Partidas jogadas até o fim
+        self.latencies = np.asarray(latencies)  # Segundos, um por turno
+        self.elapsed = elapsed
+        self.errors = errors
+
+    @property
+    def turns(self):
+        return len(self.latencies)
+
+    def percentile(self, q):
+        """Latência do percentil `q`, em milissegundos"""
+        return float(np.percentile(self.latencies, q)) * 1000 if self.turns else 0.0
+
+    @property
+    def turns_per_second(self):
+        return self.turns / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format(self):
+        return (f"{self.matches:6d} partidas simultâneas: {self.turns} turnos em "
+                f"{self.elapsed:.1f}s ({self.turns_per_second:,.0f} turnos/s) | "
+                f"p50 {self.percentile(50):.1f} ms, p99 {self.percentile(99):.1f} ms, "
+                f"máx. {self.latencies.max() * 1000 if self.turns else 0:.1f} ms | "
+                f"{self.finished} terminadas, {self.errors} erros")
+
+
+async def run_load(matches, host=None, port=None, agent=None, connections=None, seed=0,
+                   max_turns=1000):
+    """Joga `matches` partidas ao mesmo tempo contra o servidor
+
+    O jogador cura com HP abaixo de 30% (na maioria das vezes) e senão ataca.
+
+    Args:
+        matches: Partidas simultâneas
+        agent: Agente inimigo (padrão: DEFAULT_AGENT do servidor)
+        connections: Conexões TCP usadas (padrão: uma para cada 100 partidas)
+        seed: Semente das escolhas do jogador
+        max_turns: Turnos jogados, no máximo, em cada partida
+
+    Returns:
+        LoadReport
+    """
+    connections = connections or max(1, math.ceil(matches / 100))
+    clients = [await MatchClient.connect(host, port) for _ in range(connections)]
+    latencies = []
+    counters = {'finished': 0, 'errors': 0}
+
+    async def play(index):
+        client = clients[index % connections]
+        rng = random.Random(seed * 1000003 + index)
+        reply = await client.request('new', agent=agent)
+        if not reply['ok']:
+            counters['errors'] += 1
+            return
+        match, limit = reply['match'], 0.3 * reply['max_hp']
+        state = reply['state']
+        for _ in range(max_turns):
+            low = state['player_hp'] < limit and rng.random() < 0.8
+            start = time.perf_counter()
+            reply = await client.request('act', match=match, action='heal' if low else 'attack')
+            latencies.append(time.perf_counter() - start)
+            if not reply['ok']:
+                counters['errors'] += 1
+                return
+            state = reply['state']
+            if state['winner'] is not None:
+                counters['finished'] += 1
+                return
+        await client.request('quit', match=match)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play(index) for index in range(matches)))
+    finally:
+        for client in clients:
+            await client.close()
+    return LoadReport(matches, counters['finished'], latencies, time.perf_counter() - start,
+                      counters['errors'])
+
+
+def main(argv=None):
+    """Servidor de partidas ou gerador de carga"""
+    parser = argparse.ArgumentParser(description="Servidor de partidas do combate por turnos")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processos da IA (0 = número de CPUs)")
+    parser.add_argument('--load', type=int, nargs='+', metavar='PARTIDAS',
+                        help="gera carga com estes números de partidas simultâneas")
+    parser.add_argument('--agent', default=None, help="agente inimigo nas partidas de carga")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        async def load():
+            for matches in args.load:
+                report = await run_load(matches, args.host, args.port, args.agent)
+                print(report.format())
+        asyncio.run(load())
+        return
+
+    async def serve():
+        server = MatchServer(args.host, args.port, workers=args.workers)
+        await server.start()
+        try:
+            # SIGTERM encerra como o Ctrl+C, sem deixar os processos do pool órfãos
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                          asyncio.current_task().cancel)
+        except NotImplementedError:  # Windows
+            pass
+        print(f"🌐 Servidor de partidas em {server.host}:{server.port} "
+              f"({server.ai.workers} processos para a IA)", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nServidor encerrado.")
+
+
+__all__ = [
+    "AIPool",
+    "LoadReport",
+    "MatchClient",
+    "MatchServer",
+    "ProtocolError",
+    "ServerMatch",
+    "run_load",
+]
+
+
+if __name__ == "__main__":
+    main()
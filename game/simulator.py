@@ -0,0 +1,262 @@
+"""
+Simulador de partidas em lote
+
+simulate() joga N partidas ao mesmo tempo, turno a turno, com o estado de
+todas em arrays NumPy (HPs, defesas, turno). Cada turno segue as regras de
+RulesEngine.play_turn(): as defesas acabam, o jogador age e, se o inimigo
+sobreviver, o inimigo age. Dano (ataque + variação de -5 a 5, menos a
+defesa do alvo se ele estiver defendendo, no mínimo 1) e cura (HEAL_MIN a
+HEAL_MAX, até o HP máximo) são sorteados para todas as partidas de uma vez.
+
+As políticas são vetorizadas: recebem um BatchView com os arrays das
+partidas em andamento e devolvem um array de ações (ATTACK, DEFEND, HEAL
+de game.rules). As partidas que terminam saem dos arrays, então o custo de
+cada turno acompanha o número de partidas ainda em jogo.
+
+Partidas demais para a memória são jogadas em blocos de `chunk_size`.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .rules import ATTACK, DAMAGE_VARIATION, DEFEND, ENEMY, HEAL, PLAYER, BattleRules
+
+# Vencedor de uma partida que chegou ao limite de turnos
+NO_WINNER = -1
+
+# Partidas simuladas juntas; cada uma ocupa algumas dezenas de bytes por array
+CHUNK_SIZE = 1 << 20
+
+# Estado das partidas em andamento, visto pelas políticas (um elemento por partida)
+BatchView = namedtuple('BatchView', ['player_hp', 'enemy_hp', 'player_defending',
+                                     'enemy_defending', 'turn'])
+
+
+class SimulationResult:
+    """Resultado de simulate(): um elemento por partida, na ordem das partidas"""
+
+    def __init__(self, winners, turns, player_hp, enemy_hp, elapsed):
+        self.winners = winners  # PLAYER, ENEMY ou NO_WINNER (int8)
+        self.turns = turns  # Turnos jogados (int32)
+        self.player_hp = player_hp  # HPs finais
+        self.enemy_hp = enemy_hp
+        self.elapsed = elapsed  # Segundos
+
+    def __len__(self):
+        return len(self.winners)
+
+    @property
+    def player_wins(self):
+        return int(np.count_nonzero(self.winners == PLAYER))
+
+    @property
+    def enemy_wins(self):
+        return int(np.count_nonzero(self.winners == ENEMY))
+
+    @property
+    def unfinished(self):
+        return int(np.count_nonzero(self.winners == NO_WINNER))
+
+    @property
+    def player_win_rate(self):
+        return self.player_wins / len(self) if len(self) else 0.0
+
+    @property
+    def total_turns(self):
+        return int(self.turns.sum(dtype=np.int64))
+
+    @property
+    def matches_per_second(self):
+        return len(self) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def turns_per_second(self):
+        return self.total_turns / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """Resumo de uma linha"""
+        return (f"{len(self)} partidas: jogador {self.player_win_rate:.1%}, "
+                f"inimigo {self.enemy_wins / max(len(self), 1):.1%}, "
+                f"{self.turns.mean() if len(self) else 0:.1f} turnos em média | "
+                f"{self.matches_per_second:,.0f} partidas/s, {self.turns_per_second:,.0f} turnos/s")
+
+    def __repr__(self):
+        return f"SimulationResult({self.summary()})"
+
+
+def _attack(count, attack, defending, defense, rng):
+    """Dano de `count` ataques; `defending` (ou None) marca os alvos defendendo"""
+    damage = np.maximum(1, attack + rng.integers(-DAMAGE_VARIATION, DAMAGE_VARIATION + 1,
+                                                 count, dtype=np.int32))
+    if defending is not None:
+        damage = np.where(defending, np.maximum(1, damage - defense), damage)
+    return damage
+
+
+def _simulate_chunk(count, player_policy, enemy_policy, rules, rng, max_turns, start_state):
+    """Joga `count` partidas; devolve (vencedores, turnos, HP do jogador, HP do inimigo)"""
+    max_hp = rules.max_hp
+    winners = np.full(count, NO_WINNER, dtype=np.int8)
+    turns = np.full(count, max_turns, dtype=np.int32)
+    final_player_hp = np.empty(count, dtype=np.int32)
+    final_enemy_hp = np.empty(count, dtype=np.int32)
+
+    # Arrays só das partidas em andamento; `index` diz de qual partida é cada linha
+    index = np.arange(count)
+    player_hp = np.full(count, start_state[0], dtype=np.int32)
+    enemy_hp = np.full(count, start_state[1], dtype=np.int32)
+    no_defense = np.zeros(count, dtype=bool)
+
+    for turn in range(1, max_turns + 1):
+        active = len(index)
+        if active == 0:
+            break
+        turn_array = np.full(active, turn, dtype=np.int32)
+        not_defending = no_defense[:active]
+
+        # Jogador (o inimigo nunca está defendendo: as defesas acabaram no início do turno)
+        actions = np.asarray(player_policy(BatchView(player_hp, enemy_hp, not_defending,
+                                                     not_defending, turn_array)))
+        attack = actions == ATTACK
+        if attack.any():
+            damage = _attack(active, rules.player_attack, None, 0, rng)
+            enemy_hp = np.where(attack, np.maximum(0, enemy_hp - damage), enemy_hp)
+        heal = actions == HEAL
+        if heal.any():
+            healing = rng.integers(rules.heal_min, rules.heal_max + 1, active, dtype=np.int32)
+            player_hp = np.where(heal, np.minimum(max_hp, player_hp + healing), player_hp)
+        player_defending = actions == DEFEND
+
+        # Inimigo, nas partidas em que ele sobreviveu
+        alive = enemy_hp > 0
+        actions = np.asarray(enemy_policy(BatchView(player_hp, enemy_hp, player_defending,
+                                                    not_defending, turn_array)))
+        attack = (actions == ATTACK) & alive
+        if attack.any():
+            damage = _attack(active, rules.ai_attack, player_defending, rules.player_defense, rng)
+            player_hp = np.where(attack, np.maximum(0, player_hp - damage), player_hp)
+        heal = (actions == HEAL) & alive
+        if heal.any():
+            healing = rng.integers(rules.heal_min, rules.heal_max + 1, active, dtype=np.int32)
+            enemy_hp = np.where(heal, np.minimum(max_hp, enemy_hp + healing), enemy_hp)
+
+        # Partidas terminadas saem dos arrays
+        player_won = ~alive
+        enemy_won = alive & (player_hp <= 0)
+        finished = player_won | enemy_won
+        if finished.any():
+            done = index[finished]
+            winners[done] = np.where(player_won[finished], PLAYER, ENEMY)
+            turns[done] = turn
+            final_player_hp[done] = player_hp[finished]
+            final_enemy_hp[done] = enemy_hp[finished]
+            keep = ~finished
+            index, player_hp, enemy_hp = index[keep], player_hp[keep], enemy_hp[keep]
+
+    final_player_hp[index] = player_hp
+    final_enemy_hp[index] = enemy_hp
+    return winners, turns, final_player_hp, final_enemy_hp
+
+
+def simulate(count, player_policy, enemy_policy, rules=None, rng=None, max_turns=1000,
+             player_hp=None, enemy_hp=None, chunk_size=CHUNK_SIZE):
+    """Joga `count` partidas entre duas políticas vetorizadas
+
+    Args:
+        count: Número de partidas
+        player_policy: Função BatchView -> array de ações do jogador
+        enemy_policy: Função BatchView -> array de ações do inimigo (vê a ação
+            do jogador já aplicada, como no jogo)
+        rules: BattleRules (padrão: GAME_CONFIG atual)
+        rng: np.random.Generator ou semente (padrão: sem semente)
+        max_turns: Turnos até a partida terminar sem vencedor
+        player_hp: HP inicial do jogador (padrão: HP máximo)
+        enemy_hp: HP inicial do inimigo (padrão: HP máximo)
+        chunk_size: Partidas simuladas juntas
+
+    Returns:
+        SimulationResult
+    """
+    rules = BattleRules.from_config() if rules is None else rules
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    start_state = (rules.max_hp if player_hp is None else player_hp,
+                   rules.max_hp if enemy_hp is None else enemy_hp)
+
+    start = time.perf_counter()
+    parts = [_simulate_chunk(min(chunk_size, count - first), player_policy, enemy_policy, rules,
+                             rng, max_turns, start_state)
+             for first in range(0, count, chunk_size)]
+    elapsed = time.perf_counter() - start
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int32)
+        return SimulationResult(np.empty(0, dtype=np.int8), empty, empty, empty, elapsed)
+    return SimulationResult(*(np.concatenate(column) for column in zip(*parts)), elapsed)
+
+
+# Políticas prontas
+
+
+def constant_policy(action):
+    """Sempre a mesma ação"""
+    return lambda view: np.full(len(view.turn), action, dtype=np.int8)
+
+
+def random_policy(rng=None, probabilities=None):
+    """Ações sorteadas (padrão: ATTACK, DEFEND e HEAL com a mesma chance)"""
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    actions = np.array([ATTACK, DEFEND, HEAL], dtype=np.int8)
+    return lambda view: rng.choice(actions, len(view.turn), p=probabilities)
+
+
+def heal_when_low(side, threshold=0.3, max_hp=None):
+    """Cura com HP abaixo de `threshold` x HP máximo, senão ataca
+
+    Args:
+        side: PLAYER ou ENEMY (de quem é o HP olhado)
+    """
+    limit = threshold * (BattleRules.from_config().max_hp if max_hp is None else max_hp)
+
+    def policy(view):
+        hp = view.player_hp if side == PLAYER else view.enemy_hp
+        return np.where(hp < limit, HEAL, ATTACK).astype(np.int8)
+    return policy
+
+
+def neural_policy(neural_ai, exploration_rate=0.0):
+    """Política do inimigo dada pela NeuralAI (decide_action_indices() em lote)"""
+    def policy(view):
+        return neural_ai.decide_action_indices(view.player_hp, view.enemy_hp,
+                                               view.player_defending, view.enemy_defending,
+                                               view.turn, exploration_rate=exploration_rate)
+    return policy
+
+
+def minimax_policy(depth, config=None):
+    """Política do inimigo dada por batch_minimax() com profundidade fixa"""
+    from .batch_search import NO_ACTION, batch_minimax
+
+    # minimax.ACTIONS é ('attack', 'heal', 'defend')
+    to_rules = np.array([ATTACK, HEAL, DEFEND], dtype=np.int8)
+
+    def policy(view):
+        _, actions = batch_minimax(view.player_hp, view.enemy_hp, False, view.player_defending,
+                                   view.enemy_defending, depth=depth, maximizing_player=True,
+                                   config=config)
+        return np.where(actions == NO_ACTION, ATTACK, to_rules[actions])
+    return policy
+
+
+__all__ = [
+    "BatchView",
+    "NO_WINNER",
+    "SimulationResult",
+    "constant_policy",
+    "heal_when_low",
+    "minimax_policy",
+    "neural_policy",
+    "random_policy",
+    "simulate",
+]
@@ -0,0 +1,316 @@
+"""
+Tablebase exata do modelo determinístico de combate
+
+Resolve por análise retrógrada todos os estados vistos pelo Minimax (HP de
+0 a MAX_HP para cada lado, de quem é a vez e as duas flags de defesa) e
+guarda o valor teórico e a melhor ação de cada um em um arquivo binário
+compacto, lido com memory-map. O arquivo é identificado por um hash das
+regras de GAME_CONFIG usadas na construção.
+
+Só a dificuldade mais alta (MINIMAX_DEPTH a partir de TABLEBASE_MIN_DEPTH,
+o DIFICIL) consulta a tablebase, e as regras dela (AI_ATTACK) são outras:
+construa a tablebase do nível que vai ser jogado.
+
+Uso pela linha de comando:
+    python -m game.tablebase --difficulty DIFICIL
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from .config import GAME_CONFIG, difficulty_config
+from .minimax import ACTIONS, SearchResult
+from .rules import RULE_KEYS
+
+FORMAT_VERSION = 1
+MAGIC = b'TBASE\x00\x00\x00'
+# magic, versão, MAX_HP, número de estados, hash das regras
+HEADER_FORMAT = '<8sIIQ32s'
+HEADER_SIZE = 64
+
+WIN_SCORE = 10000
+NO_ACTION = 255
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class TablebaseError(Exception):
+    """Arquivo de tablebase inválido ou construído com outras regras"""
+
+
+def rules_hash(config=None) -> str:
+    """Hash das regras de combate que definem a tablebase"""
+    config = GAME_CONFIG if config is None else config
+    rules = {key: config[key] for key in RULE_KEYS}
+    rules['FORMAT_VERSION'] = FORMAT_VERSION
+    digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def default_path(config=None) -> str:
+    """Caminho padrão da tablebase para as regras atuais"""
+    return os.path.join(DATA_DIR, f"tablebase_{rules_hash(config)}.bin")
+
+
+def state_index(player_hp, enemy_hp, player_turn, player_defending, enemy_defending, max_hp):
+    """Posição de um estado nos arrays da tablebase"""
+    return ((((player_hp * (max_hp + 1)) + enemy_hp) * 2 + int(player_turn)) * 4
+            + int(player_defending) * 2 + int(enemy_defending))
+
+
+def solve(config=None):
+    """Resolve o jogo e retorna (scores int16, actions uint8)
+
+    O score é do ponto de vista da IA: WIN_SCORE - n quando a IA vence em n
+    meias-jogadas, o negativo disso quando o jogador vence e 0 para empate
+    (nenhum lado consegue forçar a vitória).
+    """
+    config = GAME_CONFIG if config is None else config
+    max_hp = config['MAX_HP']
+    size = (max_hp + 1) ** 2 * 8
+
+    index = np.arange(size, dtype=np.int64)
+    enemy_defending = index & 1
+    player_defending = (index >> 1) & 1
+    player_turn = (index >> 2) & 1
+    hp_pair = index >> 3
+    enemy_hp = hp_pair % (max_hp + 1)
+    player_hp = hp_pair // (max_hp + 1)
+
+    healing = (config['HEAL_MIN'] + config['HEAL_MAX']) // 2
+    player_damage = np.where(enemy_defending == 1,
+                             max(1, config['PLAYER_ATTACK'] - config['AI_DEFENSE']),
+                             config['PLAYER_ATTACK'])
+    ai_damage = np.where(player_defending == 1,
+                         max(1, config['AI_ATTACK'] - config['PLAYER_DEFENSE']),
+                         config['AI_ATTACK'])
+    is_player = player_turn == 1
+    next_turn = 1 - player_turn
+
+    def child(new_player_hp, new_enemy_hp, new_player_defending, new_enemy_defending):
+        return ((new_player_hp * (max_hp + 1) + new_enemy_hp) * 2 + next_turn) * 4 \
+            + new_player_defending * 2 + new_enemy_defending
+
+    zeros = np.zeros(size, dtype=np.int64)
+    ones = np.ones(size, dtype=np.int64)
+    attack = np.where(is_player,
+                      child(player_hp, np.maximum(0, enemy_hp - player_damage), zeros, zeros),
+                      child(np.maximum(0, player_hp - ai_damage), enemy_hp, zeros, zeros))
+    heal = np.where(is_player,
+                    child(np.minimum(max_hp, player_hp + healing), enemy_hp, zeros, zeros),
+                    child(player_hp, np.minimum(max_hp, enemy_hp + healing), zeros, zeros))
+    defend = np.where(is_player,
+                      child(player_hp, enemy_hp, ones, zeros),
+                      child(player_hp, enemy_hp, zeros, ones))
+    children = np.stack([attack, heal, defend], axis=1)  # ordem de ACTIONS
+
+    # +1 = vitória da IA, -1 = vitória do jogador, 0 = ainda indefinido/empate
+    status = np.zeros(size, dtype=np.int8)
+    status[enemy_hp == 0] = -1
+    status[player_hp == 0] = 1
+    terminal = status != 0
+    distance = np.zeros(size, dtype=np.int32)
+
+    # Quem joga vence com +1 (IA) ou -1 (jogador)
+    mover_win = np.where(is_player, -1, 1).astype(np.int8)
+
+    plies = 0
+    while True:
+        plies += 1
+        child_status = status[children]
+        open_states = status == 0
+        wins = open_states & (child_status == mover_win[:, None]).any(axis=1)
+        losses = open_states & ~wins & (child_status == -mover_win[:, None]).all(axis=1)
+        if not wins.any() and not losses.any():
+            break
+        status[wins] = mover_win[wins]
+        status[losses] = -mover_win[losses]
+        distance[wins | losses] = plies
+
+    scores = np.where(status == 0, 0, status * (WIN_SCORE - distance)).astype(np.int16)
+
+    # Melhor ação: vencer o mais rápido possível, perder o mais tarde possível
+    # e, no empate, manter o empate com a melhor avaliação estática
+    child_scores = scores[children].astype(np.int32)
+    mover_scores = child_scores * mover_win[:, None]
+    drawn_children = status[children] == 0
+    draws = (status == 0) & ~terminal
+
+    child_player_hp = children >> 3
+    child_enemy_hp = child_player_hp % (max_hp + 1)
+    child_player_hp = child_player_hp // (max_hp + 1)
+    hp_diff = child_enemy_hp - child_player_hp
+    static = hp_diff * 10 + np.sign(hp_diff) * 50
+    static = static * mover_win[:, None]
+    draw_choice = np.argmax(np.where(drawn_children, static, np.iinfo(np.int64).min), axis=1)
+
+    actions = np.argmax(mover_scores, axis=1)
+    actions = np.where(draws, draw_choice, actions).astype(np.uint8)
+    actions[terminal] = NO_ACTION
+
+    return scores, actions
+
+
+class Tablebase:
+    """Valores e melhores ações exatas para todos os estados do combate"""
+
+    def __init__(self, scores, actions, max_hp, version_hash):
+        self.scores = scores
+        self.actions = actions
+        self.max_hp = max_hp
+        self.version_hash = version_hash
+
+    @classmethod
+    def build(cls, config=None):
+        """Constrói a tablebase resolvendo o jogo em memória"""
+        config = GAME_CONFIG if config is None else config
+        scores, actions = solve(config)
+        return cls(scores, actions, config['MAX_HP'], rules_hash(config))
+
+    @classmethod
+    def load(cls, filepath, config=None):
+        """Abre uma tablebase em disco com memory-map, validando o cabeçalho"""
+        config = GAME_CONFIG if config is None else config
+        with open(filepath, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise TablebaseError(f"Arquivo de tablebase truncado: {filepath}")
+
+        magic, version, max_hp, size, version_hash = struct.unpack_from(HEADER_FORMAT, header)
+        version_hash = version_hash.decode('ascii')
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise TablebaseError(f"Formato de tablebase desconhecido: {filepath}")
+        if version_hash != rules_hash(config):
+            raise TablebaseError("Tablebase construída com outras regras de GAME_CONFIG")
+        if size != (max_hp + 1) ** 2 * 8:
+            raise TablebaseError(f"Tamanho inconsistente na tablebase: {filepath}")
+
+        scores = np.memmap(filepath, dtype='<i2', mode='r', offset=HEADER_SIZE, shape=(size,))
+        actions = np.memmap(filepath, dtype=np.uint8, mode='r',
+                            offset=HEADER_SIZE + 2 * size, shape=(size,))
+        return cls(scores, actions, max_hp, version_hash)
+
+    def save(self, filepath):
+        """Grava a tablebase de forma atômica (arquivo temporário + rename)"""
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, self.max_hp,
+                             len(self.scores), self.version_hash.encode('ascii'))
+        temp_path = f"{filepath}.tmp{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE, b'\x00'))
+            f.write(np.asarray(self.scores, dtype='<i2').tobytes())
+            f.write(np.asarray(self.actions, dtype=np.uint8).tobytes())
+        os.replace(temp_path, filepath)
+
+    def covers(self, state):
+        """Indica se o estado está dentro da faixa de HP da tablebase"""
+        return 0 <= state.player_hp <= self.max_hp and 0 <= state.enemy_hp <= self.max_hp
+
+    def lookup(self, state):
+        """Retorna (score, ação) para o estado, do ponto de vista da IA"""
+        i = state_index(state.player_hp, state.enemy_hp, state.player_turn,
+                        state.player_defending, state.enemy_defending, self.max_hp)
+        action = int(self.actions[i])
+        return int(self.scores[i]), (ACTIONS[action] if action != NO_ACTION else None)
+
+
+_loaded = {}
+
+
+def get_tablebase(config=None, build=False):
+    """Retorna a tablebase das regras atuais, ou None se não existir
+
+    Com build=True, constrói e grava a tablebase quando ela não existe.
+    """
+    config = GAME_CONFIG if config is None else config
+    version_hash = rules_hash(config)
+    if version_hash in _loaded:
+        return _loaded[version_hash]
+
+    path = default_path(config)
+    tablebase = None
+    if os.path.exists(path):
+        try:
+            tablebase = Tablebase.load(path, config)
+        except (TablebaseError, OSError, ValueError) as e:
+            print(f"Tablebase ignorada: {e}")
+    if tablebase is None and build:
+        tablebase = Tablebase.build(config)
+        tablebase.save(path)
+
+    if tablebase is not None:
+        _loaded[version_hash] = tablebase
+    return tablebase
+
+
+def probe(state, config=None, depth=None):
+    """Consulta a tablebase padrão para a jogada da IA
+
+    A tablebase joga perfeito, então só é usada quando a profundidade da
+    busca (`depth`, padrão MINIMAX_DEPTH) chega a TABLEBASE_MIN_DEPTH: as
+    dificuldades mais baixas continuam limitadas pela própria busca.
+
+    Retorna SearchResult(score, action, depth), com `depth` igual à distância
+    exata até o fim da partida, ou None quando a tablebase está desativada,
+    ausente ou não cobre o estado.
+    """
+    config = GAME_CONFIG if config is None else config
+    minimax_config = config['MINIMAX_CONFIG']
+    if not minimax_config.get('USE_TABLEBASE', False):
+        return None
+    depth = config['MINIMAX_DEPTH'] if depth is None else depth
+    if depth < minimax_config.get('TABLEBASE_MIN_DEPTH', 0):
+        return None
+    tablebase = get_tablebase(config)
+    if tablebase is None or not tablebase.covers(state):
+        return None
+    score, action = tablebase.lookup(state)
+    return SearchResult(score, action, WIN_SCORE - abs(score) if score else 0)
+
+
+def main(argv=None):
+    """Linha de comando para (re)construir a tablebase"""
+    parser = argparse.ArgumentParser(description="Tablebase exata do combate por turnos")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="reconstrói a tablebase mesmo se já existir")
+    parser.add_argument('--path', default=None,
+                        help="arquivo de saída (padrão: game/data/tablebase_<hash>.bin)")
+    parser.add_argument('--difficulty', choices=list(GAME_CONFIG['DIFFICULTY_LEVELS']),
+                        default=None,
+                        help="regras do nível de DIFFICULTY_LEVELS (padrão: as de GAME_CONFIG)")
+    args = parser.parse_args(argv)
+
+    config = GAME_CONFIG if args.difficulty is None else difficulty_config(args.difficulty)
+    path = args.path or default_path(config)
+    if os.path.exists(path) and not args.rebuild:
+        tablebase = Tablebase.load(path, config)
+        print(f"Tablebase já existe: {path} ({len(tablebase.scores)} estados)")
+        return
+
+    print(f"Resolvendo {(config['MAX_HP'] + 1) ** 2 * 8} estados...")
+    start = time.perf_counter()
+    tablebase = Tablebase.build(config)
+    tablebase.save(path)
+    _loaded.pop(tablebase.version_hash, None)
+    print(f"Tablebase gravada em {path} ({time.perf_counter() - start:.1f}s)")
+
+
+__all__ = [
+    "Tablebase",
+    "TablebaseError",
+    "get_tablebase",
+    "probe",
+    "rules_hash",
+    "solve",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Treinamento da rede neural
+
+Trainer executa o laço de épocas de SimpleNeuralNetwork.fit() com:
+
+- otimizadores plugáveis (SGD, Momentum, Adam), que recebem a direção de
+  atualização de cada lote (a soma dos passos de backpropagation das
+  amostras) e decidem o passo aplicado aos parâmetros;
+- separação de uma parte das amostras para validação;
+- parada antecipada quando o erro monitorado para de cair por `patience`
+  épocas, voltando aos melhores pesos;
+- limite de tempo por chamada.
+
+Cada treinamento devolve um TrainingReport com as épocas executadas, o
+tempo gasto, os erros e o motivo da parada.
+"""
+
+import time
+
+import numpy as np
+
+# Nomes dos parâmetros da rede, na ordem usada pelos otimizadores
+PARAMETERS = ('weights_input_hidden', 'bias_hidden', 'weights_hidden_output', 'bias_output')
+
+# Motivos de parada do TrainingReport
+STOP_EPOCHS = 'epochs'
+STOP_PLATEAU = 'plateau'
+STOP_TIME_BUDGET = 'time_budget'
+
+
+class Optimizer:
+    """Base dos otimizadores: transforma a direção de cada lote em um passo"""
+
+    def __init__(self, learning_rate):
+        self.learning_rate = learning_rate
+        self.state = {}
+
+    def reset(self):
+        """Descarta o estado acumulado (chamado no início de cada treinamento)"""
+        self.state = {}
+
+    def step(self, params, directions):
+        """Atualiza `params` (dict de arrays) no lugar, a partir de `directions`"""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(learning_rate={self.learning_rate})"
+
+
+class SGD(Optimizer):
+    """Descida de gradiente simples: passo = learning_rate x direção"""
+
+    def step(self, params, directions):
+        for name, direction in directions.items():
+            params[name] += direction * self.learning_rate
+
+
+class Momentum(Optimizer):
+    """SGD com momento: o passo acumula uma fração do passo anterior"""
+
+    def __init__(self, learning_rate, momentum=0.9):
+        super().__init__(learning_rate)
+        self.momentum = momentum
+
+    def step(self, params, directions):
+        for name, direction in directions.items():
+            velocity = self.state.get(name)
+            if velocity is None:
+                velocity = self.state[name] = np.zeros_like(direction)
+            velocity *= self.momentum
+            velocity += direction * self.learning_rate
+            params[name] += velocity
+
+
+class Adam(Optimizer):
+    """Adam: passo normalizado pelas médias móveis da direção e do seu quadrado"""
+
+    def __init__(self, learning_rate=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        super().__init__(learning_rate)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+
+    def reset(self):
+        super().reset()
+        self.steps = 0
+
+    def step(self, params, directions):
+        self.steps += 1
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = 1 - self.beta2 ** self.steps
+        for name, direction in directions.items():
+            if name not in self.state:
+                self.state[name] = (np.zeros_like(direction), np.zeros_like(direction))
+            mean, square = self.state[name]
+            mean *= self.beta1
+            mean += (1 - self.beta1) * direction
+            square *= self.beta2
+            square += (1 - self.beta2) * direction ** 2
+            params[name] += (self.learning_rate * (mean / correction1)
+                             / (np.sqrt(square / correction2) + self.epsilon))
+
+
+OPTIMIZERS = {
+    'sgd': SGD,
+    'momentum': Momentum,
+    'adam': Adam,
+}
+
+
+def create_optimizer(name, learning_rate=None, **kwargs):
+    """Cria um otimizador pelo nome ('sgd', 'momentum' ou 'adam')"""
+    try:
+        optimizer_class = OPTIMIZERS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Otimizador desconhecido: {name!r} "
+                         f"(use {', '.join(sorted(OPTIMIZERS))})") from None
+    if learning_rate is not None:
+        kwargs['learning_rate'] = learning_rate
+    return optimizer_class(**kwargs)
+
+
+class TrainingReport:
+    """Resultado de um treinamento"""
+
+    def __init__(self):
+        self.epochs = 0  # Épocas executadas
+        self.max_epochs = 0
+        self.elapsed = 0.0  # Segundos
+        self.stop_reason = STOP_EPOCHS
+        self.train_loss = 0.0  # Erro médio de treino da última época
+        self.val_loss = None  # Erro de validação da última época (sem validação: None)
+        self.best_loss = None  # Melhor erro monitorado
+        self.best_epoch = 0
+        self.history = []  # Erro monitorado de cada época
+        self.samples = 0
+        self.validation_samples = 0
+
+    def to_dict(self):
+        return {
+            'epochs': self.epochs,
+            'max_epochs': self.max_epochs,
+            'elapsed': self.elapsed,
+            'stop_reason': self.stop_reason,
+            'train_loss': self.train_loss,
+            'val_loss': self.val_loss,
+            'best_loss': self.best_loss,
+            'best_epoch': self.best_epoch,
+            'samples': self.samples,
+            'validation_samples': self.validation_samples
+        }
+
+    def format(self):
+        """Resumo de uma linha para logs"""
+        reasons = {STOP_EPOCHS: 'limite de épocas', STOP_PLATEAU: 'erro estabilizado',
+                   STOP_TIME_BUDGET: 'limite de tempo'}
+        text = (f"{self.epochs}/{self.max_epochs} épocas em {self.elapsed * 1000:.0f}ms "
+                f"({reasons[self.stop_reason]}) | erro {self.train_loss:.4f}")
+        if self.val_loss is not None:
+            text += f" | validação {self.val_loss:.4f}"
+        return text
+
+    def __repr__(self):
+        return f"TrainingReport({self.format()})"
+
+
+class Trainer:
+    """Laço de treinamento em mini-batches com parada antecipada"""
+
+    def __init__(self, optimizer=None, batch_size=32, shuffle=True, validation_split=0.0,
+                 patience=None, min_delta=0.0, time_budget=None, restore_best=True,
+                 verbose=True):
+        """
+        Args:
+            optimizer: Optimizer, nome de um otimizador ou None (SGD com a taxa
+                de aprendizado da rede)
+            batch_size: Amostras por lote (0 = todas em um lote)
+            shuffle: Embaralha as amostras a cada época
+            validation_split: Fração das amostras separada para validação
+            patience: Épocas sem melhora antes de parar (None = sem parada antecipada)
+            min_delta: Queda mínima do erro para contar como melhora
+            time_budget: Tempo máximo do treinamento, em segundos (None = sem limite)
+            restore_best: Na parada antecipada, volta aos pesos da melhor época
+            verbose: Imprime o erro a cada 100 épocas
+        """
+        self.optimizer = optimizer
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.validation_split = validation_split
+        self.patience = patience
+        self.min_delta = min_delta
+        self.time_budget = time_budget
+        self.restore_best = restore_best
+        self.verbose = verbose
+
+    def _optimizer_for(self, network):
+        if self.optimizer is None:
+            return SGD(network.learning_rate)
+        if isinstance(self.optimizer, str):
+            return create_optimizer(self.optimizer)
+        return self.optimizer
+
+    def fit(self, network, inputs, expected_outputs, epochs=1000, sample_weight=None):
+        """Treina `network` e devolve o TrainingReport
+
+        `sample_weight` (um peso por amostra, como os pesos de importância do
+        replay priorizado) multiplica a contribuição de cada amostra no
+        gradiente e no erro de treino; a validação não usa pesos.
+
+        O erro de cada época é registrado em network.performance_history a
+        cada 100 épocas, como antes.
+        """
+        start = time.perf_counter()
+        report = TrainingReport()
+        report.max_epochs = epochs
+
+        inputs = np.asarray(inputs, dtype=float).reshape(-1, network.input_size)
+        expected_outputs = np.asarray(expected_outputs, dtype=float).reshape(-1, network.output_size)
+        count = len(inputs)
+        if count == 0 or epochs <= 0:
+            return report
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight, dtype=float).reshape(count)
+
+        # Separa a validação (só se sobrar pelo menos uma amostra para treino)
+        validation_count = int(count * self.validation_split)
+        if 0 < validation_count < count:
+            order = np.random.permutation(count)
+            validation_inputs = inputs[order[:validation_count]]
+            validation_outputs = expected_outputs[order[:validation_count]]
+            training = order[validation_count:]
+            inputs, expected_outputs = inputs[training], expected_outputs[training]
+            if sample_weight is not None:
+                sample_weight = sample_weight[training]
+            count -= validation_count
+        else:
+            validation_count = 0
+        report.samples = count
+        report.validation_samples = validation_count
+
+        batch_size = min(self.batch_size, count) if self.batch_size > 0 else count
+        optimizer = self._optimizer_for(network)
+        optimizer.reset()
+        params = {name: getattr(network, name) for name in PARAMETERS}
+
+        best_params = None
+        epochs_without_improvement = 0
+        for epoch in range(epochs):
+            if self.shuffle:
+                order = np.random.permutation(count)
+                epoch_inputs, epoch_outputs = inputs[order], expected_outputs[order]
+                epoch_weights = None if sample_weight is None else sample_weight[order]
+            else:
+                epoch_inputs, epoch_outputs = inputs, expected_outputs
+                epoch_weights = sample_weight
+
+            total_error = 0.0
+            for batch_start in range(0, count, batch_size):
+                batch = slice(batch_start, batch_start + batch_size)
+                directions, error = network.gradients(
+                    epoch_inputs[batch], epoch_outputs[batch],
+                    None if epoch_weights is None else epoch_weights[batch])
+                optimizer.step(params, directions)
+                total_error += error
+            report.train_loss = total_error / count
+            report.epochs = epoch + 1
+
+            # Registra performance a cada 100 épocas
+            if epoch % 100 == 0:
+                network.performance_history.append(report.train_loss)
+                if self.verbose:
+                    print(f"Época {epoch}: Erro médio = {report.train_loss:.4f}")
+
+            if validation_count:
+                report.val_loss = network.loss(validation_inputs, validation_outputs)
+                monitored = report.val_loss
+            else:
+                monitored = report.train_loss
+            report.history.append(monitored)
+
+            if report.best_loss is None or monitored < report.best_loss - self.min_delta:
+                report.best_loss = monitored
+                report.best_epoch = epoch + 1
+                epochs_without_improvement = 0
+                if self.patience is not None and self.restore_best:
+                    best_params = {name: np.array(value) for name, value in params.items()}
+            else:
+                epochs_without_improvement += 1
+
+            if self.patience is not None and epochs_without_improvement >= self.patience:
+                report.stop_reason = STOP_PLATEAU
+                break
+            if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                report.stop_reason = STOP_TIME_BUDGET
+                break
+
+        if report.stop_reason == STOP_PLATEAU and best_params is not None:
+            for name, value in best_params.items():
+                params[name][...] = value
+
+        network.generation += 1
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+__all__ = [
+    "Adam",
+    "Momentum",
+    "OPTIMIZERS",
+    "Optimizer",
+    "SGD",
+    "STOP_EPOCHS",
+    "STOP_PLATEAU",
+    "STOP_TIME_BUDGET",
+    "Trainer",
+    "TrainingReport",
+    "create_optimizer",
+]
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from .config import GAME_CONFIG
+
+# Tipos de limite guardados em cada entrada
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+EVICTION_POLICIES = ('lru', 'fifo', 'depth')
+
+
+class TranspositionTable:
+    """Tabela de transposição limitada para a busca do Minimax
+
+    As entradas são tuplas (depth, flag, value, best_move) indexadas pela
+    chave inteira do estado (ver BattleState.to_key). A tabela pode ser
+    mantida entre os turnos de uma mesma partida.
+
+    Políticas de remoção quando a tabela está cheia:
+    - 'lru': remove a entrada usada há mais tempo
+    - 'fifo': remove a entrada inserida há mais tempo
+    - 'depth': entre as entradas mais antigas, remove a de menor profundidade
+    """
+
+    def __init__(self, max_entries=200000, policy='lru', exact_depth=True, depth_sample=8):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            policy: Política de remoção ('lru', 'fifo' ou 'depth')
+            exact_depth: Se True, só reaproveita valores buscados exatamente na
+                mesma profundidade, mantendo o resultado idêntico à busca sem
+                tabela. Com False, entradas mais profundas também são usadas.
+            depth_sample: Quantas entradas antigas a política 'depth' examina
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Política de remoção inválida: {policy}")
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser positivo")
+
+        self.max_entries = max_entries
+        self.policy = policy
+        self.exact_depth = exact_depth
+        self.depth_sample = depth_sample
+        self._entries = OrderedDict()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def probe(self, key):
+        """Retorna a entrada de `key` ou None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_usable(self, entry_depth, depth):
+        """Indica se um valor buscado em `entry_depth` serve para `depth`"""
+        if self.exact_depth:
+            return entry_depth == depth
+        return entry_depth >= depth
+
+    def store(self, key, depth, flag, value, best_move):
+        """Guarda o resultado de uma busca"""
+        entries = self._entries
+        old = entries.get(key)
+        if old is not None:
+            # Na política 'depth' uma busca mais rasa não sobrescreve uma profunda
+            if self.policy == 'depth' and old[0] > depth:
+                return
+            entries[key] = (depth, flag, value, best_move)
+            if self.policy == 'lru':
+                entries.move_to_end(key)
+            self.stores += 1
+            return
+
+        if len(entries) >= self.max_entries:
+            self._evict()
+        entries[key] = (depth, flag, value, best_move)
+        self.stores += 1
+
+    def _evict(self):
+        entries = self._entries
+        if self.policy == 'depth':
+            victim = None
+            victim_depth = None
+            for i, (key, entry) in enumerate(entries.items()):
+                if i >= self.depth_sample:
+                    break
+                if victim is None or entry[0] < victim_depth:
+                    victim, victim_depth = key, entry[0]
+            del entries[victim]
+        else:
+            entries.popitem(last=False)
+        self.evictions += 1
+
+    def clear(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        self._entries.clear()
+
+    def reset_stats(self):
+        """Zera os contadores de acertos, falhas e remoções"""
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        """Retorna os contadores da tabela"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'capacity': self.max_entries,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def create_transposition_table() -> TranspositionTable:
+    """Cria uma tabela de transposição com as configurações do Minimax"""
+    config = GAME_CONFIG['MINIMAX_CONFIG']
+    return TranspositionTable(max_entries=config['TT_SIZE'], policy=config['TT_POLICY'])
+
+
+__all__ = [
+    "TranspositionTable",
+    "create_transposition_table",
+    "EXACT",
+    "LOWER_BOUND",
+    "UPPER_BOUND",
+    "EVICTION_POLICIES",
+]
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .game_gui import GameGUI
-from .config import GAME_CONFIG, GUI_CONFIG, STYLE_CONFIG
+from .config import GAME_CONFIG, GUI_CONFIG, STYLE_CONFIG, apply_difficulty
 
 class WindowManager:
     """Gerenciador de janelas do jogo"""
@@ -183,17 +183,31 @@ Sistema de IA:
                            variable=hp_var, length=200)
         hp_scale.pack(side="left")
         
+        # Dificuldade (ataque e profundidade de busca da IA)
+        difficulty_frame = tk.Frame(config_frame)
+        difficulty_frame.pack(fill="x", pady=5)
+        
+        tk.Label(difficulty_frame, text="Dificuldade:", width=15, anchor="w").pack(side="left")
+        difficulty_var = tk.StringVar(value=GAME_CONFIG['DIFFICULTY'])
+        difficulty_box = ttk.Combobox(difficulty_frame, textvariable=difficulty_var,
+                                      values=list(GAME_CONFIG['DIFFICULTY_LEVELS']),
+                                      state="readonly", width=12)
+        difficulty_box.pack(side="left")
+        
         # Botão para aplicar mudanças
         apply_btn = tk.Button(config_frame, text="💾 Aplicar Mudanças",
-                             command=lambda: self.apply_config(hp_var.get()),
+                             command=lambda: self.apply_config(hp_var.get(), difficulty_var.get()),
                              bg="lightgreen", font=("Arial", 10))
         apply_btn.pack(pady=20)
         
-    def apply_config(self, new_hp):
+    def apply_config(self, new_hp, difficulty=None):
         """Aplica novas configurações"""
         GAME_CONFIG['MAX_HP'] = new_hp
+        if difficulty is not None:
+            apply_difficulty(difficulty)
         messagebox.showinfo("Configurações", 
-                           f"HP máximo alterado para {new_hp}!")
+                           f"HP máximo alterado para {new_hp}!\n"
+                           f"Dificuldade: {GAME_CONFIG['DIFFICULTY']}")
         
     def show_config(self):
         """Mostra janela de configurações"""
@@ -391,7 +405,10 @@ Desvantagens:
         """Retreina a IA neural"""
         if hasattr(game_instance, 'neural_ai') and game_instance.neural_ai:
             game_instance.neural_ai.retrain_network()
-            messagebox.showinfo("Retreinamento", "IA Neural retreinada com sucesso!")
+            if game_instance.neural_ai.learner is not None:
+                messagebox.showinfo("Retreinamento", "Retreinamento da IA Neural iniciado em segundo plano!")
+            else:
+                messagebox.showinfo("Retreinamento", "IA Neural retreinada com sucesso!")
         else:
             messagebox.showerror("Erro", "IA Neural não encontrada!")
         
@@ -1,4 +1,21 @@
+import argparse
+
+from game.config import GAME_CONFIG, apply_difficulty
 from game.engine import run_game
 
-if __name__ == "__main__":
+
+def main(argv=None):
+    """Joga no console, opcionalmente em outro nível de DIFFICULTY_LEVELS"""
+    parser = argparse.ArgumentParser(description="Combate por turnos no console")
+    parser.add_argument('--difficulty', choices=list(GAME_CONFIG['DIFFICULTY_LEVELS']),
+                        default=None,
+                        help=f"nível de dificuldade (padrão: {GAME_CONFIG['DIFFICULTY']})")
+    args = parser.parse_args(argv)
+
+    if args.difficulty is not None:
+        apply_difficulty(args.difficulty)
     run_game()
+
+
+if __name__ == "__main__":
+    main()
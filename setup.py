@@ -59,11 +59,12 @@ setup(
             "combate-turnos=game.window_manager:run_window_manager",
             "combate-console=main:main",
             "combate-demo=demo_neural_ai:menu_principal",
+            "combate-tablebase=game.tablebase:main",
         ],
     },
     include_package_data=True,
     package_data={
-        "game": ["assets/*.png"],
+        "game": ["assets/*.png", "data/default_model.bin"],
     },
     keywords=[
         "game", "ai", "minimax", "neural-network", "turn-based", 
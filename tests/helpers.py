@@ -0,0 +1,36 @@
+"""Funções de apoio compartilhadas pelos testes"""
+
+import random
+
+import numpy as np
+
+from game.minimax import BattleState
+from game.neural_ai import SimpleNeuralNetwork
+
+
+def make_network(seed=0, **kwargs):
+    """SimpleNeuralNetwork com pesos iniciais reproduzíveis"""
+    np.random.seed(seed)
+    return SimpleNeuralNetwork(**kwargs)
+
+
+def random_states(count, seed=0, low_hp=None, min_hp=0):
+    """Lista de BattleStates com HPs de `min_hp` a 300 e vez e defesas sorteadas
+
+    Com `low_hp`, cada HP sai com a mesma chance de `min_hp` a `low_hp`, para
+    exercitar os estados terminais.
+    """
+    rng = random.Random(seed)
+
+    def hp():
+        if low_hp is None:
+            return rng.randint(min_hp, 300)
+        return rng.choice([rng.randint(min_hp, low_hp), rng.randint(min_hp, 300)])
+
+    states = []
+    for _ in range(count):
+        player_hp = hp()
+        enemy_hp = hp()
+        states.append(BattleState(player_hp, enemy_hp, rng.random() < 0.5,
+                                  rng.random() < 0.5, rng.random() < 0.5))
+    return states
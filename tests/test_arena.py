@@ -0,0 +1,100 @@
+import unittest
+
+from game.arena import (SPRT, MinimaxAgent, RandomAgent, ScriptedAgent, create_agent,
+                        elo_difference, elo_ratings, match_seed, play_match, run_tournament,
+                        wilson_interval)
+from game.rules import ENEMY, PLAYER, BattleRules
+
+RULES = BattleRules(max_hp=100, player_attack=20, player_defense=5, ai_attack=25,
+                    ai_defense=4, heal_min=5, heal_max=20)
+
+
+class TestMatches(unittest.TestCase):
+
+    def test_seeded_match_repeats(self):
+        results = [play_match(RandomAgent(), RandomAgent(), 42, rules=RULES) for _ in range(2)]
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(match_seed(1, 0), match_seed(1, 1))
+
+    def test_minimax_wins_from_both_sides(self):
+        """Testa o Minimax jogando como jogador (regras espelhadas) e como inimigo"""
+        for side in (PLAYER, ENEMY):
+            scores = [play_match(MinimaxAgent(3), RandomAgent(), seed, side, RULES)[0]
+                      for seed in range(10)]
+            self.assertGreaterEqual(sum(scores), 9, side)
+
+    def test_draw_at_turn_limit(self):
+        defender = ScriptedAgent('defender')
+        defender.decide = lambda state, side: 1  # DEFEND
+        score, turns = play_match(defender, defender, 0, rules=RULES, max_turns=20)
+        self.assertEqual((score, turns), (0.5, 20))
+
+    def test_unknown_agent(self):
+        with self.assertRaises(ValueError):
+            create_agent('oracle')
+        self.assertEqual(create_agent('minimax-facil').depth, 3)
+
+
+class TestStatistics(unittest.TestCase):
+
+    def test_sprt_decides(self):
+        test = SPRT(delta=0.1)
+        decisions = [test.update(1.0) for _ in range(20)]
+        self.assertEqual(decisions[-1], 'first')
+        self.assertIsNone(decisions[0])
+
+        test = SPRT(delta=0.1)
+        for _ in range(20):
+            test.update(0.0)
+        self.assertEqual(test.decision, 'second')
+
+    def test_sprt_undecided_when_even(self):
+        test = SPRT()
+        for score in [1.0, 0.0] * 100:
+            test.update(score)
+        self.assertIsNone(test.decision)
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(0.5, 100)
+        self.assertAlmostEqual(low, 0.4038, places=3)
+        self.assertAlmostEqual(high, 0.5962, places=3)
+        self.assertEqual(wilson_interval(0.0, 0), (0.0, 1.0))
+        self.assertAlmostEqual(wilson_interval(1.0, 10)[1], 1.0)
+
+    def test_elo(self):
+        self.assertAlmostEqual(elo_difference(0.75), 190.85, places=1)
+        ratings = elo_ratings(['a', 'b'], [[0, 750], [250, 0]], [[0, 1000], [1000, 0]])
+        self.assertAlmostEqual(ratings[0] - ratings[1], 190.85, delta=2)
+        self.assertAlmostEqual(ratings.sum(), 0.0)
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_round_robin_with_sprt(self):
+        seen = []
+        result = run_tournament(['random', 'aggressive', 'healer'], games=60, workers=1,
+                                seed=3, rules=RULES, on_result=seen.append)
+
+        self.assertEqual(len(seen), len(result.results))
+        self.assertEqual(result.decisions[(0, 1)], 'second')
+        # O SPRT encerra confrontos desequilibrados bem antes do limite
+        self.assertLess(result.games[0, 1], 60)
+        standings = result.standings()
+        self.assertEqual(standings[-1]['agent'], 'random')
+        self.assertTrue(all(row['score_low'] <= row['score'] <= row['score_high']
+                            for row in standings))
+        self.assertGreater(result.matches_per_second, 0)
+        self.assertIn('partidas/s', result.format())
+
+    def test_parallel_matches_serial(self):
+        """Testa que as partidas dão o mesmo resultado no pool de processos"""
+        options = dict(games=8, seed=5, rules=RULES, sprt=False)
+        serial = run_tournament(['random', 'healer'], workers=1, **options)
+        parallel = run_tournament(['random', 'healer'], workers=2, **options)
+        self.assertEqual([(r.game, r.seed, r.score, r.turns) for r in serial.results],
+                         [(r.game, r.seed, r.score, r.turns) for r in parallel.results])
+        self.assertEqual(len(serial.results), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
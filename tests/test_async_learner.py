@@ -0,0 +1,96 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+
+
+class TestAsyncLearner(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(GAME_CONFIG['NEURAL_CONFIG'], ASYNC_LEARNING=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        model_path = os.path.join(directory.name, 'model.bin')
+        SimpleNeuralNetwork().save_model(model_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ai = NeuralAI(model_path=model_path, legacy_model_path=None)
+        self.addCleanup(self.ai.close)
+
+    def learn(self, count):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(count):
+                self.ai.learn_from_experience(100, 250, 'heal', 1.0, turn_count=i % 20)
+
+    def test_learning_does_not_block(self):
+        """Testa que o treinamento fica na thread e a rede nova é trocada ao final"""
+        network = self.ai.network
+        release = threading.Event()
+        train_network = self.ai.train_network
+
+        def slow_train(target):
+            release.wait(10)
+            train_network(target)
+
+        with mock.patch.object(self.ai, 'train_network', side_effect=slow_train):
+            self.learn(50)
+            # O retreino está parado na thread, mas as decisões continuam
+            self.assertIs(self.ai.network, network)
+            self.ai.decide_action(100, 250)
+            metrics = self.ai.learner.get_metrics()
+            self.assertEqual(metrics['latest_version'], 50)
+            self.assertEqual(metrics['version_lag'], 50)
+
+            release.set()
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(self.ai.learner.flush(timeout=30))
+
+        metrics = self.ai.learner.get_metrics()
+        self.assertIsNot(self.ai.network, network)
+        self.assertEqual(metrics['queue_depth'], 0)
+        self.assertEqual(metrics['version_lag'], 0)
+        self.assertEqual(metrics['retrains'], 1)
+        self.assertEqual(self.ai.network.generation, network.generation + 1)
+        # A rede anterior não foi alterada pelo treinamento
+        self.assertEqual(len(network.performance_history) + 1,
+                         len(self.ai.network.performance_history))
+
+    def test_lag_until_next_retrain(self):
+        """Testa o atraso do modelo em uso entre dois retreinos"""
+        self.learn(60)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ai.learner.flush(timeout=30)
+
+        stats = self.ai.get_performance_stats()
+        self.assertEqual(stats['experience_count'], 60)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['version_lag'], 10)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ai.retrain_network()
+            self.ai.learner.flush(timeout=30)
+        self.assertEqual(self.ai.get_performance_stats()['version_lag'], 0)
+
+    def test_learned_network_prefers_rewarded_action(self):
+        """Testa que a rede trocada aprendeu com as experiências enviadas"""
+        self.learn(100)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ai.close()
+
+        inputs = self.ai.game_state_to_input(100, 250, turn_count=5)
+        self.assertEqual(int(np.argmax(self.ai.network.forward_batch(inputs))), 2)
+        self.assertIsNone(self.ai.learner)
+
+
+if __name__ == '__main__':
+    unittest.main()
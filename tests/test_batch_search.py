@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from game.minimax import BattleState, minimax, full_minimax, ACTIONS
+from game.batch_search import batch_minimax, batch_minimax_states, NO_ACTION
+from tests.helpers import random_states
+
+
+class TestBatchMinimax(unittest.TestCase):
+
+    def test_same_result_as_full_minimax(self):
+        """Testa se o lote devolve exatamente o score e a ação da busca exaustiva"""
+        states = random_states(200, seed=3, low_hp=40)
+        for depth in range(7):
+            for maximizing in (True, False):
+                expected = [full_minimax(state, depth, maximizing) for state in states]
+                self.assertEqual(batch_minimax_states(states, depth, maximizing), expected)
+
+    def test_same_result_as_minimax(self):
+        """Testa profundidades maiores contra a busca alpha-beta"""
+        states = random_states(40, seed=9, low_hp=40)
+        expected = [minimax(state, 9, True) for state in states]
+        self.assertEqual(batch_minimax_states(states, 9, True), expected)
+
+    def test_arrays_and_chunks(self):
+        """Testa broadcast, maximizing por estado e divisão em blocos"""
+        states = random_states(50, seed=5, low_hp=40)
+        maximizing = np.array([i % 3 == 0 for i in range(len(states))])
+        scores, actions = batch_minimax(
+            [state.player_hp for state in states], [state.enemy_hp for state in states],
+            [state.player_turn for state in states], [state.player_defending for state in states],
+            [state.enemy_defending for state in states], depth=4,
+            maximizing_player=maximizing, chunk_size=7)
+
+        self.assertEqual(scores.dtype, np.int64)
+        for state, is_max, score, action in zip(states, maximizing, scores, actions):
+            expected_score, expected_action = full_minimax(state, 4, bool(is_max))
+            self.assertEqual(score, expected_score)
+            self.assertEqual(ACTIONS[action] if action != NO_ACTION else None, expected_action)
+
+        scores, actions = batch_minimax(100, 100, False, depth=3)
+        self.assertEqual(scores.shape, ())
+        self.assertEqual((int(scores), ACTIONS[actions]), minimax(BattleState(100, 100, False), 3, True))
+
+    def test_terminal_and_zero_depth(self):
+        """Testa estados terminais e profundidade 0"""
+        scores, actions = batch_minimax([0, 50, 80], [50, 0, 60], True, depth=5)
+        self.assertEqual(scores.tolist()[:2], [10000, -10000])
+        self.assertEqual(actions.tolist()[:2], [NO_ACTION, NO_ACTION])
+        self.assertEqual(scores[2], minimax(BattleState(80, 60, True), 5, True)[0])
+
+        scores, actions = batch_minimax([10, 80], [20, 60], True, depth=0)
+        self.assertEqual(scores.tolist(), [150, -250])
+        self.assertEqual(actions.tolist(), [NO_ACTION, NO_ACTION])
+
+
+if __name__ == '__main__':
+    unittest.main()
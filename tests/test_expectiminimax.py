@@ -0,0 +1,93 @@
+import unittest
+from game.config import GAME_CONFIG
+from game.minimax import BattleState, ACTIONS
+from game.expectiminimax import (
+    ChanceTables, ExpectiminimaxSearch, expectiminimax, full_expectiminimax,
+    damage_distribution, heal_distribution
+)
+from tests.helpers import random_states
+
+
+class TestChanceTables(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = ChanceTables()
+
+    def test_distributions(self):
+        """Testa se as distribuições seguem Character.attack e Character.heal"""
+        attack = damage_distribution(25, False, 10)
+        self.assertEqual(attack, tuple((damage, 1) for damage in range(20, 31)))
+
+        defended = damage_distribution(10, True, 15)
+        self.assertEqual(defended, ((1, 11),))
+
+        heal = heal_distribution(GAME_CONFIG['HEAL_MIN'], GAME_CONFIG['HEAL_MAX'])
+        self.assertEqual(len(heal), GAME_CONFIG['HEAL_MAX'] - GAME_CONFIG['HEAL_MIN'] + 1)
+
+    def test_outcomes_are_merged_after_clamping(self):
+        """Testa se resultados com o mesmo HP final viram um único filho"""
+        state = BattleState(100, 10, True)
+        total_weight, outcomes = self.tables.outcomes(state, 'attack')
+        self.assertEqual(len(outcomes), 1)
+        self.assertEqual(outcomes[0][0], total_weight)
+        self.assertTrue(outcomes[0][1].is_terminal())
+
+        state = BattleState(GAME_CONFIG['MAX_HP'] - 2, 100, True)
+        total_weight, outcomes = self.tables.outcomes(state, 'heal')
+        self.assertEqual(len(outcomes), 1)
+        self.assertEqual(outcomes[0][1].player_hp, GAME_CONFIG['MAX_HP'])
+
+    def test_outcome_weights(self):
+        """Testa se os pesos somam o total e os filhos são distintos"""
+        for state in random_states(50, seed=7, low_hp=60):
+            for action in ACTIONS:
+                total_weight, outcomes = self.tables.outcomes(state, action)
+                self.assertEqual(sum(weight for weight, _ in outcomes), total_weight)
+                keys = [child.to_key() for _, child in outcomes]
+                self.assertEqual(len(keys), len(set(keys)))
+                for _, child in outcomes:
+                    self.assertEqual(child.player_turn, not state.player_turn)
+
+    def test_bounds_contain_value(self):
+        """Testa se o valor buscado fica dentro dos limites de bounds()"""
+        for i, state in enumerate(random_states(40, seed=11, low_hp=60)):
+            depth = i % 3
+            low, high = self.tables.bounds(state, depth)
+            value, _ = full_expectiminimax(state, depth, not state.player_turn, self.tables)
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+
+
+class TestExpectiminimax(unittest.TestCase):
+
+    def test_same_result_as_full_expectiminimax(self):
+        """Testa se a busca com poda devolve o mesmo valor e ação da exaustiva"""
+        tables = ChanceTables()
+        for i, state in enumerate(random_states(60, seed=7, low_hp=60)):
+            depth = i % 4
+            maximizing = not state.player_turn
+            expected_score, expected_action = full_expectiminimax(state, depth, maximizing, tables)
+            for star2 in (False, True):
+                score, action = expectiminimax(state, depth, maximizing, tables, star2=star2)
+                self.assertAlmostEqual(score, expected_score, places=6)
+                self.assertEqual(action, expected_action)
+
+    def test_pruning_reduces_nodes(self):
+        """Testa se a poda visita bem menos nós que a busca exaustiva"""
+        tables = ChanceTables()
+        search = ExpectiminimaxSearch(tables)
+        score, action = search.search(BattleState(300, 300, False), 4, True)
+
+        # Sem poda cada nível tem 3 ações x 11 a 16 resultados: bem mais de 33^3 nós
+        self.assertIn(action, ACTIONS)
+        self.assertGreater(search.cutoffs, 0)
+        self.assertLess(search.nodes, 33 ** 3)
+
+    def test_terminal_state(self):
+        """Testa estados terminais"""
+        self.assertEqual(expectiminimax(BattleState(0, 50, False), 6), (10000, None))
+        self.assertEqual(expectiminimax(BattleState(50, 0, False), 6), (-10000, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from game.experience_buffer import ExperienceBuffer
+
+
+def experience(i):
+    """Experiência identificável pelo número i"""
+    return np.full(6, i, dtype=np.float32), np.full(3, -i, dtype=np.float32)
+
+
+class TestExperienceBuffer(unittest.TestCase):
+
+    def fill(self, buffer, count, start=0):
+        for i in range(start, start + count):
+            inputs, target = experience(i)
+            buffer.append(inputs, target, action=i % 3, reward=i / 2, turn=i)
+
+    def test_append_and_recent(self):
+        """Testa as experiências mais recentes antes de o buffer encher"""
+        buffer = ExperienceBuffer(8)
+        self.fill(buffer, 5)
+
+        batch = buffer.recent(3)
+        self.assertEqual(len(buffer), 5)
+        np.testing.assert_array_equal(batch.inputs[:, 0], [2, 3, 4])
+        np.testing.assert_array_equal(batch.targets[:, 0], [-2, -3, -4])
+        np.testing.assert_array_equal(batch.actions, [2, 0, 1])
+        np.testing.assert_array_equal(batch.rewards, [1.0, 1.5, 2.0])
+        np.testing.assert_array_equal(batch.turns, [2, 3, 4])
+        self.assertEqual(len(buffer.recent(100).inputs), 5)
+
+    def test_wraparound_keeps_recent_contiguous(self):
+        """Testa que recent() devolve views contíguas depois de o buffer dar a volta"""
+        buffer = ExperienceBuffer(8)
+        self.fill(buffer, 21)
+
+        self.assertEqual(len(buffer), 8)
+        self.assertEqual(buffer.total, 21)
+        batch = buffer.recent(8)
+        np.testing.assert_array_equal(batch.inputs[:, 0], np.arange(13, 21))
+        np.testing.assert_array_equal(batch.turns, np.arange(13, 21))
+        self.assertFalse(batch.inputs.flags.owndata)
+        self.assertTrue(batch.inputs.flags.c_contiguous)
+        self.assertTrue(np.shares_memory(batch.inputs, buffer.all().inputs))
+
+    def test_extend_matches_append(self):
+        """Testa que extend() equivale a vários append(), inclusive com mais itens que a capacidade"""
+        appended = ExperienceBuffer(7)
+        extended = ExperienceBuffer(7)
+        self.fill(appended, 3)
+        self.fill(extended, 3)
+
+        self.fill(appended, 12, start=3)
+        numbers = np.arange(3, 15)
+        extended.extend(np.repeat(numbers[:, None], 6, axis=1), -np.repeat(numbers[:, None], 3, axis=1),
+                        actions=numbers % 3, rewards=numbers / 2, turns=numbers)
+
+        self.assertEqual(extended.total, appended.total)
+        for first, second in zip(appended.all(), extended.all()):
+            np.testing.assert_array_equal(first, second)
+
+    def test_sample(self):
+        """Testa o sorteio vetorizado de experiências"""
+        buffer = ExperienceBuffer(16)
+        self.fill(buffer, 10)
+
+        batch = buffer.sample(500, rng=np.random.default_rng(0))
+        numbers = batch.inputs[:, 0]
+        self.assertEqual(batch.inputs.shape, (500, 6))
+        self.assertEqual(set(numbers.tolist()), set(range(10)))
+        np.testing.assert_array_equal(batch.targets[:, 0], -numbers)
+        np.testing.assert_array_equal(batch.turns, numbers)
+
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        with self.assertRaises(ValueError):
+            buffer.sample(1)
+
+    def test_memory_per_experience(self):
+        """Testa que o custo por experiência é só o dos arrays"""
+        buffer = ExperienceBuffer(1000000)
+        # Espelho: 2 x (6 + 3 floats de 4 bytes + ação + recompensa + turno)
+        self.assertEqual(buffer.nbytes / buffer.capacity, 2 * (9 * 4 + 1 + 4 + 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
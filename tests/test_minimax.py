@@ -0,0 +1,227 @@
+import unittest
+import time
+from unittest import mock
+from game.config import GAME_CONFIG
+from game.minimax import (
+    BattleState, minimax, full_minimax, iterative_deepening, AlphaBetaSearch,
+    MoveOrdering, EvaluationOrdering, KillerHistoryOrdering, SearchTimeout
+)
+from game.transposition import TranspositionTable, EXACT
+from game.search_stats import SearchStats, MatchSearchStats
+from game.rules import BattleRules
+from tests.helpers import random_states
+
+
+class TestBattleRules(unittest.TestCase):
+
+    def test_rules_are_cached(self):
+        """Testa se as regras são lidas uma vez e herdadas pelos filhos"""
+        state = BattleState(100, 100, False)
+        self.assertIs(state.rules, BattleRules.from_config())
+        self.assertFalse(hasattr(state, '__dict__'))
+        for action in ('attack', 'heal', 'defend'):
+            self.assertIs(state.apply_action(action).rules, state.rules)
+
+    def test_rules_follow_config(self):
+        """Testa se mudanças em GAME_CONFIG valem para novos estados"""
+        old_state = BattleState(100, 100, False)
+        with mock.patch.dict(GAME_CONFIG, AI_ATTACK=40, MAX_HP=120):
+            state = BattleState(100, 100, False)
+            self.assertEqual(state.apply_action('attack').player_hp, 60)
+            self.assertEqual(state.apply_action('heal').enemy_hp, 112)
+            self.assertEqual(state.rules.to_config()['MAX_HP'], 120)
+        # Estados criados antes continuam com as regras da época
+        self.assertEqual(old_state.apply_action('attack').player_hp,
+                         100 - GAME_CONFIG['AI_ATTACK'])
+
+    def test_defended_damage(self):
+        """Testa o dano mínimo de 1 contra defesa"""
+        rules = BattleRules(300, 3, 10, 25, 4, 5, 20)
+        state = BattleState(100, 100, True, enemy_defending=True, rules=rules)
+        self.assertEqual(state.apply_action('attack').enemy_hp, 99)
+        self.assertEqual(rules.healing, 12)
+
+
+class TestAlphaBeta(unittest.TestCase):
+
+    def test_same_result_as_full_minimax(self):
+        """Testa se a poda devolve a mesma ação e score da busca exaustiva"""
+        orderings = [MoveOrdering, EvaluationOrdering, KillerHistoryOrdering,
+                     lambda: KillerHistoryOrdering(EvaluationOrdering())]
+        for i, state in enumerate(random_states(150, seed=42)):
+            depth = i % 7
+            maximizing = i % 2 == 0
+            expected = full_minimax(state, depth, maximizing)
+            for make_ordering in orderings:
+                result = AlphaBetaSearch(make_ordering()).search(state, depth, maximizing)
+                self.assertEqual(result, expected)
+
+    def test_node_count_reduction(self):
+        """Testa quanto da árvore a poda corta na profundidade DIFICIL"""
+        state = BattleState(300, 300, player_turn=False)
+        counter = [0]
+        expected = full_minimax(state, 8, True, counter)
+        self.assertEqual(counter[0], 9841)  # 1 + 3 + ... + 3^8
+
+        for ordering in (MoveOrdering(), EvaluationOrdering(), KillerHistoryOrdering()):
+            search = AlphaBetaSearch(ordering)
+            self.assertEqual(search.search(state, 8, True), expected)
+            # Menos de 5% dos nós da árvore completa
+            self.assertLess(search.nodes, counter[0] // 20)
+            self.assertGreater(search.cutoffs, 0)
+
+    def test_minimax_terminal_state(self):
+        """Testa se estados terminais não retornam ação"""
+        self.assertEqual(minimax(BattleState(0, 50, False), 4, True), (10000, None))
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_state_key_is_unique(self):
+        """Testa se estados diferentes geram chaves diferentes"""
+        keys = set()
+        for player_hp in (0, 1, 300):
+            for enemy_hp in (0, 1, 300):
+                for flags in range(8):
+                    state = BattleState(player_hp, enemy_hp, bool(flags & 4),
+                                        bool(flags & 2), bool(flags & 1))
+                    keys.add(state.to_key())
+        self.assertEqual(len(keys), 72)
+
+    def test_same_result_with_table(self):
+        """Testa se a tabela não altera o resultado, em qualquer política"""
+        for policy in ('lru', 'fifo', 'depth'):
+            tt = TranspositionTable(max_entries=64, policy=policy)
+            for i, state in enumerate(random_states(60, seed=7)):
+                depth = i % 8
+                expected = full_minimax(state, depth, i % 2 == 0)
+                # Busca duas vezes: a segunda reaproveita a tabela
+                self.assertEqual(minimax(state, depth, i % 2 == 0, tt=tt), expected)
+                self.assertEqual(minimax(state, depth, i % 2 == 0, tt=tt), expected)
+            stats = tt.get_stats()
+            self.assertGreater(stats['hits'], 0)
+            self.assertGreater(stats['evictions'], 0)
+            self.assertLessEqual(stats['size'], 64)
+
+    def test_deep_search_node_count(self):
+        """Testa se a tabela reduz os nós visitados em profundidade 14"""
+        state = BattleState(300, 300, player_turn=False)
+        plain = AlphaBetaSearch()
+        expected = plain.search(state, 14, True)
+        cached = AlphaBetaSearch(tt=TranspositionTable())
+        self.assertEqual(cached.search(state, 14, True), expected)
+        self.assertLess(cached.nodes, plain.nodes // 4)
+
+    def test_eviction_policies(self):
+        """Testa a remoção de entradas quando a tabela enche"""
+        lru = TranspositionTable(max_entries=2, policy='lru')
+        lru.store(1, 3, EXACT, 10, 'attack')
+        lru.store(2, 3, EXACT, 20, 'heal')
+        lru.probe(1)
+        lru.store(3, 3, EXACT, 30, 'defend')
+        self.assertIn(1, lru)
+        self.assertNotIn(2, lru)
+
+        depth = TranspositionTable(max_entries=2, policy='depth')
+        depth.store(1, 5, EXACT, 10, 'attack')
+        depth.store(2, 1, EXACT, 20, 'heal')
+        depth.store(3, 3, EXACT, 30, 'defend')
+        self.assertIn(1, depth)
+        self.assertNotIn(2, depth)
+        self.assertEqual(depth.get_stats()['evictions'], 1)
+
+        with self.assertRaises(ValueError):
+            TranspositionTable(policy='random')
+
+
+class TestIterativeDeepening(unittest.TestCase):
+
+    def test_reaches_max_depth(self):
+        """Testa se, com tempo de sobra, o resultado é o da profundidade máxima"""
+        state = BattleState(150, 200, player_turn=False)
+        result = iterative_deepening(state, time_limit=5.0, max_depth=6,
+                                     tt=TranspositionTable())
+        self.assertEqual(result.depth, 6)
+        self.assertEqual((result.score, result.action), full_minimax(state, 6, True))
+
+    def test_respects_deadline(self):
+        """Testa se a busca para no prazo e devolve a última profundidade completa"""
+        state = BattleState(300, 300, player_turn=False)
+        start = time.perf_counter()
+        result = iterative_deepening(state, time_limit=0.05, max_depth=1000)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.5)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertLess(result.depth, 1000)
+        self.assertEqual((result.score, result.action),
+                         minimax(state, result.depth, True))
+
+    def test_zero_budget_still_returns_action(self):
+        """Testa se um prazo esgotado ainda devolve uma jogada válida"""
+        result = iterative_deepening(BattleState(100, 100, False), time_limit=0)
+        self.assertEqual(result.depth, 1)
+        self.assertIn(result.action, ['attack', 'heal', 'defend'])
+
+    def test_search_timeout(self):
+        """Testa se um prazo vencido interrompe a busca"""
+        search = AlphaBetaSearch(deadline=time.perf_counter() - 1)
+        with self.assertRaises(SearchTimeout):
+            search.search(BattleState(300, 300, False), 12, True)
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def test_minimax_stats(self):
+        """Testa se as estatísticas refletem a busca sem mudar o resultado"""
+        state = BattleState(200, 180, player_turn=False)
+        stats = SearchStats()
+        result = minimax(state, 6, True, tt=TranspositionTable(), stats=stats)
+
+        self.assertEqual(result, full_minimax(state, 6, True))
+        search = AlphaBetaSearch(tt=TranspositionTable())
+        search.search(state, 6, True)
+        self.assertEqual(stats.nodes, search.nodes)
+        self.assertEqual(stats.cutoffs, search.cutoffs)
+        self.assertGreater(stats.leaf_evals, 0)
+        self.assertLess(stats.leaf_evals, stats.nodes)
+        self.assertEqual(stats.max_depth, 6)
+        self.assertEqual(stats.depth, 6)
+        self.assertGreater(stats.tt_probes, 0)
+        self.assertGreater(stats.elapsed, 0)
+        self.assertGreater(stats.nps, 0)
+
+    def test_iterative_deepening_stats(self):
+        """Testa se o aprofundamento iterativo soma o custo de todas as iterações"""
+        stats = SearchStats()
+        result = iterative_deepening(BattleState(150, 200, False), time_limit=5.0,
+                                     max_depth=5, tt=TranspositionTable(), stats=stats)
+        self.assertEqual(stats.depth, result.depth)
+        self.assertEqual(stats.max_depth, 5)
+        self.assertGreater(stats.tt_hits, 0)
+
+        terminal = SearchStats()
+        iterative_deepening(BattleState(0, 200, False), time_limit=1.0, stats=terminal)
+        self.assertEqual((terminal.nodes, terminal.leaf_evals, terminal.max_depth), (1, 1, 0))
+
+    def test_match_aggregation(self):
+        """Testa a soma das decisões de uma partida"""
+        match = MatchSearchStats()
+        for turn, depth in enumerate((2, 4, 3), start=1):
+            stats = SearchStats()
+            minimax(BattleState(100, 100, False), depth, True, stats=stats)
+            match.record(stats, turn)
+
+        self.assertEqual(len(match), 3)
+        self.assertEqual(match.total.nodes, sum(entry['nodes'] for entry in match.turns))
+        self.assertEqual(match.total.max_depth, 4)
+        self.assertAlmostEqual(match.average('nodes'), match.total.nodes / 3)
+        self.assertIn("3 decisões", match.summary())
+
+        match.reset()
+        self.assertEqual(len(match), 0)
+        self.assertEqual(match.total.nodes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
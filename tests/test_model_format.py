@@ -0,0 +1,148 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.model_format import (HEADER_SIZE, ModelFormatError, load_network, migrate_json,
+                               read_header, save_network)
+from game.model_persister import ModelPersister
+from game.neural_ai import NeuralAI
+from tests.helpers import make_network
+
+
+def network_with_history(seed=0, hidden_size=10):
+    network = make_network(seed, hidden_size=hidden_size)
+    network.performance_history = [0.5, 0.25, 0.125]
+    return network
+
+
+class TestModelFormat(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, 'model.bin')
+
+    def assertSameWeights(self, first, second):
+        for name in ('weights_input_hidden', 'weights_hidden_output', 'bias_hidden', 'bias_output'):
+            np.testing.assert_allclose(getattr(first, name), getattr(second, name), rtol=1e-6)
+
+    def test_roundtrip(self):
+        """Testa gravar e carregar um modelo binário"""
+        network = network_with_history()
+        network.generation = 2
+        network.save_model(self.path)
+
+        loaded = network_with_history(1)
+        self.assertTrue(loaded.load_model(self.path))
+        self.assertSameWeights(network, loaded)
+        self.assertEqual(loaded.performance_history, [0.5, 0.25, 0.125])
+        self.assertEqual(loaded.generation, 2)
+        self.assertEqual(read_header(self.path).generation, 2)
+        # 6*10 + 10 + 10*3 + 3 pesos e 3 erros em float32
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + (103 + 3) * 4)
+
+    def test_training_does_not_touch_file(self):
+        """Testa que os pesos carregados ficam em memória e o treino não altera o arquivo"""
+        network_with_history().save_model(self.path)
+        with open(self.path, 'rb') as f:
+            original = f.read()
+
+        network = network_with_history(1)
+        network.load_model(self.path)
+        self.assertNotIsInstance(network.weights_input_hidden.base, np.memmap)
+        with contextlib.redirect_stdout(io.StringIO()):
+            network.fit(np.random.random((20, 6)), np.eye(3)[np.arange(20) % 3], epochs=5)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), original)
+
+    def test_checkpoint_over_loaded_model(self):
+        """Testa carregar, treinar e gravar de volta no mesmo arquivo
+
+        Com o arquivo ainda mapeado, o os.replace() da gravação falharia no Windows.
+        """
+        network_with_history().save_model(self.path)
+        network = network_with_history(1)
+        network.load_model(self.path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            network.fit(np.random.random((20, 6)), np.eye(3)[np.arange(20) % 3], epochs=5)
+        network.generation += 1
+
+        persister = ModelPersister(self.path)
+        self.addCleanup(persister.close)
+        self.assertTrue(persister.checkpoint(network))
+        loaded = network_with_history(2)
+        self.assertTrue(loaded.load_model(self.path))
+        self.assertSameWeights(network, loaded)
+        self.assertEqual(loaded.generation, network.generation)
+
+    def test_failed_write_keeps_previous_model(self):
+        """Testa que uma falha na gravação não corrompe o modelo anterior"""
+        previous = network_with_history()
+        previous.save_model(self.path)
+
+        with mock.patch('game.model_format.os.fsync', side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                network_with_history(1).save_model(self.path)
+
+        loaded = network_with_history(2)
+        self.assertTrue(loaded.load_model(self.path))
+        self.assertSameWeights(previous, loaded)
+        self.assertEqual(os.listdir(self.directory), ['model.bin'])
+
+    def test_header_checks(self):
+        """Testa a rejeição de arquiteturas diferentes e arquivos corrompidos"""
+        save_network(network_with_history(), self.path)
+
+        with self.assertRaises(ModelFormatError):
+            load_network(network_with_history(hidden_size=8), self.path)
+
+        with open(self.path, 'r+b') as f:
+            f.seek(HEADER_SIZE + 10)
+            f.write(b'\xff\xff')
+        with self.assertRaises(ModelFormatError):
+            load_network(network_with_history(), self.path)
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + 8)
+        with self.assertRaises(ModelFormatError):
+            read_header(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'{"weights_input_hidden": []}' * 4)
+        with self.assertRaises(ModelFormatError):
+            read_header(self.path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(network_with_history().load_model(self.path))
+
+    def test_json_migration(self):
+        """Testa a conversão do modelo JSON na criação da NeuralAI"""
+        json_path = os.path.join(self.directory, 'model.json')
+        network = network_with_history()
+        network.save_model(json_path)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai = NeuralAI(model_path=self.path, legacy_model_path=json_path)
+            self.assertTrue(ai.is_ready())
+        self.assertEqual(ai.model_source, 'legacy')
+        self.assertTrue(os.path.exists(self.path))
+        self.assertSameWeights(network, ai.network)
+
+        converted = network_with_history(1)
+        converted.load_model(self.path)
+        self.assertSameWeights(network, converted)
+        self.assertEqual(converted.performance_history, [0.5, 0.25, 0.125])
+
+        other_path = migrate_json(json_path)
+        self.assertEqual(other_path, self.path)
+        self.assertLess(os.path.getsize(self.path), os.path.getsize(json_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
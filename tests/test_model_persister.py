@@ -0,0 +1,124 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.model_persister import ModelPersister, disk_generation
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from tests.helpers import make_network
+
+
+def network_at(generation, seed=0):
+    network = make_network(seed)
+    network.generation = generation
+    return network
+
+
+class TestModelPersister(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'model.bin')
+
+    def make_persister(self, flush_interval=3600.0):
+        persister = ModelPersister(self.path, flush_interval=flush_interval)
+        self.addCleanup(persister.close)
+        return persister
+
+    def test_marks_are_coalesced(self):
+        """Testa que várias alterações viram uma gravação só, da versão mais recente"""
+        persister = self.make_persister()
+        for generation in range(1, 101):
+            persister.mark_dirty(network_at(generation))
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(persister.flush())
+        self.assertFalse(persister.flush())
+        self.assertEqual(disk_generation(self.path), 100)
+        self.assertEqual(persister.get_stats(), {'marks': 100, 'saves': 1, 'skipped': 0,
+                                                 'errors': 0, 'dirty': False})
+
+    def test_background_flush(self):
+        """Testa a gravação pela thread depois do intervalo"""
+        persister = self.make_persister(flush_interval=0.05)
+        persister.mark_dirty(network_at(1))
+
+        deadline = time.perf_counter() + 10
+        while persister.saves == 0 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(disk_generation(self.path), 1)
+
+    def test_snapshot_is_saved(self):
+        """Testa que a versão gravada é a do momento de mark_dirty()"""
+        persister = self.make_persister()
+        network = network_at(1)
+        expected = network.weights_input_hidden.copy()
+        persister.mark_dirty(network)
+        network.weights_input_hidden += 1.0
+        persister.close()
+
+        loaded = SimpleNeuralNetwork()
+        loaded.load_model(self.path)
+        np.testing.assert_allclose(loaded.weights_input_hidden, expected, rtol=1e-6)
+
+    def test_failed_write_keeps_model_pending(self):
+        """Testa que uma falha na gravação é avisada sem derrubar o jogo"""
+        persister = self.make_persister()
+        output = io.StringIO()
+        with mock.patch('game.model_persister.save_network',
+                        side_effect=PermissionError("somente leitura")), \
+                contextlib.redirect_stdout(output):
+            self.assertFalse(persister.checkpoint(network_at(1)))
+            persister.close()
+        self.assertIn("somente leitura", output.getvalue())
+        self.assertEqual(persister.errors, 2)
+        self.assertTrue(persister.dirty)
+
+        # A próxima gravação que funcionar leva o modelo pendente
+        self.assertTrue(persister.flush())
+        self.assertEqual(disk_generation(self.path), 1)
+
+    def test_older_generation_never_overwrites(self):
+        """Testa que só a geração mais recente fica no arquivo com vários escritores"""
+        newer = self.make_persister()
+        older = self.make_persister()
+        newer.checkpoint(network_at(5))
+        self.assertFalse(older.checkpoint(network_at(3, seed=1)))
+        self.assertEqual(older.skipped, 1)
+        self.assertEqual(disk_generation(self.path), 5)
+
+        persisters = [self.make_persister() for _ in range(8)]
+        threads = [threading.Thread(target=persister.checkpoint, args=(network_at(10 + i),))
+                   for i, persister in enumerate(persisters)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(disk_generation(self.path), 17)
+
+    def test_neural_ai_saves_once_per_interval(self):
+        """Testa que os retreinos da NeuralAI não gravam o arquivo a cada vez"""
+        SimpleNeuralNetwork().save_model(self.path)
+        with mock.patch.dict(GAME_CONFIG['NEURAL_CONFIG'], ASYNC_LEARNING=False,
+                             SAVE_INTERVAL=3600.0), contextlib.redirect_stdout(io.StringIO()):
+            ai = NeuralAI(model_path=self.path, legacy_model_path=None)
+            for i in range(200):
+                ai.learn_from_experience(100, 250, 'heal', 1.0, turn_count=i % 20)
+            self.assertEqual(ai.persister.saves, 0)
+            ai.close()
+
+        self.assertEqual(ai.persister.get_stats()['marks'], 4)
+        self.assertEqual(ai.persister.saves, 1)
+        self.assertEqual(disk_generation(self.path), ai.network.generation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.neural_ai import (ACTIONS, DEFAULT_MODEL_PATH, LEGACY_MODEL_PATH, NeuralAI,
+                            basic_strategy)
+from game.paths import PACKAGE_DATA_DIR
+from tests.helpers import make_network
+
+
+def quiet(function, *args, **kwargs):
+    """Executa sem os prints de progresso do treinamento"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def copy_weights(source, target):
+    for name in ('weights_input_hidden', 'weights_hidden_output', 'bias_hidden', 'bias_output'):
+        setattr(target, name, getattr(source, name).copy())
+
+
+class TestMiniBatchTraining(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        ai = NeuralAI.__new__(NeuralAI)
+        self.inputs, self.expected = ai.initial_training_data(samples=60)
+
+    def assertSameWeights(self, first, second):
+        for name in ('weights_input_hidden', 'weights_hidden_output', 'bias_hidden', 'bias_output'):
+            np.testing.assert_allclose(getattr(first, name), getattr(second, name), atol=1e-12)
+
+    def test_batch_of_one_matches_backward(self):
+        """Testa que lotes de 1 amostra reproduzem forward/backward amostra a amostra"""
+        reference = make_network()
+        batched = make_network(1)
+        copy_weights(reference, batched)
+
+        for _ in range(3):
+            for sample, expected in zip(self.inputs, self.expected):
+                reference.forward(sample)
+                reference.backward(sample, expected)
+        quiet(batched.fit, self.inputs, self.expected, epochs=3, batch_size=1, shuffle=False)
+
+        self.assertSameWeights(reference, batched)
+
+    def test_batch_sums_sample_gradients(self):
+        """Testa que um lote aplica a soma dos gradientes de cada amostra"""
+        network = make_network()
+        start = make_network(1)
+        copy_weights(network, start)
+        quiet(network.fit, self.inputs[:8], self.expected[:8], epochs=1, batch_size=0)
+
+        deltas = {name: np.zeros_like(getattr(start, name))
+                  for name in ('weights_input_hidden', 'weights_hidden_output',
+                               'bias_hidden', 'bias_output')}
+        for sample, expected in zip(self.inputs[:8], self.expected[:8]):
+            single = make_network(2)
+            copy_weights(start, single)
+            single.forward(sample)
+            single.backward(sample, expected)
+            for name in deltas:
+                deltas[name] += getattr(single, name) - getattr(start, name)
+
+        for name, delta in deltas.items():
+            np.testing.assert_allclose(getattr(network, name) - getattr(start, name), delta,
+                                       atol=1e-12)
+
+    def test_fit_learns_basic_strategy(self):
+        """Testa que o treinamento em lotes aprende a estratégia básica"""
+        network = make_network()
+        error = quiet(network.fit, self.inputs, self.expected, epochs=300, batch_size=16)
+
+        outputs = np.array([network.forward(sample) for sample in self.inputs])
+        accuracy = np.mean(outputs.argmax(axis=1) == self.expected.argmax(axis=1))
+        self.assertGreaterEqual(accuracy, 0.9)
+        self.assertLess(error, 0.05)
+        self.assertEqual(len(network.performance_history), 3)
+
+    def test_train_accepts_sample_list(self):
+        """Testa que train() continua aceitando a lista de pares (entrada, saída)"""
+        network = make_network()
+        pairs = list(zip(self.inputs, self.expected))
+        error = quiet(network.train, pairs, epochs=5)
+
+        self.assertEqual(len(network.performance_history), 1)
+        self.assertGreater(error, 0.0)
+        self.assertEqual(quiet(network.train, [], epochs=5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class TestBatchedInference(unittest.TestCase):
+
+    def setUp(self):
+        self.ai = NeuralAI.__new__(NeuralAI)  # Sem carregar modelo do disco
+        self.ai.network = make_network(5)
+        self.ai.policy_table = None
+        rng = np.random.default_rng(0)
+        self.player_hp = rng.integers(0, 301, 200)
+        self.enemy_hp = rng.integers(0, 301, 200)
+        self.player_defending = rng.random(200) < 0.5
+        self.enemy_defending = rng.random(200) < 0.5
+        self.turn_count = rng.integers(1, 30, 200)
+
+    def test_states_to_inputs_matches_single_encoding(self):
+        """Testa a codificação vetorizada contra game_state_to_input()"""
+        inputs = self.ai.states_to_inputs(self.player_hp, self.enemy_hp, self.player_defending,
+                                          self.enemy_defending, self.turn_count)
+        expected = np.array([self.ai.game_state_to_input(*fields) for fields in zip(
+            self.player_hp.tolist(), self.enemy_hp.tolist(), self.player_defending.tolist(),
+            self.enemy_defending.tolist(), self.turn_count.tolist())])
+        np.testing.assert_allclose(inputs, expected)
+
+    def test_decide_actions_matches_network(self):
+        """Testa que, sem exploração, o lote escolhe a mesma ação de predict()"""
+        actions = self.ai.decide_actions(self.player_hp, self.enemy_hp, self.player_defending,
+                                         self.enemy_defending, self.turn_count,
+                                         exploration_rate=0.0)
+        expected = [self.ai.network.predict(self.ai.game_state_to_input(*fields)) for fields in zip(
+            self.player_hp.tolist(), self.enemy_hp.tolist(), self.player_defending.tolist(),
+            self.enemy_defending.tolist(), self.turn_count.tolist())]
+        self.assertEqual(actions, expected)
+
+    def test_forward_batch_is_stateless(self):
+        """Testa que forward_batch() não altera a rede e dá o mesmo resultado de forward()"""
+        inputs = self.ai.states_to_inputs(self.player_hp, self.enemy_hp)
+        outputs = self.ai.network.forward_batch(inputs)
+
+        self.assertFalse(hasattr(self.ai.network, 'output'))
+        np.testing.assert_allclose(outputs[7], self.ai.network.forward(inputs[7]))
+
+    def test_exploration_per_sample(self):
+        """Testa que cada estado tem a própria chance de ação aleatória"""
+        count = 20000
+        greedy = self.ai.decide_action_indices(150, 150, exploration_rate=0.0)[0]
+        actions = self.ai.decide_action_indices(np.full(count, 150), 150, exploration_rate=0.3,
+                                                rng=np.random.default_rng(1))
+
+        self.assertEqual(actions.shape, (count,))
+        # 30% aleatórias, das quais 2/3 diferem da ação da rede
+        changed = np.mean(actions != greedy)
+        self.assertAlmostEqual(changed, 0.2, delta=0.02)
+        self.assertEqual(set(actions.tolist()), {0, 1, 2})
+
+        repeated = self.ai.decide_action_indices(np.full(count, 150), 150, exploration_rate=0.3,
+                                                 rng=np.random.default_rng(1))
+        np.testing.assert_array_equal(actions, repeated)
+
+
+class TestColdStart(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.model_path = os.path.join(self.directory, 'data', 'model.bin')
+
+    def make_ai(self, **kwargs):
+        kwargs.setdefault('legacy_model_path', None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai = NeuralAI(model_path=self.model_path, **kwargs)
+        self.addCleanup(ai.close)
+        return ai
+
+    def test_constructor_does_not_load(self):
+        """Testa que criar a IA não lê nem treina o modelo"""
+        start = time.perf_counter()
+        ai = self.make_ai()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIsNone(ai.model_source)
+        self.assertFalse(ai.get_performance_stats()['model_ready'])
+
+    def test_default_paths(self):
+        """Testa que o modelo do jogador fica na pasta do usuário, fora do pacote"""
+        with mock.patch.dict(os.environ, TURNBASED_AI_DATA=self.directory), \
+                mock.patch.dict(GAME_CONFIG['NEURAL_CONFIG'], MODEL_PATH=None):
+            ai = NeuralAI(legacy_model_path=None)
+        self.addCleanup(ai.close)
+        self.assertEqual(ai.model_path, os.path.join(self.directory, 'neural_ai_model.bin'))
+        self.assertEqual(os.path.dirname(DEFAULT_MODEL_PATH), PACKAGE_DATA_DIR)
+        # O modelo antigo é procurado num caminho fixo, não no diretório atual
+        self.assertTrue(os.path.isabs(LEGACY_MODEL_PATH))
+
+    def test_packaged_default_model(self):
+        """Testa o modelo pré-treinado do pacote na primeira decisão"""
+        self.assertTrue(os.path.exists(DEFAULT_MODEL_PATH))
+        ai = self.make_ai()
+        ai.exploration_rate = 0.0
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            action = ai.decide_action(60, 250, turn_count=1)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(action, ACTIONS)
+        self.assertEqual(ai.model_source, 'default')
+
+        # O modelo distribuído segue a estratégia básica na maior parte dos estados
+        rng = np.random.default_rng(0)
+        player_hp, enemy_hp = rng.integers(0, 301, 2000), rng.integers(0, 301, 2000)
+        agreement = np.mean(ai.decide_action_indices(player_hp, enemy_hp)
+                            == basic_strategy(player_hp, enemy_hp))
+        self.assertGreater(agreement, 0.9)
+
+    def test_background_bootstrap_with_fallback(self):
+        """Testa o treino inicial em segundo plano e a estratégia básica enquanto isso"""
+        ai = self.make_ai(default_model_path=None)
+        ai.exploration_rate = 0.0
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            self.assertFalse(ai.is_ready())
+            self.assertEqual(ai.decide_action(50, 250), 'heal')
+            actions = ai.decide_action_indices([50, 250, 100], [250, 50, 200])
+            self.assertLess(time.perf_counter() - start, 0.5)
+            np.testing.assert_array_equal(actions, [2, 0, 1])
+
+            self.assertTrue(ai.wait_ready(timeout=120))
+        self.assertEqual(ai.model_source, 'bootstrap')
+        self.assertTrue(os.path.exists(self.model_path))
+
+        # Uma nova IA carrega o modelo treinado
+        other = self.make_ai(default_model_path=None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(other.is_ready())
+        self.assertEqual(other.model_source, 'user')
+
+    def test_eager_start(self):
+        """Testa o carregamento no construtor com lazy=False"""
+        ai = self.make_ai(lazy=False)
+        self.assertEqual(ai.model_source, 'default')
+        self.assertTrue(ai.get_performance_stats()['model_ready'])
@@ -0,0 +1,67 @@
+import time
+import unittest
+from game.minimax import ACTIONS, BattleState, SearchTimeout, full_minimax, iterative_deepening
+from game.parallel_search import ParallelSearcher
+from game.search_stats import SearchStats
+from tests.helpers import random_states
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_same_result_as_full_minimax(self):
+        """Testa se a divisão da raiz e do segundo nível mantém score e ação"""
+        states = random_states(12, seed=21, min_hp=1)
+        # 2 workers dividem só a raiz; 4 dividem também o segundo nível
+        for workers in (2, 4):
+            with ParallelSearcher(workers=workers, min_depth=0) as searcher:
+                searcher.warm_up()
+                for i, state in enumerate(states):
+                    depth = 2 + i % 5
+                    maximizing = i % 2 == 0
+                    self.assertTrue(searcher.is_parallel(state, depth))
+                    # As subárvores depois da primeira jogada usam o valor dela como limite
+                    first_move = ACTIONS[i % len(ACTIONS)]
+                    self.assertEqual(searcher.search(state, depth, maximizing, first_move),
+                                     full_minimax(state, depth, maximizing))
+
+    def test_serial_fallback(self):
+        """Testa se buscas rasas e estados terminais não usam o pool"""
+        searcher = ParallelSearcher(workers=4, min_depth=8)
+        state = BattleState(120, 90, False)
+        self.assertFalse(searcher.is_parallel(state, 4))
+        self.assertEqual(searcher.search(state, 4, True), full_minimax(state, 4, True))
+        self.assertFalse(searcher.is_parallel(BattleState(0, 90, False), 10))
+        self.assertIsNone(searcher._pool)
+
+        single = ParallelSearcher(workers=1, min_depth=0)
+        self.assertFalse(single.is_parallel(state, 10))
+
+    def test_iterative_deepening(self):
+        """Testa as iterações a partir de PARALLEL_MIN_DEPTH no pool, com o mesmo resultado"""
+        state = BattleState(150, 120, False)
+        with ParallelSearcher(workers=2, min_depth=4) as searcher:
+            stats = SearchStats()
+            result = iterative_deepening(state, 30.0, max_depth=7, stats=stats,
+                                         parallel=searcher)
+            self.assertEqual((result.score, result.action), full_minimax(state, 7, True))
+            self.assertEqual(result.depth, 7)
+            self.assertGreater(searcher.nodes, 0)
+            self.assertGreater(stats.nodes, searcher.nodes)
+
+    def test_deadline(self):
+        """Testa se o prazo interrompe a busca paralela e o aprofundamento iterativo"""
+        state = BattleState(300, 300, False)
+        with ParallelSearcher(workers=2, min_depth=0) as searcher:
+            searcher.warm_up()
+            with self.assertRaises(SearchTimeout):
+                searcher.search(state, 40, True, deadline=time.perf_counter() + 0.05)
+
+            start = time.perf_counter()
+            result = iterative_deepening(state, 0.2, max_depth=100, parallel=searcher)
+            self.assertLess(time.perf_counter() - start, 2.0)
+            self.assertIn(result.action, ACTIONS)
+            self.assertLess(result.depth, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
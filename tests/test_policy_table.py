@@ -0,0 +1,97 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from game.policy_table import PolicyTable
+
+
+def make_ai(seed=0):
+    ai = NeuralAI.__new__(NeuralAI)  # Sem carregar modelo do disco
+    np.random.seed(seed)
+    ai.network = SimpleNeuralNetwork()
+    ai.policy_table = None
+    return ai
+
+
+class TestPolicyTable(unittest.TestCase):
+
+    def setUp(self):
+        self.ai = make_ai()
+        self.table = PolicyTable(self.ai)
+        rng = np.random.default_rng(0)
+        count = 3000
+        self.states = (rng.integers(0, 301, count), rng.integers(0, 301, count),
+                       rng.random(count) < 0.5, rng.random(count) < 0.5,
+                       rng.integers(0, 40, count))
+
+    def network_actions(self, states):
+        return self.ai.network.predict_batch(self.ai.states_to_inputs(*states))
+
+    def test_lookup_matches_network(self):
+        """Testa que a tabela devolve a mesma ação da rede"""
+        actions = self.table.lookup(*self.states)
+        np.testing.assert_array_equal(actions, self.network_actions(self.states))
+
+        for fields in list(zip(*(array.tolist() for array in self.states)))[:200]:
+            expected = self.ai.network.predict(self.ai.game_state_to_input(*fields))
+            self.assertEqual(['attack', 'defend', 'heal'][self.table.action_index(*fields)],
+                             expected)
+
+    def test_rows_are_built_lazily(self):
+        """Testa que só as linhas consultadas são calculadas, uma vez cada"""
+        self.table.action_index(150, 100, False, True, 3)
+        self.assertEqual(self.table.builds, 1)
+        self.table.lookup([150, 150, 149], [0, 300, 7], [False, False, False],
+                          [True, True, True], [3, 3, 3])
+        self.assertEqual(self.table.builds, 2)
+        self.assertLess(self.table.built_fraction, 0.001)
+
+        # Turnos a partir de 20 usam a mesma linha
+        self.table.action_index(10, 10, True, True, 20)
+        self.table.action_index(10, 10, True, True, 57)
+        self.assertEqual(self.table.builds, 3)
+
+    def test_invalidated_when_weights_change(self):
+        """Testa a reconstrução depois de um treinamento e depois da troca da rede"""
+        self.table.lookup(*self.states)
+        builds = self.table.builds
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ai.network.fit(self.ai.states_to_inputs(*self.states), np.eye(3)[
+                np.arange(len(self.states[0])) % 3], epochs=20)
+        np.testing.assert_array_equal(self.table.lookup(*self.states),
+                                      self.network_actions(self.states))
+        self.assertEqual(self.table.invalidations, 1)
+        self.assertEqual(self.table.builds, 2 * builds)
+
+        self.ai.network = make_ai(7).network
+        np.testing.assert_array_equal(self.table.lookup(*self.states),
+                                      self.network_actions(self.states))
+        self.assertEqual(self.table.invalidations, 2)
+
+    def test_states_outside_table(self):
+        """Testa estados fora da tabela (HP acima do máximo ou negativo)"""
+        states = ([350, -5, 20, 100.5], [10, 20, 400, 50], [False] * 4, [True] * 4, [1, 2, 3, 4])
+        np.testing.assert_array_equal(self.table.lookup(*states), self.network_actions(states))
+        self.assertEqual(self.table.action_index(350, 10, False, True, 1),
+                         self.network_actions(([350], [10], [False], [True], [1]))[0])
+
+    def test_full_build(self):
+        """Testa o cálculo da tabela inteira"""
+        # HP máximo menor para o teste ser rápido; o resto fica fora da tabela
+        with mock.patch.dict(GAME_CONFIG, MAX_HP=80):
+            self.table.build()
+            self.assertEqual(self.table.built_fraction, 1.0)
+            self.assertEqual(self.table.table.shape, (21, 2, 2, 81, 81))
+            self.assertEqual(self.table.table.dtype, np.uint8)
+            np.testing.assert_array_equal(self.table.lookup(*self.states),
+                                          self.network_actions(self.states))
+
+
+if __name__ == '__main__':
+    unittest.main()
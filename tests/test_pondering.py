@@ -0,0 +1,89 @@
+import time
+import unittest
+from unittest import mock
+from game.config import GAME_CONFIG
+from game.minimax import BattleState, minimax
+from game.pondering import PonderService
+from game.search_stats import SearchStats
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestPonderService(unittest.TestCase):
+
+    def setUp(self):
+        # A tablebase daria outros scores; aqui o pondering deve buscar
+        patcher = mock.patch.dict(GAME_CONFIG['MINIMAX_CONFIG'], USE_TABLEBASE=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = PonderService(depth=4)
+        self.addCleanup(self.service.close)
+
+    def test_candidates(self):
+        """Testa os estados possíveis depois da jogada do jogador"""
+        state = BattleState(200, 150, True, player_defending=True, enemy_defending=True)
+        candidates = self.service.candidates(state)
+        keys = [child.to_key() for child in candidates]
+
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertTrue(all(not child.player_turn for child in candidates))
+        # Defesa (certa) primeiro; 11 danos de ataque e 16 curas possíveis
+        self.assertTrue(candidates[0].player_defending)
+        self.assertEqual(len(candidates), 1 + 11 + 16)
+
+        # Jogadas que acabam com o jogo não precisam de resposta
+        self.assertEqual(len(self.service.candidates(BattleState(200, 10, True))), 1 + 16)
+
+    def test_serves_pondered_result(self):
+        """Testa se a resposta pensada é a mesma da busca normal"""
+        self.service.ponder(BattleState(200, 150, True))
+        reply_state = BattleState(200, 150, False, player_defending=True)
+        self.assertTrue(wait_until(lambda: self.service.is_ready(reply_state)))
+
+        stats = SearchStats()
+        result = self.service.take(reply_state, stats)
+        self.assertEqual((result.score, result.action), minimax(reply_state, 4, True))
+        self.assertEqual(result.depth, 4)
+        self.assertGreater(stats.nodes, 0)
+        self.assertEqual(self.service.get_stats()['hits'], 1)
+
+    def test_closed_service_ignores_ponder(self):
+        """Testa que uma janela fechada não volta a abrir a thread"""
+        self.service.ponder(BattleState(200, 150, True))
+        self.service.close()
+        self.service.ponder(BattleState(200, 150, True))
+        self.assertIsNone(self.service._thread)
+
+    def test_miss_and_stale_results(self):
+        """Testa estados não previstos e resultados de uma vez anterior"""
+        self.service.ponder(BattleState(200, 150, True))
+        self.assertTrue(wait_until(
+            lambda: self.service.is_ready(BattleState(200, 150, False, player_defending=True))))
+
+        # Nova vez do jogador: o que foi pensado antes não vale mais
+        self.service.ponder(BattleState(120, 90, True))
+        self.assertIsNone(self.service.take(BattleState(200, 150, False, player_defending=True)))
+        self.assertIsNone(self.service.take(BattleState(1, 1, False)))
+        self.assertEqual(self.service.get_stats()['misses'], 2)
+
+    def test_take_cancels_long_search(self):
+        """Testa se take() interrompe uma busca longa sem esperar o fim"""
+        service = PonderService(depth=60)
+        self.addCleanup(service.close)
+        service.ponder(BattleState(300, 300, True))
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        self.assertIsNone(service.take(BattleState(300, 300, False, player_defending=True)))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from game.prioritized_replay import PrioritizedExperienceBuffer, SumTree
+
+
+def experiences(count, start=0):
+    inputs = np.arange(start, start + count, dtype=np.float32)[:, None].repeat(6, axis=1)
+    targets = np.eye(3, dtype=np.float32)[np.arange(count) % 3]
+    return inputs, targets
+
+
+class TestSumTree(unittest.TestCase):
+
+    def test_total_and_update(self):
+        tree = SumTree(5)
+        tree.update([0, 1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(tree.total, 15.0)
+        tree.update(2, 0.5)
+        self.assertEqual(tree.total, 12.5)
+        np.testing.assert_array_equal(tree[[1, 2]], [2.0, 0.5])
+
+    def test_find_maps_prefix_sums_to_leaves(self):
+        """Testa que cada soma acumulada cai na folha certa"""
+        tree = SumTree(4)
+        tree.update([0, 1, 2, 3], [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(tree.find([0.0, 0.99, 1.0, 2.5, 3.0, 5.99, 6.0, 9.99]),
+                                      [0, 0, 1, 1, 2, 2, 3, 3])
+
+    def test_find_skips_empty_leaves(self):
+        tree = SumTree(6)
+        tree.update([1, 4], [2.0, 2.0])
+        leaves = tree.find(np.linspace(0, tree.total, 50))
+        self.assertTrue(set(leaves.tolist()) <= {1, 4})
+
+    def test_sampling_is_proportional(self):
+        tree = SumTree(3)
+        tree.update([0, 1, 2], [1.0, 3.0, 6.0])
+        rng = np.random.default_rng(0)
+        counts = np.bincount(tree.find(rng.random(20000) * tree.total), minlength=3)
+        np.testing.assert_allclose(counts / counts.sum(), [0.1, 0.3, 0.6], atol=0.02)
+
+
+class TestPrioritizedExperienceBuffer(unittest.TestCase):
+
+    def test_new_experiences_get_max_priority(self):
+        buffer = PrioritizedExperienceBuffer(8)
+        buffer.extend(*experiences(3))
+        buffer.update_priorities([0], [3.0])
+        buffer.append(*(column[0] for column in experiences(1, start=10)))
+
+        self.assertAlmostEqual(buffer.tree[3], buffer.max_priority)
+        self.assertGreater(buffer.max_priority, 1.0)
+        self.assertEqual(buffer.tree.total, buffer.tree[[0, 1, 2, 3]].sum())
+
+    def test_sample_prefers_high_error(self):
+        """Testa que experiências com erro alto são sorteadas mais vezes"""
+        buffer = PrioritizedExperienceBuffer(10, alpha=1.0, epsilon=0.0)
+        buffer.extend(*experiences(10))
+        buffer.update_priorities(np.arange(10), [0.01] * 9 + [1.0])
+
+        sample = buffer.sample_prioritized(100, rng=np.random.default_rng(1))
+        self.assertGreater(np.mean(sample.indices == 9), 0.9)
+        np.testing.assert_array_equal(sample.batch.inputs[:, 0], sample.indices)
+        # A experiência mais sorteada tem o menor peso de importância
+        self.assertEqual(sample.weights.max(), 1.0)
+        self.assertTrue(np.all(sample.weights[sample.indices == 9]
+                               < sample.weights[sample.indices != 9].min()))
+
+    def test_uniform_when_alpha_is_zero(self):
+        buffer = PrioritizedExperienceBuffer(4, alpha=0.0)
+        buffer.extend(*experiences(4))
+        buffer.update_priorities(np.arange(4), [0.0, 0.1, 1.0, 10.0])
+
+        sample = buffer.sample_prioritized(8, rng=np.random.default_rng(2))
+        np.testing.assert_array_equal(np.sort(sample.indices), [0, 0, 1, 1, 2, 2, 3, 3])
+        np.testing.assert_allclose(sample.weights, 1.0)
+
+    def test_overwritten_slot_gets_new_priority(self):
+        buffer = PrioritizedExperienceBuffer(3)
+        buffer.extend(*experiences(3))
+        buffer.update_priorities([0, 1, 2], [0.0, 0.0, 0.0])
+        buffer.extend(*experiences(1, start=3))
+
+        self.assertAlmostEqual(buffer.tree[0], buffer.max_priority)
+        self.assertEqual(len(buffer), 3)
+
+    def test_clear(self):
+        buffer = PrioritizedExperienceBuffer(4)
+        buffer.extend(*experiences(4))
+        buffer.clear()
+        self.assertEqual(buffer.tree.total, 0.0)
+        with self.assertRaises(ValueError):
+            buffer.sample_prioritized(1)
+
+
+class TestPrioritizedRetraining(unittest.TestCase):
+
+    def test_zero_weight_samples_do_not_train(self):
+        """Testa que sample_weight multiplica a contribuição de cada amostra"""
+        np.random.seed(0)
+        network = SimpleNeuralNetwork()
+        inputs, targets = experiences(4)
+        directions, _ = network.gradients(inputs, targets, np.array([1.0, 0.0, 0.0, 2.0]))
+        expected, _ = network.gradients(inputs[[0, 3, 3]], targets[[0, 3, 3]])
+        for name, direction in directions.items():
+            np.testing.assert_allclose(direction, expected[name])
+
+    def test_train_network_updates_priorities(self):
+        ai = NeuralAI.__new__(NeuralAI)
+        ai.last_training_report = None
+        ai.persister = mock.Mock()
+        ai.experience_buffer = PrioritizedExperienceBuffer(100)
+        ai.experience_buffer.extend(*experiences(60))
+        np.random.seed(3)
+        network = SimpleNeuralNetwork()
+
+        with mock.patch.dict(GAME_CONFIG['NEURAL_CONFIG'], REPLAY_SAMPLES=32, REPLAY_EPOCHS=5,
+                             VALIDATION_SPLIT=0.0, PATIENCE=None, TRAIN_TIME_BUDGET=None), \
+                contextlib.redirect_stdout(io.StringIO()):
+            ai.train_network(network)
+
+        self.assertEqual(network.last_report.epochs, 5)
+        self.assertEqual(network.last_report.samples, 32)
+        # As experiências sorteadas ganharam prioridade pelo erro (menor que a inicial)
+        self.assertLess(ai.experience_buffer.tree.total, 60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
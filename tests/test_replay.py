@@ -0,0 +1,201 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+from game import replay
+from game.config import GAME_CONFIG
+from game.replay import (ENEMY_WON, NO_ACTION, PLAYER_DEFENDED, PLAYER_WON, RECORD_SIZE,
+                         ReplayFormatError, ReplayReader, ReplayWriter, new_seed)
+from game.rules import ATTACK, DEFEND, ENEMY, HEAL, PLAYER, BattleRules, RulesEngine
+
+RULES = BattleRules(max_hp=100, player_attack=20, player_defense=5, ai_attack=25,
+                    ai_defense=4, heal_min=5, heal_max=20)
+
+
+def play(writer, seed, choices):
+    """Grava uma partida do RulesEngine com ações sorteadas por `choices`"""
+    engine = RulesEngine(RULES, seed)
+    state = engine.new_match()
+    recording = writer.begin_match(seed)
+    while state.winner is None:
+        events = []
+        engine.play_turn(state, choices.randrange(3), choices.randrange(3), events)
+        recording.record_events(events, state)
+    recording.finish()
+    return state
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'replays.tbr')
+
+    def test_round_trip(self):
+        choices = random.Random(0)
+        with ReplayWriter(self.path, RULES, buffer_records=50) as writer:
+            finals = [play(writer, seed, choices) for seed in range(40)]
+
+        reader = ReplayReader(self.path)
+        self.assertEqual(len(reader), 40)
+        self.assertEqual(reader.rules, RULES)
+        self.assertEqual(os.path.getsize(self.path), 64 + reader.record_count * RECORD_SIZE)
+        np.testing.assert_array_equal(reader.winners(), [state.winner for state in finals])
+        np.testing.assert_array_equal(reader.turn_counts(), [state.turn - 1 for state in finals])
+
+        last = reader.match(-1)
+        self.assertEqual(list(last['match']), [39] * len(last))
+        self.assertEqual(list(last['turn']), list(range(1, len(last) + 1)))
+        self.assertEqual((last['player_hp'][-1], last['enemy_hp'][-1]),
+                         (finals[-1].player_hp, finals[-1].enemy_hp))
+        # Os HPs do início de um turno são os do fim do anterior
+        np.testing.assert_array_equal(last['player_hp_start'][1:], last['player_hp'][:-1])
+        self.assertTrue(all(reader.verify(i) for i in range(len(reader))))
+        self.assertIn("40 partidas", reader.summary())
+
+    def test_record_fields(self):
+        with ReplayWriter(self.path, RULES) as writer:
+            recording = writer.begin_match(seed=7)
+            recording.record_turn('heal', 'attack', 90, 100, 10, 20)
+            recording.record_turn(DEFEND, ATTACK, 76, 100, 0, 14)
+            recording.record_turn('attack', None, 76, 0, 25)
+            recording.finish()
+
+        records = ReplayReader(self.path).match(0)
+        self.assertEqual(list(records['player_action']), [HEAL, DEFEND, ATTACK])
+        self.assertEqual(list(records['enemy_action']), [ATTACK, ATTACK, NO_ACTION])
+        self.assertEqual(list(records['player_healing']), [10, 0, 0])
+        self.assertEqual(list(records['player_damage']), [0, 0, 25])
+        self.assertEqual(list(records['enemy_damage']), [20, 14, 0])
+        self.assertEqual(list(records['flags']), [0, PLAYER_DEFENDED, PLAYER_WON])
+        self.assertEqual(list(records['seed']), [7, 7, 7])
+        self.assertEqual(list(records['player_hp_start']), [100, 90, 76])
+
+    def test_interleaved_matches_stay_contiguous(self):
+        with ReplayWriter(self.path, RULES) as writer:
+            first, second = writer.begin_match(1), writer.begin_match(2)
+            for _ in range(3):
+                first.record_turn('attack', 'attack', 80, 80)
+                second.record_turn('defend', 'heal', 100, 100)
+            second.record_turn('defend', 'attack', 0, 100)
+            second.finish()
+            first.finish()
+            writer.begin_match(3).finish()  # Sem turnos: ignorada
+
+        reader = ReplayReader(self.path)
+        self.assertEqual([len(reader.match(i)) for i in range(len(reader))], [4, 3])
+        self.assertEqual(list(reader.match(0)['seed']), [2] * 4)
+        self.assertEqual(reader.match(0)['flags'][-1] & ENEMY_WON, ENEMY_WON)
+        self.assertEqual(list(reader.winners()), [ENEMY, -1])
+
+    def test_buffer_and_append(self):
+        writer = ReplayWriter(self.path, RULES, buffer_records=1000)
+        play(writer, 0, random.Random(0))
+        self.assertEqual(os.path.getsize(self.path), 64)  # Ainda no buffer
+        writer.close()
+        self.assertEqual(writer.matches, 1)
+
+        # Outro writer continua a numeração; regras diferentes são recusadas
+        with ReplayWriter(self.path, RULES) as writer:
+            play(writer, 1, random.Random(1))
+        self.assertEqual(list(ReplayReader(self.path).records['match'][[0, -1]]), [0, 1])
+        with self.assertRaises(ReplayFormatError):
+            ReplayWriter(self.path, BattleRules(100, 20, 5, 30, 4, 5, 20))
+
+    def test_partial_record_is_dropped(self):
+        with ReplayWriter(self.path, RULES) as writer:
+            play(writer, 0, random.Random(0))
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01' * 10)  # Escrita interrompida
+
+        reader = ReplayReader(self.path, cache_index=False)
+        self.assertEqual(len(reader), 1)
+        with ReplayWriter(self.path, RULES) as writer:
+            play(writer, 1, random.Random(1))
+        reader = ReplayReader(self.path, cache_index=False)
+        self.assertEqual(len(reader), 2)
+        self.assertTrue(reader.verify(1))
+
+    def test_index_cache(self):
+        choices = random.Random(0)
+        with ReplayWriter(self.path, RULES) as writer:
+            for seed in range(10):
+                play(writer, seed, choices)
+        starts = ReplayReader(self.path).starts
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+
+        # Reabrir usa o índice salvo; partidas novas são indexadas a partir dele
+        with ReplayWriter(self.path, RULES) as writer:
+            for seed in range(10, 15):
+                play(writer, seed, choices)
+        with mock.patch('game.replay._match_starts', wraps=replay._match_starts) as scan:
+            reader = ReplayReader(self.path)
+        self.assertGreater(scan.call_args[0][1], 0)
+        self.assertEqual(len(reader), 15)
+        np.testing.assert_array_equal(reader.starts[:10], starts)
+        np.testing.assert_array_equal(reader.starts, ReplayReader(self.path,
+                                                                  cache_index=False).starts)
+
+        # Um índice que não confere com o arquivo é montado de novo
+        with open(self.path + '.idx', 'r+b') as f:
+            f.seek(12)
+            f.write(np.array([0, 1, 2], dtype='<i8').tobytes())
+        self.assertEqual(len(ReplayReader(self.path)), 15)
+
+    def test_refresh(self):
+        writer = ReplayWriter(self.path, RULES)
+        play(writer, 0, random.Random(0))
+        writer.flush()
+        reader = ReplayReader(self.path)
+        play(writer, 1, random.Random(1))
+        writer.flush()
+        self.assertEqual(len(reader), 1)
+        reader.refresh()
+        self.assertEqual(len(reader), 2)
+        self.assertTrue(reader.verify(1))
+
+    def test_console_game_is_recorded(self):
+        """Testa a gravação de run_game(), jogando sempre o ataque"""
+        from game.engine import run_game
+
+        writer = ReplayWriter(self.path)
+        minimax = dict(GAME_CONFIG['MINIMAX_CONFIG'], THINKING_TIME=0.01, PONDERING=False,
+                       USE_TABLEBASE=False)
+        with mock.patch.dict(GAME_CONFIG, MINIMAX_CONFIG=minimax), \
+                mock.patch('builtins.input', return_value='1'), redirect_stdout(io.StringIO()):
+            run_game('MINIMAX', replay_writer=writer)
+        writer.close()
+
+        reader = ReplayReader(self.path)
+        self.assertEqual(len(reader), 1)
+        self.assertTrue(np.all(reader.match(0)['player_action'] == ATTACK))
+        self.assertIn(reader.winners()[0], (PLAYER, ENEMY))
+        self.assertTrue(reader.verify(0))
+
+    def test_default_writer(self):
+        """Testa que a gravação vem desligada e usa a pasta de dados do usuário"""
+        self.assertIsNone(replay.get_replay_writer())
+
+        config = {'REPLAY_CONFIG': {'RECORD': True}}
+        with mock.patch.dict(os.environ, TURNBASED_AI_DATA=self.directory):
+            writer = replay.get_replay_writer(config)
+            self.addCleanup(replay._writers.pop, writer.path)
+            self.addCleanup(writer.close)
+            self.assertIs(replay.get_replay_writer(config), writer)
+        self.assertEqual(writer.path, os.path.join(self.directory, 'replays.tbr'))
+
+    def test_new_seed(self):
+        self.assertNotEqual(new_seed(), new_seed())
+        self.assertLess(new_seed(), 1 << 63)
+
+
+if __name__ == '__main__':
+    unittest.main()
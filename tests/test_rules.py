@@ -0,0 +1,147 @@
+import contextlib
+import io
+import random
+import unittest
+
+import numpy as np
+
+from game.entities import Character
+from game.rules import (ATTACK, DEFEND, ENEMY, HEAL, INVALID, PLAYER, BattleRules, Dice,
+                        MatchState, RulesEngine, TurnEvent, action_index, describe_event)
+
+RULES = BattleRules(max_hp=100, player_attack=20, player_defense=5, ai_attack=25,
+                    ai_defense=4, heal_min=5, heal_max=20)
+
+# Ações do jogador e do inimigo em cada turno de uma partida roteirizada
+SCRIPT = [(ATTACK, ATTACK), (DEFEND, ATTACK), (HEAL, DEFEND), (ATTACK, HEAL),
+          (INVALID, ATTACK), (DEFEND, HEAL)] * 4
+
+
+def scripted(side):
+    """Política que segue SCRIPT pelo turno do estado"""
+    return lambda state: SCRIPT[(state.turn - 1) % len(SCRIPT)][side]
+
+
+class TestRulesEngine(unittest.TestCase):
+
+    def test_matches_character(self):
+        """Testa que o núcleo reproduz Character com o mesmo gerador"""
+        engine = RulesEngine(RULES, random.Random(7))
+        state = engine.new_match()
+        player = Character("Jogador", 100, 20, 5, rng=random.Random(7), echo=False)
+        enemy = Character("Inimigo", 100, 25, 4, rng=player.dice.rng)
+
+        for player_action, enemy_action in SCRIPT:
+            if engine.play_turn(state, player_action, enemy_action) is not None:
+                break
+            player.reset_turn()
+            enemy.reset_turn()
+            for actor, target, action in ((player, enemy, player_action),
+                                          (enemy, player, enemy_action)):
+                if action == ATTACK:
+                    actor.attack(target)
+                elif action == DEFEND:
+                    actor.defend()
+                elif action == HEAL:
+                    actor.heal()
+            self.assertEqual((state.player_hp, state.enemy_hp), (player.hp, enemy.hp))
+
+    def test_play_match_matches_play_turn(self):
+        """Testa que o laço rápido de play_match() é igual a play_turn() em sequência"""
+        for seed in range(5):
+            fast_events, slow_events = [], []
+            fast = RulesEngine(RULES, random.Random(seed)).play_match(
+                scripted(PLAYER), scripted(ENEMY), events=fast_events)
+
+            engine = RulesEngine(RULES, random.Random(seed))
+            slow = engine.new_match()
+            while slow.winner is None:
+                actions = SCRIPT[(slow.turn - 1) % len(SCRIPT)]
+                engine.play_turn(slow, *actions, events=slow_events)
+
+            self.assertEqual((fast.player_hp, fast.enemy_hp, fast.turn, fast.winner),
+                             (slow.player_hp, slow.enemy_hp, slow.turn, slow.winner))
+            self.assertEqual(fast_events, slow_events)
+
+    def test_seeded_matches_repeat(self):
+        for rng in (lambda: random.Random(3), lambda: np.random.default_rng(3)):
+            first = RulesEngine(RULES, rng()).play_match(scripted(PLAYER), scripted(ENEMY))
+            second = RulesEngine(RULES, rng()).play_match(scripted(PLAYER), scripted(ENEMY))
+            self.assertEqual(first, second)
+            self.assertIsNotNone(first.winner)
+
+    def test_no_output(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            RulesEngine(RULES, 1).play_match(scripted(PLAYER), scripted(ENEMY))
+        self.assertEqual(output.getvalue(), "")
+
+    def test_defense_and_heal_limits(self):
+        engine = RulesEngine(RULES, random.Random(0))
+        state = MatchState(90, 100)
+        events = []
+        engine.play_turn(state, DEFEND, ATTACK, events)
+        # 25 + variação (-5 a 5) - defesa 5
+        self.assertTrue(15 <= events[1].amount <= 25)
+        self.assertEqual(state.player_hp, 90 - events[1].amount)
+
+        state = MatchState(99, 100)
+        engine.play_turn(state, HEAL, DEFEND)
+        self.assertEqual(state.player_hp, 100)
+        self.assertTrue(state.enemy_defending)
+
+    def test_winner_stops_turn(self):
+        engine = RulesEngine(RULES, random.Random(0))
+        state = MatchState(100, 1)
+        events = []
+        self.assertEqual(engine.play_turn(state, ATTACK, ATTACK, events), PLAYER)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(state.enemy_hp, 0)
+        self.assertEqual(state.turn, 2)
+
+    def test_max_turns(self):
+        state = RulesEngine(RULES, 0).play_match(lambda s: DEFEND, lambda s: DEFEND,
+                                                 max_turns=10)
+        self.assertIsNone(state.winner)
+        self.assertEqual(state.turn, 11)
+
+    def test_generator_dice_ranges(self):
+        dice = Dice(np.random.default_rng(0), 5, 20)
+        variations = [dice.variation() for _ in range(5000)]
+        healings = [dice.healing() for _ in range(5000)]
+        self.assertEqual((min(variations), max(variations)), (-5, 5))
+        self.assertEqual((min(healings), max(healings)), (5, 20))
+
+
+class TestEvents(unittest.TestCase):
+
+    def test_character_messages(self):
+        """Testa que Character continua imprimindo as mensagens de antes"""
+        attacker = Character("Atacante", 100, 20, 5, rng=random.Random(1))
+        target = Character("Alvo", 100, 15, 3)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            damage = attacker.attack(target)
+            target.defend()
+            healing = target.heal()
+        self.assertEqual(output.getvalue().splitlines(), [
+            f"Atacante atacou Alvo causando {damage} de dano!",
+            "Alvo entrou em modo de defesa!",
+            f"Alvo se curou em {healing} pontos!",
+        ])
+        self.assertEqual(target.last_event, TurnEvent("Alvo", HEAL, healing))
+
+    def test_silent_character(self):
+        character = Character("Quieto", 100, 20, 5, echo=False)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            character.defend()
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(character.last_event.action, DEFEND)
+
+    def test_action_names(self):
+        self.assertEqual(action_index('heal'), HEAL)
+        self.assertEqual(action_index('dance'), INVALID)
+        self.assertEqual(describe_event(TurnEvent(PLAYER, INVALID, 0), "Jogador"),
+                         "Jogador perdeu o turno.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from game.arena import AGENTS, Agent, register_agent
+from game.rules import ATTACK, BattleRules
+from game.server import MatchClient, MatchServer, run_load
+
+RULES = BattleRules(max_hp=100, player_attack=20, player_defense=5, ai_attack=25,
+                    ai_defense=4, heal_min=5, heal_max=20)
+
+
+class SlowAgent(Agent):
+    """Ataca depois de uma espera, como uma busca demorada"""
+
+    release = threading.Event()
+
+    def decide(self, state, side):
+        self.release.wait(5)
+        return ATTACK
+
+
+class BrokenAgent(Agent):
+
+    def decide(self, state, side):
+        raise RuntimeError("falha na busca")
+
+
+def serving(test):
+    """Roda o teste assíncrono em asyncio.run(), com servidor e cliente abertos
+
+    (unittest.IsolatedAsyncioTestCase só existe a partir do Python 3.8)
+    """
+    @functools.wraps(test)
+    def wrapper(self):
+        asyncio.run(self.serve(test))
+    return wrapper
+
+
+class ServerTestCase(unittest.TestCase):
+
+    executor_factory = staticmethod(lambda: ThreadPoolExecutor(4))
+
+    def setUp(self):
+        for name, factory in (('slow-test', SlowAgent), ('broken-test', BrokenAgent)):
+            register_agent(name, factory)
+            self.addCleanup(AGENTS.pop, name)
+        self.executor = self.executor_factory()
+
+    def tearDown(self):
+        SlowAgent.release.set()
+        self.executor.shutdown(wait=True)
+        SlowAgent.release.clear()
+
+    async def serve(self, test):
+        self.server = await MatchServer('127.0.0.1', 0, RULES, executor=self.executor,
+                                        seed=0, max_matches=100).start()
+        self.client = await MatchClient.connect('127.0.0.1', self.server.port)
+        try:
+            await test(self)
+        finally:
+            SlowAgent.release.set()
+            await self.client.close()
+            await self.server.close()
+
+
+class TestMatchServer(ServerTestCase):
+
+    @serving
+    async def test_full_match(self):
+        reply = await self.client.request('new', agent='aggressive')
+        self.assertTrue(reply['ok'])
+        self.assertEqual(reply['state']['player_hp'], 100)
+        match = reply['match']
+
+        turn = 1
+        while True:
+            reply = await self.client.request('act', match=match, action='attack')
+            self.assertTrue(reply['ok'], reply)
+            self.assertEqual(reply['player']['action'], 'attack')
+            turn += 1
+            self.assertEqual(reply['state']['turn'], turn)
+            if reply['state']['winner'] is not None:
+                break
+            self.assertEqual(reply['enemy']['action'], 'attack')
+
+        self.assertIn(reply['state']['winner'], ('player', 'enemy'))
+        # Partidas terminadas saem do servidor
+        reply = await self.client.request('state', match=match)
+        self.assertFalse(reply['ok'])
+        stats = (await self.client.request('stats'))
+        self.assertEqual((stats['active'], stats['finished']), (0, 1))
+
+    @serving
+    async def test_slow_ai_does_not_block_other_matches(self):
+        slow = (await self.client.request('new', agent='slow-test'))['match']
+        fast = (await self.client.request('new', agent='aggressive'))['match']
+
+        waiting = asyncio.create_task(self.client.request('act', match=slow, action='defend'))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        for _ in range(3):
+            reply = await self.client.request('act', match=fast, action='attack')
+            self.assertTrue(reply['ok'])
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertFalse(waiting.done())
+
+        # A mesma partida não aceita outro turno enquanto espera a IA
+        reply = await self.client.request('act', match=slow, action='attack')
+        self.assertIn("andamento", reply['error'])
+
+        SlowAgent.release.set()
+        reply = await waiting
+        self.assertEqual(reply['enemy']['action'], 'attack')
+        self.assertTrue(reply['state']['player_defending'])
+
+    @serving
+    async def test_quit_during_ai_decision(self):
+        match = (await self.client.request('new', agent='slow-test'))['match']
+        waiting = asyncio.create_task(self.client.request('act', match=match, action='attack'))
+        await asyncio.sleep(0.05)
+        reply = await self.client.request('quit', match=match)
+        self.assertTrue(reply['ok'])
+
+        # O turno pendente não termina numa partida que já saiu do servidor
+        SlowAgent.release.set()
+        reply = await waiting
+        self.assertFalse(reply['ok'])
+        self.assertIn("encerrada", reply['error'])
+        stats = await self.client.request('stats')
+        self.assertEqual((stats['active'], stats['finished'], stats['turns']), (0, 0, 0))
+
+    @serving
+    async def test_ai_failure_keeps_state(self):
+        match = (await self.client.request('new', agent='broken-test'))['match']
+        reply = await self.client.request('act', match=match, action='attack')
+        self.assertFalse(reply['ok'])
+        self.assertIn("falha na busca", reply['error'])
+        state = (await self.client.request('state', match=match))['state']
+        self.assertEqual((state['turn'], state['enemy_hp']), (1, 100))
+
+    @serving
+    async def test_protocol_errors(self):
+        errors = [
+            await self.client.request('dance'),
+            await self.client.request('act', match=999, action='attack'),
+            await self.client.request('new', agent='oracle'),
+        ]
+        match = (await self.client.request('new', agent='random'))['match']
+        errors.append(await self.client.request('act', match=match, action='flee'))
+        self.assertTrue(all(not reply['ok'] and reply['error'] for reply in errors))
+
+        # Linhas que não são JSON recebem erro sem derrubar a conexão
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        writer.write(b'isto nao e json\n[1, 2]\n{"op": "stats", "id": "x"}\n')
+        replies = [json.loads(await reader.readline()) for _ in range(3)]
+        self.assertEqual([reply['ok'] for reply in replies].count(False), 2)
+        self.assertTrue(any(reply['ok'] and reply.get('id') == 'x' for reply in replies))
+        writer.close()
+        await writer.wait_closed()
+
+    @serving
+    async def test_server_full_and_disconnect(self):
+        other = await MatchClient.connect('127.0.0.1', self.server.port)
+        replies = await asyncio.gather(*(other.request('new', agent='random')
+                                         for _ in range(100)))
+        self.assertTrue(all(reply['ok'] for reply in replies))
+        reply = await self.client.request('new', agent='random')
+        self.assertEqual(reply['error'], "servidor cheio")
+
+        # Partidas de uma conexão encerrada são descartadas
+        await other.close()
+        for _ in range(100):
+            if not self.server.matches:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self.server.matches), 0)
+
+    @serving
+    async def test_load_generator(self):
+        report = await run_load(60, '127.0.0.1', self.server.port, agent='healer',
+                                connections=3)
+        self.assertEqual((report.finished, report.errors), (60, 0))
+        self.assertEqual(report.turns, self.server.turns)
+        self.assertGreaterEqual(report.percentile(99), report.percentile(50))
+        self.assertIn("p99", report.format())
+
+
+class TestProcessPool(ServerTestCase):
+
+    executor_factory = staticmethod(lambda: ProcessPoolExecutor(2))
+
+    @serving
+    async def test_minimax_in_batches(self):
+        """Testa decisões do Minimax nos processos, pedidas juntas em lotes"""
+        report = await run_load(40, '127.0.0.1', self.server.port, agent='minimax-facil',
+                                connections=2)
+        self.assertEqual((report.finished, report.errors), (40, 0))
+        stats = self.server.get_stats()
+        self.assertGreater(stats['decisions'], 0)
+        self.assertLess(stats['batches'], stats['decisions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from game.neural_ai import NeuralAI, SimpleNeuralNetwork
+from game.rules import ATTACK, DEFEND, ENEMY, HEAL, PLAYER, BattleRules, RulesEngine
+from game.simulator import (NO_WINNER, constant_policy, heal_when_low, minimax_policy,
+                            neural_policy, random_policy, simulate)
+
+RULES = BattleRules(max_hp=100, player_attack=20, player_defense=5, ai_attack=25,
+                    ai_defense=4, heal_min=5, heal_max=20)
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_seeded_runs_repeat(self):
+        first = simulate(500, random_policy(1), random_policy(2), RULES, rng=3)
+        second = simulate(500, random_policy(1), random_policy(2), RULES, rng=3)
+        np.testing.assert_array_equal(first.winners, second.winners)
+        np.testing.assert_array_equal(first.turns, second.turns)
+
+    def test_matches_rules_engine(self):
+        """Testa que o lote tem as mesmas estatísticas de RulesEngine.play_match()"""
+        result = simulate(20000, heal_when_low(PLAYER, max_hp=100),
+                          heal_when_low(ENEMY, max_hp=100), RULES, rng=0)
+
+        engine = RulesEngine(RULES, np.random.default_rng(1))
+        player_policy = lambda state: HEAL if state.player_hp < 30 else ATTACK
+        enemy_policy = lambda state: HEAL if state.enemy_hp < 30 else ATTACK
+        states = [engine.play_match(player_policy, enemy_policy) for _ in range(4000)]
+        win_rate = np.mean([state.winner == PLAYER for state in states])
+        mean_turns = np.mean([state.turn - 1 for state in states])
+
+        self.assertAlmostEqual(result.player_win_rate, win_rate, delta=0.03)
+        self.assertAlmostEqual(result.turns.mean(), mean_turns, delta=0.3)
+        self.assertEqual(result.unfinished, 0)
+
+    def test_attack_race(self):
+        """Testa vencedores, turnos e HPs finais de ataque contra ataque"""
+        result = simulate(1000, constant_policy(ATTACK), constant_policy(ATTACK), RULES, rng=0)
+        player_won = result.winners == PLAYER
+        self.assertEqual(result.player_wins + result.enemy_wins, 1000)
+        self.assertTrue(np.all(result.enemy_hp[player_won] == 0))
+        self.assertTrue(np.all(result.player_hp[~player_won] == 0))
+        # 100 HP com 15 a 30 de dano por turno
+        self.assertTrue(np.all((result.turns >= 4) & (result.turns <= 7)))
+
+    def test_defense_reduces_damage(self):
+        result = simulate(1000, constant_policy(DEFEND), constant_policy(ATTACK), RULES,
+                          rng=0, max_turns=2)
+        # Dois ataques de 25 +- 5 contra a defesa 5: 30 a 50 de dano
+        lost = 100 - result.player_hp
+        self.assertTrue(np.all((lost >= 30) & (lost <= 50)))
+        self.assertEqual(result.unfinished, 1000)
+        self.assertTrue(np.all(result.winners == NO_WINNER))
+        self.assertTrue(np.all(result.turns == 2))
+
+    def test_heal_is_capped(self):
+        result = simulate(100, constant_policy(HEAL), constant_policy(HEAL), RULES, rng=0,
+                          max_turns=3, player_hp=95, enemy_hp=10)
+        self.assertTrue(np.all(result.player_hp == 100))
+        self.assertTrue(np.all((result.enemy_hp >= 25) & (result.enemy_hp <= 70)))
+
+    def test_policies_see_only_active_matches(self):
+        sizes = []
+
+        def policy(view):
+            sizes.append(len(view.player_hp))
+            self.assertTrue(np.all(view.player_hp > 0) and np.all(view.enemy_hp > 0))
+            return np.full(len(view.turn), ATTACK)
+
+        simulate(300, policy, constant_policy(ATTACK), RULES, rng=0)
+        self.assertEqual(sizes[0], 300)
+        self.assertTrue(all(later <= earlier for earlier, later in zip(sizes, sizes[1:])))
+
+    def test_chunks(self):
+        result = simulate(1000, random_policy(0), random_policy(1), RULES, rng=0, chunk_size=128)
+        self.assertEqual(len(result), 1000)
+        self.assertEqual(result.total_turns, int(result.turns.sum()))
+        self.assertIn("1000 partidas", result.summary())
+        self.assertEqual(len(simulate(0, random_policy(0), random_policy(1), RULES)), 0)
+
+
+class TestAIPolicies(unittest.TestCase):
+
+    def test_minimax_policy(self):
+        result = simulate(50, constant_policy(ATTACK), minimax_policy(2, RULES.to_config()),
+                          RULES, rng=0)
+        self.assertEqual(result.unfinished, 0)
+        self.assertGreater(result.enemy_wins, 25)
+
+    def test_neural_policy(self):
+        ai = NeuralAI.__new__(NeuralAI)  # Sem carregar modelo do disco
+        np.random.seed(0)
+        ai.network = SimpleNeuralNetwork()
+        ai.policy_table = None
+        result = simulate(50, random_policy(0), neural_policy(ai), RULES, rng=0, max_turns=200)
+        self.assertEqual(len(result), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from game import tablebase
+from game.config import GAME_CONFIG, difficulty_config
+from game.minimax import BattleState, minimax, ACTIONS
+from game.tablebase import Tablebase, TablebaseError, probe, rules_hash, WIN_SCORE
+
+
+def small_config(**changes):
+    config = dict(GAME_CONFIG, MAX_HP=60)
+    config.update(changes)
+    return config
+
+
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = small_config()
+        cls.tablebase = Tablebase.build(cls.config)
+
+    def test_values_are_consistent(self):
+        """Testa se cada valor é o melhor valor dos filhos, uma jogada mais distante"""
+        def one_ply_back(score):
+            return score - 1 if score > 0 else score + 1 if score < 0 else 0
+
+        with mock.patch.dict(GAME_CONFIG, MAX_HP=60):
+            for player_hp in range(1, 61, 3):
+                for enemy_hp in range(1, 61, 3):
+                    for flags in range(8):
+                        state = BattleState(player_hp, enemy_hp, bool(flags & 4),
+                                            bool(flags & 2), bool(flags & 1))
+                        score, action = self.tablebase.lookup(state)
+                        children = [self.tablebase.lookup(state.apply_action(a))[0]
+                                    for a in ACTIONS]
+                        backed_up = [one_ply_back(child) for child in children]
+                        best = min(backed_up) if state.player_turn else max(backed_up)
+                        self.assertEqual(score, best)
+                        if score != 0:
+                            self.assertEqual(backed_up[ACTIONS.index(action)], score)
+
+    def test_terminal_states(self):
+        """Testa estados terminais da tablebase"""
+        self.assertEqual(self.tablebase.lookup(BattleState(0, 30, True)), (WIN_SCORE, None))
+        self.assertEqual(self.tablebase.lookup(BattleState(30, 0, False)), (-WIN_SCORE, None))
+
+    def test_save_and_load(self):
+        """Testa gravação e leitura com memory-map, validando as regras"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tb.bin')
+            self.tablebase.save(path)
+            loaded = Tablebase.load(path, self.config)
+            state = BattleState(45, 32, False, True, False)
+            self.assertEqual(loaded.lookup(state), self.tablebase.lookup(state))
+            self.assertEqual(loaded.version_hash, rules_hash(self.config))
+
+            with self.assertRaises(TablebaseError):
+                Tablebase.load(path, small_config(AI_ATTACK=31))
+            del loaded
+
+    def test_minimax_uses_tablebase(self):
+        """Testa se minimax() responde pela tablebase quando ela cobre o estado"""
+        state = BattleState(40, 50, player_turn=False)
+        self.assertEqual(minimax(state, 8, True, tablebase=self.tablebase),
+                         self.tablebase.lookup(state))
+        # Fora da faixa de HP volta para a busca
+        far = BattleState(200, 50, player_turn=False)
+        self.assertEqual(minimax(far, 3, True, tablebase=self.tablebase), minimax(far, 3, True))
+
+    def test_probe_only_at_top_difficulty(self):
+        """Testa que as dificuldades mais rasas não jogam perfeito pela tablebase"""
+        minimax_config = dict(GAME_CONFIG['MINIMAX_CONFIG'], USE_TABLEBASE=True,
+                              TABLEBASE_MIN_DEPTH=8)
+        state = BattleState(40, 50, player_turn=False)
+        with mock.patch('game.tablebase.get_tablebase', return_value=self.tablebase):
+            for depth, expected in ((3, False), (6, False), (8, True)):
+                config = small_config(MINIMAX_DEPTH=depth, MINIMAX_CONFIG=minimax_config)
+                self.assertEqual(probe(state, config) is not None, expected, depth)
+            # A profundidade pedida (a do pondering, por exemplo) vale sobre MINIMAX_DEPTH
+            config = small_config(MINIMAX_DEPTH=8, MINIMAX_CONFIG=minimax_config)
+            self.assertIsNone(probe(state, config, depth=3))
+            self.assertEqual(tuple(probe(state, config))[:2], self.tablebase.lookup(state))
+
+
+class TestTablebaseInGame(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patches = (mock.patch.object(tablebase, 'DATA_DIR', directory.name),
+                   mock.patch.dict(tablebase._loaded, clear=True),
+                   mock.patch.dict(GAME_CONFIG))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def play(self, difficulty):
+        """Joga uma partida no console no nível `difficulty`, sempre atacando"""
+        from game.engine import run_game
+
+        GAME_CONFIG.update(difficulty_config(difficulty))
+        output = io.StringIO()
+        with mock.patch('builtins.input', return_value='1'), redirect_stdout(output):
+            run_game('MINIMAX')
+        return [line for line in output.getvalue().splitlines() if 'Busca:' in line]
+
+    def test_default_game_uses_tablebase(self):
+        """Testa que o jogo com a configuração padrão no DIFICIL responde pela tablebase"""
+        with redirect_stdout(io.StringIO()):
+            for difficulty in ('DIFICIL', 'NORMAL'):
+                tablebase.main(['--difficulty', difficulty])
+                path = tablebase.default_path(difficulty_config(difficulty))
+                self.assertTrue(os.path.exists(path), difficulty)
+
+        searches = self.play('DIFICIL')
+        self.assertTrue(searches)
+        self.assertTrue(all(line.endswith('Busca: tablebase') for line in searches), searches)
+
+        # As dificuldades mais baixas continuam buscando, mesmo com a tablebase pronta
+        searches = self.play('NORMAL')
+        self.assertFalse(any(line.endswith('Busca: tablebase') for line in searches), searches)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from game.config import GAME_CONFIG
+from game.neural_ai import NeuralAI
+from game.training import (STOP_EPOCHS, STOP_PLATEAU, STOP_TIME_BUDGET, SGD, Adam, Momentum,
+                           Trainer, create_optimizer)
+from tests.helpers import make_network
+
+
+class TestTrainer(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(5)
+        ai = NeuralAI.__new__(NeuralAI)
+        self.inputs, self.expected = ai.initial_training_data(samples=120)
+
+    def test_default_matches_plain_sgd(self):
+        """Testa que fit() sem opções é o SGD de antes, com a taxa da rede"""
+        network = make_network()
+        reference = make_network()
+        np.random.seed(9)
+        with contextlib.redirect_stdout(io.StringIO()):
+            network.fit(self.inputs, self.expected, epochs=5, batch_size=16)
+        np.random.seed(9)
+        report = Trainer(SGD(reference.learning_rate), batch_size=16, verbose=False).fit(
+            reference, self.inputs, self.expected, epochs=5)
+
+        np.testing.assert_allclose(network.weights_input_hidden, reference.weights_input_hidden)
+        self.assertEqual(report.epochs, 5)
+        self.assertEqual(report.stop_reason, STOP_EPOCHS)
+        self.assertEqual(network.last_report.train_loss, report.train_loss)
+
+    def test_optimizers_reduce_loss(self):
+        """Testa que todos os otimizadores diminuem o erro"""
+        for optimizer in (SGD(0.1), Momentum(0.02), Adam(0.01)):
+            network = make_network()
+            before = network.loss(self.inputs, self.expected)
+            Trainer(optimizer, verbose=False).fit(network, self.inputs, self.expected, epochs=50)
+            self.assertLess(network.loss(self.inputs, self.expected), before * 0.7,
+                            type(optimizer).__name__)
+
+    def test_early_stopping_restores_best_weights(self):
+        """Testa a parada no platô, voltando aos pesos da melhor época de validação"""
+        network = make_network()
+        trainer = Trainer(SGD(0.1), validation_split=0.25, patience=3, min_delta=1.0,
+                          verbose=False)
+        report = trainer.fit(network, self.inputs, self.expected, epochs=100)
+
+        # min_delta enorme: nenhuma época depois da primeira conta como melhora
+        self.assertEqual(report.stop_reason, STOP_PLATEAU)
+        self.assertEqual(report.epochs, 4)
+        self.assertEqual(report.best_epoch, 1)
+        self.assertEqual(report.validation_samples, 30)
+        self.assertEqual(report.samples, 90)
+        self.assertEqual(len(report.history), 4)
+
+    def test_restored_weights_give_best_loss(self):
+        network = make_network()
+        np.random.seed(2)
+        report = Trainer(SGD(2.0), validation_split=0.5, patience=2, verbose=False).fit(
+            network, self.inputs, self.expected, epochs=200)
+
+        np.random.seed(2)
+        order = np.random.permutation(len(self.inputs))[:60]
+        self.assertAlmostEqual(network.loss(self.inputs[order], self.expected[order]),
+                               report.best_loss)
+
+    def test_time_budget(self):
+        """Testa que o limite de tempo interrompe o treinamento"""
+        network = make_network()
+        report = Trainer(time_budget=0.0, verbose=False).fit(network, self.inputs,
+                                                             self.expected, epochs=1000)
+
+        self.assertEqual(report.stop_reason, STOP_TIME_BUDGET)
+        self.assertEqual(report.epochs, 1)
+        self.assertGreater(report.elapsed, 0)
+        self.assertIn('limite de tempo', report.format())
+
+    def test_generation_counts_trainings(self):
+        network = make_network()
+        trainer = Trainer(verbose=False)
+        trainer.fit(network, self.inputs, self.expected, epochs=2)
+        trainer.fit(network, self.inputs, self.expected, epochs=0)
+        self.assertEqual(network.generation, 1)
+
+    def test_create_optimizer(self):
+        self.assertIsInstance(create_optimizer('Adam'), Adam)
+        self.assertEqual(create_optimizer('momentum', 0.05).learning_rate, 0.05)
+        with self.assertRaises(ValueError):
+            create_optimizer('rmsprop')
+
+
+class TestNeuralAITraining(unittest.TestCase):
+
+    def test_train_network_uses_config(self):
+        """Testa que o retreino usa as opções de NEURAL_CONFIG e guarda o relatório"""
+        ai = NeuralAI.__new__(NeuralAI)
+        ai.last_training_report = None
+        ai.persister = mock.Mock()
+        ai.experience_buffer = mock.Mock()
+        random.seed(1)
+        inputs, expected = ai.initial_training_data(samples=50)
+        ai.experience_buffer.recent.return_value = mock.Mock(inputs=inputs, targets=expected)
+
+        network = make_network()
+        with mock.patch.dict(GAME_CONFIG['NEURAL_CONFIG'], OPTIMIZER='adam', LEARNING_RATE=0.01,
+                             VALIDATION_SPLIT=0.2, PATIENCE=1, MIN_DELTA=1.0,
+                             TRAIN_TIME_BUDGET=None), \
+                contextlib.redirect_stdout(io.StringIO()):
+            ai.train_network(network)
+
+        report = ai.last_training_report
+        self.assertIs(report, network.last_report)
+        self.assertEqual(report.stop_reason, STOP_PLATEAU)
+        self.assertEqual(report.epochs, 2)
+        self.assertEqual(report.validation_samples, 10)
+        ai.persister.mark_dirty.assert_called_once_with(network)
+
+
+if __name__ == '__main__':
+    unittest.main()